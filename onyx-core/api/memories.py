@@ -528,14 +528,16 @@ async def memory_health_check():
     try:
         memory_service = get_memory_service()
         # Test database connection
-        memory_service.connect()
-        memory_service.close()
+        health = await memory_service.health_check()
+        if health["status"] != "healthy":
+            raise RuntimeError(health.get("error", "database unavailable"))
 
         return {
             "success": True,
             "data": {
                 "status": "healthy",
                 "service": "memory",
+                "pool": health["pool"],
                 "timestamp": datetime.utcnow().isoformat() + "Z"
             }
         }
@@ -6,18 +6,20 @@ parsing, and indexing into the vector database.
 """
 
 import os
-import tempfile
 import shutil
+import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, AsyncIterator, BinaryIO, Callable, Awaitable, Tuple
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, BackgroundTasks
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
-from rag_service import get_rag_service
+from rag_service import get_rag_service, DocumentChunk
 from file_parsers.parser_factory import ParserFactory
 from services.embedding_service import get_embedding_service
+from services.parse_pool import get_parse_pool
+from services.ingestion_job_service import IngestionFile, get_ingestion_job_service
 from utils.auth import require_authenticated_user
 
 logger = logging.getLogger(__name__)
@@ -25,6 +27,7 @@ logger = logging.getLogger(__name__)
 # Constants
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
 MAX_FILES_PER_REQUEST = 10
+UPLOAD_FILE_CONCURRENCY = int(os.getenv("UPLOAD_FILE_CONCURRENCY", str(MAX_FILES_PER_REQUEST)))
 UPLOAD_DIR = os.getenv("UPLOAD_DIR", "/tmp/uploads")
 
 # Create upload router
@@ -69,16 +72,27 @@ class FileUploadResponse(BaseModel):
     processing_stats: Optional[Dict[str, Any]] = None
 
 
+class IngestionJobResponse(BaseModel):
+    """Response model for a queued ingestion job"""
+    job_id: str
+    status: str
+    status_url: str
+    queued_files: List[str]
+    rejected_files: List[FileProcessingResult]
+
+
 # Ensure upload directory exists
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 
-def validate_upload_file(file: UploadFile) -> FileValidationResult:
+def validate_upload_file(file: UploadFile, file_path: Optional[str] = None) -> FileValidationResult:
     """
     Validate uploaded file for format, size, and security
 
     Args:
         file: UploadFile object
+        file_path: Copy of the upload already spooled to disk, validated
+            instead of spooling the stream again
 
     Returns:
         FileValidationResult with validation status
@@ -94,30 +108,20 @@ def validate_upload_file(file: UploadFile) -> FileValidationResult:
                 error_message="No filename provided"
             )
 
-        # Create temporary file for validation
-        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-            shutil.copyfileobj(file.file, temp_file)
-            temp_file_path = temp_file.name
-
-        try:
-            # Use ParserFactory to validate file
-            validation = ParserFactory.validate_file(temp_file_path)
-
-            return FileValidationResult(
-                filename=file.filename,
-                is_valid=validation.is_valid,
-                file_size=validation.file_size or 0,
-                file_type=validation.detected_format or "unknown",
-                error_message=validation.error_message,
-                detected_format=validation.detected_format
-            )
+        if file_path is not None:
+            validation = ParserFactory.validate_path(file_path, file.filename)
+        else:
+            # Validate from the upload stream (streaming parsers only read the header)
+            validation = ParserFactory.validate_stream(file.file, file.filename)
 
-        finally:
-            # Clean up temporary file
-            try:
-                os.unlink(temp_file_path)
-            except Exception:
-                pass
+        return FileValidationResult(
+            filename=file.filename,
+            is_valid=validation.is_valid,
+            file_size=validation.file_size or 0,
+            file_type=validation.detected_format or "unknown",
+            error_message=validation.error_message,
+            detected_format=validation.detected_format
+        )
 
     except Exception as e:
         logger.error(f"File validation error for {file.filename}: {e}")
@@ -130,10 +134,29 @@ def validate_upload_file(file: UploadFile) -> FileValidationResult:
         )
 
 
+async def _iterate_in_thread(iterator: Iterator[str]) -> AsyncIterator[str]:
+    """
+    Pull items from a blocking iterator in a worker thread
+
+    Args:
+        iterator: Iterator that does blocking I/O (e.g. a parser reading a file)
+
+    Yields:
+        Items of the iterator, without blocking the event loop
+    """
+    exhausted = object()
+    while True:
+        item = await asyncio.to_thread(next, iterator, exhausted)
+        if item is exhausted:
+            return
+        yield item
+
+
 async def process_uploaded_file(
     file: UploadFile,
     user_id: str,
-    doc_id_prefix: str = "upload"
+    doc_id_prefix: str = "upload",
+    file_path: Optional[str] = None
 ) -> FileProcessingResult:
     """
     Process uploaded file: parse, generate embeddings, and index
@@ -142,121 +165,328 @@ async def process_uploaded_file(
         file: UploadFile object
         user_id: User ID for permission metadata
         doc_id_prefix: Prefix for document ID
+        file_path: Copy of the upload spooled during validation, if any
 
     Returns:
         FileProcessingResult with processing status
     """
+    # Reset file pointer
+    await file.seek(0)
+    return await ingest_file(file.file, file.filename, user_id, doc_id_prefix, file_path=file_path)
+
+
+async def ingest_file(
+    stream: BinaryIO,
+    filename: str,
+    user_id: str,
+    doc_id_prefix: str = "upload",
+    progress: Optional[Callable[..., Awaitable[None]]] = None,
+    file_path: Optional[str] = None
+) -> FileProcessingResult:
+    """
+    Parse, embed and index a file
+
+    The file is streamed through the pipeline: the parser yields text
+    segments, the embedding service chunks and embeds them in batches, and
+    each batch is indexed while the next one is being read and embedded, so
+    memory stays bounded regardless of file size.
+
+    Args:
+        stream: Seekable binary stream of the file
+        filename: Original filename
+        user_id: User ID for permission metadata
+        doc_id_prefix: Prefix for document ID
+        progress: Optional async callback, called with keyword updates as
+            the file advances: parsed=True once the parser has produced all
+            text, chunks_embedded=n and chunks_indexed=n as running totals
+        file_path: The same file on disk, if there is one; non-streaming
+            formats are then parsed from it instead of spooling the stream
+
+    Returns:
+        FileProcessingResult with processing status. Chunks of a file that
+        fails (or is cancelled) part-way are deleted again, so an error result
+        never leaves searchable chunks behind.
+    """
     start_time = datetime.now()
+    index_task: Optional[asyncio.Task] = None
+    rag_service = None
+    written_ids: List[str] = []  # Chunk ids sent to the index, removed again unless the file completes
+    completed = False
 
-    try:
-        # Reset file pointer
-        await file.seek(0)
+    async def report(**updates):
+        if progress is not None:
+            try:
+                await progress(**updates)
+            except Exception as e:
+                logger.warning(f"Progress update failed for {filename}: {e}")
 
-        # Save to temporary file for processing
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{file.filename}") as temp_file:
-            shutil.copyfileobj(file.file, temp_file)
-            temp_file_path = temp_file.name
+    try:
+        stream.seek(0)
 
+        # Parse file using appropriate parser
         try:
-            # Parse file using appropriate parser
-            parse_result = ParserFactory.parse_file(temp_file_path, user_id)
-
-            if not parse_result.success:
-                return FileProcessingResult(
-                    filename=file.filename,
-                    status="error",
-                    error_message=parse_result.error_message
+            if ParserFactory.supports_streaming(filename):
+                # Parsers that split work across processes (PDF page ranges) share the parse pool
+                content_stream = await asyncio.to_thread(
+                    ParserFactory.open_stream, stream, filename, user_id, get_parse_pool().executor
                 )
-
-            # Generate embeddings
-            embedding_service = await get_embedding_service()
-            embedding_result = await embedding_service.generate_embeddings(
-                content=parse_result.content,
-                doc_metadata=parse_result.metadata or {}
+            elif file_path is not None:
+                # CPU-bound parsers run in the process pool, from the file already on disk
+                content_stream = await get_parse_pool().open_file(file_path, filename, user_id)
+            else:
+                # CPU-bound parsers run in the process pool
+                content_stream = await get_parse_pool().open_stream(stream, filename, user_id)
+        except ValueError as e:
+            return FileProcessingResult(
+                filename=filename,
+                status="error",
+                error_message=str(e)
             )
 
-            if not embedding_result.success:
-                return FileProcessingResult(
-                    filename=file.filename,
-                    status="error",
-                    error_message=f"Embedding generation failed: {embedding_result.error_message}"
-                )
-
-            # Index chunks in vector database
-            rag_service = await get_rag_service()
-            doc_id = f"{doc_id_prefix}_{int(start_time.timestamp())}_{file.filename.replace('.', '_')}"
-
-            indexed_chunks = 0
-            for i, chunk in enumerate(embedding_result.chunks):
+        embedding_service = await get_embedding_service()
+        rag_service = await get_rag_service()
+        doc_id = f"{doc_id_prefix}_{int(start_time.timestamp())}_{filename.replace('.', '_')}"
+
+        chunks_count = 0
+        indexed_chunks = 0
+        total_tokens = 0
+        reused_chunks = 0
+
+        async def segments():
+            async for segment in _iterate_in_thread(content_stream.segments):
+                yield segment
+            await report(parsed=True)
+
+        batches = embedding_service.embed_stream(segments(), doc_metadata=content_stream.metadata)
+        async for batch in batches:
+            documents = []
+            for chunk in batch:
                 chunk_metadata = {
                     "chunk_index": chunk.metadata.chunk_index,
-                    "total_chunks": chunk.metadata.total_chunks,
                     "token_count": chunk.metadata.token_count,
                     "start_char": chunk.metadata.start_char,
                     "end_char": chunk.metadata.end_char,
                     "chunk_hash": chunk.metadata.chunk_hash,
                 }
+                page_numbers = content_stream.pages_for_range(chunk.metadata.start_char, chunk.metadata.end_char)
+                if page_numbers:
+                    chunk_metadata["page_numbers"] = page_numbers
 
                 # Combine with document metadata
                 combined_metadata = {
-                    **(parse_result.metadata or {}),
+                    **content_stream.metadata,
                     **chunk_metadata
                 }
 
-                # Add document to vector database
-                success = await rag_service.add_document(
-                    doc_id=f"{doc_id}_chunk_{i}",
+                documents.append(DocumentChunk(
+                    doc_id=f"{doc_id}_chunk_{chunk.metadata.chunk_index}",
                     text=chunk.text,
-                    title=file.filename,
+                    title=filename,
                     source="local_upload",
-                    metadata=combined_metadata
-                )
+                    metadata=combined_metadata,
+                    embedding=chunk.embedding  # Already generated above; don't pay for it twice
+                ))
 
-                if success:
-                    indexed_chunks += 1
-
-            processing_time = (datetime.now() - start_time).total_seconds()
-
-            if indexed_chunks == len(embedding_result.chunks):
-                return FileProcessingResult(
-                    filename=file.filename,
-                    status="success",
-                    chunks_count=len(embedding_result.chunks),
-                    doc_id=doc_id,
-                    processing_time=processing_time,
-                    metadata={
-                        "parse_result": parse_result.metadata,
-                        "embedding_stats": embedding_result.stats,
-                        "indexed_chunks": indexed_chunks,
-                        "total_chunks": len(embedding_result.chunks)
-                    }
-                )
-            else:
-                return FileProcessingResult(
-                    filename=file.filename,
-                    status="error",
-                    chunks_count=len(embedding_result.chunks),
-                    error_message=f"Only {indexed_chunks}/{len(embedding_result.chunks)} chunks were indexed",
-                    processing_time=processing_time
-                )
+                total_tokens += chunk.metadata.token_count
+                reused_chunks += chunk.reused
 
-        finally:
-            # Clean up temporary file
-            try:
-                os.unlink(temp_file_path)
-            except Exception:
-                pass
+            chunks_count += len(documents)
+            await report(chunks_embedded=chunks_count)
+
+            # Index this batch while the next one is read and embedded
+            if index_task is not None:
+                indexed_chunks += await index_task
+                await report(chunks_indexed=indexed_chunks)
+            written_ids.extend(document.doc_id for document in documents)
+            index_task = asyncio.create_task(rag_service.add_documents(documents))
+
+        if index_task is not None:
+            indexed_chunks += await index_task
+            index_task = None
+            await report(chunks_indexed=indexed_chunks)
+
+        processing_time = (datetime.now() - start_time).total_seconds()
+
+        if chunks_count == 0:
+            return FileProcessingResult(
+                filename=filename,
+                status="error",
+                error_message="Embedding generation failed: No content chunks generated",
+                processing_time=processing_time
+            )
+
+        if indexed_chunks == chunks_count:
+            completed = True
+            return FileProcessingResult(
+                filename=filename,
+                status="success",
+                chunks_count=chunks_count,
+                doc_id=doc_id,
+                processing_time=processing_time,
+                metadata={
+                    "parse_result": content_stream.metadata,
+                    "embedding_stats": {
+                        "total_chunks": chunks_count,
+                        "total_tokens": total_tokens,
+                        "embedded_chunks": chunks_count - reused_chunks,
+                        "reused_chunks": reused_chunks,
+                        "model_used": embedding_service.model,
+                    },
+                    "indexed_chunks": indexed_chunks,
+                    "total_chunks": chunks_count
+                }
+            )
+        else:
+            return FileProcessingResult(
+                filename=filename,
+                status="error",
+                chunks_count=chunks_count,
+                error_message=f"Only {indexed_chunks}/{chunks_count} chunks were indexed",
+                processing_time=processing_time
+            )
 
     except Exception as e:
         processing_time = (datetime.now() - start_time).total_seconds()
-        logger.error(f"File processing error for {file.filename}: {e}")
+        logger.error(f"File processing error for {filename}: {e}")
         return FileProcessingResult(
-            filename=file.filename,
+            filename=filename,
             status="error",
             processing_time=processing_time,
             error_message=f"Processing error: {str(e)}"
         )
 
+    finally:
+        if index_task is not None and not index_task.done():
+            index_task.cancel()
+            await asyncio.gather(index_task, return_exceptions=True)
+        if not completed and written_ids:
+            await _discard_partial_upload(rag_service, filename, written_ids)
+
+
+async def _discard_partial_upload(rag_service, filename: str, chunk_ids: List[str]) -> None:
+    """
+    Delete the chunks of a file that failed part-way through indexing
+
+    Args:
+        rag_service: RAG service the chunks were written to
+        filename: Original filename (for logging)
+        chunk_ids: Ids of every chunk sent to the index
+    """
+    if await rag_service.delete_documents(chunk_ids):
+        logger.info(f"Removed {len(chunk_ids)} partially indexed chunks of {filename}")
+    else:
+        logger.error(f"Failed to remove {len(chunk_ids)} partially indexed chunks of {filename}")
+
+
+def _prepare_upload(file: UploadFile) -> Tuple[FileValidationResult, Optional[str]]:
+    """
+    Validate an upload, spooling it to disk once if its parser needs a file
+
+    Args:
+        file: Uploaded file
+
+    Returns:
+        (validation result, spooled path or None); the spooled copy of a
+        rejected file is removed right away
+    """
+    file_path = None
+    if file.filename:
+        try:
+            file_path = ParserFactory.spool_upload(file.file, file.filename)
+        except Exception as e:
+            logger.error(f"Failed to spool upload {file.filename}: {e}")
+            return FileValidationResult(
+                filename=file.filename,
+                is_valid=False,
+                file_size=0,
+                file_type="unknown",
+                error_message=f"Validation error: {str(e)}"
+            ), None
+
+    validation = validate_upload_file(file, file_path=file_path)
+    if not validation.is_valid or validation.file_size > MAX_FILE_SIZE:
+        _remove_spooled_files([file_path])
+        file_path = None
+    return validation, file_path
+
+
+def _remove_spooled_files(paths: List[Optional[str]]) -> None:
+    """Delete temporary copies of uploads"""
+    for path in paths:
+        if path is None:
+            continue
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+async def _validate_upload_files(
+    files: List[UploadFile]
+) -> Tuple[List[Tuple[UploadFile, Optional[str]]], List[FileProcessingResult]]:
+    """
+    Validate uploaded files concurrently (validation may read the files)
+
+    Non-streaming formats are spooled to a temporary file once here; the
+    same copy is used for parsing, and the caller deletes it.
+
+    Args:
+        files: Uploaded files
+
+    Returns:
+        ((file, spooled path or None) for the valid files, error results for the rejected files)
+    """
+    prepared = await asyncio.gather(*(
+        asyncio.to_thread(_prepare_upload, file) for file in files
+    ))
+
+    valid_files = []
+    rejected = []
+    for file, (validation, file_path) in zip(files, prepared):
+        if not validation.is_valid:
+            rejected.append(FileProcessingResult(
+                filename=validation.filename,
+                status="error",
+                error_message=validation.error_message
+            ))
+        elif validation.file_size > MAX_FILE_SIZE:
+            # Check file size limit
+            rejected.append(FileProcessingResult(
+                filename=validation.filename,
+                status="error",
+                error_message=f"File size exceeds {MAX_FILE_SIZE / (1024*1024):.1f}MB limit"
+            ))
+        else:
+            valid_files.append((file, file_path))
+
+    return valid_files, rejected
+
+
+def _store_upload(file: UploadFile, file_path: Optional[str], job_dir: str, index: int) -> IngestionFile:
+    """
+    Save an upload for the ingestion worker
+
+    Args:
+        file: Uploaded file
+        file_path: Copy spooled during validation, moved instead of copying the upload again
+        job_dir: Directory of the job under UPLOAD_DIR
+        index: Position of the file in the job (keeps names unique)
+
+    Returns:
+        IngestionFile pointing at the stored copy
+    """
+    filename = os.path.basename(file.filename)
+    path = os.path.join(job_dir, f"{index}_{filename}")
+
+    if file_path is not None:
+        shutil.move(file_path, path)
+    else:
+        file.file.seek(0)
+        with open(path, "wb") as stored_file:
+            shutil.copyfileobj(file.file, stored_file)
+
+    return IngestionFile(filename=filename, path=path)
+
 
 @router.post("/files", response_model=FileUploadResponse)
 async def upload_files(
@@ -290,43 +520,33 @@ async def upload_files(
         failed_count = 0
         total_processing_time = 0
 
-        # Validate all files first
-        validation_results = []
-        for file in files:
-            validation = validate_upload_file(file)
-            validation_results.append(validation)
-
-            if not validation.is_valid:
-                results.append(FileProcessingResult(
-                    filename=validation.filename,
-                    status="error",
-                    error_message=validation.error_message
-                ))
-                failed_count += 1
+        valid_files, rejected = await _validate_upload_files(files)
+        results.extend(rejected)
+        failed_count += len(rejected)
+
+        # Process valid files concurrently: parsing runs in the parse pool, so
+        # one file's embedding and indexing overlap with the next file's parsing
+        semaphore = asyncio.Semaphore(max(1, UPLOAD_FILE_CONCURRENCY))
+
+        async def process_file(file: UploadFile, file_path: Optional[str]) -> FileProcessingResult:
+            async with semaphore:
+                return await process_uploaded_file(file, user_id, file_path=file_path)
+
+        try:
+            processing_results = await asyncio.gather(*(
+                process_file(file, file_path) for file, file_path in valid_files
+            ))
+        finally:
+            _remove_spooled_files([file_path for _, file_path in valid_files])
+
+        for processing_result in processing_results:
+            results.append(processing_result)
+
+            if processing_result.status == "success":
+                successful_count += 1
+                total_processing_time += processing_result.processing_time or 0
             else:
-                # Check file size limit
-                if validation.file_size > MAX_FILE_SIZE:
-                    results.append(FileProcessingResult(
-                        filename=validation.filename,
-                        status="error",
-                        error_message=f"File size exceeds {MAX_FILE_SIZE / (1024*1024):.1f}MB limit"
-                    ))
-                    failed_count += 1
-                else:
-                    # File is valid, proceed with processing
-                    pass
-
-        # Process valid files
-        for i, file in enumerate(files):
-            if i < len(validation_results) and validation_results[i].is_valid:
-                processing_result = await process_uploaded_file(file, user_id)
-                results.append(processing_result)
-
-                if processing_result.status == "success":
-                    successful_count += 1
-                    total_processing_time += processing_result.processing_time or 0
-                else:
-                    failed_count += 1
+                failed_count += 1
 
         # Calculate processing statistics
         processing_stats = {
@@ -359,6 +579,101 @@ async def upload_files(
         )
 
 
+@router.post("/jobs", response_model=IngestionJobResponse, status_code=202)
+async def create_ingestion_job(
+    files: List[UploadFile] = File(...),
+    current_user: dict = Depends(require_authenticated_user)
+):
+    """
+    Upload files for background ingestion
+
+    Valid files are stored and queued for the ingestion worker; the job id
+    is returned right away and progress is available from GET /jobs/{job_id}.
+
+    Args:
+        files: List of files to upload
+        current_user: Authenticated user from JWT token
+
+    Returns:
+        IngestionJobResponse with the job id and any rejected files
+    """
+    if len(files) > MAX_FILES_PER_REQUEST:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Maximum {MAX_FILES_PER_REQUEST} files allowed per request"
+        )
+
+    user_id = current_user.get("email", current_user.get("sub", "unknown"))
+
+    try:
+        job_service = get_ingestion_job_service()
+    except Exception as e:
+        logger.error(f"Ingestion queue unavailable: {e}")
+        raise HTTPException(status_code=503, detail="Ingestion queue unavailable")
+
+    valid_files, rejected = await _validate_upload_files(files)
+    if not valid_files:
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "No valid files to ingest", "rejected_files": [r.model_dump() for r in rejected]}
+        )
+
+    job_id = job_service.new_job_id()
+    job_dir = os.path.join(UPLOAD_DIR, job_id)
+
+    try:
+        os.makedirs(job_dir, exist_ok=True)
+        stored_files = await asyncio.gather(*(
+            asyncio.to_thread(_store_upload, file, file_path, job_dir, index)
+            for index, (file, file_path) in enumerate(valid_files)
+        ))
+        await job_service.enqueue_job(job_id, user_id, list(stored_files))
+
+    except Exception as e:
+        _remove_spooled_files([file_path for _, file_path in valid_files])
+        shutil.rmtree(job_dir, ignore_errors=True)
+        logger.error(f"Failed to queue ingestion job: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to queue ingestion job: {str(e)}")
+
+    return IngestionJobResponse(
+        job_id=job_id,
+        status="queued",
+        status_url=f"{router.prefix}/jobs/{job_id}",
+        queued_files=[stored_file.filename for stored_file in stored_files],
+        rejected_files=rejected
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=Dict[str, Any])
+async def get_ingestion_job(
+    job_id: str,
+    current_user: dict = Depends(require_authenticated_user)
+):
+    """
+    Get the status and per-file progress of an ingestion job
+
+    Args:
+        job_id: Job id returned when the files were uploaded
+        current_user: Authenticated user from JWT token
+
+    Returns:
+        Job status with parsed / chunks embedded / chunks indexed per file
+    """
+    user_id = current_user.get("email", current_user.get("sub", "unknown"))
+
+    try:
+        job_status = await get_ingestion_job_service().get_job_status(job_id)
+    except Exception as e:
+        logger.error(f"Failed to read ingestion job {job_id}: {e}")
+        raise HTTPException(status_code=503, detail="Ingestion queue unavailable")
+
+    # Jobs of other users are reported as missing
+    if job_status is None or job_status["user_id"] != user_id:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+
+    return job_status
+
+
 @router.get("/formats", response_model=Dict[str, Any])
 async def get_supported_formats():
     """
@@ -394,12 +709,11 @@ async def validate_files(
         List of validation results
     """
     try:
-        validation_results = []
-        for file in files:
-            validation = validate_upload_file(file)
-            validation_results.append(validation)
+        validation_results = await asyncio.gather(*(
+            asyncio.to_thread(validate_upload_file, file) for file in files
+        ))
 
-        return validation_results
+        return list(validation_results)
 
     except Exception as e:
         logger.error(f"File validation failed: {e}")
@@ -470,6 +784,8 @@ async def custom_docs():
         "description": "API endpoints for uploading files to the RAG system",
         "endpoints": {
             "/api/upload/files": "Upload and process multiple files",
+            "/api/upload/jobs": "Upload files for background ingestion (returns a job id)",
+            "/api/upload/jobs/{job_id}": "Get per-file progress of an ingestion job",
             "/api/upload/formats": "Get supported file formats",
             "/api/upload/validate": "Validate files without processing",
             "/api/upload/status": "Get upload service status"
@@ -18,7 +18,11 @@ class SearchConfig:
     semantic_weight: float = 0.7
     keyword_weight: float = 0.3
 
-    # Search Limits
+    # Result Fusion (weighted, rrf, minmax, zscore); rrf is opt-in via FUSION_STRATEGY
+    fusion_strategy: str = "weighted"
+    rrf_k: int = 60
+
+    # Search Limits (candidates fetched per leg before fusion)
     default_hybrid_limit: int = 5
     semantic_search_limit: int = 10
     keyword_search_limit: int = 10
@@ -74,6 +78,10 @@ class SearchConfigManager:
             semantic_weight=float(os.getenv("SEMANTIC_WEIGHT", "0.7")),
             keyword_weight=float(os.getenv("KEYWORD_WEIGHT", "0.3")),
 
+            # Result Fusion
+            fusion_strategy=os.getenv("FUSION_STRATEGY", "weighted").lower(),
+            rrf_k=int(os.getenv("RRF_K", "60")),
+
             # Search Limits
             default_hybrid_limit=int(os.getenv("HYBRID_SEARCH_DEFAULT_LIMIT", "5")),
             semantic_search_limit=int(os.getenv("SEMANTIC_SEARCH_LIMIT", "10")),
@@ -139,6 +147,12 @@ class SearchConfigManager:
         if abs(weight_sum - 1.0) > 0.01:
             issues.append(f"Search weights sum to {weight_sum}, should be 1.0")
 
+        # Validate fusion settings
+        if self._config.fusion_strategy not in ("rrf", "minmax", "zscore", "weighted"):
+            issues.append(f"Unknown fusion strategy: {self._config.fusion_strategy}")
+        if self._config.rrf_k <= 0:
+            issues.append("RRF k must be positive")
+
         # Validate timeouts
         if self._config.total_timeout_ms <= 0:
             issues.append("Total timeout must be positive")
@@ -178,6 +192,10 @@ class SearchConfigManager:
                 "semantic": self._config.semantic_weight,
                 "keyword": self._config.keyword_weight,
             },
+            "fusion": {
+                "strategy": self._config.fusion_strategy,
+                "rrf_k": self._config.rrf_k,
+            },
             "limits": {
                 "default_hybrid": self._config.default_hybrid_limit,
                 "semantic": self._config.semantic_search_limit,
@@ -218,6 +236,7 @@ class SearchConfigManager:
 
         logger.info("=== Search Configuration ===")
         logger.info(f"Weights: Semantic={config_dict['weights']['semantic']}, Keyword={config_dict['weights']['keyword']}")
+        logger.info(f"Fusion: {config_dict['fusion']['strategy']} (rrf_k={config_dict['fusion']['rrf_k']})")
         logger.info(f"Limits: Default={config_dict['limits']['default_hybrid']}")
         logger.info(f"Performance: Total timeout={config_dict['performance']['total_timeout_ms']}ms")
         logger.info(f"Features: Hybrid={config_dict['features']['hybrid_search']}, Recency boost={config_dict['features']['recency_boost']}")
@@ -252,7 +271,13 @@ ENVIRONMENT_DOCS = """
 SEMANTIC_WEIGHT=0.7
 KEYWORD_WEIGHT=0.3
 
-# Search Limits
+# Result Fusion (weighted, rrf, minmax, zscore)
+# rrf scores are rank-based (~0.01-0.03), not comparable to weighted scores;
+# raise the leg limits (e.g. 100) when switching to rrf
+FUSION_STRATEGY=weighted
+RRF_K=60
+
+# Search Limits (candidates per leg before fusion)
 HYBRID_SEARCH_DEFAULT_LIMIT=5
 SEMANTIC_SEARCH_LIMIT=10
 KEYWORD_SEARCH_LIMIT=10
@@ -5,7 +5,7 @@ This package provides parsers for multiple file formats with a unified interface
 for text extraction, metadata generation, and content processing.
 """
 
-from .base_parser import BaseParser, ParseResult, ValidationResult, FileMetadata
+from .base_parser import BaseParser, ParseResult, ValidationResult, FileMetadata, SegmentStream
 from .markdown_parser import MarkdownParser
 from .pdf_parser import PDFParser
 from .csv_parser import CSVParser
@@ -18,6 +18,7 @@ __all__ = [
     'ParseResult',
     'ValidationResult',
     'FileMetadata',
+    'SegmentStream',
     'MarkdownParser',
     'PDFParser',
     'CSVParser',
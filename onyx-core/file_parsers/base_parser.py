@@ -6,8 +6,10 @@ common data structures used across different file format parsers.
 """
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Dict, Any, Optional, List
+from bisect import bisect_left, bisect_right
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, BinaryIO, Iterator, Tuple
 from datetime import datetime
 
 
@@ -34,6 +36,34 @@ class ParseResult:
     processing_time: Optional[float] = None
 
 
+@dataclass
+class SegmentStream:
+    """File content parsed incrementally into text segments"""
+    segments: Iterator[str]
+    metadata: Dict[str, Any]  # Known up front; parsers may add totals once segments are exhausted
+    # (start_char, page_number) of each page in the segment text, appended as
+    # pages are yielded; empty for formats without pages
+    page_starts: List[Tuple[int, int]] = field(default_factory=list)
+
+    def pages_for_range(self, start_char: int, end_char: int) -> List[int]:
+        """
+        Get the pages a span of the segment text falls on
+
+        Args:
+            start_char: Start offset in the concatenated segments
+            end_char: End offset (exclusive)
+
+        Returns:
+            Page numbers in order (empty if the format has no pages)
+        """
+        if not self.page_starts:
+            return []
+
+        first = max(bisect_right(self.page_starts, start_char, key=lambda page: page[0]) - 1, 0)
+        last = max(bisect_left(self.page_starts, end_char, key=lambda page: page[0]) - 1, first)
+        return [page_number for _, page_number in self.page_starts[first:last + 1]]
+
+
 @dataclass
 class FileMetadata:
     """Metadata for uploaded files"""
@@ -58,6 +88,22 @@ class BaseParser(ABC):
     # Magic number signatures for file type validation
     MAGIC_NUMBERS: Dict[str, bytes] = {}
 
+    # Whether open_stream parses incrementally (other parsers spool to a temporary file)
+    STREAMING: bool = False
+
+    @classmethod
+    def streams_extension(cls, extension: str) -> bool:
+        """
+        Check if open_stream parses files with an extension incrementally
+
+        Args:
+            extension: Lowercase file extension including the dot
+
+        Returns:
+            True if segments are produced as the file is read
+        """
+        return cls.STREAMING
+
     def __init__(self):
         """Initialize parser with common settings"""
         self.max_file_size = self.MAX_FILE_SIZE
@@ -140,6 +186,169 @@ class BaseParser(ABC):
                 error_message=f"Validation failed: {str(e)}"
             )
 
+    def validate_stream(self, stream: BinaryIO, filename: str) -> ValidationResult:
+        """
+        Validate an uploaded file from its binary stream
+
+        The default spools the stream to a temporary file and runs
+        validate_file. Streaming parsers override this to validate from the
+        stream header without copying the file.
+
+        Args:
+            stream: Seekable binary stream of the file
+            filename: Original filename (used for the extension)
+
+        Returns:
+            ValidationResult with validation status
+        """
+        import os
+
+        try:
+            temp_file_path = self._spool_to_temp_file(stream, filename)
+        except Exception as e:
+            return ValidationResult(
+                is_valid=False,
+                error_message=f"Validation failed: {str(e)}"
+            )
+
+        try:
+            return self.validate_file(temp_file_path)
+        finally:
+            try:
+                os.unlink(temp_file_path)
+            except Exception:
+                pass
+
+    def open_stream(self, stream: BinaryIO, filename: str, executor: Optional[Executor] = None) -> SegmentStream:
+        """
+        Parse a file from its binary stream into text segments
+
+        The default spools the stream to a temporary file and runs
+        extract_content, yielding the whole content as one segment. Streaming
+        parsers override this to read and yield segments incrementally so
+        memory stays bounded regardless of file size.
+
+        Args:
+            stream: Seekable binary stream of the file
+            filename: Original filename (used for the extension)
+            executor: Optional process pool for parsers that split their
+                work across processes (unused by the default)
+
+        Returns:
+            SegmentStream over the parsed text
+
+        Raises:
+            ValueError: If the file cannot be parsed
+        """
+        import os
+
+        temp_file_path = self._spool_to_temp_file(stream, filename)
+        try:
+            result = self.extract_content(temp_file_path)
+        finally:
+            try:
+                os.unlink(temp_file_path)
+            except Exception:
+                pass
+
+        if not result.success:
+            raise ValueError(result.error_message)
+
+        return SegmentStream(segments=iter([result.content]), metadata=result.metadata or {})
+
+    def _spool_to_temp_file(self, stream: BinaryIO, filename: str) -> str:
+        """
+        Copy a stream to a named temporary file
+
+        Args:
+            stream: Seekable binary stream (rewound before and after copying)
+            filename: Original filename, kept as the suffix so the extension is preserved
+
+        Returns:
+            Path of the temporary file (the caller deletes it)
+        """
+        import os
+        import shutil
+        import tempfile
+
+        stream.seek(0)
+        with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{os.path.basename(filename)}") as temp_file:
+            shutil.copyfileobj(stream, temp_file)
+        stream.seek(0)
+        return temp_file.name
+
+    def _get_stream_size(self, stream: BinaryIO) -> int:
+        """
+        Get the size of a seekable stream (the stream is rewound)
+
+        Args:
+            stream: Seekable binary stream
+
+        Returns:
+            Size in bytes
+        """
+        import os
+
+        stream.seek(0, os.SEEK_END)
+        file_size = stream.tell()
+        stream.seek(0)
+        return file_size
+
+    def _validate_stream_header(self, stream: BinaryIO, filename: str) -> ValidationResult:
+        """
+        Size, extension and magic number checks of validate_file, from a stream
+
+        Args:
+            stream: Seekable binary stream (rewound afterwards)
+            filename: Original filename
+
+        Returns:
+            ValidationResult with validation status
+        """
+        import os
+
+        try:
+            file_size = self._get_stream_size(stream)
+            if file_size > self.max_file_size:
+                return ValidationResult(
+                    is_valid=False,
+                    error_message=f"File size {file_size} bytes exceeds maximum {self.max_file_size} bytes",
+                    file_size=file_size
+                )
+
+            file_extension = os.path.splitext(filename)[1].lower()
+            if file_extension not in self.SUPPORTED_EXTENSIONS:
+                return ValidationResult(
+                    is_valid=False,
+                    error_message=f"File extension '{file_extension}' not supported. Supported: {', '.join(self.SUPPORTED_EXTENSIONS)}",
+                    file_size=file_size
+                )
+
+            magic_number = stream.read(16)
+            stream.seek(0)
+            detected_format = self._detect_format_by_magic_number(magic_number)
+
+            if detected_format and detected_format not in self.SUPPORTED_EXTENSIONS:
+                return ValidationResult(
+                    is_valid=False,
+                    error_message=f"Magic number indicates '{detected_format}' but parser expects one of: {', '.join(self.SUPPORTED_EXTENSIONS)}",
+                    file_size=file_size,
+                    magic_number=magic_number.hex() if magic_number else None
+                )
+
+            return ValidationResult(
+                is_valid=True,
+                file_size=file_size,
+                detected_format=file_extension,
+                magic_number=magic_number.hex() if magic_number else None
+            )
+
+        except Exception as e:
+            return ValidationResult(
+                is_valid=False,
+                error_message=f"Validation failed: {str(e)}"
+            )
+
     def _get_magic_number(self, file_path: str, bytes_to_read: int = 16) -> Optional[bytes]:
         """
         Read magic number bytes from file start
@@ -228,6 +437,9 @@ class BaseParser(ABC):
                 if chunk_text:
                     chunks.append(chunk_text)
 
+                if end_idx == len(tokens):
+                    break
+
                 # Move start position with overlap
                 start_idx = max(0, end_idx - overlap)
 
@@ -250,6 +462,9 @@ class BaseParser(ABC):
                 if chunk_text:
                     chunks.append(chunk_text)
 
+                if end_idx == len(words):
+                    break
+
                 # Move start position with overlap
                 start_idx = max(0, end_idx - int(overlap * 0.75))
 
@@ -263,15 +478,29 @@ class BaseParser(ABC):
             file_path: Path to file
             user_id: User ID who uploaded the file
 
+        Returns:
+            FileMetadata object
+        """
+        import os
+
+        return self.build_file_metadata(os.path.basename(file_path), os.path.getsize(file_path), user_id)
+
+    def build_file_metadata(self, filename: str, file_size: int, user_id: str) -> FileMetadata:
+        """
+        Build metadata for an uploaded file
+
+        Args:
+            filename: File name
+            file_size: File size in bytes
+            user_id: User ID who uploaded the file
+
         Returns:
             FileMetadata object
         """
         import os
         from datetime import datetime
 
-        filename = os.path.basename(file_path)
         file_type = os.path.splitext(filename)[1].lower()
-        file_size = os.path.getsize(file_path)
         upload_timestamp = datetime.utcnow()
 
         return FileMetadata(
@@ -3,14 +3,78 @@ JSON File Parser
 
 This module handles parsing of JSON (.json) files with intelligent
 data extraction and structure preservation for vector indexing.
+
+JSON Lines (.jsonl) files are streamed: records are read one line at a time
+and converted to text in batches, and their structure statistics are
+gathered in the same pass, so memory stays bounded regardless of file size.
 """
 
 import json
 import os
 import re
-from typing import Dict, Any, Optional, List, Union
+from concurrent.futures import Executor
+from typing import Dict, Any, Optional, List, Union, BinaryIO, Iterator
 from datetime import datetime
-from .base_parser import BaseParser, ParseResult, ValidationResult
+from .base_parser import BaseParser, ParseResult, ValidationResult, SegmentStream
+
+# Constants
+JSON_SAMPLE_SIZE = 1024  # Bytes checked when validating
+JSONL_RECORDS_PER_SEGMENT = 100  # Records converted to text per segment
+JSONL_SAMPLE_RECORDS = 10  # Leading records kept for the sample structure analysis
+JSONL_MAX_TRACKED_FIELDS = 1000  # Distinct field names counted for field frequency
+
+
+class JSONStructureAnalyzer:
+    """Structure statistics of JSON values, gathered in one traversal each"""
+
+    def __init__(self):
+        self.depth = 0
+        self.total_keys = 0
+        self.total_values = 0
+        self.has_arrays = False
+        self.has_objects = False
+        self.max_array_length = 0
+        self.value_types: Dict[str, int] = {}
+
+    def add(self, value: Any):
+        """
+        Add a JSON value (a whole document, or one JSONL record) to the statistics
+
+        Args:
+            value: Parsed JSON value
+        """
+        # Iterative, so deeply nested documents cannot hit the recursion limit;
+        # children are pushed in reverse so they are visited in document order
+        stack = [(value, 0)]
+        while stack:
+            item, depth = stack.pop()
+            if depth > self.depth:
+                self.depth = depth
+
+            if isinstance(item, dict):
+                self.has_objects = True
+                self.total_keys += len(item)
+                stack.extend((child, depth + 1) for child in reversed(item.values()))
+            elif isinstance(item, list):
+                self.has_arrays = True
+                if len(item) > self.max_array_length:
+                    self.max_array_length = len(item)
+                stack.extend((child, depth + 1) for child in reversed(item))
+            else:
+                self.total_values += 1
+                type_name = type(item).__name__
+                self.value_types[type_name] = self.value_types.get(type_name, 0) + 1
+
+    def to_metadata(self) -> Dict[str, Any]:
+        """Get the statistics as metadata fields"""
+        return {
+            'depth': self.depth,
+            'total_keys': self.total_keys,
+            'total_values': self.total_values,
+            'has_arrays': self.has_arrays,
+            'has_objects': self.has_objects,
+            'max_array_length': self.max_array_length,
+        }
 
 
 class JSONParser(BaseParser):
@@ -22,6 +86,11 @@ class JSONParser(BaseParser):
         '.jsonl': b'',  # JSONL files are line-by-line JSON
     }
 
+    @classmethod
+    def streams_extension(cls, extension: str) -> bool:
+        """Only JSON Lines is streamed; a JSON document is parsed as a whole"""
+        return extension == '.jsonl'
+
     def extract_content(self, file_path: str) -> ParseResult:
         """
         Extract content from JSON file with intelligent structuring
@@ -36,8 +105,9 @@ class JSONParser(BaseParser):
         start_time = time.time()
 
         try:
-            # Validate file first
-            validation = self.validate_file(file_path)
+            # The full JSON validation parses the whole document; parsing
+            # below reports invalid JSON, so only the basic checks run here
+            validation = super().validate_file(file_path)
             if not validation.is_valid:
                 return ParseResult(
                     success=False,
@@ -48,12 +118,14 @@ class JSONParser(BaseParser):
             file_extension = os.path.splitext(file_path)[1].lower()
 
             if file_extension == '.jsonl':
-                parsed_data, metadata = self._parse_jsonl_file(file_path)
+                metadata = {}
+                with open(file_path, 'rb') as file:
+                    processed_content = ''.join(self._iter_jsonl_segments(file, metadata))
             else:
                 parsed_data, metadata = self._parse_json_file(file_path)
 
-            # Convert to searchable text format
-            processed_content = self._convert_json_to_text(parsed_data, metadata)
+                # Convert to searchable text format
+                processed_content = self._convert_json_to_text(parsed_data, metadata)
 
             # Create chunks for vector indexing
             chunks = self.chunk_text(processed_content)
@@ -90,17 +162,15 @@ class JSONParser(BaseParser):
             with open(file_path, 'r', encoding='utf-8') as file:
                 data = json.load(file)
 
+            analyzer = JSONStructureAnalyzer()
+            analyzer.add(data)
+
             metadata = {
                 'file_type': 'json',
                 'json_format': 'object',
                 'root_type': type(data).__name__,
-                'depth': self._calculate_depth(data),
-                'total_keys': self._count_keys(data),
-                'total_values': self._count_values(data),
-                'has_arrays': self._has_arrays(data),
-                'has_objects': self._has_objects(data),
-                'max_array_length': self._get_max_array_length(data),
-                'structure_analysis': self._analyze_structure(data)
+                **analyzer.to_metadata(),
+                'structure_analysis': self._analyze_structure(data, analyzer.value_types)
             }
 
             return data, metadata
@@ -110,185 +180,126 @@ class JSONParser(BaseParser):
         except Exception as e:
             raise Exception(f"JSON parsing failed: {str(e)}")
 
-    def _parse_jsonl_file(self, file_path: str) -> tuple[List[Dict], Dict[str, Any]]:
-        """
-        Parse JSONL (JSON Lines) file - one JSON object per line
-
-        Args:
-            file_path: Path to JSONL file
-
-        Returns:
-            Tuple of (parsed_data, metadata)
-        """
-        try:
-            data = []
-            line_count = 0
-            error_count = 0
-
-            with open(file_path, 'r', encoding='utf-8') as file:
-                for line_num, line in enumerate(file, 1):
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    try:
-                        json_obj = json.loads(line)
-                        data.append(json_obj)
-                        line_count += 1
-                    except json.JSONDecodeError as e:
-                        error_count += 1
-                        # Continue parsing other lines even if some are invalid
-                        continue
-
-            if not data and error_count > 0:
-                raise Exception(f"No valid JSON objects found in {error_count} lines")
-
-            # Analyze the first few objects to understand structure
-            sample_objects = data[:min(10, len(data))]
-            structure_analysis = self._analyze_jsonl_structure(sample_objects)
-
-            metadata = {
-                'file_type': 'jsonl',
-                'json_format': 'lines',
-                'line_count': line_count,
-                'error_count': error_count,
-                'total_objects': len(data),
-                'sample_structure': structure_analysis,
-                'consistent_structure': self._check_consistent_structure(data)
-            }
-
-            return data, metadata
-
-        except Exception as e:
-            raise Exception(f"JSONL parsing failed: {str(e)}")
-
-    def _calculate_depth(self, obj: Any, current_depth: int = 0) -> int:
-        """
-        Calculate the maximum depth of nested JSON structure
-
-        Args:
-            obj: JSON object to analyze
-            current_depth: Current recursion depth
-
-        Returns:
-            Maximum depth
-        """
-        if isinstance(obj, dict):
-            if not obj:
-                return current_depth
-            return max(self._calculate_depth(v, current_depth + 1) for v in obj.values())
-        elif isinstance(obj, list):
-            if not obj:
-                return current_depth
-            return max(self._calculate_depth(item, current_depth + 1) for item in obj)
-        else:
-            return current_depth
-
-    def _count_keys(self, obj: Any) -> int:
+    def open_stream(self, stream: BinaryIO, filename: str, executor: Optional[Executor] = None) -> SegmentStream:
         """
-        Count total number of keys in JSON structure
+        Parse a JSON Lines file incrementally into segments of records
 
-        Args:
-            obj: JSON object to analyze
-
-        Returns:
-            Total key count
-        """
-        count = 0
-        if isinstance(obj, dict):
-            count += len(obj)
-            for value in obj.values():
-                count += self._count_keys(value)
-        elif isinstance(obj, list):
-            for item in obj:
-                count += self._count_keys(item)
-        return count
-
-    def _count_values(self, obj: Any) -> int:
-        """
-        Count total number of values (non-object, non-array) in JSON structure
+        JSON documents are parsed as a whole (see BaseParser.open_stream).
+        Record counts and structure statistics are added to the metadata
+        once the stream is read.
 
         Args:
-            obj: JSON object to analyze
+            stream: Seekable binary stream of the file
+            filename: Original filename
+            executor: Unused; records are parsed in the calling thread
 
         Returns:
-            Total value count
-        """
-        count = 0
-        if isinstance(obj, dict):
-            for value in obj.values():
-                if isinstance(value, (dict, list)):
-                    count += self._count_values(value)
-                else:
-                    count += 1
-        elif isinstance(obj, list):
-            for item in obj:
-                if isinstance(item, (dict, list)):
-                    count += self._count_values(item)
-                else:
-                    count += 1
-        else:
-            count = 1
-        return count
+            SegmentStream over the records as text
 
-    def _has_arrays(self, obj: Any) -> bool:
+        Raises:
+            ValueError: If the file cannot be parsed
         """
-        Check if JSON structure contains arrays
+        if os.path.splitext(filename)[1].lower() != '.jsonl':
+            return super().open_stream(stream, filename, executor=executor)
 
-        Args:
-            obj: JSON object to analyze
+        stream.seek(0)
+        metadata = {'streamed': True}
+        return SegmentStream(segments=self._iter_jsonl_segments(stream, metadata), metadata=metadata)
 
-        Returns:
-            True if arrays are present
+    def _iter_jsonl_segments(self, stream: BinaryIO, metadata: Dict[str, Any]) -> Iterator[str]:
         """
-        if isinstance(obj, list):
-            return True
-        elif isinstance(obj, dict):
-            return any(self._has_arrays(v) for v in obj.values())
-        return False
+        Read JSONL records one line at a time and yield them as text
 
-    def _has_objects(self, obj: Any) -> bool:
-        """
-        Check if JSON structure contains objects
+        Invalid lines are counted and skipped. Structure statistics, field
+        frequency and structure consistency are gathered as records are read;
+        a summary of them is the last segment.
 
         Args:
-            obj: JSON object to analyze
+            stream: Binary stream positioned at the first line
+            metadata: Metadata dictionary, filled in once the stream is read
 
         Returns:
-            True if objects are present
-        """
-        if isinstance(obj, dict):
-            return True
-        elif isinstance(obj, list):
-            return any(self._has_objects(item) for item in obj)
-        return False
-
-    def _get_max_array_length(self, obj: Any) -> int:
-        """
-        Get the maximum array length in JSON structure
-
-        Args:
-            obj: JSON object to analyze
-
-        Returns:
-            Maximum array length
-        """
-        max_length = 0
-        if isinstance(obj, list):
-            max_length = max(max_length, len(obj))
-            for item in obj:
-                max_length = max(max_length, self._get_max_array_length(item))
-        elif isinstance(obj, dict):
-            for value in obj.values():
-                max_length = max(max_length, self._get_max_array_length(value))
-        return max_length
-
-    def _analyze_structure(self, obj: Any) -> Dict[str, Any]:
+            Iterator of text segments of up to JSONL_RECORDS_PER_SEGMENT records
+
+        Raises:
+            ValueError: If no line holds valid JSON
+        """
+        analyzer = JSONStructureAnalyzer()
+        sample_objects = []
+        field_counts: Dict[str, int] = {}
+        first_keys = None
+        consistent_structure = True
+        line_count = 0
+        error_count = 0
+        batch = []
+
+        metadata.update({'file_type': 'jsonl', 'json_format': 'lines'})
+
+        for raw_line in stream:
+            line = raw_line.decode('utf-8', errors='replace').strip()
+            if not line:
+                continue
+
+            try:
+                json_obj = json.loads(line)
+            except json.JSONDecodeError:
+                error_count += 1
+                # Continue parsing other lines even if some are invalid
+                continue
+
+            line_count += 1
+            analyzer.add(json_obj)
+
+            if isinstance(json_obj, dict):
+                if len(sample_objects) < JSONL_SAMPLE_RECORDS:
+                    sample_objects.append(json_obj)
+
+                for key in json_obj:
+                    if key in field_counts or len(field_counts) < JSONL_MAX_TRACKED_FIELDS:
+                        field_counts[key] = field_counts.get(key, 0) + 1
+
+                # Consistent if each record shares 80% of its keys with the first
+                current_keys = set(json_obj)
+                if first_keys is None:
+                    first_keys = current_keys
+                elif consistent_structure and first_keys | current_keys:
+                    overlap = len(first_keys & current_keys) / len(first_keys | current_keys)
+                    consistent_structure = overlap >= 0.8
+
+            batch.append(f"Record {line_count}:\n{self._format_json_object(json_obj, max_depth=2)}")
+            if len(batch) >= JSONL_RECORDS_PER_SEGMENT:
+                yield '\n\n'.join(batch) + '\n\n'
+                batch = []
+
+        if batch:
+            yield '\n\n'.join(batch) + '\n\n'
+
+        if not line_count and error_count > 0:
+            raise ValueError(f"JSONL parsing failed: No valid JSON objects found in {error_count} lines")
+
+        metadata.update({
+            'line_count': line_count,
+            'error_count': error_count,
+            'total_objects': line_count,
+            **analyzer.to_metadata(),
+            'value_types': analyzer.value_types,
+            'sample_structure': self._analyze_jsonl_structure(sample_objects),
+            'field_frequency': {  # Most frequent fields
+                key: {'count': count, 'percentage': (count / line_count) * 100}
+                for key, count in sorted(field_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+            },
+            'consistent_structure': consistent_structure,
+        })
+
+        yield self._format_jsonl_summary(metadata)
+
+    def _analyze_structure(self, obj: Any, value_types: Dict[str, int]) -> Dict[str, Any]:
         """
         Analyze JSON structure and extract key patterns
 
         Args:
             obj: JSON object to analyze
+            value_types: Value type counts (from JSONStructureAnalyzer)
 
         Returns:
             Structure analysis dictionary
@@ -310,38 +321,11 @@ class JSONParser(BaseParser):
                 analysis['root_keys'] = list(first_item.keys())
                 analysis['key_types'] = {k: type(v).__name__ for k, v in first_item.items()}
 
-        # Analyze value types distribution
-        value_counts = self._count_value_types(obj)
-        analysis['value_types'] = value_counts
+        # Value types distribution
+        analysis['value_types'] = value_types
 
         return analysis
 
-    def _count_value_types(self, obj: Any) -> Dict[str, int]:
-        """
-        Count different value types in JSON structure
-
-        Args:
-            obj: JSON object to analyze
-
-        Returns:
-            Dictionary of type counts
-        """
-        type_counts = {}
-
-        def count_types(item):
-            if isinstance(item, dict):
-                for value in item.values():
-                    count_types(value)
-            elif isinstance(item, list):
-                for element in item:
-                    count_types(element)
-            else:
-                type_name = type(item).__name__
-                type_counts[type_name] = type_counts.get(type_name, 0) + 1
-
-        count_types(obj)
-        return type_counts
-
     def _analyze_jsonl_structure(self, objects: List[Dict]) -> Dict[str, Any]:
         """
         Analyze structure of JSONL objects
@@ -388,33 +372,6 @@ class JSONParser(BaseParser):
 
         return analysis
 
-    def _check_consistent_structure(self, objects: List[Dict]) -> bool:
-        """
-        Check if all JSONL objects have consistent structure
-
-        Args:
-            objects: List of JSON objects
-
-        Returns:
-            True if structure is consistent
-        """
-        if not objects:
-            return True
-
-        first_keys = set(objects[0].keys())
-
-        for obj in objects[1:]:
-            current_keys = set(obj.keys())
-
-            # Allow some flexibility - consider consistent if 80% of keys match
-            intersection = len(first_keys.intersection(current_keys))
-            union = len(first_keys.union(current_keys))
-
-            if (intersection / union) < 0.8:
-                return False
-
-        return True
-
     def _convert_json_to_text(self, data: Any, metadata: Dict[str, Any]) -> str:
         """
         Convert JSON data to searchable text format
@@ -436,14 +393,9 @@ class JSONParser(BaseParser):
         metadata_section.append(f"- Maximum Depth: {metadata.get('depth', 0)}")
         metadata_section.append(f"- Total Keys: {metadata.get('total_keys', 0)}")
         metadata_section.append(f"- Total Values: {metadata.get('total_values', 0)}")
-
-        if metadata.get('json_format') == 'lines':
-            metadata_section.append(f"- Total Objects: {metadata.get('total_objects', 0)}")
-            metadata_section.append(f"- Consistent Structure: {metadata.get('consistent_structure', False)}")
-        else:
-            metadata_section.append(f"- Contains Arrays: {metadata.get('has_arrays', False)}")
-            metadata_section.append(f"- Contains Objects: {metadata.get('has_objects', False)}")
-            metadata_section.append(f"- Max Array Length: {metadata.get('max_array_length', 0)}")
+        metadata_section.append(f"- Contains Arrays: {metadata.get('has_arrays', False)}")
+        metadata_section.append(f"- Contains Objects: {metadata.get('has_objects', False)}")
+        metadata_section.append(f"- Max Array Length: {metadata.get('max_array_length', 0)}")
 
         text_sections.append('\n'.join(metadata_section))
 
@@ -465,39 +417,42 @@ class JSONParser(BaseParser):
             text_sections.append('\n'.join(structure_section))
 
         # Add data content
-        if metadata.get('json_format') == 'lines':
-            # JSONL format
-            content_section = []
-            content_section.append(f"\nJSONL Data Content:")
-
-            # Show sample objects
-            if isinstance(data, list) and data:
-                content_section.append(f"\nSample JSON Objects (showing first {min(5, len(data))}):")
-                for i, obj in enumerate(data[:5]):
-                    content_section.append(f"\nObject {i+1}:")
-                    obj_text = self._format_json_object(obj, max_depth=2)
-                    content_section.append(obj_text)
-
-            # Add field analysis
-            if metadata.get('sample_structure', {}).get('field_frequency'):
-                freq_section = []
-                freq_section.append(f"\nField Frequency Analysis:")
-                field_freq = metadata['sample_structure']['field_frequency']
-                for field, info in sorted(field_freq.items(), key=lambda x: x[1]['count'], reverse=True)[:10]:
-                    freq_section.append(f"- {field}: {info['count']} occurrences ({info['percentage']:.1f}%)")
-                content_section.append('\n'.join(freq_section))
-
-            text_sections.append('\n'.join(content_section))
-        else:
-            # Regular JSON format
-            content_section = []
-            content_section.append(f"\nJSON Data Content:")
-            json_text = self._format_json_object(data, max_depth=3)
-            content_section.append(json_text)
-            text_sections.append('\n'.join(content_section))
+        content_section = []
+        content_section.append(f"\nJSON Data Content:")
+        json_text = self._format_json_object(data, max_depth=3)
+        content_section.append(json_text)
+        text_sections.append('\n'.join(content_section))
 
         return '\n'.join(text_sections)
 
+    def _format_jsonl_summary(self, metadata: Dict[str, Any]) -> str:
+        """
+        Format the statistics of a read JSONL file as text
+
+        Args:
+            metadata: JSONL metadata with the totals filled in
+
+        Returns:
+            Formatted summary section
+        """
+        summary_section = []
+        summary_section.append(f"JSONL File Information:")
+        summary_section.append(f"- Format: {metadata.get('json_format', 'unknown')}")
+        summary_section.append(f"- Total Objects: {metadata.get('total_objects', 0)}")
+        summary_section.append(f"- Invalid Lines: {metadata.get('error_count', 0)}")
+        summary_section.append(f"- Maximum Depth: {metadata.get('depth', 0)}")
+        summary_section.append(f"- Total Keys: {metadata.get('total_keys', 0)}")
+        summary_section.append(f"- Total Values: {metadata.get('total_values', 0)}")
+        summary_section.append(f"- Consistent Structure: {metadata.get('consistent_structure', False)}")
+
+        if metadata.get('field_frequency'):
+            summary_section.append(f"\nField Frequency Analysis:")
+            field_freq = metadata['field_frequency']
+            for field, info in sorted(field_freq.items(), key=lambda x: x[1]['count'], reverse=True)[:10]:
+                summary_section.append(f"- {field}: {info['count']} occurrences ({info['percentage']:.1f}%)")
+
+        return '\n'.join(summary_section)
+
     def _format_json_object(self, obj: Any, max_depth: int = 3, current_depth: int = 0, indent: str = "") -> str:
         """
         Format JSON object as readable text
@@ -578,7 +533,7 @@ class JSONParser(BaseParser):
 
             # Try to parse a sample to check JSON validity
             with open(file_path, 'r', encoding='utf-8') as file:
-                sample = file.read(1024)
+                sample = file.read(JSON_SAMPLE_SIZE)
 
             # Basic JSON format check
             if not (sample.strip().startswith('{') or sample.strip().startswith('[') or file_extension == '.jsonl'):
@@ -586,26 +541,11 @@ class JSONParser(BaseParser):
 
             # Try to validate JSON structure
             if file_extension == '.jsonl':
-                # Validate JSONL format
-                try:
-                    lines = sample.split('\n')
-                    valid_lines = 0
-                    for line in lines:
-                        if line.strip():
-                            json.loads(line)
-                            valid_lines += 1
-
-                    if valid_lines == 0 and len([l for l in lines if l.strip()]) > 0:
-                        return ValidationResult(
-                            is_valid=False,
-                            error_message="No valid JSON objects found in JSONL file",
-                            file_size=base_validation.file_size
-                        )
-
-                except json.JSONDecodeError:
+                error_message = self._check_jsonl_sample(sample, complete=len(sample) < JSON_SAMPLE_SIZE)
+                if error_message:
                     return ValidationResult(
                         is_valid=False,
-                        error_message="JSONL file contains invalid JSON format",
+                        error_message=error_message,
                         file_size=base_validation.file_size
                     )
             else:
@@ -626,4 +566,72 @@ class JSONParser(BaseParser):
             return ValidationResult(
                 is_valid=False,
                 error_message=f"JSON validation failed: {str(e)}"
-            )
\ No newline at end of file
+            )
+
+    def validate_stream(self, stream: BinaryIO, filename: str) -> ValidationResult:
+        """
+        Validate a JSONL upload from its first lines, without copying it
+
+        JSON documents are validated as a whole (see BaseParser.validate_stream).
+
+        Args:
+            stream: Seekable binary stream of the file
+            filename: Original filename
+
+        Returns:
+            ValidationResult with JSON-specific validation
+        """
+        if os.path.splitext(filename)[1].lower() != '.jsonl':
+            return super().validate_stream(stream, filename)
+
+        base_validation = self._validate_stream_header(stream, filename)
+
+        if not base_validation.is_valid:
+            return base_validation
+
+        try:
+            header = stream.read(JSON_SAMPLE_SIZE)
+            stream.seek(0)
+
+            error_message = self._check_jsonl_sample(
+                header.decode('utf-8', errors='replace'),
+                complete=len(header) < JSON_SAMPLE_SIZE
+            )
+            if error_message:
+                return ValidationResult(
+                    is_valid=False,
+                    error_message=error_message,
+                    file_size=base_validation.file_size
+                )
+
+            return base_validation
+
+        except Exception as e:
+            return ValidationResult(
+                is_valid=False,
+                error_message=f"JSON validation failed: {str(e)}"
+            )
+
+    def _check_jsonl_sample(self, sample: str, complete: bool) -> Optional[str]:
+        """
+        Check that the leading lines of a JSONL file are valid JSON
+
+        Args:
+            sample: Decoded start of the file
+            complete: Whether the sample is the whole file; otherwise its
+                last line may be cut off and is not checked
+
+        Returns:
+            Error message, or None if the sample is valid
+        """
+        lines = [line for line in sample.split('\n') if line.strip()]
+        if not complete:
+            lines = lines[:-1]
+
+        try:
+            for line in lines:
+                json.loads(line)
+        except json.JSONDecodeError:
+            return "JSONL file contains invalid JSON format"
+
+        return None
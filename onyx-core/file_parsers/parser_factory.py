@@ -6,8 +6,9 @@ based on file extensions and format detection.
 """
 
 import os
-from typing import Dict, Any, Optional
-from .base_parser import BaseParser, ParseResult, ValidationResult
+from concurrent.futures import Executor
+from typing import Dict, Any, Optional, BinaryIO
+from .base_parser import BaseParser, ParseResult, ValidationResult, SegmentStream
 from .markdown_parser import MarkdownParser
 from .pdf_parser import PDFParser
 from .csv_parser import CSVParser
@@ -94,6 +95,21 @@ class ParserFactory:
         extension = cls._get_file_extension(file_path)
         return extension in cls.SUPPORTED_EXTENSIONS
 
+    @classmethod
+    def supports_streaming(cls, file_path: str) -> bool:
+        """
+        Check if the parser for a file type parses incrementally
+
+        Args:
+            file_path: Path or name of the file
+
+        Returns:
+            True if the parser yields segments as it reads the file
+        """
+        extension = cls._get_file_extension(file_path)
+        parser_class = cls.PARSER_MAPPING.get(extension)
+        return parser_class is not None and parser_class.streams_extension(extension)
+
     @classmethod
     def _get_file_extension(cls, file_path: str) -> str:
         """
@@ -226,6 +242,117 @@ class ParserFactory:
                 error_message=f"File parsing failed: {str(e)}"
             )
 
+    @classmethod
+    def validate_stream(cls, stream: BinaryIO, filename: str) -> ValidationResult:
+        """
+        Validate an uploaded file from its stream
+
+        Args:
+            stream: Seekable binary stream of the file
+            filename: Original filename
+
+        Returns:
+            ValidationResult with validation status
+        """
+        try:
+            parser = cls.get_parser(filename)
+            return parser.validate_stream(stream, filename)
+
+        except ValueError:
+            return ValidationResult(
+                is_valid=False,
+                error_message=f"Unsupported file type. Supported formats: {', '.join(cls.get_supported_extensions())}"
+            )
+        except Exception as e:
+            return ValidationResult(
+                is_valid=False,
+                error_message=f"File validation failed: {str(e)}"
+            )
+
+    @classmethod
+    def spool_upload(cls, stream: BinaryIO, filename: str) -> Optional[str]:
+        """
+        Copy an upload to a temporary file if its parser needs a file path
+
+        Non-streaming parsers validate and parse from a file; spooling once
+        up front lets validation and parsing share the same copy (see
+        validate_path and ParsePool.open_file).
+
+        Args:
+            stream: Seekable binary stream of the file
+            filename: Original filename
+
+        Returns:
+            Path of the temporary file (the caller deletes it), or None for
+            streaming and unsupported file types
+        """
+        if not cls.is_supported(filename) or cls.supports_streaming(filename):
+            return None
+        return cls.get_parser(filename)._spool_to_temp_file(stream, filename)
+
+    @classmethod
+    def validate_path(cls, file_path: str, filename: str) -> ValidationResult:
+        """
+        Validate an upload that was already spooled to a file
+
+        Args:
+            file_path: Path of the spooled upload
+            filename: Original filename (selects the parser)
+
+        Returns:
+            ValidationResult with validation status
+        """
+        try:
+            parser = cls.get_parser(filename)
+            return parser.validate_file(file_path)
+
+        except ValueError:
+            return ValidationResult(
+                is_valid=False,
+                error_message=f"Unsupported file type. Supported formats: {', '.join(cls.get_supported_extensions())}"
+            )
+        except Exception as e:
+            return ValidationResult(
+                is_valid=False,
+                error_message=f"File validation failed: {str(e)}"
+            )
+
+    @classmethod
+    def open_stream(
+        cls,
+        stream: BinaryIO,
+        filename: str,
+        user_id: str,
+        executor: Optional[Executor] = None
+    ) -> SegmentStream:
+        """
+        Parse an uploaded file into text segments using the appropriate parser
+
+        Streaming parsers read the file incrementally; others parse it in one
+        go (see BaseParser.open_stream).
+
+        Args:
+            stream: Seekable binary stream of the file
+            filename: Original filename
+            user_id: User ID for permission metadata
+            executor: Optional process pool for parsers that split their work
+                across processes (PDF page ranges)
+
+        Returns:
+            SegmentStream over the parsed text
+
+        Raises:
+            ValueError: If the file type is not supported or parsing fails
+        """
+        parser = cls.get_parser(filename)
+        file_size = parser._get_stream_size(stream)
+        content_stream = parser.open_stream(stream, filename, executor=executor)
+
+        file_metadata = parser.build_file_metadata(os.path.basename(filename), file_size, user_id)
+        content_stream.metadata['file_metadata'] = file_metadata.__dict__
+
+        return content_stream
+
     @classmethod
     def get_parser_info(cls, file_path: str) -> Dict[str, Any]:
         """
@@ -1,15 +1,134 @@
 """
 PDF File Parser
 
-This module handles parsing of PDF (.pdf) files using multiple libraries
-for reliable text extraction with fallback options.
+This module handles parsing of PDF (.pdf) files page by page. Pages are
+extracted with pdfminer.six in page ranges, optionally in parallel worker
+processes, and merged back in page order. A page pdfminer cannot read is
+retried with PyPDF2 and skipped if that fails too, so one broken or
+encrypted page does not cost the rest of the document.
 """
 
+import io
 import os
 import re
-from typing import Dict, Any, Optional
+import logging
+import weakref
+from collections import deque
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, BinaryIO, Iterator, List, Tuple
 from datetime import datetime
-from .base_parser import BaseParser, ParseResult, ValidationResult
+from .base_parser import BaseParser, ParseResult, ValidationResult, SegmentStream
+
+logger = logging.getLogger(__name__)
+
+# Constants
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "16"))  # Pages extracted per worker task
+PDF_MAX_PENDING_RANGES = 8  # Page ranges in flight; bounds the extracted text held ahead of the reader
+PDFMINER_LAPARAMS = {
+    'detect_vertical': True,  # Better text flow detection
+    'all_texts': True,  # Extract all text including small fonts
+    'char_margin': 1.0,  # Tighter character grouping
+    'line_margin': 0.5,  # Better line detection
+    'word_margin': 0.1,  # Better word detection
+}
+
+
+@dataclass
+class PageText:
+    """Text extracted from one PDF page"""
+    page_number: int  # 1-based
+    text: str
+    method: Optional[str] = None  # 'pdfminer', 'pypdf2', or None if the page was skipped
+
+
+def extract_page_range(file_path: str, first_page: int, last_page: Optional[int] = None) -> List[PageText]:
+    """
+    Extract the text of a range of pages (runs in parse pool workers)
+
+    Each page is extracted with pdfminer.six; pages it fails on or finds no
+    text in are retried with PyPDF2, and pages neither can read come back
+    with method None.
+
+    Args:
+        file_path: Path to the PDF file
+        first_page: First page number (1-based)
+        last_page: Last page number (inclusive); None for all remaining pages
+
+    Returns:
+        PageText for every page in the range, in page order
+    """
+    texts: Dict[int, str] = {}
+    methods: Dict[int, str] = {}
+    page_numbers = list(range(first_page, last_page + 1)) if last_page is not None else []
+
+    try:
+        from pdfminer.converter import TextConverter
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+
+        laparams = LAParams(**PDFMINER_LAPARAMS)
+        resource_manager = PDFResourceManager()
+
+        with open(file_path, 'rb') as file:
+            if last_page is not None:
+                pages = zip(page_numbers, PDFPage.get_pages(file, pagenos={n - 1 for n in page_numbers}))
+            else:
+                pages = ((n, page) for n, page in enumerate(PDFPage.get_pages(file), 1) if n >= first_page)
+
+            for page_number, page in pages:
+                if last_page is None:
+                    page_numbers.append(page_number)
+                output = io.StringIO()
+                try:
+                    with TextConverter(resource_manager, output, laparams=laparams) as device:
+                        PDFPageInterpreter(resource_manager, device).process_page(page)
+                    texts[page_number] = output.getvalue()
+                    methods[page_number] = 'pdfminer'
+                except Exception as e:
+                    logger.debug(f"pdfminer failed on page {page_number} of {file_path}: {e}")
+
+    except Exception as e:
+        # Pages not reached yet are retried below
+        logger.warning(f"pdfminer failed on pages {first_page}-{last_page or 'end'} of {file_path}: {e}")
+
+    retry_pages = [n for n in page_numbers if not texts.get(n, '').strip()]
+    if retry_pages:
+        try:
+            from PyPDF2 import PdfReader
+
+            with open(file_path, 'rb') as file:
+                reader = PdfReader(file)
+                for page_number in retry_pages:
+                    try:
+                        page_text = reader.pages[page_number - 1].extract_text() or ''
+                    except Exception as e:
+                        logger.debug(f"PyPDF2 failed on page {page_number} of {file_path}: {e}")
+                        continue
+                    if page_text.strip():
+                        texts[page_number] = page_text
+                        methods[page_number] = 'pypdf2'
+
+        except Exception as e:
+            logger.warning(f"PyPDF2 failed on pages {first_page}-{last_page or 'end'} of {file_path}: {e}")
+
+    return [
+        PageText(
+            page_number=n,
+            text=texts.get(n, ''),
+            method=methods.get(n) if texts.get(n, '').strip() else None
+        )
+        for n in page_numbers
+    ]
+
+
+def _remove_file(file_path: str):
+    """Delete a temporary file, ignoring errors"""
+    try:
+        os.unlink(file_path)
+    except OSError:
+        pass
 
 
 class PDFParser(BaseParser):
@@ -19,10 +138,11 @@ class PDFParser(BaseParser):
     MAGIC_NUMBERS = {
         '.pdf': b'%PDF-',  # PDF files start with %PDF-
     }
+    STREAMING = True
 
     def extract_content(self, file_path: str) -> ParseResult:
         """
-        Extract text content from PDF file with multiple extraction methods
+        Extract text content from PDF file page by page
 
         Args:
             file_path: Path to the PDF file
@@ -42,33 +162,18 @@ class PDFParser(BaseParser):
                     error_message=validation.error_message
                 )
 
-            # Try different extraction methods in order of preference
-            text_content = None
-            metadata = None
-            extraction_method = None
-
-            # Method 1: Try pdfminer.six (most reliable for text-based PDFs)
-            try:
-                text_content, metadata = self._extract_with_pdfminer(file_path)
-                extraction_method = 'pdfminer'
-            except Exception as e:
-                print(f"PDFMiner extraction failed: {e}")
-
-            # Method 2: Try PyPDF2 as fallback
-            if not text_content:
-                try:
-                    text_content, metadata = self._extract_with_pypdf2(file_path)
-                    extraction_method = 'pypdf2'
-                except Exception as e:
-                    print(f"PyPDF2 extraction failed: {e}")
+            metadata = self._extract_pdf_metadata(file_path)
+            pages = list(self.iter_pages(file_path, metadata.get('page_count')))
+            text_content = "\n\n".join(page.text for page in pages if page.method)
+            self._add_page_stats(metadata, pages)
 
-            # Method 3: Last resort - try to read as plain text (rare case)
-            if not text_content:
+            # Last resort - try to read as plain text (rare case)
+            if not text_content.strip():
                 try:
                     text_content = self._extract_as_text(file_path)
-                    extraction_method = 'text'
+                    metadata['extraction_method'] = 'text'
                 except Exception as e:
-                    print(f"Text extraction failed: {e}")
+                    logger.warning(f"Text extraction failed: {e}")
 
             if not text_content or not text_content.strip():
                 return ParseResult(
@@ -82,8 +187,6 @@ class PDFParser(BaseParser):
             # Create chunks for vector indexing
             chunks = self.chunk_text(processed_content)
 
-            # Add extraction method to metadata
-            metadata['extraction_method'] = extraction_method
             metadata['file_type'] = 'pdf'
 
             processing_time = time.time() - start_time
@@ -104,93 +207,149 @@ class PDFParser(BaseParser):
                 error_message=f"Failed to parse PDF file: {str(e)}"
             )
 
-    def _extract_with_pdfminer(self, file_path: str) -> tuple[str, Dict[str, Any]]:
+    def open_stream(self, stream: BinaryIO, filename: str, executor: Optional[Executor] = None) -> SegmentStream:
         """
-        Extract text using pdfminer.six library
+        Parse a PDF into one segment per page
+
+        The upload is spooled to a temporary file (PDFs need random access)
+        and pages are extracted lazily as segments are read: with an
+        executor, page ranges are extracted in parallel worker processes and
+        yielded in page order. Each yielded page is recorded in page_starts
+        so chunks can be mapped back to their pages. Page counts and skipped
+        pages are added to the metadata once the stream is read.
 
         Args:
-            file_path: Path to PDF file
+            stream: Seekable binary stream of the file
+            filename: Original filename
+            executor: Optional process pool for page-range extraction
 
         Returns:
-            Tuple of (extracted_text, metadata)
+            SegmentStream over the processed page text
         """
+        temp_file_path = self._spool_to_temp_file(stream, filename)
         try:
-            from pdfminer.high_level import extract_text
-            from pdfminer.layout import LAParams
-            from pdfminer.pdfparser import PDFParser
-            from pdfminer.pdfdocument import PDFDocument
-            from pdfminer.pdfpage import PDFPage
-
-            # Extract text with optimized parameters
-            text = extract_text(
-                file_path,
-                laparams=LAParams(
-                    detect_vertical=True,  # Better text flow detection
-                    all_texts=True,  # Extract all text including small fonts
-                    char_margin=1.0,  # Tighter character grouping
-                    line_margin=0.5,  # Better line detection
-                    word_margin=0.1,  # Better word detection
-                )
-            )
-
-            # Extract additional metadata
-            metadata = self._extract_pdf_metadata(file_path)
-
-            return text, metadata
-
-        except ImportError:
-            raise ImportError("pdfminer.six not available. Install with: pip install pdfminer.six")
-        except Exception as e:
-            raise Exception(f"PDFMiner extraction failed: {str(e)}")
-
-    def _extract_with_pypdf2(self, file_path: str) -> tuple[str, Dict[str, Any]]:
+            metadata = self._extract_pdf_metadata(temp_file_path)
+        except Exception:
+            _remove_file(temp_file_path)
+            raise
+
+        metadata['streamed'] = True
+        page_starts: List[Tuple[int, int]] = []
+        segments = self._iter_segments(temp_file_path, metadata, page_starts, executor)
+
+        # Removed once the segments are read or dropped, whichever comes first
+        weakref.finalize(segments, _remove_file, temp_file_path)
+
+        return SegmentStream(segments=segments, metadata=metadata, page_starts=page_starts)
+
+    def _iter_segments(
+        self,
+        file_path: str,
+        metadata: Dict[str, Any],
+        page_starts: List[Tuple[int, int]],
+        executor: Optional[Executor]
+    ) -> Iterator[str]:
+        """Yield each page's processed text, recording where it starts"""
+        pages = []
+        offset = 0
+
+        for page in self.iter_pages(file_path, metadata.get('page_count'), executor):
+            pages.append(PageText(page_number=page.page_number, text='', method=page.method))
+            if not page.method:
+                continue
+
+            processed = self._process_pdf_text(page.text)
+            if not processed:
+                continue
+
+            segment = processed + "\n\n"
+            page_starts.append((offset, page.page_number))
+            offset += len(segment)
+            yield segment
+
+        self._add_page_stats(metadata, pages)
+        _remove_file(file_path)
+
+    def iter_pages(
+        self,
+        file_path: str,
+        page_count: Optional[int] = None,
+        executor: Optional[Executor] = None
+    ) -> Iterator[PageText]:
         """
-        Extract text using PyPDF2 library as fallback
+        Extract pages in page order, a range of PDF_PAGES_PER_TASK at a time
+
+        With an executor, up to PDF_MAX_PENDING_RANGES ranges are extracted
+        ahead of the reader in worker processes. A range whose worker fails
+        is extracted in this process instead.
 
         Args:
-            file_path: Path to PDF file
+            file_path: Path to the PDF file
+            page_count: Number of pages, if known (otherwise one sequential pass)
+            executor: Optional process pool for page-range extraction
 
         Returns:
-            Tuple of (extracted_text, metadata)
+            Iterator of PageText in page order
         """
-        try:
-            from PyPDF2 import PdfReader
-
-            with open(file_path, 'rb') as file:
-                reader = PdfReader(file)
-                text_content = []
-                page_count = len(reader.pages)
-
-                for page_num, page in enumerate(reader.pages, 1):
-                    try:
-                        page_text = page.extract_text()
-                        if page_text.strip():
-                            text_content.append(f"PAGE {page_num}:\n{page_text}")
-                    except Exception as e:
-                        print(f"Failed to extract text from page {page_num}: {e}")
-                        continue
-
-                text = "\n\n".join(text_content)
+        if not page_count:
+            yield from extract_page_range(file_path, 1)
+            return
 
-                # Extract metadata
-                metadata = {
-                    'page_count': page_count,
-                    'has_text': len(text.strip()) > 0,
-                    'extraction_quality': 'pypdf2'
-                }
+        page_ranges = iter([
+            (first, min(first + PDF_PAGES_PER_TASK - 1, page_count))
+            for first in range(1, page_count + 1, PDF_PAGES_PER_TASK)
+        ])
 
-                # Try to get PDF metadata
-                if hasattr(reader, 'metadata') and reader.metadata:
-                    for key, value in reader.metadata.items():
-                        if key and value:
-                            metadata[f'pdf_{key.lower()}'] = str(value)
+        if executor is None:
+            for first, last in page_ranges:
+                yield from extract_page_range(file_path, first, last)
+            return
 
-                return text, metadata
+        def submit(page_range):
+            try:
+                return executor.submit(extract_page_range, file_path, *page_range)
+            except Exception as e:  # Pool shut down or broken
+                logger.warning(f"Could not submit pages {page_range[0]}-{page_range[1]} of {file_path}: {e}")
+                return None
 
-        except ImportError:
-            raise ImportError("PyPDF2 not available. Install with: pip install PyPDF2")
-        except Exception as e:
-            raise Exception(f"PyPDF2 extraction failed: {str(e)}")
+        pending = deque()
+        try:
+            for page_range in page_ranges:
+                pending.append((page_range, submit(page_range)))
+                if len(pending) >= PDF_MAX_PENDING_RANGES:
+                    break
+
+            while pending:
+                (first, last), future = pending.popleft()
+                next_range = next(page_ranges, None)
+                if next_range is not None:
+                    pending.append((next_range, submit(next_range)))
+
+                pages = None
+                if future is not None:
+                    try:
+                        pages = future.result()
+                    except Exception as e:
+                        logger.warning(f"Page worker failed on pages {first}-{last} of {file_path}: {e}")
+                if pages is None:
+                    pages = extract_page_range(file_path, first, last)
+
+                yield from pages
+        finally:
+            for _, future in pending:
+                if future is not None:
+                    future.cancel()
+
+    def _add_page_stats(self, metadata: Dict[str, Any], pages: List[PageText]):
+        """Add page counts, skipped pages and the extraction method to metadata"""
+        methods = {page.method for page in pages if page.method}
+        skipped_pages = [page.page_number for page in pages if not page.method]
+
+        metadata['page_count'] = metadata.get('page_count') or len(pages)
+        metadata['pages_extracted'] = len(pages) - len(skipped_pages)
+        metadata['skipped_pages'] = skipped_pages
+        metadata['has_text'] = bool(methods)
+        metadata['extraction_method'] = methods.pop() if len(methods) == 1 else ('mixed' if methods else None)
 
     def _extract_as_text(self, file_path: str) -> str:
         """
@@ -7,9 +7,23 @@ extraction and metadata for vector indexing.
 
 import os
 import re
-from typing import Dict, Any, Optional
+import codecs
+from concurrent.futures import Executor
+from typing import Dict, Any, Optional, BinaryIO, Iterator
 from datetime import datetime
-from .base_parser import BaseParser, ParseResult, ValidationResult
+from .base_parser import BaseParser, ParseResult, ValidationResult, SegmentStream
+
+# Streaming constants
+STREAM_READ_SIZE = 64 * 1024  # Bytes read per block
+STREAM_SAMPLE_SIZE = 1024  # Bytes used for encoding detection and validation
+STREAM_MAX_SEGMENT_CHARS = 4 * STREAM_READ_SIZE  # Cut even without a line break past this
+
+ENCODINGS_TO_TRY = [
+    'utf-8', 'utf-8-sig',  # UTF-8 with and without BOM
+    'latin-1', 'cp1252',     # Common Western encodings
+    'iso-8859-1',           # ISO standard
+    'ascii',                 # ASCII fallback
+]
 
 
 class TextParser(BaseParser):
@@ -20,6 +34,7 @@ class TextParser(BaseParser):
         '.txt': b'',  # Text files don't have reliable magic numbers
         '.log': b'',  # Log files are text files
     }
+    STREAMING = True
 
     def extract_content(self, file_path: str) -> ParseResult:
         """
@@ -96,14 +111,7 @@ class TextParser(BaseParser):
         Returns:
             Detected encoding string
         """
-        encodings_to_try = [
-            'utf-8', 'utf-8-sig',  # UTF-8 with and without BOM
-            'latin-1', 'cp1252',     # Common Western encodings
-            'iso-8859-1',           # ISO standard
-            'ascii',                 # ASCII fallback
-        ]
-
-        for encoding in encodings_to_try:
+        for encoding in ENCODINGS_TO_TRY:
             try:
                 with open(file_path, 'r', encoding=encoding) as f:
                     f.read(1024)  # Try to read a small chunk
@@ -116,6 +124,175 @@ class TextParser(BaseParser):
         # Fallback to utf-8 with error handling
         return 'utf-8'
 
+    def _detect_sample_encoding(self, sample: bytes) -> str:
+        """
+        Detect encoding from the first bytes of a file
+
+        Args:
+            sample: Leading bytes of the file (may end mid-character)
+
+        Returns:
+            Detected encoding string
+        """
+        for encoding in ENCODINGS_TO_TRY:
+            try:
+                codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+                return encoding
+            except UnicodeDecodeError:
+                continue
+
+        return 'utf-8'
+
+    def validate_stream(self, stream: BinaryIO, filename: str) -> ValidationResult:
+        """
+        Validate a text upload from its stream header, without copying it
+
+        Args:
+            stream: Seekable binary stream of the file
+            filename: Original filename
+
+        Returns:
+            ValidationResult with text-specific validation
+        """
+        base_validation = self._validate_stream_header(stream, filename)
+
+        if not base_validation.is_valid:
+            return base_validation
+
+        try:
+            header = stream.read(STREAM_SAMPLE_SIZE)
+            stream.seek(0)
+            encoding = self._detect_sample_encoding(header)
+            sample = codecs.getincrementaldecoder(encoding)(errors='replace').decode(header, final=False)
+
+            error_message = self._check_text_sample(sample, header)
+            if error_message:
+                return ValidationResult(
+                    is_valid=False,
+                    error_message=error_message,
+                    file_size=base_validation.file_size
+                )
+
+            return base_validation
+
+        except Exception as e:
+            return ValidationResult(
+                is_valid=False,
+                error_message=f"Text file validation failed: {str(e)}"
+            )
+
+    def open_stream(self, stream: BinaryIO, filename: str, executor: Optional[Executor] = None) -> SegmentStream:
+        """
+        Parse a text file incrementally into segments
+
+        The file is decoded block by block and cut at paragraph (or line)
+        breaks; each segment gets the same processing as extract_content.
+        Undecodable bytes past the detection sample are replaced rather than
+        failing a file that is already partly ingested. Line, word and
+        character counts are added to the metadata once the stream is read.
+
+        Args:
+            stream: Seekable binary stream of the file
+            filename: Original filename
+            executor: Unused; text is decoded in the calling thread
+
+        Returns:
+            SegmentStream over the processed text
+        """
+        stream.seek(0)
+        sample = stream.read(STREAM_SAMPLE_SIZE)
+        encoding = self._detect_sample_encoding(sample)
+
+        file_name = os.path.basename(filename).lower()
+        if any(indicator in file_name for indicator in ['.log', 'debug', 'error', 'output']):
+            content_subtype = 'log'
+        elif any(indicator in file_name for indicator in ['.py', '.js', '.html', '.css', '.java']):
+            content_subtype = 'code'
+        else:
+            content_subtype = 'general'
+
+        metadata = {
+            'file_type': 'text',
+            'encoding': encoding,
+            'content_subtype': content_subtype,
+            'streamed': True,
+        }
+
+        return SegmentStream(
+            segments=self._iter_segments(stream, sample, encoding, metadata),
+            metadata=metadata
+        )
+
+    def _iter_segments(self, stream: BinaryIO, first_block: bytes, encoding: str,
+                       metadata: Dict[str, Any]) -> Iterator[str]:
+        """
+        Decode a stream block by block and yield processed segments
+
+        Args:
+            stream: Binary stream positioned after first_block
+            first_block: Bytes already read from the stream
+            encoding: Text encoding
+            metadata: Stream metadata, updated with totals at the end
+
+        Yields:
+            Processed text segments, each ending with the break it was cut at
+        """
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        buffer = ""
+        block = first_block
+        line_count, word_count, char_count = 1, 0, 0
+
+        while True:
+            final = not block
+            buffer += decoder.decode(block, final=final)
+
+            cut, separator = (len(buffer), '') if final else self._find_segment_cut(buffer)
+            if cut:
+                segment, buffer = buffer[:cut], buffer[cut:]
+                line_count += segment.count('\n')
+                word_count += len(segment.split())
+                char_count += len(segment)
+
+                processed = self._process_text_content(segment)
+                if processed:
+                    yield processed + separator
+
+            if final:
+                break
+            block = stream.read(STREAM_READ_SIZE)
+
+        metadata.update({
+            'line_count': line_count,
+            'word_count': word_count,
+            'char_count': char_count,
+        })
+
+    def _find_segment_cut(self, buffer: str) -> tuple[int, str]:
+        """
+        Find where to cut decoded text into a segment
+
+        Args:
+            buffer: Decoded text not yet yielded
+
+        Returns:
+            (cut position, separator to append to the processed segment);
+            position 0 means wait for more text
+        """
+        paragraph_break = max(buffer.rfind('\n\n'), buffer.rfind('\n\r\n'))
+        if paragraph_break >= 0:
+            return buffer.index('\n', paragraph_break + 1) + 1, '\n\n'
+
+        line_break = buffer.rfind('\n')
+        if line_break >= 0:
+            return line_break + 1, '\n'
+
+        if len(buffer) < STREAM_MAX_SEGMENT_CHARS:
+            return 0, ''
+
+        # No line breaks at all: cut at a space, or anywhere as a last resort
+        space = max(buffer.rfind(' '), buffer.rfind('\t'))
+        return (space + 1, ' ') if space > 0 else (len(buffer), '')
+
     def _extract_text_metadata(self, content: str, file_path: str) -> Dict[str, Any]:
         """
         Extract metadata from text content
@@ -330,35 +507,16 @@ class TextParser(BaseParser):
             with open(file_path, 'r', encoding=encoding) as file:
                 sample = file.read(1024)
 
-            # Check if file contains readable text (high text-to-binary ratio)
-            if sample:
-                text_chars = len([c for c in sample if c.isprintable()])
-                total_chars = len(sample)
-                text_ratio = text_chars / total_chars
-
-                if text_ratio < 0.7:  # Less than 70% printable characters
-                    return ValidationResult(
-                        is_valid=False,
-                        error_message=f"File appears to be binary data (text ratio: {text_ratio:.2%})",
-                        file_size=base_validation.file_size
-                    )
-
-            # Check for obvious binary file signatures
-            binary_signatures = [
-                b'\x00\x00\x00',  # Common binary start
-                b'\xff\xfe',      # UTF-16 LE BOM
-                b'\xfe\xff',      # UTF-16 BE BOM
-            ]
-
             with open(file_path, 'rb') as file:
                 header = file.read(16)
-                for signature in binary_signatures:
-                    if header.startswith(signature):
-                        return ValidationResult(
-                            is_valid=False,
-                            error_message="File appears to be binary data, not text",
-                            file_size=base_validation.file_size
-                        )
+
+            error_message = self._check_text_sample(sample, header)
+            if error_message:
+                return ValidationResult(
+                    is_valid=False,
+                    error_message=error_message,
+                    file_size=base_validation.file_size
+                )
 
             return base_validation
 
@@ -372,4 +530,37 @@ class TextParser(BaseParser):
             return ValidationResult(
                 is_valid=False,
                 error_message=f"Text file validation failed: {str(e)}"
-            )
\ No newline at end of file
+            )
+
+    def _check_text_sample(self, sample: str, header: bytes) -> Optional[str]:
+        """
+        Check that the start of a file looks like text
+
+        Args:
+            sample: First characters of the file, decoded
+            header: First bytes of the file
+
+        Returns:
+            Error message, or None if the sample looks like text
+        """
+        # Check if file contains readable text (high text-to-binary ratio)
+        if sample:
+            text_chars = len([c for c in sample if c.isprintable()])
+            total_chars = len(sample)
+            text_ratio = text_chars / total_chars
+
+            if text_ratio < 0.7:  # Less than 70% printable characters
+                return f"File appears to be binary data (text ratio: {text_ratio:.2%})"
+
+        # Check for obvious binary file signatures
+        binary_signatures = [
+            b'\x00\x00\x00',  # Common binary start
+            b'\xff\xfe',      # UTF-16 LE BOM
+            b'\xfe\xff',      # UTF-16 BE BOM
+        ]
+
+        for signature in binary_signatures:
+            if header.startswith(signature):
+                return "File appears to be binary data, not text"
+
+        return None
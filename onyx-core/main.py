@@ -13,6 +13,8 @@ from api.web_tools import router as web_tools_router, startup_event as web_tools
 from contextlib import asynccontextmanager
 from rag_service import get_rag_service
 from services.memory_service import get_memory_service
+from services.analytics_writer import get_analytics_writer
+from services.parse_pool import get_parse_pool
 from utils.auth import require_authenticated_user
 
 # Optional imports guarded for developer environments without full dependencies
@@ -51,7 +53,8 @@ async def lifespan(app: FastAPI):
 
     # Initialize RAG service
     try:
-        await get_rag_service()
+        rag_service = await get_rag_service()
+        await rag_service.ensure_collection_exists()
         logger.info("✅ RAG service initialized successfully")
     except Exception as e:
         logger.error(f"❌ Failed to initialize RAG service: {e}")
@@ -68,11 +71,18 @@ async def lifespan(app: FastAPI):
 
     # Initialize memory service
     try:
-        await get_memory_service()
+        await get_memory_service().initialize()
         logger.info("✅ Memory service initialized successfully")
     except Exception as e:
         logger.error(f"❌ Failed to initialize memory service: {e}")
 
+    # Start buffered analytics writer
+    try:
+        await get_analytics_writer().start()
+        logger.info("✅ Analytics writer started successfully")
+    except Exception as e:
+        logger.error(f"❌ Failed to start analytics writer: {e}")
+
     # Initialize web tools services
     try:
         await web_tools_startup()
@@ -102,6 +112,35 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"❌ Failed to shutdown web tools services: {e}")
 
+    # Drain buffered analytics before connections close
+    try:
+        await get_analytics_writer().stop()
+        logger.info("✅ Analytics writer drained")
+    except Exception as e:
+        logger.error(f"❌ Failed to drain analytics writer: {e}")
+
+    # Stop file parsing workers
+    try:
+        get_parse_pool().shutdown()
+        logger.info("✅ Parse pool stopped")
+    except Exception as e:
+        logger.error(f"❌ Failed to stop parse pool: {e}")
+
+    # Close memory service connection pool
+    try:
+        await get_memory_service().close()
+        logger.info("✅ Memory service connections closed")
+    except Exception as e:
+        logger.error(f"❌ Failed to close memory service: {e}")
+
+    # Close RAG service connection pools
+    try:
+        rag_service = await get_rag_service()
+        await rag_service.close()
+        logger.info("✅ RAG service connections closed")
+    except Exception as e:
+        logger.error(f"❌ Failed to close RAG service: {e}")
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -286,6 +325,24 @@ async def get_document_count():
         )
 
 
+@app.post("/documents/collection/reset")
+async def reset_collection_state(
+    current_user: dict = Depends(require_authenticated_user)
+):
+    """Re-verify the vector collection, e.g. after it was dropped or restored"""
+    try:
+        rag_service = await get_rag_service()
+        rag_service.reset_collection_state()
+        await rag_service.ensure_collection_exists(force=True)
+
+        return {"success": True, "data": {"collection": rag_service.collection_name, "verified": True}}
+    except Exception as e:
+        logger.error(f"Failed to reset collection state: {e}")
+        raise HTTPException(
+            status_code=500, detail="Document service temporarily unavailable"
+        )
+
+
 # Note: Google Drive sync endpoints moved to api/google_drive.py router
 
 
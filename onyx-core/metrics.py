@@ -129,6 +129,28 @@ DATABASE_QUERY_DURATION = Histogram(
     registry=REGISTRY
 )
 
+DATABASE_POOL_SATURATION = Gauge(
+    'onyx_database_pool_saturation_ratio',
+    'Fraction of pool connections currently checked out',
+    ['pool'],
+    registry=REGISTRY
+)
+
+DATABASE_POOL_ACQUIRE_DURATION = Histogram(
+    'onyx_database_pool_acquire_duration_seconds',
+    'Time spent waiting to acquire a pooled database connection',
+    ['pool'],
+    buckets=[0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0],
+    registry=REGISTRY
+)
+
+DATABASE_POOL_LEAKS_TOTAL = Counter(
+    'onyx_database_pool_leaks_total',
+    'Pooled connections reclaimed after being garbage collected without release',
+    ['pool'],
+    registry=REGISTRY
+)
+
 VECTOR_DB_OPERATIONS_TOTAL = Counter(
     'onyx_vector_db_operations_total',
     'Total number of vector database operations',
@@ -151,6 +173,13 @@ CACHE_OPERATIONS_TOTAL = Counter(
     registry=REGISTRY
 )
 
+EMBEDDING_CACHE_LOOKUPS_TOTAL = Counter(
+    'onyx_embedding_cache_lookups_total',
+    'Total number of query embedding cache lookups',
+    ['tier', 'result'],
+    registry=REGISTRY
+)
+
 ERRORS_TOTAL = Counter(
     'onyx_errors_total',
     'Total number of errors',
@@ -320,6 +349,13 @@ class MetricsCollector:
             "status": status
         })
 
+    def record_embedding_cache_lookup(self, tier: str, result: str):
+        """Record query embedding cache lookup (tier: memory/redis/all, result: hit/miss)"""
+        EMBEDDING_CACHE_LOOKUPS_TOTAL.labels(
+            tier=tier,
+            result=result
+        ).inc()
+
     def record_error(self, error_type: str, component: str, error: Exception = None):
         """Record error metrics"""
         ERRORS_TOTAL.labels(
@@ -337,6 +373,19 @@ class MetricsCollector:
         """Set active database connections count"""
         DATABASE_CONNECTIONS.labels(database=database).set(count)
 
+    def record_db_pool_acquire(self, pool: str, wait_seconds: float):
+        """Record time spent waiting for a pooled connection"""
+        DATABASE_POOL_ACQUIRE_DURATION.labels(pool=pool).observe(wait_seconds)
+
+    def set_db_pool_usage(self, pool: str, in_use: int, max_size: int):
+        """Set checked-out connections and saturation for a pool"""
+        DATABASE_CONNECTIONS.labels(database=pool).set(in_use)
+        DATABASE_POOL_SATURATION.labels(pool=pool).set(in_use / max_size if max_size else 0.0)
+
+    def record_db_pool_leak(self, pool: str):
+        """Record a leaked (never released) pooled connection"""
+        DATABASE_POOL_LEAKS_TOTAL.labels(pool=pool).inc()
+
     def cleanup(self):
         """Cleanup metrics collector"""
         if self.system_metrics_thread and self.system_metrics_thread.is_alive():
@@ -443,4 +492,29 @@ def record_api_call(endpoint: str, method: str, status: str, duration: float):
 def record_error(error_type: str, component: str, error: Exception = None):
     """Record error metrics"""
     collector = get_metrics_collector()
-    collector.record_error(error_type, component, error)
\ No newline at end of file
+    collector.record_error(error_type, component, error)
+
+def record_embedding_cache_lookup(tier: str, result: str):
+    """Record query embedding cache lookup metrics"""
+    collector = get_metrics_collector()
+    collector.record_embedding_cache_lookup(tier, result)
+
+def record_db_pool_acquire(pool: str, wait_seconds: float):
+    """Record database pool acquire wait metrics"""
+    collector = get_metrics_collector()
+    collector.record_db_pool_acquire(pool, wait_seconds)
+
+def set_db_pool_usage(pool: str, in_use: int, max_size: int):
+    """Record database pool saturation metrics"""
+    collector = get_metrics_collector()
+    collector.set_db_pool_usage(pool, in_use, max_size)
+
+def record_db_pool_leak(pool: str):
+    """Record database pool leak metrics"""
+    collector = get_metrics_collector()
+    collector.record_db_pool_leak(pool)
+
+def record_cache_operation(cache: str, operation: str, status: str):
+    """Record cache operation metrics"""
+    collector = get_metrics_collector()
+    collector.record_cache_operation(cache, operation, status)
@@ -0,0 +1,18 @@
+-- Migration: Embedding Dedup Store
+-- Purpose: Persist chunk-hash -> embedding vectors so identical chunks
+--          (boilerplate, signatures, re-shared files) are embedded only once
+
+CREATE TABLE IF NOT EXISTS chunk_embeddings (
+    chunk_hash CHAR(64) NOT NULL,          -- SHA-256 of the chunk text
+    model VARCHAR(100) NOT NULL,           -- Embedding model that produced the vector
+    dimensions INTEGER NOT NULL,
+    embedding BYTEA NOT NULL,              -- Packed little-endian float32 vector
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (chunk_hash, model)
+);
+
+-- Supports pruning of old vectors
+CREATE INDEX IF NOT EXISTS idx_chunk_embeddings_created_at
+    ON chunk_embeddings(created_at);
+
+COMMENT ON TABLE chunk_embeddings IS 'Content-hash embedding dedup store used by EmbeddingService';
@@ -0,0 +1,75 @@
+-- Migration: Materialized Memory Rank Score
+-- Purpose: Let memory injection take the top-K memories of a user straight
+--          from an index instead of scoring and sorting every memory on
+--          every chat turn
+--
+-- The injection score is
+--   confidence * 0.5 + access_count * 0.01 + source/category boosts
+--   - 0.001 * age_in_days
+-- Because the age decay is linear, "- 0.001 * (now - created_at) in days"
+-- equals "+ 0.001 * created_at in days" minus a term that depends only on
+-- NOW() and is the same for every row. rank_score stores everything except
+-- that NOW() term, so it never changes with time, orders memories exactly
+-- like the full score, and only needs recomputing when a scoring input
+-- changes. Queries subtract the NOW() term to report the full score.
+
+-- Time-independent part of the injection score
+CREATE OR REPLACE FUNCTION compute_memory_rank_score(
+    p_confidence FLOAT,
+    p_access_count INTEGER,
+    p_source_type TEXT,
+    p_category TEXT,
+    p_created_at TIMESTAMP
+) RETURNS DOUBLE PRECISION AS $$
+    SELECT p_confidence * 0.5
+         + COALESCE(p_access_count, 0) * 0.01
+         + CASE WHEN p_source_type = 'auto_summary' THEN 0.2 ELSE 0 END
+         + CASE p_category
+               WHEN 'priority' THEN 0.1
+               WHEN 'decision' THEN 0.05
+               WHEN 'goal' THEN 0.03
+               ELSE 0
+           END
+         + EXTRACT(EPOCH FROM p_created_at) / 86400.0 * 0.001
+$$ LANGUAGE SQL IMMUTABLE;
+
+ALTER TABLE user_memories ADD COLUMN IF NOT EXISTS rank_score DOUBLE PRECISION;
+
+-- Backfill without touching updated_at
+ALTER TABLE user_memories DISABLE TRIGGER update_user_memories_updated_at;
+UPDATE user_memories
+SET rank_score = compute_memory_rank_score(
+    confidence, access_count, source_type, category, COALESCE(created_at, NOW()::timestamp)
+)
+WHERE rank_score IS NULL;
+ALTER TABLE user_memories ENABLE TRIGGER update_user_memories_updated_at;
+
+-- Keep rank_score current whenever a scoring input changes
+CREATE OR REPLACE FUNCTION update_memory_rank_score()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.created_at = COALESCE(NEW.created_at, NOW()::timestamp);
+    NEW.rank_score = compute_memory_rank_score(
+        NEW.confidence, NEW.access_count, NEW.source_type, NEW.category, NEW.created_at
+    );
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS update_user_memories_rank_score ON user_memories;
+CREATE TRIGGER update_user_memories_rank_score
+    BEFORE INSERT OR UPDATE OF confidence, access_count, source_type, category, created_at
+    ON user_memories
+    FOR EACH ROW EXECUTE FUNCTION update_memory_rank_score();
+
+-- Top-K injection reads walk this index in order and stop after K rows
+CREATE INDEX IF NOT EXISTS idx_memories_rank
+    ON user_memories(user_id, rank_score DESC)
+    WHERE is_deleted = FALSE;
+
+COMMENT ON COLUMN user_memories.rank_score IS
+    'Time-independent memory injection score (see compute_memory_rank_score); subtract 0.001 * epoch(now) / 86400 for the full score';
+
+-- The keyword filter of context-aware injection matches
+-- to_tsvector('english', fact) against a prefix tsquery so it can use
+-- idx_memories_search (migration 005) instead of scanning with ILIKE.
@@ -0,0 +1,22 @@
+-- Migration: Memory Near-Duplicate Index
+-- Purpose: Find near-duplicate memories with an index probe instead of an
+--          ILIKE sequential scan or pairwise text comparisons
+--
+-- lsh_bands holds the MinHash LSH band hashes of the fact, computed by the
+-- application (services/memory_dedup.py). Two facts whose word sets are
+-- similar share at least one band hash with high probability, so
+-- "lsh_bands && <bands of the new fact>" returns a small candidate set that
+-- the application confirms with the exact Jaccard similarity.
+--
+-- Existing rows start with NULL bands and only match exact duplicates until
+-- backfilled:
+--   python -m services.memory_dedup
+
+ALTER TABLE user_memories ADD COLUMN IF NOT EXISTS lsh_bands BIGINT[];
+
+CREATE INDEX IF NOT EXISTS idx_memories_lsh_bands
+    ON user_memories USING GIN(lsh_bands)
+    WHERE is_deleted = FALSE;
+
+COMMENT ON COLUMN user_memories.lsh_bands IS
+    'MinHash LSH band hashes of fact (16 bands x 4 rows) for near-duplicate lookup';
@@ -0,0 +1,22 @@
+-- Migration: Memory Extraction Checkpoints
+-- Purpose: Let batch memory extraction (services/batch_memory_extraction.py)
+--          resume a long backfill where it stopped
+--
+-- Conversations are processed in (created_at, id) order; a job's checkpoint
+-- is the position up to which every conversation has been processed.
+
+CREATE TABLE IF NOT EXISTS memory_extraction_checkpoints (
+    job_id VARCHAR(100) PRIMARY KEY,
+    last_created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    last_conversation_id UUID NOT NULL,
+    conversations_processed INTEGER NOT NULL DEFAULT 0,
+    memories_stored INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Streaming order of batch extraction
+CREATE INDEX IF NOT EXISTS idx_conversations_created_at_id
+    ON conversations(created_at, id);
+
+COMMENT ON TABLE memory_extraction_checkpoints IS 'Resume positions of batch memory extraction jobs';
@@ -6,11 +6,13 @@ and sentence transformers for embedding generation.
 """
 
 import os
+import asyncio
 from typing import List, Dict, Any, Optional, Union
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import logging
 
-from qdrant_client import QdrantClient # pyright: ignore[reportMissingImports]
+import httpx
+from qdrant_client import QdrantClient, AsyncQdrantClient # pyright: ignore[reportMissingImports]
 from qdrant_client.models import ( # pyright: ignore[reportMissingImports]
     Distance,
     VectorParams,
@@ -20,8 +22,12 @@ from qdrant_client.models import ( # pyright: ignore[reportMissingImports]
     MatchValue,
     MatchAny,
     OptimizersConfigDiff,
+    PointIdsList,
 )
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
+
+from services.embedding_cache import EmbeddingCache
+from services.search_result_cache import invalidate_search_cache
 
 # Import hybrid search components
 try:
@@ -39,6 +45,12 @@ logger = logging.getLogger(__name__)
 EMBEDDING_MODEL_NAME = "text-embedding-3-small"
 VECTOR_SIZE = 1536
 COLLECTION_NAME = "documents"
+DEFAULT_HTTP_MAX_CONNECTIONS = 100
+DEFAULT_HTTP_MAX_KEEPALIVE = 20
+MAX_EMBEDDING_INPUTS = 2048  # OpenAI embeddings API limit on inputs per request
+DEFAULT_EMBEDDING_BATCH_SIZE = 256  # ~128k tokens at 500-token chunks, under the per-request token cap
+DEFAULT_UPSERT_BATCH_SIZE = 256
+DEFAULT_INDEX_PARALLELISM = 4
 
 
 @dataclass
@@ -53,6 +65,18 @@ class SearchResult:
     metadata: Dict[str, Any]
 
 
+@dataclass
+class DocumentChunk:
+    """Data class for a chunk to index with RAGService.add_documents"""
+
+    doc_id: str
+    text: str
+    title: str
+    source: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    embedding: Optional[List[float]] = None  # Precomputed vector; skips re-embedding when set
+
+
 class RAGService:
     """RAG Service for document search and retrieval with hybrid search capabilities"""
 
@@ -63,12 +87,39 @@ class RAGService:
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.collection_name = COLLECTION_NAME
 
+        # Memoized collection state: verified once, re-checked only after a
+        # "collection not found" error or an explicit reset
+        self._collection_verified = False
+        self._collection_lock = asyncio.Lock()
+
+        # Async execution mode: non-blocking Qdrant/OpenAI clients on shared HTTP pools
+        self.async_mode = os.getenv("RAG_ASYNC_MODE", "true").lower() == "true"
+        self.http_max_connections = int(os.getenv("RAG_HTTP_MAX_CONNECTIONS", DEFAULT_HTTP_MAX_CONNECTIONS))
+        self.http_max_keepalive = int(os.getenv("RAG_HTTP_MAX_KEEPALIVE", DEFAULT_HTTP_MAX_KEEPALIVE))
+        self.async_qdrant_client = None
+        self.async_openai_client = None
+        self._async_http_client = None
+
+        # Bulk indexing configuration
+        self.embedding_batch_size = min(
+            int(os.getenv("RAG_EMBEDDING_BATCH_SIZE", DEFAULT_EMBEDDING_BATCH_SIZE)),
+            MAX_EMBEDDING_INPUTS,
+        )
+        self.upsert_batch_size = int(os.getenv("RAG_UPSERT_BATCH_SIZE", DEFAULT_UPSERT_BATCH_SIZE))
+        self.index_parallelism = max(1, int(os.getenv("RAG_INDEX_PARALLELISM", DEFAULT_INDEX_PARALLELISM)))
+
         # Hybrid search configuration
         self.enable_hybrid_search = os.getenv("ENABLE_HYBRID_SEARCH", "true").lower() == "true"
         self.hybrid_search_service = None
 
+        # Query embedding cache configuration
+        self.enable_embedding_cache = os.getenv("ENABLE_EMBEDDING_CACHE", "true").lower() == "true"
+        self.embedding_cache = None
+        self._pending_query_embeddings: Dict[str, asyncio.Task] = {}
+
         # Initialize clients
         self._init_clients()
+        self._init_embedding_cache()
         self._init_hybrid_search()
 
     def _init_clients(self):
@@ -84,6 +135,9 @@ class RAGService:
                 logger.warning("OPENAI_API_KEY not set. Embedding generation will fail.")
             self.openai_client = OpenAI(api_key=self.openai_api_key)
 
+            if self.async_mode:
+                self._init_async_clients()
+
             logger.info(f"RAG service initialized with Qdrant at {self.qdrant_url}")
             logger.info(f"Using OpenAI embedding model: {EMBEDDING_MODEL_NAME}")
 
@@ -91,6 +145,71 @@ class RAGService:
             logger.error(f"Failed to initialize RAG service: {e}")
             raise
 
+    def _init_async_clients(self):
+        """Initialize async Qdrant and OpenAI clients with bounded, keep-alive HTTP pools"""
+        limits = httpx.Limits(
+            max_connections=self.http_max_connections,
+            max_keepalive_connections=self.http_max_keepalive,
+        )
+
+        self.async_qdrant_client = AsyncQdrantClient(
+            url=self.qdrant_url, api_key=self.qdrant_api_key, limits=limits
+        )
+
+        # One pooled HTTP client shared by every embedding request
+        self._async_http_client = httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(30.0))
+        self.async_openai_client = AsyncOpenAI(
+            api_key=self.openai_api_key, http_client=self._async_http_client
+        )
+
+        logger.info(
+            f"RAG async mode enabled (max_connections={self.http_max_connections}, "
+            f"max_keepalive={self.http_max_keepalive})"
+        )
+
+    async def _qdrant(self, method: str, *args, **kwargs):
+        """Call a Qdrant client method, using the non-blocking client in async mode"""
+        try:
+            if self.async_qdrant_client is not None:
+                return await getattr(self.async_qdrant_client, method)(*args, **kwargs)
+            return getattr(self.qdrant_client, method)(*args, **kwargs)
+        except Exception as e:
+            if self._is_collection_not_found(e):
+                logger.warning(
+                    f"Qdrant collection {self.collection_name} not found during {method} - "
+                    "will re-verify on next request"
+                )
+                self.reset_collection_state()
+            raise
+
+    def _is_collection_not_found(self, error: Exception) -> bool:
+        """Check whether a Qdrant error means the collection no longer exists"""
+        if getattr(error, "status_code", None) == 404:
+            return True
+        message = str(error).lower()
+        return "not found" in message and self.collection_name.lower() in message
+
+    def reset_collection_state(self):
+        """Forget the memoized collection state so the next request re-verifies it"""
+        self._collection_verified = False
+
+    def _init_embedding_cache(self):
+        """Initialize the two-tier query embedding cache if enabled"""
+        if not self.enable_embedding_cache:
+            logger.info("Query embedding cache disabled")
+            return
+
+        try:
+            self.embedding_cache = EmbeddingCache(
+                model_name=EMBEDDING_MODEL_NAME,
+                vector_size=VECTOR_SIZE,
+                redis_url=os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+            )
+            logger.info("Query embedding cache enabled (in-process LRU + Redis)")
+        except Exception as e:
+            logger.error(f"Failed to initialize query embedding cache: {e}")
+            self.embedding_cache = None
+
     def _init_hybrid_search(self):
         """Initialize hybrid search service if enabled"""
         if not self.enable_hybrid_search:
@@ -110,16 +229,35 @@ class RAGService:
             logger.error(f"Failed to initialize hybrid search: {e}")
             self.enable_hybrid_search = False
 
-    async def ensure_collection_exists(self):
-        """Ensure the Qdrant collection exists"""
+    async def ensure_collection_exists(self, force: bool = False):
+        """
+        Ensure the Qdrant collection exists
+
+        The result is memoized, so after the first successful check this costs no
+        Qdrant round trip until reset_collection_state() is called.
+
+        Args:
+            force: Re-verify even if the collection was already verified
+        """
+        if self._collection_verified and not force:
+            return
+
+        async with self._collection_lock:
+            if self._collection_verified and not force:
+                return
+            await self._verify_collection()
+
+    async def _verify_collection(self):
+        """Check for the Qdrant collection and create it if missing"""
         try:
             # Check if collection exists
-            collections = self.qdrant_client.get_collections().collections
+            collections = (await self._qdrant("get_collections")).collections
             collection_names = [c.name for c in collections]
 
             if self.collection_name not in collection_names:
                 # Create collection with optimized configuration
-                self.qdrant_client.create_collection(
+                await self._qdrant(
+                    "create_collection",
                     collection_name=self.collection_name,
                     vectors_config=VectorParams(
                         size=VECTOR_SIZE,
@@ -138,6 +276,8 @@ class RAGService:
             else:
                 logger.info(f"Qdrant collection {self.collection_name} already exists")
 
+            self._collection_verified = True
+
         except Exception as e:
             logger.error(f"Failed to ensure collection exists: {e}")
             raise
@@ -155,6 +295,100 @@ class RAGService:
             logger.error(f"Failed to embed query: {e}")
             raise
 
+    async def embed_text(self, text: str) -> List[float]:
+        """Embed text without blocking the event loop when async mode is enabled"""
+        if self.async_openai_client is None:
+            return self.embed_query(text)
+
+        try:
+            response = await self.async_openai_client.embeddings.create(
+                model=EMBEDDING_MODEL_NAME,
+                input=text
+            )
+            return response.data[0].embedding
+        except Exception as e:
+            logger.error(f"Failed to embed query: {e}")
+            raise
+
+    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed many texts with as few API requests as possible
+
+        Texts are sent in requests of up to embedding_batch_size inputs
+        (capped at the provider's MAX_EMBEDDING_INPUTS).
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embedding vectors in the same order as texts
+        """
+        embeddings = []
+        for start in range(0, len(texts), self.embedding_batch_size):
+            batch = texts[start:start + self.embedding_batch_size]
+            if self.async_openai_client is not None:
+                response = await self.async_openai_client.embeddings.create(
+                    model=EMBEDDING_MODEL_NAME,
+                    input=batch
+                )
+            else:
+                response = self.openai_client.embeddings.create(
+                    model=EMBEDDING_MODEL_NAME,
+                    input=batch
+                )
+
+            # The API may return items out of order; restore input order by index
+            batch_embeddings = [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+            if len(batch_embeddings) != len(batch):
+                raise ValueError(
+                    f"Embedding count mismatch: expected {len(batch)}, got {len(batch_embeddings)}"
+                )
+            embeddings.extend(batch_embeddings)
+
+        return embeddings
+
+    async def get_query_embedding(self, query: str) -> List[float]:
+        """
+        Get the embedding for a search query, served from the embedding cache when possible
+
+        Cache misses are embedded in a shielded background task, so a caller
+        that is cancelled (e.g. a search leg hitting its timeout) does not stop
+        the embedding from being cached for the next request. Concurrent misses
+        for the same query share one task.
+
+        Args:
+            query: Search query string
+
+        Returns:
+            Query embedding vector
+        """
+        if self.embedding_cache is None:
+            return await self.embed_text(query)
+
+        cached = await self.embedding_cache.get(query)
+        if cached is not None:
+            return cached
+
+        key = self.embedding_cache.make_key(query)
+        task = self._pending_query_embeddings.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._embed_and_cache_query(query))
+            self._pending_query_embeddings[key] = task
+            task.add_done_callback(lambda done: self._finish_query_embedding(key, done))
+        return await asyncio.shield(task)
+
+    async def _embed_and_cache_query(self, query: str) -> List[float]:
+        """Embed a query and store it in the embedding cache"""
+        embedding = await self.embed_text(query)
+        await self.embedding_cache.set(query, embedding)
+        return embedding
+
+    def _finish_query_embedding(self, key: str, task: asyncio.Task):
+        """Forget a finished query embedding task and consume its error if nobody awaited it"""
+        self._pending_query_embeddings.pop(key, None)
+        if not task.cancelled():
+            task.exception()
+
     async def search(
         self,
         query: str,
@@ -198,7 +432,7 @@ class RAGService:
 
             # Fallback to semantic search
             # Embed the query
-            query_embedding = self.embed_query(query)
+            query_embedding = await self.get_query_embedding(query)
 
             # Build filter conditions
             filter_conditions = []
@@ -232,7 +466,8 @@ class RAGService:
                 search_filter = Filter(must=filter_conditions)
 
             # Search in Qdrant
-            search_result = self.qdrant_client.search(
+            search_result = await self._qdrant(
+                "search",
                 collection_name=self.collection_name,
                 query_vector=query_embedding,
                 query_filter=search_filter,
@@ -272,6 +507,7 @@ class RAGService:
         title: str,
         source: str,
         metadata: Optional[Dict[str, Any]] = None,
+        embedding: Optional[List[float]] = None,
     ) -> bool:
         """
         Add a document to the vector database
@@ -282,6 +518,7 @@ class RAGService:
             title: Document title
             source: Document source (e.g., 'google_drive', 'slack', 'local')
             metadata: Additional metadata
+            embedding: Precomputed embedding of text (skips the embeddings API call)
 
         Returns:
             True if successful, False otherwise
@@ -290,8 +527,11 @@ class RAGService:
             # Ensure collection exists
             await self.ensure_collection_exists()
 
-            # Embed the document text
-            doc_embedding = self.embed_query(text)
+            # Embed the document text unless a usable vector was supplied
+            if self._is_valid_embedding(embedding):
+                doc_embedding = embedding
+            else:
+                doc_embedding = await self.embed_text(text)
 
             # Create point structure
             point = PointStruct(
@@ -306,10 +546,12 @@ class RAGService:
             )
 
             # Upsert to Qdrant
-            self.qdrant_client.upsert(
-                collection_name=self.collection_name, points=[point]
+            await self._qdrant(
+                "upsert", collection_name=self.collection_name, points=[point]
             )
 
+            await invalidate_search_cache()
+
             logger.info(f"Added document {doc_id} from {source}")
             return True
 
@@ -317,11 +559,138 @@ class RAGService:
             logger.error(f"Failed to add document {doc_id}: {e}")
             return False
 
+    async def add_documents(
+        self,
+        documents: List[DocumentChunk],
+        batch_size: Optional[int] = None,
+    ) -> int:
+        """
+        Add many documents to the vector database in bulk
+
+        Documents are split into batches of batch_size. Each batch is embedded with
+        batched embedding requests and written with a single Qdrant upsert;
+        up to index_parallelism batches run concurrently. Upserts wait until
+        the points are applied so the search cache is only invalidated once
+        new results are visible.
+        Documents that carry a precomputed embedding are not re-embedded.
+
+        Args:
+            documents: Chunks to index
+            batch_size: Points per Qdrant upsert (defaults to RAG_UPSERT_BATCH_SIZE)
+
+        Returns:
+            Number of documents successfully indexed
+        """
+        if not documents:
+            return 0
+
+        batch_size = batch_size or self.upsert_batch_size
+
+        try:
+            await self.ensure_collection_exists()
+        except Exception as e:
+            logger.error(f"Failed to add {len(documents)} documents: {e}")
+            return 0
+
+        semaphore = asyncio.Semaphore(self.index_parallelism)
+
+        async def index_batch(batch: List[DocumentChunk]) -> int:
+            async with semaphore:
+                try:
+                    embeddings = [
+                        doc.embedding if self._is_valid_embedding(doc.embedding) else None
+                        for doc in batch
+                    ]
+                    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+                    if missing:
+                        new_embeddings = await self.embed_texts([batch[i].text for i in missing])
+                        for i, embedding in zip(missing, new_embeddings):
+                            embeddings[i] = embedding
+
+                    points = [
+                        PointStruct(
+                            id=doc.doc_id,
+                            vector=embedding,
+                            payload={
+                                "text": doc.text,
+                                "title": doc.title,
+                                "source": doc.source,
+                                "metadata": doc.metadata or {},
+                            },
+                        )
+                        for doc, embedding in zip(batch, embeddings)
+                    ]
+                    await self._qdrant(
+                        "upsert", collection_name=self.collection_name, points=points, wait=True
+                    )
+                    return len(points)
+                except Exception as e:
+                    logger.error(
+                        f"Failed to index batch of {len(batch)} documents "
+                        f"starting at {batch[0].doc_id}: {e}"
+                    )
+                    return 0
+
+        batches = [documents[i:i + batch_size] for i in range(0, len(documents), batch_size)]
+        indexed = sum(await asyncio.gather(*(index_batch(batch) for batch in batches)))
+        if indexed:
+            await invalidate_search_cache()
+
+        logger.info(
+            f"Bulk indexed {indexed}/{len(documents)} documents in {len(batches)} batches "
+            f"(batch_size={batch_size}, parallelism={self.index_parallelism})"
+        )
+        return indexed
+
+    async def delete_documents(self, doc_ids: List[str]) -> bool:
+        """
+        Delete documents from the vector database by id
+
+        Ids that were never written are ignored by Qdrant, so this is safe to
+        call with every id of a partially indexed upload.
+
+        Args:
+            doc_ids: Ids of the points to delete
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not doc_ids:
+            return True
+
+        try:
+            await self._qdrant(
+                "delete",
+                collection_name=self.collection_name,
+                points_selector=PointIdsList(points=doc_ids),
+                wait=True,
+            )
+            await invalidate_search_cache()
+
+            logger.info(f"Deleted {len(doc_ids)} documents")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to delete {len(doc_ids)} documents: {e}")
+            return False
+
+    def _is_valid_embedding(self, embedding: Optional[List[float]]) -> bool:
+        """Check that a precomputed embedding can be stored as-is in the collection"""
+        if embedding is None:
+            return False
+        if len(embedding) != VECTOR_SIZE:
+            logger.warning(
+                f"Ignoring precomputed embedding with {len(embedding)} dimensions "
+                f"(expected {VECTOR_SIZE}); re-embedding"
+            )
+            return False
+        return True
+
     async def get_document_count(self) -> int:
         """Get total number of documents in the collection"""
         try:
             await self.ensure_collection_exists()
-            collection_info = self.qdrant_client.get_collection(self.collection_name)
+            collection_info = await self._qdrant("get_collection", self.collection_name)
             return collection_info.points_count
         except Exception as e:
             logger.error(f"Failed to get document count: {e}")
@@ -331,21 +700,24 @@ class RAGService:
         """Perform health check on RAG service"""
         try:
             # Check Qdrant connection
-            collections = self.qdrant_client.get_collections()
+            collections = await self._qdrant("get_collections")
             collection_exists = self.collection_name in [c.name for c in collections.collections]
+            if not collection_exists:
+                self.reset_collection_state()
 
             health_info = {
                 "status": "healthy",
                 "qdrant_url": self.qdrant_url,
                 "collection_exists": collection_exists,
                 "embedding_model": EMBEDDING_MODEL_NAME,
+                "async_mode": self.async_openai_client is not None,
             }
 
             # If collection exists, get detailed info
             if collection_exists:
                 try:
                     doc_count = await self.get_document_count()
-                    collection_info = self.qdrant_client.get_collection(self.collection_name)
+                    collection_info = await self._qdrant("get_collection", self.collection_name)
 
                     health_info.update({
                         "document_count": doc_count,
@@ -364,7 +736,20 @@ class RAGService:
             logger.error(f"Health check failed: {e}")
             return {"status": "unhealthy", "error": str(e)}
 
-    async def _get_hybrid_search_service(self) -> HybridSearchService:
+    async def close(self):
+        """Close async clients, the shared HTTP pool and the embedding cache"""
+        try:
+            if self.async_qdrant_client is not None:
+                await self.async_qdrant_client.close()
+            if self._async_http_client is not None:
+                await self._async_http_client.aclose()
+            if self.embedding_cache is not None:
+                await self.embedding_cache.close()
+            logger.info("RAG service connections closed")
+        except Exception as e:
+            logger.error(f"Error closing RAG service connections: {e}")
+
+    async def _get_hybrid_search_service(self) -> "HybridSearchService":
         """Get or create hybrid search service instance"""
         if self.hybrid_search_service is None:
             from .services.hybrid_search_service import get_hybrid_search_service
@@ -389,7 +774,7 @@ class RAGService:
             hybrid_service = await self._get_hybrid_search_service()
 
             # Execute hybrid search
-            hybrid_results = await hybrid_service.search(
+            response = await hybrid_service.search_with_diagnostics(
                 query=query,
                 user_permissions=user_permissions,
                 source_filter=source_filter,
@@ -397,6 +782,7 @@ class RAGService:
                 include_recency_boost=True,
                 query_type="hybrid"
             )
+            hybrid_results = response.results
 
             # Convert HybridSearchResult to SearchResult format
             search_results = []
@@ -416,7 +802,9 @@ class RAGService:
                         'semantic_score': result.semantic_score,
                         'keyword_score': result.keyword_score,
                         'combined_score': result.combined_score,
-                        'rank': result.rank
+                        'rank': result.rank,
+                        'search_degraded': response.degraded,
+                        'search_leg_timings_ms': response.leg_timings_ms
                     }
                 )
                 search_results.append(search_result)
@@ -485,6 +873,36 @@ class RAGService:
             # Fallback to semantic search
             return await self._search_with_semantic_only(query, top_k, source_filter, user_email)
 
+    async def semantic_search(
+        self,
+        query: str,
+        top_k: int,
+        source_filter: Optional[str] = None,
+        user_email: Optional[str] = None,
+        score_threshold: float = 0.3
+    ) -> List[SearchResult]:
+        """
+        Vector search only, raising on failure
+
+        Unlike search(), embedding and Qdrant errors propagate, so callers
+        that track failures themselves (hybrid search legs) can tell a
+        failed search from one without matches.
+
+        Args:
+            query: Search query string
+            top_k: Number of top results to return
+            source_filter: Optional filter for document source
+            user_email: User email for permission filtering
+            score_threshold: Minimum similarity score threshold
+
+        Returns:
+            List of search results filtered by user permissions
+        """
+        await self.ensure_collection_exists()
+        return await self._search_with_semantic_only(
+            query, top_k, source_filter, user_email, score_threshold
+        )
+
     async def _search_with_semantic_only(
         self,
         query: str,
@@ -495,7 +913,7 @@ class RAGService:
     ) -> List[SearchResult]:
         """Execute semantic search only with enhanced filtering"""
         # Embed the query
-        query_embedding = self.embed_query(query)
+        query_embedding = await self.get_query_embedding(query)
 
         # Build filter conditions
         filter_conditions = []
@@ -526,7 +944,8 @@ class RAGService:
             search_filter = Filter(must=filter_conditions)
 
         # Search in Qdrant
-        search_result = self.qdrant_client.search(
+        search_result = await self._qdrant(
+            "search",
             collection_name=self.collection_name,
             query_vector=query_embedding,
             query_filter=search_filter,
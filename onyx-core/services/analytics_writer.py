@@ -0,0 +1,320 @@
+"""
+Analytics Writer for ONYX Core
+
+Buffers analytics writes that don't need to happen inside a request:
+- memory_injection_logs rows
+- user_memories access_count / last_accessed_at increments
+- standing_instructions usage_count / last_used_at increments
+
+Events are queued in memory and flushed by a background task once the
+buffer reaches the batch size or the flush interval elapses. Log rows go out
+as one multi-row INSERT, and access increments are aggregated per id into a
+single UPDATE ... FROM (VALUES ...) per table. Analytics are best effort:
+when the buffer is full, new events are dropped and counted rather than
+blocking the request.
+"""
+
+import os
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from psycopg2.extras import execute_values
+
+from services.db_pool import SharedConnectionPool, get_shared_pool
+
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL_SECONDS = 2.0
+DEFAULT_MAX_BUFFER = 10000
+
+INSERT_INJECTION_LOGS_SQL = """
+    INSERT INTO memory_injection_logs (
+        user_id, conversation_id, memories_count, injection_type,
+        performance_ms, success, error_message, created_at
+    ) VALUES %s
+"""
+
+UPDATE_MEMORY_ACCESS_SQL = """
+    UPDATE user_memories AS m
+    SET access_count = m.access_count + v.hits,
+        last_accessed_at = GREATEST(COALESCE(m.last_accessed_at, v.seen_at), v.seen_at)
+    FROM (VALUES %s) AS v(id, hits, seen_at)
+    WHERE m.id = v.id::uuid
+"""
+
+UPDATE_INSTRUCTION_USAGE_SQL = """
+    UPDATE standing_instructions AS s
+    SET usage_count = s.usage_count + v.hits,
+        last_used_at = GREATEST(COALESCE(s.last_used_at, v.seen_at), v.seen_at)
+    FROM (VALUES %s) AS v(id, hits, seen_at)
+    WHERE s.id = v.id::uuid
+"""
+
+# Row values for the aggregated UPDATEs
+ACCESS_TEMPLATE = "(%s, %s, %s::timestamp)"
+
+
+class AnalyticsWriter:
+    """Background batching writer for memory analytics events"""
+
+    def __init__(
+        self,
+        pool: Optional[SharedConnectionPool] = None,
+        batch_size: Optional[int] = None,
+        flush_interval_seconds: Optional[float] = None,
+        max_buffer: Optional[int] = None,
+    ):
+        """
+        Initialize the analytics writer
+
+        Args:
+            pool: Connection pool to flush through (defaults to the shared pool)
+            batch_size: Buffered events that trigger an early flush
+            flush_interval_seconds: Maximum time an event waits before being flushed
+            max_buffer: Buffered events beyond which new events are dropped
+        """
+        self.pool = pool or get_shared_pool()
+        self.batch_size = batch_size if batch_size is not None else int(
+            os.getenv("ANALYTICS_FLUSH_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+        )
+        self.flush_interval_seconds = flush_interval_seconds if flush_interval_seconds is not None else float(
+            os.getenv("ANALYTICS_FLUSH_INTERVAL_SECONDS", DEFAULT_FLUSH_INTERVAL_SECONDS)
+        )
+        self.max_buffer = max_buffer if max_buffer is not None else int(
+            os.getenv("ANALYTICS_MAX_BUFFER", DEFAULT_MAX_BUFFER)
+        )
+
+        self._lock = threading.Lock()
+        self._injection_logs: List[Tuple[Any, ...]] = []
+        # id -> [hits, last seen]
+        self._memory_access: Dict[str, List[Any]] = {}
+        self._instruction_usage: Dict[str, List[Any]] = {}
+        self._pending = 0
+
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._stopping = False
+
+        self._stats = {
+            "events": 0,
+            "dropped": 0,
+            "flushes": 0,
+            "failed_flushes": 0,
+            "rows_written": 0,
+        }
+
+    # =========================================================================
+    # Event Recording
+    # =========================================================================
+
+    def record_injection(
+        self,
+        user_id: str,
+        conversation_id: str,
+        memories_count: int,
+        injection_type: str,
+        performance_ms: int,
+        success: bool,
+        error_message: Optional[str] = None,
+    ) -> None:
+        """
+        Queue a memory_injection_logs row
+
+        Args:
+            user_id: User UUID
+            conversation_id: Conversation UUID
+            memories_count: Memories plus instructions injected
+            injection_type: Injection type (e.g. "chat")
+            performance_ms: Injection time in milliseconds
+            success: Whether the injection succeeded
+            error_message: Error message for failed injections
+        """
+        row = (user_id, conversation_id, memories_count, injection_type,
+               performance_ms, success, error_message, datetime.utcnow())
+        with self._lock:
+            if not self._reserve(1):
+                return
+            self._injection_logs.append(row)
+        self._after_record()
+
+    def record_memory_access(self, memory_ids: Iterable[str]) -> None:
+        """
+        Queue access_count increments for memories
+
+        Args:
+            memory_ids: Memory UUIDs that were read or injected
+        """
+        self._record_hits(self._memory_access, memory_ids)
+
+    def record_instruction_usage(self, instruction_ids: Iterable[str]) -> None:
+        """
+        Queue usage_count increments for standing instructions
+
+        Args:
+            instruction_ids: Standing instruction UUIDs that were injected
+        """
+        self._record_hits(self._instruction_usage, instruction_ids)
+
+    def _record_hits(self, buffer: Dict[str, List[Any]], ids: Iterable[str]) -> None:
+        """Aggregate per-id hits into a buffer"""
+        ids = [str(item_id) for item_id in ids if item_id]
+        if not ids:
+            return
+
+        now = datetime.utcnow()
+        with self._lock:
+            if not self._reserve(len(ids)):
+                return
+            for item_id in ids:
+                entry = buffer.get(item_id)
+                if entry is None:
+                    buffer[item_id] = [1, now]
+                else:
+                    entry[0] += 1
+                    entry[1] = now
+        self._after_record()
+
+    def _reserve(self, count: int) -> bool:
+        """Account for new events (caller holds the lock); False when the buffer is full"""
+        if self._pending + count > self.max_buffer:
+            self._stats["dropped"] += count
+            logger.warning(f"Analytics buffer full, dropped {count} event(s)")
+            return False
+        self._pending += count
+        self._stats["events"] += count
+        return True
+
+    def _after_record(self) -> None:
+        """Start the flush task on first use and wake it when a batch is ready"""
+        self._ensure_started()
+        if self._wake is not None and self._pending >= self.batch_size:
+            self._wake.set()
+
+    # =========================================================================
+    # Background Flushing
+    # =========================================================================
+
+    def _ensure_started(self) -> None:
+        """Start the background flush task if a loop is running"""
+        if self._stopping or (self._task is not None and not self._task.done()):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop (e.g. scripts): events wait for an explicit flush()
+
+        self._wake = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    async def start(self) -> None:
+        """Start the background flush task"""
+        self._stopping = False
+        self._ensure_started()
+        logger.info(
+            f"Analytics writer started (batch size {self.batch_size}, "
+            f"interval {self.flush_interval_seconds}s)"
+        )
+
+    async def stop(self) -> None:
+        """Stop the flush task and drain everything still buffered"""
+        self._stopping = True
+        if self._task is not None:
+            self._wake.set()
+            try:
+                await self._task
+            except Exception as e:
+                logger.error(f"Analytics writer task failed: {e}")
+            self._task = None
+        await self.flush()
+        logger.info("Analytics writer stopped")
+
+    async def _run(self) -> None:
+        """Flush on size or time threshold until stopped"""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Write everything buffered so far
+
+        Returns:
+            Number of rows inserted or updated
+        """
+        with self._lock:
+            logs, self._injection_logs = self._injection_logs, []
+            memory_access, self._memory_access = self._memory_access, {}
+            instruction_usage, self._instruction_usage = self._instruction_usage, {}
+            self._pending = 0
+
+        if not (logs or memory_access or instruction_usage):
+            return 0
+
+        try:
+            # psycopg2 is blocking: keep the event loop free while the batch is written
+            rows = await asyncio.to_thread(self._write_batch, logs, memory_access, instruction_usage)
+            self._stats["flushes"] += 1
+            self._stats["rows_written"] += rows
+            return rows
+        except Exception as e:
+            self._stats["failed_flushes"] += 1
+            logger.error(
+                f"Failed to flush analytics ({len(logs)} logs, {len(memory_access)} memories, "
+                f"{len(instruction_usage)} instructions): {e}"
+            )
+            return 0
+
+    def _write_batch(
+        self,
+        logs: List[Tuple[Any, ...]],
+        memory_access: Dict[str, List[Any]],
+        instruction_usage: Dict[str, List[Any]],
+    ) -> int:
+        """Write one batch in a single transaction"""
+        rows = 0
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                if logs:
+                    execute_values(cur, INSERT_INJECTION_LOGS_SQL, logs, page_size=len(logs))
+                    rows += len(logs)
+                for sql, buffer in (
+                    (UPDATE_MEMORY_ACCESS_SQL, memory_access),
+                    (UPDATE_INSTRUCTION_USAGE_SQL, instruction_usage),
+                ):
+                    if buffer:
+                        # Sorted ids lock rows in the same order in every worker
+                        values = [(item_id, hits, seen_at) for item_id, (hits, seen_at) in sorted(buffer.items())]
+                        execute_values(cur, sql, values, template=ACCESS_TEMPLATE, page_size=len(values))
+                        rows += len(values)
+        return rows
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get writer statistics"""
+        with self._lock:
+            pending = self._pending
+        return {
+            **self._stats,
+            "pending": pending,
+            "running": self._task is not None and not self._task.done(),
+        }
+
+
+# Global analytics writer instance
+_analytics_writer = None
+
+
+def get_analytics_writer() -> AnalyticsWriter:
+    """Get or create the analytics writer"""
+    global _analytics_writer
+    if _analytics_writer is None:
+        _analytics_writer = AnalyticsWriter()
+    return _analytics_writer
@@ -0,0 +1,492 @@
+"""
+Batch Memory Extraction for ONYX Core
+
+Extracts memories from a large backlog of historical conversations (e.g.
+when onboarding an organization) instead of one conversation per call:
+
+- Conversations are streamed from PostgreSQL with a server-side cursor in
+  (created_at, id) order, so memory use does not grow with the backlog
+- Short conversations are packed into one LLM prompt up to a token budget
+- A bounded number of prompts run concurrently
+- Memories of a pack are checked against the user's existing memories with
+  one near-duplicate query and stored with one multi-row INSERT
+- A checkpoint records the last conversation of the longest run of
+  completed packs; rerunning a job resumes after it
+
+Packs finishing out of order never move the checkpoint past an unfinished
+or failed pack. Conversations reprocessed after a crash are caught by the
+near-duplicate check instead of being stored twice.
+
+    python -m services.batch_memory_extraction --job-id onboarding-acme
+"""
+
+import os
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+from psycopg2.extras import Json, execute_values
+
+from services.db_pool import get_shared_pool
+from services.memory_dedup import jaccard_similarity, lsh_bands
+from services.memory_generation import bump_memory_generation
+from services.memory_vector_index import get_memory_vector_index
+
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_CONCURRENCY = 4
+DEFAULT_PROMPT_TOKEN_BUDGET = 6000
+DEFAULT_FETCH_SIZE = 200
+MAX_CONVERSATIONS_PER_PROMPT = 8
+CHARS_PER_TOKEN = 4  # Same estimate as ChatContextBuilder._estimate_tokens
+DUPLICATE_SIMILARITY_THRESHOLD = 0.8
+
+# Conversations after a (created_at, id) position, each with its messages as one JSON array
+CONVERSATIONS_SQL = """
+    SELECT c.id, c.user_id, c.created_at, m.messages
+    FROM conversations c
+    CROSS JOIN LATERAL (
+        SELECT json_agg(
+            json_build_object('id', id, 'role', role, 'content', content)
+            ORDER BY created_at
+        ) AS messages
+        FROM messages
+        WHERE conversation_id = c.id AND role IN ('user', 'assistant')
+    ) m
+    WHERE m.messages IS NOT NULL
+      AND (c.created_at, c.id) > (%s, %s)
+      {user_filter}
+    ORDER BY c.created_at, c.id
+"""
+
+INSERT_MEMORIES_SQL = """
+    INSERT INTO user_memories
+    (user_id, fact, category, confidence, source_type, source_message_id,
+     conversation_id, metadata, lsh_bands)
+    VALUES %s
+    RETURNING id, user_id, fact, category, confidence, source_type
+"""
+INSERT_MEMORIES_TEMPLATE = "(%s, %s, %s, %s, %s, %s, %s, %s, %s::bigint[])"
+
+LOAD_CHECKPOINT_SQL = """
+    SELECT last_created_at, last_conversation_id
+    FROM memory_extraction_checkpoints
+    WHERE job_id = %s
+"""
+
+SAVE_CHECKPOINT_SQL = """
+    INSERT INTO memory_extraction_checkpoints
+    (job_id, last_created_at, last_conversation_id, conversations_processed, memories_stored)
+    VALUES (%s, %s, %s, %s, %s)
+    ON CONFLICT (job_id) DO UPDATE SET
+        last_created_at = EXCLUDED.last_created_at,
+        last_conversation_id = EXCLUDED.last_conversation_id,
+        conversations_processed = memory_extraction_checkpoints.conversations_processed
+            + EXCLUDED.conversations_processed,
+        memories_stored = memory_extraction_checkpoints.memories_stored + EXCLUDED.memories_stored,
+        updated_at = NOW()
+"""
+
+# Position before every conversation
+START_POSITION = (datetime.min, "00000000-0000-0000-0000-000000000000")
+
+
+@dataclass
+class ConversationRecord:
+    """A conversation streamed for extraction"""
+    conversation_id: str
+    user_id: str
+    created_at: datetime
+    messages: List[Dict[str, Any]]
+    estimated_tokens: int = 0
+
+    @property
+    def position(self) -> Tuple[datetime, str]:
+        """Stream position (the checkpoint key)"""
+        return (self.created_at, self.conversation_id)
+
+
+@dataclass
+class ConversationPack:
+    """Conversations sent to the LLM in one prompt"""
+    sequence: int
+    conversations: List[ConversationRecord] = field(default_factory=list)
+    estimated_tokens: int = 0
+
+    @property
+    def last_position(self) -> Tuple[datetime, str]:
+        """Stream position of the pack's last conversation"""
+        return self.conversations[-1].position
+
+
+@dataclass
+class BatchExtractionResult:
+    """Outcome of a batch extraction run"""
+    job_id: str
+    conversations_processed: int = 0
+    prompts: int = 0
+    failed_prompts: int = 0
+    memories_extracted: int = 0
+    memories_stored: int = 0
+    duplicates_skipped: int = 0
+    checkpoint: Optional[Tuple[datetime, str]] = None
+    duration_seconds: float = 0.0
+
+
+def estimate_tokens(messages: List[Dict[str, Any]]) -> int:
+    """Rough prompt size of a conversation"""
+    return sum(len(message.get('content') or '') for message in messages) // CHARS_PER_TOKEN + len(messages)
+
+
+def fit_to_budget(messages: List[Dict[str, Any]], token_budget: int) -> List[Dict[str, Any]]:
+    """Keep the most recent messages that fit a token budget"""
+    kept = []
+    tokens = 0
+    for message in reversed(messages):
+        tokens += estimate_tokens([message])
+        if kept and tokens > token_budget:
+            break
+        kept.append(message)
+    return list(reversed(kept))
+
+
+class BatchMemoryExtractor:
+    """Streaming, packed and checkpointed memory extraction over many conversations"""
+
+    def __init__(
+        self,
+        extractor: Any = None,
+        pool: Any = None,
+        concurrency: Optional[int] = None,
+        token_budget: Optional[int] = None,
+        fetch_size: int = DEFAULT_FETCH_SIZE
+    ):
+        """
+        Initialize the batch extractor
+
+        Args:
+            extractor: Object with async extract_memories_batch(conversations)
+                (defaults to the MemoryExtractionService)
+            pool: Shared psycopg2 pool (defaults to get_shared_pool())
+            concurrency: Prompts in flight at once
+            token_budget: Estimated tokens of conversation text per prompt
+            fetch_size: Conversations fetched per cursor round trip
+        """
+        self.extractor = extractor
+        self.pool = pool or get_shared_pool()
+        self.concurrency = concurrency or int(os.getenv("MEMORY_BATCH_CONCURRENCY", str(DEFAULT_CONCURRENCY)))
+        self.token_budget = token_budget or int(
+            os.getenv("MEMORY_BATCH_PROMPT_TOKENS", str(DEFAULT_PROMPT_TOKEN_BUDGET))
+        )
+        self.fetch_size = fetch_size
+
+    async def _ensure_extractor(self) -> None:
+        """Use the shared extraction service unless one was injected"""
+        if self.extractor is None:
+            from services.memory_extraction_service import get_memory_extraction_service
+            self.extractor = await get_memory_extraction_service()
+
+    # =========================================================================
+    # Run
+    # =========================================================================
+
+    async def run(self, job_id: str, user_id: Optional[str] = None) -> BatchExtractionResult:
+        """
+        Extract memories from every conversation after the job's checkpoint
+
+        Args:
+            job_id: Checkpoint name; rerunning a job resumes where it stopped
+            user_id: Only process this user's conversations
+
+        Returns:
+            BatchExtractionResult for this run
+        """
+        await self._ensure_extractor()
+        start = time.time()
+        result = BatchExtractionResult(job_id=job_id)
+        result.checkpoint = await asyncio.to_thread(self._load_checkpoint, job_id)
+        logger.info(f"Batch memory extraction {job_id} starting after {result.checkpoint or 'the beginning'}")
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        # Finished packs by sequence: (last position, conversations, memories stored), None if failed
+        completed: Dict[int, Optional[Tuple[Tuple[datetime, str], int, int]]] = {}
+        next_to_commit = 0
+        held = False
+        commit_lock = asyncio.Lock()
+
+        async def commit_completed() -> None:
+            """Advance the checkpoint over the contiguous run of finished packs"""
+            nonlocal next_to_commit, held
+            async with commit_lock:
+                position, processed, stored = None, 0, 0
+                while not held and next_to_commit in completed:
+                    outcome = completed.pop(next_to_commit)
+                    if outcome is None:
+                        # Failed pack: hold the checkpoint so a rerun retries from here
+                        held = True
+                        break
+                    position = outcome[0]
+                    processed += outcome[1]
+                    stored += outcome[2]
+                    next_to_commit += 1
+                if held:
+                    completed.clear()
+                if position is not None:
+                    await asyncio.to_thread(self._save_checkpoint, job_id, position, processed, stored)
+                    result.checkpoint = position
+
+        async def worker() -> None:
+            while True:
+                pack = await queue.get()
+                try:
+                    if pack is None:
+                        return
+                    try:
+                        stored = await self._process_pack(pack, result)
+                    except Exception as e:
+                        logger.error(f"Pack {pack.sequence} failed: {e}")
+                        stored = None
+                    if stored is None:
+                        completed[pack.sequence] = None
+                    else:
+                        completed[pack.sequence] = (pack.last_position, len(pack.conversations), stored)
+                    await commit_completed()
+                except Exception as e:
+                    logger.error(f"Failed to checkpoint batch memory extraction {job_id}: {e}")
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            async for pack in self._packs(result.checkpoint or START_POSITION, user_id):
+                await queue.put(pack)
+        finally:
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        result.duration_seconds = time.time() - start
+        logger.info(
+            f"Batch memory extraction {job_id} finished: {result.conversations_processed} conversations, "
+            f"{result.prompts} prompts ({result.failed_prompts} failed), {result.memories_stored} memories "
+            f"stored, {result.duplicates_skipped} duplicates skipped in {result.duration_seconds:.1f}s"
+        )
+        return result
+
+    async def _packs(self, after: Tuple[datetime, str], user_id: Optional[str]):
+        """Stream conversations and group them into prompt-sized packs"""
+        pack = ConversationPack(sequence=0)
+        async for conversation in self._stream_conversations(after, user_id):
+            if pack.conversations and (
+                pack.estimated_tokens + conversation.estimated_tokens > self.token_budget
+                or len(pack.conversations) >= MAX_CONVERSATIONS_PER_PROMPT
+            ):
+                yield pack
+                pack = ConversationPack(sequence=pack.sequence + 1)
+            pack.conversations.append(conversation)
+            pack.estimated_tokens += conversation.estimated_tokens
+        if pack.conversations:
+            yield pack
+
+    async def _stream_conversations(self, after: Tuple[datetime, str], user_id: Optional[str]):
+        """Yield conversations after a position using a server-side cursor"""
+        conn = await asyncio.to_thread(self.pool.getconn)
+        try:
+            cursor = conn.cursor(name=f"memory_batch_{os.getpid()}_{id(self)}")
+            cursor.itersize = self.fetch_size
+            params: List[Any] = [after[0], after[1]]
+            user_filter = ""
+            if user_id:
+                user_filter = "AND c.user_id = %s"
+                params.append(user_id)
+            await asyncio.to_thread(cursor.execute, CONVERSATIONS_SQL.format(user_filter=user_filter), params)
+
+            while True:
+                rows = await asyncio.to_thread(cursor.fetchmany, self.fetch_size)
+                if not rows:
+                    break
+                for conversation_id, owner_id, created_at, messages in rows:
+                    messages = fit_to_budget(messages, self.token_budget)
+                    yield ConversationRecord(
+                        conversation_id=str(conversation_id),
+                        user_id=str(owner_id),
+                        created_at=created_at,
+                        messages=messages,
+                        estimated_tokens=estimate_tokens(messages),
+                    )
+            cursor.close()
+        finally:
+            conn.close()
+
+    # =========================================================================
+    # Extraction and storage
+    # =========================================================================
+
+    async def _process_pack(self, pack: ConversationPack, result: BatchExtractionResult) -> Optional[int]:
+        """Extract and store one pack; returns memories stored, or None on failure"""
+        result.prompts += 1
+        extracted = await self.extractor.extract_memories_batch(pack.conversations)
+        if extracted is None:
+            result.failed_prompts += 1
+            logger.warning(
+                f"Pack {pack.sequence} ({len(pack.conversations)} conversations) failed; "
+                "checkpoint held for retry"
+            )
+            return None
+
+        rows = []
+        for conversation in pack.conversations:
+            for memory in extracted.get(conversation.conversation_id, []):
+                rows.append((conversation, memory))
+        result.memories_extracted += len(rows)
+
+        try:
+            stored, duplicates = await asyncio.to_thread(self._store_memories, rows)
+        except Exception as e:
+            result.failed_prompts += 1
+            logger.error(f"Failed to store memories of pack {pack.sequence}: {e}")
+            return None
+
+        for user_id in {memory['user_id'] for memory in stored}:
+            await bump_memory_generation(user_id)
+        vector_index = get_memory_vector_index()
+        for memory in stored:
+            vector_index.index_in_background(memory)
+
+        result.conversations_processed += len(pack.conversations)
+        result.memories_stored += len(stored)
+        result.duplicates_skipped += duplicates
+        return len(stored)
+
+    def _store_memories(self, rows: List[Tuple[ConversationRecord, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Bulk insert a pack's memories, skipping near-duplicates
+
+        Args:
+            rows: (conversation, ExtractedMemory) pairs
+
+        Returns:
+            (stored memory dicts, number of duplicates skipped)
+        """
+        if not rows:
+            return [], 0
+
+        from services.memory_service import get_memory_service
+        mask_pii = get_memory_service()._detect_and_mask_pii
+        extraction_time = datetime.utcnow().isoformat()
+
+        candidates = []
+        for conversation, memory in rows:
+            fact, _ = mask_pii(memory.fact)
+            if fact.strip():
+                candidates.append((conversation, memory, fact, lsh_bands(fact)))
+
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                existing = self._find_existing(cur, candidates)
+
+                values = []
+                kept: Dict[str, List[str]] = {}
+                for conversation, memory, fact, bands in candidates:
+                    seen = existing.get(conversation.user_id, []) + kept.get(conversation.user_id, [])
+                    if any(jaccard_similarity(fact, other) >= DUPLICATE_SIMILARITY_THRESHOLD for other in seen):
+                        continue
+                    kept.setdefault(conversation.user_id, []).append(fact)
+                    category = memory.category.value if isinstance(memory.category, Enum) else memory.category
+                    values.append((
+                        conversation.user_id,
+                        fact,
+                        category,
+                        memory.confidence,
+                        'extracted_from_chat',
+                        memory.source_message_id,
+                        conversation.conversation_id,
+                        Json({
+                            'extraction_method': memory.extraction_method,
+                            'extraction_time': extraction_time,
+                            'evidence': memory.evidence,
+                            'batch': True,
+                            **memory.metadata
+                        }),
+                        bands,
+                    ))
+
+                stored = []
+                if values:
+                    columns = ['id', 'user_id', 'fact', 'category', 'confidence', 'source_type']
+                    inserted = execute_values(
+                        cur, INSERT_MEMORIES_SQL, values, template=INSERT_MEMORIES_TEMPLATE, fetch=True
+                    )
+                    stored = [
+                        {key: str(value) if key in ('id', 'user_id') else value for key, value in zip(columns, row)}
+                        for row in inserted
+                    ]
+
+        return stored, len(candidates) - len(values)
+
+    def _find_existing(self, cur, candidates: List[Tuple[Any, Any, str, List[int]]]) -> Dict[str, List[str]]:
+        """Existing facts sharing an LSH band with any candidate, by user (one query)"""
+        user_ids = sorted({conversation.user_id for conversation, _, _, _ in candidates})
+        bands = sorted({band for _, _, _, fact_bands in candidates for band in fact_bands})
+        if not user_ids or not bands:
+            return {}
+
+        cur.execute(
+            """
+            SELECT user_id, fact
+            FROM user_memories
+            WHERE user_id = ANY(%s::uuid[])
+              AND is_deleted = FALSE
+              AND lsh_bands && %s::bigint[]
+            """,
+            (user_ids, bands)
+        )
+        existing: Dict[str, List[str]] = {}
+        for owner_id, fact in cur.fetchall():
+            existing.setdefault(str(owner_id), []).append(fact)
+        return existing
+
+    # =========================================================================
+    # Checkpoints
+    # =========================================================================
+
+    def _load_checkpoint(self, job_id: str) -> Optional[Tuple[datetime, str]]:
+        """Last committed stream position of a job"""
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(LOAD_CHECKPOINT_SQL, (job_id,))
+                row = cur.fetchone()
+        return (row[0], str(row[1])) if row else None
+
+    def _save_checkpoint(
+        self,
+        job_id: str,
+        position: Tuple[datetime, str],
+        conversations_processed: int,
+        memories_stored: int
+    ) -> None:
+        """Record the stream position every earlier conversation has been processed up to"""
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    SAVE_CHECKPOINT_SQL,
+                    (job_id, position[0], position[1], conversations_processed, memories_stored)
+                )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Extract memories from historical conversations")
+    parser.add_argument("--job-id", required=True, help="Checkpoint name (rerun to resume)")
+    parser.add_argument("--user-id", help="Only process this user's conversations")
+    parser.add_argument("--concurrency", type=int, help="Prompts in flight at once")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(BatchMemoryExtractor(concurrency=args.concurrency).run(args.job_id, user_id=args.user_id))
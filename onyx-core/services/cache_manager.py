@@ -132,6 +132,39 @@ class CacheManager:
             logger.error(f"Cache exists check error for key {key}: {e}")
             return False
 
+    async def increment(self, key: str) -> Optional[int]:
+        """
+        Atomically increment an integer counter.
+
+        Args:
+            key: Counter key (created at 0 if missing)
+
+        Returns:
+            New counter value, None on error
+        """
+        try:
+            return int(await self.redis.incr(key))
+        except Exception as e:
+            logger.error(f"Cache increment error for key {key}: {e}")
+            return None
+
+    async def get_counter(self, key: str) -> Optional[int]:
+        """
+        Get an integer counter value.
+
+        Args:
+            key: Counter key
+
+        Returns:
+            Counter value, 0 if the key doesn't exist, None on error
+        """
+        try:
+            value = await self.redis.get(key)
+            return int(value) if value is not None else 0
+        except Exception as e:
+            logger.error(f"Cache counter get error for key {key}: {e}")
+            return None
+
     async def get_ttl(self, key: str) -> Optional[int]:
         """
         Get remaining TTL for a key.
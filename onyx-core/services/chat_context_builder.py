@@ -13,6 +13,7 @@ import logging
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 
+from .analytics_writer import get_analytics_writer
 from .memory_injection_service import get_memory_injection_service
 from .memory_service import get_memory_service
 
@@ -247,40 +248,11 @@ class ChatContextBuilder:
         user_id: str,
         memory_injection
     ):
-        """Track memory usage for analytics"""
+        """Track memory usage for analytics (buffered, written in the background)"""
         try:
-            # Update usage counts for injected memories
-            memory_ids = [memory['id'] for memory in memory_injection.memories]
-            if memory_ids:
-                conn = self.memory_injection_service._get_connection()
-                with conn.cursor() as cur:
-                    cur.execute(
-                        """
-                        UPDATE user_memories
-                        SET access_count = access_count + 1,
-                            last_accessed_at = NOW()
-                        WHERE id = ANY(%s)
-                        """,
-                        (memory_ids,)
-                    )
-                    conn.commit()
-
-            # Update instruction usage
-            instruction_ids = [inst['id'] for inst in memory_injection.standing_instructions]
-            if instruction_ids:
-                conn = self.memory_injection_service._get_connection()
-                with conn.cursor() as cur:
-                    cur.execute(
-                        """
-                        UPDATE standing_instructions
-                        SET usage_count = usage_count + 1,
-                            last_used_at = NOW()
-                        WHERE id = ANY(%s)
-                        """,
-                        (instruction_ids,)
-                    )
-                    conn.commit()
-
+            analytics = get_analytics_writer()
+            analytics.record_memory_access(memory['id'] for memory in memory_injection.memories)
+            analytics.record_instruction_usage(inst['id'] for inst in memory_injection.standing_instructions)
         except Exception as e:
             logger.error(f"Failed to track memory usage: {e}")
 
@@ -15,10 +15,11 @@ import asyncio
 from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 import logging
-import psycopg2
 from psycopg2.extras import RealDictCursor
 from dataclasses import dataclass
 
+from services.db_pool import get_shared_pool
+
 logger = logging.getLogger(__name__)
 
 
@@ -57,25 +58,16 @@ class ConversationSummarizer:
 
     def __init__(self):
         """Initialize conversation summarizer"""
-        self.connection_string = self._build_connection_string()
+        self.db_pool = get_shared_pool()
         self.litellm_proxy_url = os.getenv("LITELLM_PROXY_URL", "http://litellm-proxy:4000")
         self.default_model = os.getenv("DEEPSEEK_MODEL", "deepseek-main")
         self.request_timeout = int(os.getenv("SUMMARIZATION_TIMEOUT_SECONDS", "30"))
         self.max_retries = int(os.getenv("SUMMARIZATION_MAX_RETRIES", "3"))
         self.retry_delay = int(os.getenv("SUMMARIZATION_RETRY_DELAY_MS", "1000"))
 
-    def _build_connection_string(self) -> str:
-        """Build PostgreSQL connection string"""
-        host = os.getenv("POSTGRES_HOST", "localhost")
-        port = os.getenv("POSTGRES_PORT", "5432")
-        database = os.getenv("POSTGRES_DB", "manus")
-        user = os.getenv("POSTGRES_USER", "manus")
-        password = os.getenv("POSTGRES_PASSWORD", "")
-        return f"host={host} port={port} dbname={database} user={user} password={password}"
-
-    def _get_connection(self):
-        """Get database connection"""
-        return psycopg2.connect(self.connection_string)
+    async def _get_connection(self):
+        """Check out a pooled database connection off the event loop (close() returns it to the pool)"""
+        return await self.db_pool.agetconn()
 
     # =========================================================================
     # Core Summarization Methods
@@ -484,7 +476,7 @@ Provide only the JSON array, no explanation."""
     ) -> List[Dict[str, Any]]:
         """Fetch messages within specified range"""
         try:
-            conn = self._get_connection()
+            conn = await self._get_connection()
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute(
                     """
@@ -538,7 +530,7 @@ Provide only the JSON array, no explanation."""
     async def get_service_metrics(self) -> Dict[str, Any]:
         """Get summarizer performance metrics"""
         try:
-            conn = self._get_connection()
+            conn = await self._get_connection()
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute(
                     """
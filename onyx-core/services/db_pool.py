@@ -0,0 +1,638 @@
+"""
+Database Pool Module
+
+Pooled PostgreSQL access shared by the memory services:
+- InstrumentedPool: asyncpg pool wrapper used by async-native services
+  (MemoryService). Tracks saturation and acquire wait times.
+- SharedConnectionPool: bounded psycopg2 pool shared by the cursor-based
+  services (memory injection, summarization). Checkouts wait up to
+  acquire_timeout when the pool is exhausted; async code checks out with
+  agetconn() so that wait happens off the event loop, and a plain getconn()
+  on the event-loop thread fails fast instead. Connections are health checked
+  on checkout, reset on return, and connections that are never returned are
+  reported and reclaimed (leak detection).
+
+Both export saturation and acquire latency to Prometheus.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import threading
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+from urllib.parse import quote
+
+import asyncpg
+import psycopg2
+import psycopg2.extensions
+import psycopg2.pool
+
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_POOL_MIN_SIZE = 2
+DEFAULT_POOL_MAX_SIZE = 10
+DEFAULT_STATEMENT_CACHE_SIZE = 100  # asyncpg default; 0 disables (needed behind pgbouncer)
+DEFAULT_STATEMENT_LIFETIME_SECONDS = 300
+DEFAULT_COMMAND_TIMEOUT_SECONDS = 5.0
+DEFAULT_ACQUIRE_TIMEOUT_SECONDS = 5.0
+DEFAULT_LEAK_THRESHOLD_SECONDS = 30.0  # Checkouts held longer than this are reported
+POOL_WAIT_POLL_SECONDS = 0.1  # Waiters re-check for reclaimable leaked connections this often
+HEALTH_CHECK_IDLE_SECONDS = 30.0  # Ping connections idle longer than this before reuse
+
+
+@dataclass
+class PoolConfig:
+    """Connection pool sizing and prepared statement cache settings"""
+
+    min_size: int = DEFAULT_POOL_MIN_SIZE
+    max_size: int = DEFAULT_POOL_MAX_SIZE
+    statement_cache_size: int = DEFAULT_STATEMENT_CACHE_SIZE
+    max_cached_statement_lifetime: int = DEFAULT_STATEMENT_LIFETIME_SECONDS
+    command_timeout: float = DEFAULT_COMMAND_TIMEOUT_SECONDS
+    acquire_timeout: float = DEFAULT_ACQUIRE_TIMEOUT_SECONDS
+
+    @classmethod
+    def from_env(cls, prefix: str) -> "PoolConfig":
+        """
+        Load pool settings from environment variables
+
+        Args:
+            prefix: Variable prefix, e.g. "MEMORY_DB" reads MEMORY_DB_POOL_MIN_SIZE
+
+        Returns:
+            PoolConfig with environment overrides applied
+        """
+        return cls(
+            min_size=int(os.getenv(f"{prefix}_POOL_MIN_SIZE", DEFAULT_POOL_MIN_SIZE)),
+            max_size=int(os.getenv(f"{prefix}_POOL_MAX_SIZE", DEFAULT_POOL_MAX_SIZE)),
+            statement_cache_size=int(os.getenv(f"{prefix}_STATEMENT_CACHE_SIZE", DEFAULT_STATEMENT_CACHE_SIZE)),
+            max_cached_statement_lifetime=int(
+                os.getenv(f"{prefix}_STATEMENT_LIFETIME_SECONDS", DEFAULT_STATEMENT_LIFETIME_SECONDS)
+            ),
+            command_timeout=float(os.getenv(f"{prefix}_COMMAND_TIMEOUT_SECONDS", DEFAULT_COMMAND_TIMEOUT_SECONDS)),
+            acquire_timeout=float(os.getenv(f"{prefix}_ACQUIRE_TIMEOUT_SECONDS", DEFAULT_ACQUIRE_TIMEOUT_SECONDS)),
+        )
+
+
+def build_postgres_dsn() -> str:
+    """Build a PostgreSQL DSN from the POSTGRES_* variables used by the memory services"""
+    host = os.getenv("POSTGRES_HOST", "localhost")
+    port = os.getenv("POSTGRES_PORT", "5432")
+    database = os.getenv("POSTGRES_DB", "manus")
+    user = os.getenv("POSTGRES_USER", "manus")
+    password = os.getenv("POSTGRES_PASSWORD", "")
+    return f"postgresql://{quote(user, safe='')}:{quote(password, safe='')}@{host}:{port}/{database}"
+
+
+async def init_json_codecs(conn: asyncpg.Connection) -> None:
+    """Encode/decode json and jsonb columns as Python objects (like psycopg2's Json adapter)"""
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(
+            type_name, encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
+        )
+
+
+class InstrumentedPool:
+    """asyncpg pool wrapper that tracks saturation and acquire latency"""
+
+    def __init__(
+        self,
+        name: str,
+        dsn: str,
+        config: Optional[PoolConfig] = None,
+        init: Optional[Callable[[asyncpg.Connection], Awaitable[None]]] = None,
+    ):
+        """
+        Initialize the pool wrapper (the pool itself is created lazily)
+
+        Args:
+            name: Pool name used as application_name suffix and metrics label
+            dsn: PostgreSQL DSN
+            config: Pool configuration (defaults to PoolConfig())
+            init: Optional per-connection initializer (e.g. type codecs)
+        """
+        self.name = name
+        self.dsn = dsn
+        self.config = config or PoolConfig()
+        self.init = init
+        self.pool: Optional[asyncpg.Pool] = None
+        self._init_lock = asyncio.Lock()
+
+        self._in_use = 0
+        self._stats = {
+            'acquisitions': 0,
+            'waits': 0,  # Acquisitions that found no idle connection
+            'acquire_timeouts': 0,
+            'total_acquire_ms': 0.0,
+            'max_acquire_ms': 0.0,
+            'peak_in_use': 0,
+        }
+
+    async def initialize(self) -> None:
+        """Create the underlying asyncpg pool (idempotent)"""
+        if self.pool is not None:
+            return
+
+        async with self._init_lock:
+            if self.pool is not None:
+                return
+            self.pool = await asyncpg.create_pool(
+                self.dsn,
+                min_size=self.config.min_size,
+                max_size=self.config.max_size,
+                statement_cache_size=self.config.statement_cache_size,
+                max_cached_statement_lifetime=self.config.max_cached_statement_lifetime,
+                command_timeout=self.config.command_timeout,
+                init=self.init,
+                server_settings={'application_name': f'onyx-{self.name}'}
+            )
+            logger.info(
+                f"Database pool '{self.name}' initialized "
+                f"(min={self.config.min_size}, max={self.config.max_size}, "
+                f"statement_cache={self.config.statement_cache_size})"
+            )
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[asyncpg.Connection]:
+        """
+        Acquire a connection, recording wait time and saturation
+
+        Raises:
+            asyncio.TimeoutError: If no connection frees up within acquire_timeout
+        """
+        await self.initialize()
+
+        waited = self.pool.get_idle_size() == 0 and self.pool.get_size() >= self.config.max_size
+        start = time.perf_counter()
+        try:
+            conn = await self.pool.acquire(timeout=self.config.acquire_timeout)
+        except asyncio.TimeoutError:
+            self._stats['acquire_timeouts'] += 1
+            logger.warning(
+                f"Database pool '{self.name}' exhausted: no connection within "
+                f"{self.config.acquire_timeout}s ({self._in_use}/{self.config.max_size} in use)"
+            )
+            raise
+        wait_ms = (time.perf_counter() - start) * 1000
+
+        self._in_use += 1
+        self._record_acquire(wait_ms, waited)
+        try:
+            yield conn
+        finally:
+            self._in_use -= 1
+            await self.pool.release(conn)
+            self._publish_metrics()
+
+    def _record_acquire(self, wait_ms: float, waited: bool) -> None:
+        """Update acquire statistics and metrics"""
+        self._stats['acquisitions'] += 1
+        self._stats['total_acquire_ms'] += wait_ms
+        self._stats['max_acquire_ms'] = max(self._stats['max_acquire_ms'], wait_ms)
+        self._stats['peak_in_use'] = max(self._stats['peak_in_use'], self._in_use)
+        if waited:
+            self._stats['waits'] += 1
+
+        try:
+            from metrics import record_db_pool_acquire
+            record_db_pool_acquire(self.name, wait_ms / 1000.0)
+        except Exception:
+            pass
+        self._publish_metrics()
+
+    def _publish_metrics(self) -> None:
+        """Export current in-use count and saturation"""
+        try:
+            from metrics import set_db_pool_usage
+            set_db_pool_usage(self.name, self._in_use, self.config.max_size)
+        except Exception:
+            pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool saturation and acquire latency statistics"""
+        acquisitions = self._stats['acquisitions']
+        return {
+            "name": self.name,
+            "initialized": self.pool is not None,
+            "size": self.pool.get_size() if self.pool else 0,
+            "idle": self.pool.get_idle_size() if self.pool else 0,
+            "in_use": self._in_use,
+            "min_size": self.config.min_size,
+            "max_size": self.config.max_size,
+            "saturation": round(self._in_use / self.config.max_size, 4) if self.config.max_size else 0.0,
+            "peak_in_use": self._stats['peak_in_use'],
+            "statement_cache_size": self.config.statement_cache_size,
+            "acquisitions": acquisitions,
+            "waits": self._stats['waits'],
+            "acquire_timeouts": self._stats['acquire_timeouts'],
+            "avg_acquire_ms": round(self._stats['total_acquire_ms'] / acquisitions, 3) if acquisitions else 0.0,
+            "max_acquire_ms": round(self._stats['max_acquire_ms'], 3),
+        }
+
+    async def close(self) -> None:
+        """Close the underlying pool"""
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+            logger.info(f"Database pool '{self.name}' closed")
+
+
+def _on_event_loop() -> bool:
+    """True when the calling thread is running an asyncio event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class PooledConnection:
+    """
+    psycopg2 connection proxy handed out by SharedConnectionPool
+
+    close() returns the connection to the pool instead of closing it, so
+    existing `conn = await _get_connection() ... finally: conn.close()` code is
+    pooled without changes. Used as a context manager it commits on success,
+    rolls back on error, and returns the connection.
+    """
+
+    def __init__(self, pool: "SharedConnectionPool", conn, owner: str):
+        self._pool = pool
+        self._conn = conn
+        self._owner = owner
+        self._checked_out_at = time.monotonic()
+        self._released = False
+
+    def __getattr__(self, name: str):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name: str, value: Any):
+        # Settings such as autocommit apply to the underlying connection
+        if name.startswith('_'):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._conn, name, value)
+
+    @property
+    def closed(self) -> int:
+        """Closed from the caller's point of view once returned to the pool"""
+        return 1 if self._released else self._conn.closed
+
+    @property
+    def held_seconds(self) -> float:
+        """Time since checkout"""
+        return time.monotonic() - self._checked_out_at
+
+    def close(self) -> None:
+        """Return the connection to the pool"""
+        if not self._released:
+            self._released = True
+            self._pool._release(self)
+
+    def __enter__(self) -> "PooledConnection":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        try:
+            if not self._released and not self._conn.closed:
+                if exc_type is None:
+                    self._conn.commit()
+                else:
+                    self._conn.rollback()
+        finally:
+            self.close()
+
+    def __del__(self):
+        # Garbage collected without close(): a leak. Hand the raw connection back
+        # for reclamation on the next checkout (never touch the pool lock here).
+        if not self.__dict__.get('_released', True):
+            self._released = True
+            self._pool._report_leak(self._conn, self._owner, self.held_seconds)
+
+
+class SharedConnectionPool:
+    """Bounded, health-checked psycopg2 pool with leak detection"""
+
+    def __init__(
+        self,
+        name: str,
+        dsn: str,
+        config: Optional[PoolConfig] = None,
+        leak_threshold_seconds: float = DEFAULT_LEAK_THRESHOLD_SECONDS,
+    ):
+        """
+        Initialize the pool (connections are opened lazily)
+
+        Args:
+            name: Pool name used for application_name and metrics
+            dsn: PostgreSQL DSN
+            config: Pool sizing (min_size/max_size/command_timeout/acquire_timeout are used)
+            leak_threshold_seconds: Checkouts held longer than this are reported as leaks
+        """
+        self.name = name
+        self.dsn = dsn
+        self.config = config or PoolConfig()
+        self.leak_threshold_seconds = leak_threshold_seconds
+        self.pool: Optional[psycopg2.pool.ThreadedConnectionPool] = None
+
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)  # Notified whenever a connection is returned
+        self._checked_out: "weakref.WeakValueDictionary[int, PooledConnection]" = weakref.WeakValueDictionary()
+        self._leaked = deque()  # Raw connections from garbage-collected checkouts
+        self._last_used: Dict[int, float] = {}
+        self._in_use = 0
+        self._stats = {
+            'acquisitions': 0,
+            'waits': 0,  # Checkouts that found every connection in use
+            'exhausted': 0,
+            'leaks': 0,
+            'slow_returns': 0,
+            'discarded': 0,
+            'total_acquire_ms': 0.0,
+            'max_acquire_ms': 0.0,
+            'peak_in_use': 0,
+        }
+
+    def _ensure_pool(self) -> psycopg2.pool.ThreadedConnectionPool:
+        """Create the underlying pool on first use"""
+        if self.pool is None:
+            with self._lock:
+                if self.pool is None:
+                    options = f"-c statement_timeout={int(self.config.command_timeout * 1000)}"
+                    self.pool = psycopg2.pool.ThreadedConnectionPool(
+                        self.config.min_size,
+                        self.config.max_size,
+                        self.dsn,
+                        application_name=f"onyx-{self.name}",
+                        options=options
+                    )
+                    logger.info(
+                        f"Shared database pool '{self.name}' initialized "
+                        f"(min={self.config.min_size}, max={self.config.max_size})"
+                    )
+        return self.pool
+
+    def getconn(self) -> PooledConnection:
+        """
+        Check out a healthy connection
+
+        When all max_size connections are checked out, the calling thread
+        waits up to acquire_timeout for one to be returned. On an event-loop
+        thread it raises immediately instead of blocking the loop; async code
+        should use agetconn().
+
+        Returns:
+            PooledConnection (call close() to return it)
+
+        Raises:
+            psycopg2.pool.PoolError: If no connection frees up within acquire_timeout
+        """
+        return self._checkout(self._caller(), wait=not _on_event_loop())
+
+    async def agetconn(self) -> PooledConnection:
+        """
+        Check out a healthy connection from async code
+
+        The checkout (including any wait for a returned connection and the
+        idle health check ping) runs on a worker thread, so the event loop
+        keeps running while the pool is exhausted.
+
+        Raises:
+            psycopg2.pool.PoolError: If no connection frees up within acquire_timeout
+        """
+        return await asyncio.to_thread(self._checkout, self._caller(), True)
+
+    def _checkout(self, caller: str, wait: bool) -> PooledConnection:
+        """Check out a connection, recording wait time and saturation"""
+        pool = self._ensure_pool()
+        start = time.perf_counter()
+
+        while True:
+            conn = self._checkout_raw(pool, start, wait)
+            if self._is_healthy(conn):
+                break
+            self._stats['discarded'] += 1
+            self._return_raw(conn, close=True)
+
+        wait_ms = (time.perf_counter() - start) * 1000
+        pooled = PooledConnection(self, conn, caller)
+        with self._lock:
+            self._in_use += 1
+            self._checked_out[id(pooled)] = pooled
+            self._stats['acquisitions'] += 1
+            self._stats['total_acquire_ms'] += wait_ms
+            self._stats['max_acquire_ms'] = max(self._stats['max_acquire_ms'], wait_ms)
+            self._stats['peak_in_use'] = max(self._stats['peak_in_use'], self._in_use)
+
+        try:
+            from metrics import record_db_pool_acquire
+            record_db_pool_acquire(self.name, wait_ms / 1000.0)
+        except Exception:
+            pass
+        self._publish_metrics()
+        return pooled
+
+    def _checkout_raw(self, pool: psycopg2.pool.ThreadedConnectionPool, start: float, wait: bool):
+        """Take a raw connection from the pool, waiting for a return while it is exhausted"""
+        deadline = start + self.config.acquire_timeout
+        waited = False
+        while True:
+            self._reclaim_leaked()
+            with self._available:
+                try:
+                    return pool.getconn()
+                except psycopg2.pool.PoolError:
+                    remaining = deadline - time.perf_counter()
+                    if wait and remaining > 0:
+                        if not waited:
+                            waited = True
+                            self._stats['waits'] += 1
+                        self._available.wait(min(remaining, POOL_WAIT_POLL_SECONDS))
+                        continue
+
+            self._stats['exhausted'] += 1
+            if not wait:
+                logger.error(
+                    f"Shared database pool '{self.name}' exhausted on the event-loop thread "
+                    f"({self._in_use}/{self.config.max_size} in use); use agetconn() to wait. "
+                    f"Long-held checkouts: {self.find_leaks()}"
+                )
+                raise psycopg2.pool.PoolError(
+                    f"connection pool '{self.name}' exhausted: no free connection (event-loop caller)"
+                )
+            logger.error(
+                f"Shared database pool '{self.name}' exhausted for {self.config.acquire_timeout}s "
+                f"({self._in_use}/{self.config.max_size} in use); long-held checkouts: {self.find_leaks()}"
+            )
+            raise psycopg2.pool.PoolError(
+                f"connection pool '{self.name}' exhausted: no connection within {self.config.acquire_timeout}s"
+            )
+
+    @contextmanager
+    def connection(self) -> Iterator[PooledConnection]:
+        """Check out a connection for the duration of a with-block (commit on success)"""
+        conn = self.getconn()
+        with conn:
+            yield conn
+
+    def _is_healthy(self, conn) -> bool:
+        """Reject closed connections and ping ones that sat idle for a while"""
+        if conn.closed:
+            return False
+        last_used = self._last_used.get(id(conn))
+        if last_used is None or time.monotonic() - last_used < HEALTH_CHECK_IDLE_SECONDS:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception as e:
+            logger.warning(f"Discarding unhealthy connection from pool '{self.name}': {e}")
+            return False
+
+    def _release(self, pooled: PooledConnection) -> None:
+        """Reset and return a connection to the pool"""
+        conn = pooled._conn
+        held = pooled.held_seconds
+        with self._lock:
+            self._in_use -= 1
+            self._checked_out.pop(id(pooled), None)
+        if held > self.leak_threshold_seconds:
+            self._stats['slow_returns'] += 1
+            logger.warning(f"Connection from pool '{self.name}' held {held:.1f}s by {pooled._owner}")
+        self._return_raw(conn)
+        self._publish_metrics()
+
+    def _return_raw(self, conn, close: bool = False) -> None:
+        """Roll back any open transaction, put the raw connection back and wake a waiter"""
+        discard = close or bool(conn.closed)
+        if not discard:
+            try:
+                if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                if conn.autocommit:
+                    conn.autocommit = False
+            except Exception:
+                discard = True
+        self._last_used[id(conn)] = time.monotonic()
+        try:
+            self.pool.putconn(conn, close=discard)
+        except Exception as e:
+            logger.warning(f"Failed to return connection to pool '{self.name}': {e}")
+        with self._available:
+            self._available.notify()
+
+    def _report_leak(self, conn, owner: str, held_seconds: float) -> None:
+        """Record a checkout that was garbage collected without being returned"""
+        self._stats['leaks'] += 1
+        self._leaked.append(conn)
+        logger.warning(
+            f"Leaked connection from pool '{self.name}' reclaimed "
+            f"(checked out by {owner}, held {held_seconds:.1f}s)"
+        )
+        try:
+            from metrics import record_db_pool_leak
+            record_db_pool_leak(self.name)
+        except Exception:
+            pass
+
+    def _reclaim_leaked(self) -> None:
+        """Return connections from leaked checkouts to the pool"""
+        while self._leaked:
+            conn = self._leaked.popleft()
+            with self._lock:
+                self._in_use -= 1
+            self._return_raw(conn)
+
+    def find_leaks(self) -> List[Dict[str, Any]]:
+        """List checkouts held longer than the leak threshold"""
+        return [
+            {"owner": pooled._owner, "held_seconds": round(pooled.held_seconds, 1)}
+            for pooled in list(self._checked_out.values())
+            if pooled.held_seconds > self.leak_threshold_seconds
+        ]
+
+    def _caller(self) -> str:
+        """Name the function that checked the connection out (for leak reports)"""
+        frame = sys._getframe(2)
+        while frame is not None and frame.f_code.co_name in ('_get_connection', 'connection', '__enter__'):
+            frame = frame.f_back
+        if frame is None:
+            return "unknown"
+        return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}"
+
+    def _publish_metrics(self) -> None:
+        """Export current in-use count and saturation"""
+        try:
+            from metrics import set_db_pool_usage
+            set_db_pool_usage(self.name, self._in_use, self.config.max_size)
+        except Exception:
+            pass
+
+    def health_check(self) -> Dict[str, Any]:
+        """Run SELECT 1 on a pooled connection and report pool statistics"""
+        try:
+            with self.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+            return {"status": "healthy", "pool": self.get_stats()}
+        except Exception as e:
+            return {"status": "unhealthy", "error": str(e), "pool": self.get_stats()}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool saturation, leak and acquire latency statistics"""
+        acquisitions = self._stats['acquisitions']
+        return {
+            "name": self.name,
+            "initialized": self.pool is not None,
+            "in_use": self._in_use,
+            "min_size": self.config.min_size,
+            "max_size": self.config.max_size,
+            "saturation": round(self._in_use / self.config.max_size, 4) if self.config.max_size else 0.0,
+            "peak_in_use": self._stats['peak_in_use'],
+            "acquisitions": acquisitions,
+            "waits": self._stats['waits'],
+            "exhausted": self._stats['exhausted'],
+            "leaks": self._stats['leaks'],
+            "slow_returns": self._stats['slow_returns'],
+            "discarded": self._stats['discarded'],
+            "long_held": len(self.find_leaks()),
+            "avg_acquire_ms": round(self._stats['total_acquire_ms'] / acquisitions, 3) if acquisitions else 0.0,
+            "max_acquire_ms": round(self._stats['max_acquire_ms'], 3),
+        }
+
+    def closeall(self) -> None:
+        """Close every pooled connection"""
+        if self.pool is not None:
+            self.pool.closeall()
+            self.pool = None
+            self._last_used.clear()
+            logger.info(f"Shared database pool '{self.name}' closed")
+
+
+# Global shared pool for the cursor-based memory services
+_shared_pool: Optional[SharedConnectionPool] = None
+
+
+def get_shared_pool() -> SharedConnectionPool:
+    """Get or create the shared psycopg2 pool (configured via SHARED_DB_* env vars)"""
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = SharedConnectionPool(
+            name="memory-shared",
+            dsn=build_postgres_dsn(),
+            config=PoolConfig.from_env("SHARED_DB"),
+            leak_threshold_seconds=float(
+                os.getenv("SHARED_DB_LEAK_THRESHOLD_SECONDS", DEFAULT_LEAK_THRESHOLD_SECONDS)
+            )
+        )
+    return _shared_pool
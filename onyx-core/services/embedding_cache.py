@@ -0,0 +1,220 @@
+"""
+Query Embedding Cache for ONYX Core
+
+Two-tier cache for query embeddings used by RAGService:
+- In-process LRU tier for the hottest queries (no network round trip)
+- Shared Redis tier so all workers benefit from each other's embeddings
+
+Vectors are stored in Redis as packed little-endian float32 bytes rather than
+JSON lists, which keeps entries ~4x smaller and avoids float parsing on reads.
+Keys are derived from the normalized query text and the embedding model name,
+so switching models never serves stale vectors.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+try:
+    from metrics import record_embedding_cache_lookup
+except ImportError:  # pragma: no cover - metrics module optional in tooling
+    record_embedding_cache_lookup = None
+
+# Constants
+DEFAULT_MEMORY_MAX_SIZE = 2048
+DEFAULT_REDIS_TTL_SECONDS = 7 * 86400  # Embeddings are deterministic per model
+REDIS_KEY_PREFIX = "onyx:embedding:query"
+VECTOR_DTYPE = np.dtype("<f4")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize query text so trivially different queries share a cache entry.
+
+    Applies Unicode NFKC normalization, lowercases and collapses whitespace.
+
+    Args:
+        query: Raw query text
+
+    Returns:
+        Normalized query text
+    """
+    normalized = unicodedata.normalize("NFKC", query)
+    return " ".join(normalized.lower().split())
+
+
+def pack_vector(vector: List[float]) -> bytes:
+    """Pack an embedding vector into little-endian float32 bytes"""
+    return np.asarray(vector, dtype=VECTOR_DTYPE).tobytes()
+
+
+def unpack_vector(data: bytes) -> List[float]:
+    """Unpack little-endian float32 bytes into an embedding vector"""
+    return np.frombuffer(data, dtype=VECTOR_DTYPE).tolist()
+
+
+class EmbeddingCache:
+    """Two-tier (in-process LRU + Redis) cache for query embeddings"""
+
+    def __init__(
+        self,
+        model_name: str,
+        vector_size: int,
+        max_size: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+        redis_url: Optional[str] = None,
+    ):
+        """
+        Initialize the embedding cache
+
+        Args:
+            model_name: Embedding model name, part of every cache key
+            vector_size: Expected vector dimensionality (used to reject corrupt entries)
+            max_size: Maximum entries kept in the in-process LRU tier
+            ttl_seconds: TTL for entries in the Redis tier
+            redis_url: Redis URL for the shared tier (None disables it)
+        """
+        self.model_name = model_name
+        self.vector_size = vector_size
+        self.max_size = max_size if max_size is not None else int(
+            os.getenv("EMBEDDING_CACHE_MAX_SIZE", DEFAULT_MEMORY_MAX_SIZE)
+        )
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else int(
+            os.getenv("EMBEDDING_CACHE_TTL_SECONDS", DEFAULT_REDIS_TTL_SECONDS)
+        )
+
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.redis = None
+        if redis_url:
+            try:
+                # Raw bytes: vectors are stored packed, not as JSON strings
+                self.redis = redis.from_url(redis_url, decode_responses=False)
+            except Exception as e:
+                logger.warning(f"Embedding cache Redis tier disabled: {e}")
+
+        self._stats = {
+            "memory_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+        }
+
+    def make_key(self, query: str) -> str:
+        """Build the cache key for a query (normalized text + model name)"""
+        digest = hashlib.sha256(normalize_query(query).encode("utf-8")).hexdigest()
+        return f"{REDIS_KEY_PREFIX}:{self.model_name}:{digest}"
+
+    async def get(self, query: str) -> Optional[List[float]]:
+        """
+        Look up a cached embedding, promoting Redis hits into the LRU tier
+
+        Args:
+            query: Query text
+
+        Returns:
+            Cached embedding vector, or None on miss
+        """
+        key = self.make_key(query)
+
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+        if vector is not None:
+            self._record("memory", "hit")
+            return vector
+
+        if self.redis is not None:
+            try:
+                data = await self.redis.get(key)
+                if data:
+                    vector = unpack_vector(data)
+                    if len(vector) == self.vector_size:
+                        self._store_memory(key, vector)
+                        with self._lock:
+                            self._stats["redis_hits"] += 1
+                        self._record("redis", "hit")
+                        return vector
+                    logger.warning(f"Discarding embedding cache entry with bad size: {key}")
+            except Exception as e:
+                logger.warning(f"Embedding cache Redis get failed: {e}")
+
+        with self._lock:
+            self._stats["misses"] += 1
+        self._record("all", "miss")
+        return None
+
+    async def set(self, query: str, vector: List[float]) -> None:
+        """
+        Store an embedding in both cache tiers
+
+        Args:
+            query: Query text
+            vector: Embedding vector
+        """
+        key = self.make_key(query)
+        self._store_memory(key, vector)
+
+        if self.redis is not None:
+            try:
+                await self.redis.setex(key, self.ttl_seconds, pack_vector(vector))
+            except Exception as e:
+                logger.warning(f"Embedding cache Redis set failed: {e}")
+
+    def _store_memory(self, key: str, vector: List[float]) -> None:
+        """Insert into the LRU tier, evicting the least recently used entry"""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._memory[key] = vector
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_size:
+                self._memory.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _record(self, tier: str, result: str) -> None:
+        """Export a lookup result through the metrics module"""
+        if record_embedding_cache_lookup is None:
+            return
+        try:
+            record_embedding_cache_lookup(tier, result)
+        except Exception as e:
+            logger.debug(f"Failed to record embedding cache metric: {e}")
+
+    def clear(self) -> None:
+        """Clear the in-process tier (the Redis tier expires by TTL)"""
+        with self._lock:
+            self._memory.clear()
+
+    def get_stats(self) -> dict:
+        """Get cache statistics"""
+        with self._lock:
+            hits = self._stats["memory_hits"] + self._stats["redis_hits"]
+            lookups = hits + self._stats["misses"]
+            return {
+                **self._stats,
+                "size": len(self._memory),
+                "max_size": self.max_size,
+                "redis_enabled": self.redis is not None,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+
+    async def close(self) -> None:
+        """Close the Redis connection"""
+        if self.redis is not None:
+            try:
+                await self.redis.close()
+            except Exception as e:
+                logger.error(f"Error closing embedding cache Redis connection: {e}")
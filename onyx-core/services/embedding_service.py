@@ -7,14 +7,17 @@ for indexing in the vector database.
 
 import os
 import time
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
 from dataclasses import dataclass
 import asyncio
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 import tiktoken
 
+from services.embedding_dedup_store import EmbeddingDedupStore
+
 logger = logging.getLogger(__name__)
 
 # Constants
@@ -22,28 +25,233 @@ EMBEDDING_MODEL = "text-embedding-3-small"
 EMBEDDING_DIMENSIONS = 1536
 MAX_TOKENS_PER_CHUNK = 500
 CHUNK_OVERLAP_TOKENS = 50
-BATCH_SIZE = 10  # Process chunks in batches for efficiency
+BATCH_SIZE = 2048  # Max inputs per embeddings request (provider limit)
+BATCH_TOKEN_BUDGET = 100_000  # Batches are packed by tokens, well under the 300k per-request cap
+MAX_CONCURRENT_BATCHES = 4  # Max embedding requests in flight
 MAX_RETRIES = 3
+MAX_RATE_LIMIT_RETRIES = 8  # 429s are expected when running at the rate limit
 RETRY_DELAY = 1.0  # Base retry delay in seconds
+RATE_LIMIT_RECOVERY_SUCCESSES = 5  # Successes needed to raise concurrency by one
+STREAM_BATCH_CHUNKS = 64  # Chunks per embedding batch when streaming a document
+STREAM_MAX_CARRY_CHARS = 8192  # Text without whitespace is tokenized anyway past this
+
+
+class EmbeddingRateController:
+    """
+    Adaptive concurrency control for embedding requests
+
+    Bounds the number of in-flight requests and adapts to provider rate limits:
+    a 429 halves the concurrency limit and pauses all requests for the
+    Retry-After period; consecutive successes raise it again one step at a time.
+    """
+
+    def __init__(self, max_concurrency: int):
+        """
+        Initialize the rate controller
+
+        Args:
+            max_concurrency: Upper bound on requests in flight
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit = self.max_concurrency
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._successes = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        """Wait for a free request slot and for any rate-limit pause to end"""
+        async with self._condition:
+            while True:
+                wait_time = self.paused_until - time.monotonic()
+                if wait_time > 0:
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), timeout=wait_time)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                if self.in_flight < self.limit:
+                    self.in_flight += 1
+                    return
+                await self._condition.wait()
+
+    async def release(self, rate_limited: bool = False, retry_after: Optional[float] = None):
+        """
+        Release a request slot and adapt the concurrency limit
+
+        Args:
+            rate_limited: Whether the request was rejected with a 429
+            retry_after: Seconds the provider asked us to wait
+        """
+        async with self._condition:
+            self.in_flight -= 1
+            if rate_limited:
+                self.limit = max(1, self.limit // 2)
+                self._successes = 0
+                if retry_after:
+                    self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+            else:
+                self._successes += 1
+                if self._successes >= RATE_LIMIT_RECOVERY_SUCCESSES and self.limit < self.max_concurrency:
+                    self.limit += 1
+                    self._successes = 0
+            self._condition.notify_all()
+
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    """Check whether an embeddings API error is a 429 rate limit"""
+    return getattr(error, "status_code", None) == 429 or type(error).__name__ == "RateLimitError"
+
+
+def _get_retry_after(error: Exception) -> Optional[float]:
+    """Extract the Retry-After delay in seconds from an API error, if present"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return None
 
 
 @dataclass
 class ChunkMetadata:
     """Metadata for a text chunk"""
     chunk_index: int
-    total_chunks: int
+    total_chunks: Optional[int]  # None for streamed documents (unknown until fully read)
     token_count: int
     start_char: int
     end_char: int
     chunk_hash: str
 
 
+@dataclass
+class ChunkSpan:
+    """A chunk of streamed text and its character range in the document"""
+    text: str
+    start_char: int
+    end_char: int
+
+
+class StreamingChunker:
+    """
+    Incremental fixed-size token window chunking
+
+    Text is fed segment by segment as it is parsed. Chunks come out as soon as
+    a window is full and only the current window plus one segment of tokens is
+    held, so memory stays bounded however long the document is. The windows
+    are the same as chunking the whole text at once: max_tokens long,
+    overlapping by overlap tokens. Without a tokenizer, words are used as
+    tokens like the word-based fallback chunking.
+
+    Each segment is tokenized up to its last whitespace run; the rest is
+    carried into the next segment so no token is split at a segment boundary.
+    """
+
+    def __init__(self, tokenizer=None, max_tokens: int = MAX_TOKENS_PER_CHUNK,
+                 overlap: int = CHUNK_OVERLAP_TOKENS):
+        """
+        Initialize the chunker
+
+        Args:
+            tokenizer: tiktoken encoding, or None for word-based chunking
+            max_tokens: Tokens per chunk
+            overlap: Tokens shared by consecutive chunks
+        """
+        if tokenizer is not None:
+            self._encode, self._decode = tokenizer.encode, tokenizer.decode
+            self._separator_chars = 0
+            self.max_tokens, self.overlap = max_tokens, overlap
+        else:
+            # 1 token ≈ 0.75 words, as in _chunk_by_words
+            self._encode, self._decode = str.split, ' '.join
+            self._separator_chars = 1
+            self.max_tokens, self.overlap = int(max_tokens * 0.75), int(overlap * 0.75)
+
+        self._tokens: List[Any] = []
+        self._carry = ""
+        self._offset = 0  # Character position of the first buffered token
+        self._emitted = False
+
+    def feed(self, text: str) -> List[ChunkSpan]:
+        """
+        Add the next segment of text
+
+        Args:
+            text: Next part of the document
+
+        Returns:
+            Chunks completed by this segment
+        """
+        text = self._carry + text
+
+        # Hold back the last word and the whitespace before it
+        end = len(text)
+        while end and not text[end - 1].isspace():
+            end -= 1
+        while end and text[end - 1].isspace():
+            end -= 1
+
+        if end == 0:
+            if len(text) < STREAM_MAX_CARRY_CHARS:
+                self._carry = text
+                return []
+            end = len(text)
+
+        self._carry = text[end:]
+        self._tokens.extend(self._encode(text[:end]))
+        return self._drain()
+
+    def finish(self) -> List[ChunkSpan]:
+        """
+        Flush the end of the document
+
+        Returns:
+            The remaining chunks
+        """
+        if self._carry:
+            self._tokens.extend(self._encode(self._carry))
+            self._carry = ""
+
+        chunks = self._drain()
+
+        # The remainder, unless it is only the overlap already in the last chunk
+        if self._tokens and (not self._emitted or len(self._tokens) > self.overlap):
+            chunks.extend(self._emit(len(self._tokens)))
+
+        self._tokens = []
+        return chunks
+
+    def _drain(self) -> List[ChunkSpan]:
+        """Emit full windows while more than one window is buffered"""
+        chunks = []
+        step = self.max_tokens - self.overlap
+        while len(self._tokens) > self.max_tokens:
+            chunks.extend(self._emit(self.max_tokens))
+            self._offset += len(self._decode(self._tokens[:step])) + self._separator_chars
+            self._tokens = self._tokens[step:]
+        return chunks
+
+    def _emit(self, count: int) -> List[ChunkSpan]:
+        """Chunk for the first count buffered tokens (none if it is only whitespace)"""
+        self._emitted = True
+        raw_text = self._decode(self._tokens[:count])
+        chunk_text = raw_text.strip()
+        if not chunk_text:
+            return []
+        return [ChunkSpan(text=chunk_text, start_char=self._offset, end_char=self._offset + len(raw_text))]
+
+
 @dataclass
 class ProcessedChunk:
     """Processed chunk with embeddings"""
     text: str
     embedding: List[float]
     metadata: ChunkMetadata
+    reused: bool = False  # True when the vector came from the dedup store or a duplicate chunk
 
 
 @dataclass
@@ -65,10 +273,13 @@ class EmbeddingService:
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.model = EMBEDDING_MODEL
         self.dimensions = EMBEDDING_DIMENSIONS
+        self.batch_token_budget = int(os.getenv("EMBEDDING_BATCH_TOKEN_BUDGET", BATCH_TOKEN_BUDGET))
+        self.max_concurrent_batches = int(os.getenv("EMBEDDING_MAX_CONCURRENT_BATCHES", MAX_CONCURRENT_BATCHES))
+        self.rate_controller = EmbeddingRateController(self.max_concurrent_batches)
 
-        # Initialize OpenAI client
+        # Initialize OpenAI client (async so batches can be in flight concurrently)
         try:
-            self.openai_client = OpenAI(api_key=self.openai_api_key)
+            self.openai_client = AsyncOpenAI(api_key=self.openai_api_key)
             logger.info(f"Embedding service initialized with model: {self.model}")
         except Exception as e:
             logger.error(f"Failed to initialize OpenAI client: {e}")
@@ -81,6 +292,11 @@ class EmbeddingService:
             logger.warning(f"Failed to initialize tokenizer for {self.model}: {e}")
             self.tokenizer = None
 
+        # Content-hash dedup store: identical chunks are only embedded once
+        self.dedup_store = None
+        if os.getenv("ENABLE_EMBEDDING_DEDUP", "true").lower() == "true":
+            self.dedup_store = EmbeddingDedupStore(model=self.model, dimensions=self.dimensions)
+
     async def generate_embeddings(self, content: str, doc_metadata: Dict[str, Any]) -> EmbeddingResult:
         """
         Generate embeddings for text content with chunking
@@ -197,6 +413,9 @@ class EmbeddingService:
                 # Add chunk with metadata
                 chunks.append(chunk_text)
 
+            if end_idx == total_tokens:
+                break
+
             # Move start position with overlap
             start_idx = max(0, end_idx - CHUNK_OVERLAP_TOKENS)
             chunk_index += 1
@@ -232,6 +451,9 @@ class EmbeddingService:
             if chunk_text:
                 chunks.append(chunk_text)
 
+            if end_idx == len(words):
+                break
+
             # Move start position with overlap
             start_idx = max(0, end_idx - overlap_words)
 
@@ -241,6 +463,10 @@ class EmbeddingService:
         """
         Generate embeddings for chunks with batching and retry logic
 
+        Chunk hashes are checked against the dedup store first, and repeated
+        chunks within the document are embedded once; only misses are sent to
+        the embeddings API.
+
         Args:
             chunks: List of text chunks
             doc_metadata: Document metadata
@@ -248,77 +474,287 @@ class EmbeddingService:
         Returns:
             List of processed chunks with embeddings
         """
-        processed_chunks = []
         total_chunks = len(chunks)
+        resolved = await self._resolve_embeddings(chunks)
 
-        # Process chunks in batches
-        for batch_start in range(0, total_chunks, BATCH_SIZE):
-            batch_end = min(batch_start + BATCH_SIZE, total_chunks)
-            batch_chunks = chunks[batch_start:batch_end]
-            batch_indices = list(range(batch_start, batch_end))
-
-            # Generate embeddings for this batch with retry logic
-            batch_embeddings = await self._generate_batch_embeddings_with_retry(batch_chunks)
-
-            # Create processed chunks
-            for i, (chunk_text, embedding) in enumerate(zip(batch_chunks, batch_embeddings)):
-                chunk_metadata = self._create_chunk_metadata(
-                    chunk_text=chunk_text,
-                    chunk_index=batch_indices[i],
-                    total_chunks=total_chunks,
-                    doc_metadata=doc_metadata
-                )
+        # Create processed chunks
+        processed_chunks = []
+        for chunk_index, (chunk_text, (embedding, reused)) in enumerate(zip(chunks, resolved)):
+            chunk_metadata = self._create_chunk_metadata(
+                chunk_text=chunk_text,
+                chunk_index=chunk_index,
+                total_chunks=total_chunks,
+                doc_metadata=doc_metadata
+            )
 
-                processed_chunk = ProcessedChunk(
-                    text=chunk_text,
-                    embedding=embedding,
-                    metadata=chunk_metadata
-                )
-                processed_chunks.append(processed_chunk)
+            processed_chunks.append(ProcessedChunk(
+                text=chunk_text,
+                embedding=embedding,
+                metadata=chunk_metadata,
+                reused=reused
+            ))
 
         return processed_chunks
 
+    async def _resolve_embeddings(self, chunks: List[str]) -> List[Tuple[List[float], bool]]:
+        """
+        Get embeddings for chunk texts, embedding only what is not known yet
+
+        Args:
+            chunks: List of text chunks
+
+        Returns:
+            (embedding, reused) for each chunk, in input order
+        """
+        chunk_hashes = [self._calculate_chunk_hash(chunk_text) for chunk_text in chunks]
+
+        # Look up previously embedded chunks
+        known_vectors = {}
+        if self.dedup_store is not None:
+            known_vectors = await self.dedup_store.get_many(chunk_hashes)
+
+        # Unique chunks that still need an embedding, in document order
+        pending = {}
+        for chunk_text, chunk_hash in zip(chunks, chunk_hashes):
+            if chunk_hash not in known_vectors and chunk_hash not in pending:
+                pending[chunk_hash] = chunk_text
+
+        # Embed misses with concurrent, token-packed batches
+        pending_embeddings = await self._embed_concurrently(list(pending.values()))
+        new_vectors = dict(zip(pending.keys(), pending_embeddings))
+
+        if self.dedup_store is not None and new_vectors:
+            await self.dedup_store.put_many(new_vectors)
+
+        resolved = []
+        embedded_hashes = set()
+        for chunk_hash in chunk_hashes:
+            if chunk_hash in new_vectors and chunk_hash not in embedded_hashes:
+                resolved.append((new_vectors[chunk_hash], False))
+                embedded_hashes.add(chunk_hash)
+            elif chunk_hash in known_vectors:
+                resolved.append((known_vectors[chunk_hash], True))
+            else:
+                # Repeat of a chunk embedded earlier in this document
+                resolved.append((new_vectors[chunk_hash], True))
+
+        return resolved
+
+    async def embed_stream(
+        self,
+        segments: AsyncIterator[str],
+        doc_metadata: Dict[str, Any],
+        batch_chunks: Optional[int] = None
+    ) -> AsyncIterator[List[ProcessedChunk]]:
+        """
+        Chunk and embed a document while it is being parsed
+
+        Segments are chunked as they arrive. Each full batch of chunks is
+        embedded in the background while the next batch is read and chunked,
+        and is yielded as soon as its embeddings are ready, so callers can
+        index it while later parts of the document are still being read. At
+        most two batches are held at a time.
+
+        Args:
+            segments: Parsed document text, in order
+            doc_metadata: Document metadata
+            batch_chunks: Chunks per embedding batch (defaults to STREAM_BATCH_CHUNKS)
+
+        Yields:
+            Batches of processed chunks, in document order. Chunk metadata has
+            the character range in the parsed text and total_chunks=None
+        """
+        batch_chunks = batch_chunks or STREAM_BATCH_CHUNKS
+        chunker = StreamingChunker(self.tokenizer)
+
+        async def spans():
+            async for segment in segments:
+                for span in chunker.feed(segment):
+                    yield span
+            for span in chunker.finish():
+                yield span
+
+        batch: List[ChunkSpan] = []
+        first_index = 0
+        in_flight: Optional[asyncio.Task] = None
+
+        try:
+            async for span in spans():
+                batch.append(span)
+                if len(batch) < batch_chunks:
+                    continue
+
+                if in_flight is not None:
+                    yield await in_flight
+                in_flight = asyncio.create_task(self._embed_spans(batch, first_index))
+                first_index += len(batch)
+                batch = []
+
+            if in_flight is not None:
+                yield await in_flight
+                in_flight = None
+            if batch:
+                yield await self._embed_spans(batch, first_index)
+
+        finally:
+            if in_flight is not None and not in_flight.done():
+                in_flight.cancel()
+
+    async def _embed_spans(self, spans: List[ChunkSpan], first_index: int) -> List[ProcessedChunk]:
+        """
+        Embed a batch of streamed chunks
+
+        Args:
+            spans: Chunks in document order
+            first_index: Chunk index of the first span in the document
+
+        Returns:
+            Processed chunks with embeddings
+        """
+        resolved = await self._resolve_embeddings([span.text for span in spans])
+
+        return [
+            ProcessedChunk(
+                text=span.text,
+                embedding=embedding,
+                metadata=ChunkMetadata(
+                    chunk_index=first_index + i,
+                    total_chunks=None,
+                    token_count=self._count_tokens(span.text),
+                    start_char=span.start_char,
+                    end_char=span.end_char,
+                    chunk_hash=self._calculate_chunk_hash(span.text)
+                ),
+                reused=reused
+            )
+            for i, (span, (embedding, reused)) in enumerate(zip(spans, resolved))
+        ]
+
+    def _count_tokens(self, text: str) -> int:
+        """Count (or estimate, without a tokenizer) the tokens in a text"""
+        if self.tokenizer:
+            return len(self.tokenizer.encode(text))
+        return int(len(text.split()) * 1.3) + 1
+
+    def _pack_batches(self, texts: List[str]) -> List[Tuple[int, int]]:
+        """
+        Pack consecutive texts into batches by token budget
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List of (start, end) index ranges, in input order
+        """
+        batches = []
+        start = 0
+        batch_tokens = 0
+        for i, text in enumerate(texts):
+            tokens = self._count_tokens(text)
+            batch_full = (batch_tokens + tokens > self.batch_token_budget) or (i - start >= BATCH_SIZE)
+            if i > start and batch_full:
+                batches.append((start, i))
+                start, batch_tokens = i, 0
+            batch_tokens += tokens
+        if start < len(texts):
+            batches.append((start, len(texts)))
+        return batches
+
+    async def _embed_concurrently(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts with token-packed batches and bounded in-flight requests
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embeddings in the same order as texts
+        """
+        if not texts:
+            return []
+
+        batches = self._pack_batches(texts)
+        results = await asyncio.gather(*(
+            self._generate_batch_embeddings_with_retry(texts[start:end]) for start, end in batches
+        ))
+
+        # gather preserves batch order, so flattening keeps the input order
+        return [embedding for batch_embeddings in results for embedding in batch_embeddings]
+
     async def _generate_batch_embeddings_with_retry(self, chunks: List[str]) -> List[List[float]]:
         """
         Generate embeddings for a batch of chunks with retry logic
 
+        Requests go through the rate controller. 429 responses wait for the
+        provider's Retry-After and are retried separately from other failures;
+        malformed responses are retried like request errors.
+
         Args:
             chunks: List of text chunks
 
         Returns:
             List of embeddings
         """
-        for attempt in range(MAX_RETRIES):
+        attempt = 0
+        rate_limit_retries = 0
+        while True:
+            await self.rate_controller.acquire()
+            rate_limited = False
+            retry_after = None
             try:
-                response = self.openai_client.embeddings.create(
+                response = await self.openai_client.embeddings.create(
                     model=self.model,
                     input=chunks
                 )
+                return self._validate_embeddings(chunks, response)
+            except Exception as e:
+                error = e
+                if _is_rate_limit_error(e) and rate_limit_retries < MAX_RATE_LIMIT_RETRIES:
+                    rate_limited = True
+                    retry_after = _get_retry_after(e) or RETRY_DELAY * (2 ** rate_limit_retries)
+                    rate_limit_retries += 1
+                else:
+                    attempt += 1
+                    if attempt >= MAX_RETRIES:
+                        # Last attempt failed, raise the exception
+                        raise Exception(f"Embedding generation failed after {MAX_RETRIES} attempts: {str(e)}")
+            finally:
+                # Runs exactly once per acquire, including on cancellation
+                await self.rate_controller.release(rate_limited=rate_limited, retry_after=retry_after)
+
+            if rate_limited:
+                logger.warning(
+                    f"Embedding request rate limited, retrying in {retry_after:.1f}s "
+                    f"(concurrency limit now {self.rate_controller.limit})"
+                )
+                continue
 
-                embeddings = [data.embedding for data in response.data]
+            # Exponential backoff
+            wait_time = RETRY_DELAY * (2 ** (attempt - 1))
+            logger.warning(f"Embedding generation attempt {attempt} failed, retrying in {wait_time}s: {str(error)}")
+            await asyncio.sleep(wait_time)
 
-                # Validate embeddings
-                if len(embeddings) != len(chunks):
-                    raise ValueError(f"Embedding count mismatch: expected {len(chunks)}, got {len(embeddings)}")
+    def _validate_embeddings(self, chunks: List[str], response: Any) -> List[List[float]]:
+        """
+        Extract embeddings from an API response in input order and validate them
 
-                for embedding in embeddings:
-                    if len(embedding) != self.dimensions:
-                        raise ValueError(f"Embedding dimension mismatch: expected {self.dimensions}, got {len(embedding)}")
+        Args:
+            chunks: Texts sent in the request
+            response: Embeddings API response
 
-                return embeddings
+        Returns:
+            List of embeddings
+        """
+        embeddings = [data.embedding for data in sorted(response.data, key=lambda d: d.index)]
 
-            except Exception as e:
-                if attempt == MAX_RETRIES - 1:
-                    # Last attempt failed, raise the exception
-                    raise Exception(f"Embedding generation failed after {MAX_RETRIES} attempts: {str(e)}")
+        if len(embeddings) != len(chunks):
+            raise ValueError(f"Embedding count mismatch: expected {len(chunks)}, got {len(embeddings)}")
 
-                # Exponential backoff
-                wait_time = RETRY_DELAY * (2 ** attempt)
-                logger.warning(f"Embedding generation attempt {attempt + 1} failed, retrying in {wait_time}s: {str(e)}")
-                await asyncio.sleep(wait_time)
+        for embedding in embeddings:
+            if len(embedding) != self.dimensions:
+                raise ValueError(f"Embedding dimension mismatch: expected {self.dimensions}, got {len(embedding)}")
 
-        # This should never be reached
-        raise Exception("Embedding generation failed: unexpected error")
+        return embeddings
 
     def _create_chunk_metadata(self, chunk_text: str, chunk_index: int, total_chunks: int, doc_metadata: Dict[str, Any]) -> ChunkMetadata:
         """
@@ -372,7 +808,6 @@ class EmbeddingService:
         Returns:
             SHA-256 hash as hexadecimal string
         """
-        import hashlib
         return hashlib.sha256(chunk_text.encode('utf-8')).hexdigest()
 
     def _generate_stats(self, chunks: List[ProcessedChunk], processing_time: float) -> Dict[str, Any]:
@@ -391,6 +826,7 @@ class EmbeddingService:
 
         token_counts = [chunk.metadata.token_count for chunk in chunks]
         embedding_lengths = [len(chunk.embedding) for chunk in chunks]
+        reused_chunks = sum(1 for chunk in chunks if chunk.reused)
 
         return {
             'total_chunks': len(chunks),
@@ -405,6 +841,9 @@ class EmbeddingService:
             'model_used': self.model,
             'average_embedding_length': sum(embedding_lengths) / len(embedding_lengths) if embedding_lengths else 0,
             'embedding_validation_passed': all(length == self.dimensions for length in embedding_lengths),
+            'embedded_chunks': len(chunks) - reused_chunks,
+            'reused_chunks': reused_chunks,
+            'dedup_ratio': reused_chunks / len(chunks),
         }
 
     def get_model_info(self) -> Dict[str, Any]:
@@ -420,9 +859,12 @@ class EmbeddingService:
             'max_tokens_per_chunk': MAX_TOKENS_PER_CHUNK,
             'chunk_overlap_tokens': CHUNK_OVERLAP_TOKENS,
             'batch_size': BATCH_SIZE,
+            'batch_token_budget': self.batch_token_budget,
+            'max_concurrent_batches': self.max_concurrent_batches,
             'max_retries': MAX_RETRIES,
             'retry_delay': RETRY_DELAY,
             'tokenizer_available': self.tokenizer is not None,
+            'dedup_enabled': self.dedup_store is not None,
         }
 
 
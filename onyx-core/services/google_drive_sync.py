@@ -14,7 +14,7 @@ from googleapiclient.errors import HttpError
 
 from services.google_oauth import get_oauth_service
 from services.content_extractor import create_content_extractor
-from rag_service import get_rag_service
+from rag_service import get_rag_service, DocumentChunk
 from utils.database import get_db_service
 from utils.retry import retry_with_backoff
 
@@ -401,36 +401,33 @@ class GoogleDriveSync:
             raise Exception("Failed to store document metadata")
 
         # Index chunks in Qdrant
+        documents = []
         for idx, chunk_text in enumerate(chunks):
-            try:
-                # Create unique chunk ID
-                chunk_id = f"{file_id}-chunk-{idx}"
-
-                # Prepare metadata for Qdrant payload
-                metadata = {
-                    "doc_id": doc_id,
-                    "source_id": file_id,
-                    "chunk_index": idx,
-                    "total_chunks": len(chunks),
-                    "owner_email": owner_email,
-                    "permissions": permissions,
-                    "mime_type": mime_type,
-                    "web_view_link": file_metadata.get("webViewLink"),
-                    "modified_at": modified_at.isoformat(),
-                }
-
-                # Index in Qdrant
-                await self.rag_service.add_document(
-                    doc_id=chunk_id,
-                    text=chunk_text,
-                    title=file_name,
-                    source="google_drive",
-                    metadata=metadata,
-                )
+            # Prepare metadata for Qdrant payload
+            metadata = {
+                "doc_id": doc_id,
+                "source_id": file_id,
+                "chunk_index": idx,
+                "total_chunks": len(chunks),
+                "owner_email": owner_email,
+                "permissions": permissions,
+                "mime_type": mime_type,
+                "web_view_link": file_metadata.get("webViewLink"),
+                "modified_at": modified_at.isoformat(),
+            }
 
-            except Exception as e:
-                logger.error(f"Failed to index chunk {idx} of {file_name}: {e}")
-                raise
+            documents.append(DocumentChunk(
+                doc_id=f"{file_id}-chunk-{idx}",
+                text=chunk_text,
+                title=file_name,
+                source="google_drive",
+                metadata=metadata,
+            ))
+
+        indexed_chunks = await self.rag_service.add_documents(documents)
+        if indexed_chunks != len(documents):
+            logger.error(f"Only indexed {indexed_chunks}/{len(documents)} chunks of {file_name}")
+            raise Exception(f"Failed to index {len(documents) - indexed_chunks} chunks")
 
         # Update statistics
         if existing_doc:
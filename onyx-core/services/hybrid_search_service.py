@@ -10,11 +10,17 @@ import asyncio
 import logging
 import time
 from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict, field
 from datetime import datetime, timedelta
 
+import numpy as np
+
+from config.search_config import get_search_settings
 from .rag_service import RAGService, SearchResult
 from .keyword_search_service import KeywordSearchService, KeywordSearchResult
+from .search_result_cache import get_search_result_cache
+from .search_fusion import fuse_scores, FUSION_STRATEGIES
+from .search_legs import run_search_leg, LEG_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +28,6 @@ logger = logging.getLogger(__name__)
 SEMANTIC_WEIGHT = 0.7
 KEYWORD_WEIGHT = 0.3
 DEFAULT_HYBRID_LIMIT = 5
-DEFAULT_SEARCH_TIMEOUT_MS = 200
 RECENCY_BOOST_DAYS = 30
 RECENCY_BOOST_FACTOR = 1.10
 
@@ -47,6 +52,17 @@ class HybridSearchResult:
     rank: int
 
 
+@dataclass
+class HybridSearchResponse:
+    """Hybrid search results with per-leg diagnostics"""
+
+    results: List[HybridSearchResult]
+    degraded: bool = False  # True when a leg timed out or failed and was fused without
+    leg_timings_ms: Dict[str, float] = field(default_factory=dict)
+    leg_status: Dict[str, str] = field(default_factory=dict)
+    cached: bool = False
+
+
 class HybridSearchService:
     """Hybrid Search Service combining semantic and keyword search with result fusion"""
 
@@ -54,21 +70,38 @@ class HybridSearchService:
         """Initialize hybrid search service"""
         self.semantic_weight = float(os.getenv("SEMANTIC_WEIGHT", SEMANTIC_WEIGHT))
         self.keyword_weight = float(os.getenv("KEYWORD_WEIGHT", KEYWORD_WEIGHT))
-        self.timeout_ms = int(os.getenv("HYBRID_SEARCH_TIMEOUT_MS", DEFAULT_SEARCH_TIMEOUT_MS))
         self.recency_boost_days = int(os.getenv("RECENCY_BOOST_DAYS", RECENCY_BOOST_DAYS))
         self.recency_boost_factor = float(os.getenv("RECENCY_BOOST_FACTOR", RECENCY_BOOST_FACTOR))
         self.default_limit = int(os.getenv("HYBRID_SEARCH_DEFAULT_LIMIT", DEFAULT_HYBRID_LIMIT))
 
+        # Fusion and candidate pool settings
+        settings = get_search_settings()
+        self.timeout_ms = settings.total_timeout_ms
+        self.fusion_strategy = settings.fusion_strategy
+        self.rrf_k = settings.rrf_k
+        self.fusion_timeout_ms = settings.fusion_timeout_ms
+        self.semantic_candidates = settings.semantic_search_limit
+        self.keyword_candidates = settings.keyword_search_limit
+        self.min_semantic_score = settings.min_semantic_score
+        self.semantic_timeout_ms = settings.semantic_timeout_ms
+        self.keyword_timeout_ms = settings.keyword_timeout_ms
+
         # Services will be initialized lazily
         self.rag_service = None
         self.keyword_search_service = None
 
+        # Fused-result cache (None when SearchConfig.enable_search_cache is off)
+        self.result_cache = get_search_result_cache()
+
         # Performance tracking
         self._search_stats = {
             'total_searches': 0,
             'total_latency_ms': 0,
             'cache_hits': 0,
-            'cache_misses': 0
+            'cache_misses': 0,
+            'degraded_searches': 0,
+            'semantic_timeouts': 0,
+            'keyword_timeouts': 0
         }
 
     async def _ensure_services_initialized(self):
@@ -88,7 +121,8 @@ class HybridSearchService:
         source_filter: Optional[str] = None,
         limit: int = None,
         include_recency_boost: bool = True,
-        query_type: str = "auto"  # auto, semantic, keyword, hybrid
+        query_type: str = "auto",  # auto, semantic, keyword, hybrid
+        fusion_strategy: Optional[str] = None  # rrf, minmax, zscore, weighted
     ) -> List[HybridSearchResult]:
         """
         Execute hybrid search combining semantic and keyword approaches
@@ -100,15 +134,57 @@ class HybridSearchService:
             limit: Maximum number of results to return
             include_recency_boost: Whether to apply recency boosting
             query_type: Type of search to perform
+            fusion_strategy: Fusion strategy override (defaults to SearchConfig.fusion_strategy)
 
         Returns:
             List of hybrid search results with combined scores
+
+        Raises:
+            ValueError: If fusion_strategy is unknown
+        """
+        response = await self.search_with_diagnostics(
+            query, user_permissions, source_filter, limit,
+            include_recency_boost, query_type, fusion_strategy
+        )
+        return response.results
+
+    async def search_with_diagnostics(
+        self,
+        query: str,
+        user_permissions: List[str] = None,
+        source_filter: Optional[str] = None,
+        limit: int = None,
+        include_recency_boost: bool = True,
+        query_type: str = "auto",
+        fusion_strategy: Optional[str] = None
+    ) -> HybridSearchResponse:
+        """
+        Execute hybrid search and report degraded legs and per-leg timings
+
+        Args:
+            query: Search query string
+            user_permissions: List of user permissions/email addresses
+            source_filter: Optional filter for document source type
+            limit: Maximum number of results to return
+            include_recency_boost: Whether to apply recency boosting
+            query_type: Type of search to perform
+            fusion_strategy: Fusion strategy override (defaults to SearchConfig.fusion_strategy)
+
+        Returns:
+            HybridSearchResponse with results, degraded flag and per-leg timings
+
+        Raises:
+            ValueError: If fusion_strategy is unknown
         """
         await self._ensure_services_initialized()
 
         if limit is None:
             limit = self.default_limit
 
+        fusion_strategy = fusion_strategy or self.fusion_strategy
+        if fusion_strategy not in FUSION_STRATEGIES:
+            raise ValueError(f"Unknown fusion strategy: {fusion_strategy}")
+
         start_time = time.time()
 
         try:
@@ -116,19 +192,46 @@ class HybridSearchService:
             if user_permissions is None:
                 user_permissions = ['*']
 
+            # Serve repeated searches from the result cache
+            cache_key = None
+            if self.result_cache is not None:
+                cache_key = self.result_cache.make_key(
+                    query, user_permissions, source_filter, limit, query_type,
+                    recency_boost=include_recency_boost, fusion=fusion_strategy
+                )
+                cached = await self.result_cache.get(cache_key)
+                if cached is not None:
+                    self._search_stats['cache_hits'] += 1
+                    results = [self._result_from_cache(item) for item in cached]
+
+                    latency_ms = (time.time() - start_time) * 1000
+                    self._update_performance_stats(latency_ms)
+                    logger.info(
+                        f"Hybrid search cache hit in {latency_ms:.2f}ms: {len(results)} results "
+                        f"for query: '{query}' (type: {query_type})"
+                    )
+                    return HybridSearchResponse(results=results, cached=True)
+                self._search_stats['cache_misses'] += 1
+
             # Determine search strategy based on query type
             if query_type == "semantic":
-                results = await self._semantic_only_search(
+                response = HybridSearchResponse(results=await self._semantic_only_search(
                     query, user_permissions, source_filter, limit, include_recency_boost
-                )
+                ))
             elif query_type == "keyword":
-                results = await self._keyword_only_search(
+                response = HybridSearchResponse(results=await self._keyword_only_search(
                     query, user_permissions, source_filter, limit, include_recency_boost
-                )
+                ))
             else:  # auto or hybrid
-                results = await self._hybrid_search(
-                    query, user_permissions, source_filter, limit, include_recency_boost
+                response = await self._hybrid_search(
+                    query, user_permissions, source_filter, limit, include_recency_boost,
+                    fusion_strategy
                 )
+            results = response.results
+
+            # Cache complete, non-empty results only; partial fusions must not outlive the slowdown
+            if cache_key is not None and results and not response.degraded:
+                await self.result_cache.set(cache_key, [asdict(result) for result in results])
 
             # Update performance stats
             latency_ms = (time.time() - start_time) * 1000
@@ -137,14 +240,15 @@ class HybridSearchService:
             logger.info(
                 f"Hybrid search completed in {latency_ms:.2f}ms: {len(results)} results "
                 f"for query: '{query}' (type: {query_type})"
+                + (f" [degraded: {response.leg_status}]" if response.degraded else "")
             )
 
-            return results
+            return response
 
         except Exception as e:
             logger.error(f"Hybrid search failed for query '{query}': {e}")
             # Return empty results instead of raising to maintain service availability
-            return []
+            return HybridSearchResponse(results=[], degraded=True)
 
     async def _hybrid_search(
         self,
@@ -152,41 +256,55 @@ class HybridSearchService:
         user_permissions: List[str],
         source_filter: Optional[str],
         limit: int,
-        include_recency_boost: bool
-    ) -> List[HybridSearchResult]:
-        """Execute parallel hybrid search combining semantic and keyword approaches"""
-
-        # Execute both searches in parallel
-        tasks = [
-            self._execute_semantic_search(query, user_permissions, source_filter),
-            self._execute_keyword_search(query, user_permissions, source_filter, include_recency_boost)
-        ]
+        include_recency_boost: bool,
+        fusion_strategy: Optional[str] = None
+    ) -> HybridSearchResponse:
+        """
+        Execute parallel hybrid search combining semantic and keyword approaches
 
-        try:
-            semantic_results, keyword_results = await asyncio.wait_for(
-                asyncio.gather(*tasks, return_exceptions=True),
-                timeout=self.timeout_ms / 1000.0
+        Each leg runs under its own budget (SearchConfig.semantic_timeout_ms and
+        keyword_timeout_ms), capped by total_timeout_ms; the legs run
+        concurrently, so the cap bounds the whole fan-out. Legs that finish in
+        time are fused; a leg that times out or fails is dropped and the
+        response is marked degraded.
+        """
+        semantic_leg, keyword_leg = await asyncio.gather(
+            run_search_leg(
+                "semantic",
+                self._execute_semantic_search(query, user_permissions, source_filter),
+                min(self.semantic_timeout_ms, self.timeout_ms)
+            ),
+            run_search_leg(
+                "keyword",
+                self._execute_keyword_search(query, user_permissions, source_filter, include_recency_boost),
+                min(self.keyword_timeout_ms, self.timeout_ms)
             )
-        except asyncio.TimeoutError:
-            logger.warning(f"Hybrid search timeout after {self.timeout_ms}ms for query: '{query}'")
-            # Fallback to semantic search only
-            return await self._semantic_only_search(query, user_permissions, source_filter, limit, include_recency_boost)
-
-        # Handle exceptions from individual searches
-        if isinstance(semantic_results, Exception):
-            logger.error(f"Semantic search failed: {semantic_results}")
-            semantic_results = []
-        if isinstance(keyword_results, Exception):
-            logger.error(f"Keyword search failed: {keyword_results}")
-            keyword_results = []
-
-        # Fuse results with combined scoring
-        fused_results = self._fuse_results(
-            semantic_results, keyword_results, include_recency_boost
         )
 
-        # Return top results
-        return fused_results[:limit]
+        legs = (semantic_leg, keyword_leg)
+        degraded = not all(leg.ok for leg in legs)
+        if degraded:
+            self._search_stats['degraded_searches'] += 1
+            for leg in legs:
+                if leg.status == LEG_TIMEOUT:
+                    self._search_stats[f'{leg.name}_timeouts'] += 1
+
+        fusion_start = time.perf_counter()
+        fused_results = self._fuse_results(
+            semantic_leg.results, keyword_leg.results, include_recency_boost, fusion_strategy
+        )
+        fusion_ms = (time.perf_counter() - fusion_start) * 1000
+
+        return HybridSearchResponse(
+            results=fused_results[:limit],
+            degraded=degraded,
+            leg_timings_ms={
+                "semantic": round(semantic_leg.latency_ms, 2),
+                "keyword": round(keyword_leg.latency_ms, 2),
+                "fusion": round(fusion_ms, 2)
+            },
+            leg_status={leg.name: leg.status for leg in legs}
+        )
 
     async def _semantic_only_search(
         self,
@@ -281,13 +399,16 @@ class HybridSearchService:
         # Note: RAG service uses user_email for permissions, we need to convert
         user_email = user_permissions[0] if user_permissions and user_permissions != ['*'] else None
 
-        # Set appropriate top_k for more candidates (we'll filter later)
-        semantic_results = await self.rag_service.search(
+        # Candidate pool depth is SearchConfig.semantic_search_limit (SEMANTIC_SEARCH_LIMIT).
+        # semantic_search never routes back into hybrid search and raises on failure,
+        # so a broken leg is reported as an error (and the result is not cached);
+        # in async mode this leg yields to the event loop so it overlaps the keyword leg.
+        semantic_results = await self.rag_service.semantic_search(
             query=query,
-            top_k=10,  # Get more candidates for better fusion
+            top_k=self.semantic_candidates,
             source_filter=source_filter,
             user_email=user_email,
-            score_threshold=0.3  # Lower threshold for more candidates
+            score_threshold=self.min_semantic_score  # Lower threshold for more candidates
         )
 
         return semantic_results
@@ -305,7 +426,7 @@ class HybridSearchService:
             query=query,
             user_permissions=user_permissions,
             source_filter=source_filter,
-            limit=10,  # Get more candidates for better fusion
+            limit=self.keyword_candidates,  # SearchConfig.keyword_search_limit
             include_recency_boost=include_recency_boost
         )
 
@@ -315,104 +436,102 @@ class HybridSearchService:
         self,
         semantic_results: List[SearchResult],
         keyword_results: List[KeywordSearchResult],
-        include_recency_boost: bool = True
+        include_recency_boost: bool = True,
+        fusion_strategy: Optional[str] = None
     ) -> List[HybridSearchResult]:
         """
-        Fuse semantic and keyword search results with weighted scoring
+        Fuse semantic and keyword search results with the configured strategy
 
         Args:
             semantic_results: Results from semantic search
             keyword_results: Results from keyword search
             include_recency_boost: Whether to apply recency boosting
+            fusion_strategy: Fusion strategy override (defaults to SearchConfig.fusion_strategy)
 
         Returns:
             Fused and ranked hybrid search results
         """
+        fusion_start = time.perf_counter()
+        strategy = fusion_strategy or self.fusion_strategy
+
         merged_docs = {}  # doc_id -> HybridSearchResult
 
-        # Process semantic results
+        # Semantic results provide the document fields when both legs match
         for result in semantic_results:
-            doc_id = result.doc_id
-            created_at = result.metadata.get('created_at', datetime.now())
-
-            hybrid_result = HybridSearchResult(
+            if result.doc_id in merged_docs:
+                continue
+            merged_docs[result.doc_id] = HybridSearchResult(
                 doc_id=result.doc_id,
                 title=result.title,
                 content=result.text,
                 source_type=result.source,
                 source_id=result.metadata.get('source_id', ''),
-                created_at=created_at,
+                created_at=result.metadata.get('created_at', datetime.now()),
                 updated_at=result.metadata.get('updated_at', datetime.now()),
                 permissions=result.metadata.get('permissions', ['*']),
                 metadata=result.metadata,
                 semantic_score=result.score,
                 keyword_score=0.0,
-                combined_score=result.score * self.semantic_weight,
+                combined_score=0.0,
                 content_preview=result.text[:200] + "..." if len(result.text) > 200 else result.text,
                 rank=0  # Will be assigned after sorting
             )
 
-            # Apply recency boost if enabled
-            if include_recency_boost:
-                hybrid_result.combined_score = self._apply_recency_boost(
-                    hybrid_result.combined_score, created_at
-                )
-
-            merged_docs[doc_id] = hybrid_result
-
-        # Merge keyword results
         for result in keyword_results:
-            doc_id = result.doc_id
-
-            if doc_id in merged_docs:
-                # Update existing document with keyword score
-                existing = merged_docs[doc_id]
+            existing = merged_docs.get(result.doc_id)
+            if existing is not None:
                 existing.keyword_score = result.bm25_score
-                existing.combined_score = (
-                    existing.semantic_score * self.semantic_weight +
-                    result.bm25_score * self.keyword_weight
-                )
-
-                # Apply recency boost again with updated combined score
-                if include_recency_boost:
-                    existing.combined_score = self._apply_recency_boost(
-                        existing.combined_score, result.created_at
-                    )
-            else:
-                # Add new document from keyword search
-                combined_score = result.bm25_score * self.keyword_weight
-
-                if include_recency_boost:
-                    combined_score = self._apply_recency_boost(combined_score, result.created_at)
-
-                hybrid_result = HybridSearchResult(
-                    doc_id=result.doc_id,
-                    title=result.title,
-                    content=result.content,
-                    source_type=result.source_type,
-                    source_id=result.source_id,
-                    created_at=result.created_at,
-                    updated_at=result.updated_at,
-                    permissions=result.permissions,
-                    metadata=result.metadata,
-                    semantic_score=0.0,
-                    keyword_score=result.bm25_score,
-                    combined_score=combined_score,
-                    content_preview=result.content_preview,
-                    rank=0  # Will be assigned after sorting
-                )
-
-                merged_docs[doc_id] = hybrid_result
+                continue
+            merged_docs[result.doc_id] = HybridSearchResult(
+                doc_id=result.doc_id,
+                title=result.title,
+                content=result.content,
+                source_type=result.source_type,
+                source_id=result.source_id,
+                created_at=result.created_at,
+                updated_at=result.updated_at,
+                permissions=result.permissions,
+                metadata=result.metadata,
+                semantic_score=0.0,
+                keyword_score=result.bm25_score,
+                combined_score=0.0,
+                content_preview=result.content_preview,
+                rank=0  # Will be assigned after sorting
+            )
 
-        # Convert to list and sort by combined score
-        fused_results = list(merged_docs.values())
-        fused_results.sort(key=lambda x: x.combined_score, reverse=True)
+        doc_ids, combined = fuse_scores(
+            [(r.doc_id, r.score) for r in semantic_results],
+            [(r.doc_id, r.bm25_score) for r in keyword_results],
+            strategy=strategy,
+            semantic_weight=self.semantic_weight,
+            keyword_weight=self.keyword_weight,
+            rrf_k=self.rrf_k
+        )
 
-        # Assign ranks
-        for i, result in enumerate(fused_results):
-            result.rank = i + 1
+        fused_results = [merged_docs[doc_id] for doc_id in doc_ids]
+        if include_recency_boost and fused_results:
+            boost = np.array([
+                self._apply_recency_boost(1.0, result.created_at) for result in fused_results
+            ])
+            combined = combined * boost
+
+        # Stable sort keeps first-seen order for ties
+        order = np.argsort(-combined, kind="stable")
+        ranked = []
+        for rank, idx in enumerate(order, start=1):
+            result = fused_results[idx]
+            result.combined_score = float(combined[idx])
+            result.rank = rank
+            ranked.append(result)
+
+        fusion_ms = (time.perf_counter() - fusion_start) * 1000
+        if fusion_ms > self.fusion_timeout_ms:
+            logger.warning(
+                f"Fusion of {len(ranked)} candidates ({strategy}) took {fusion_ms:.2f}ms, "
+                f"over the {self.fusion_timeout_ms}ms budget"
+            )
 
-        return fused_results
+        return ranked
 
     def _apply_recency_boost(self, score: float, created_at: datetime) -> float:
         """Apply recency boost to search score"""
@@ -427,6 +546,24 @@ class HybridSearchService:
         else:
             return score
 
+    def _result_from_cache(self, item: Dict[str, Any]) -> HybridSearchResult:
+        """Rebuild a HybridSearchResult from its cached dict form"""
+        result = HybridSearchResult(**item)
+        # The Redis tier stores datetimes as strings
+        for field_name in ('created_at', 'updated_at'):
+            value = getattr(result, field_name)
+            if isinstance(value, str):
+                try:
+                    setattr(result, field_name, datetime.fromisoformat(value))
+                except ValueError:
+                    pass
+        return result
+
+    def _get_cache_hit_rate(self) -> float:
+        """Get result cache hit rate"""
+        lookups = self._search_stats['cache_hits'] + self._search_stats['cache_misses']
+        return self._search_stats['cache_hits'] / lookups if lookups else 0.0
+
     def _update_performance_stats(self, latency_ms: float):
         """Update performance statistics"""
         self._search_stats['total_searches'] += 1
@@ -505,6 +642,9 @@ class HybridSearchService:
                 "configuration": {
                     "semantic_weight": self.semantic_weight,
                     "keyword_weight": self.keyword_weight,
+                    "fusion_strategy": self.fusion_strategy,
+                    "semantic_candidates": self.semantic_candidates,
+                    "keyword_candidates": self.keyword_candidates,
                     "timeout_ms": self.timeout_ms,
                     "recency_boost_days": self.recency_boost_days,
                     "recency_boost_factor": self.recency_boost_factor,
@@ -518,7 +658,11 @@ class HybridSearchService:
                     "total_searches": self._search_stats['total_searches'],
                     "average_latency_ms": round(avg_latency_ms, 2),
                     "cache_hits": self._search_stats['cache_hits'],
-                    "cache_misses": self._search_stats['cache_misses']
+                    "cache_misses": self._search_stats['cache_misses'],
+                    "cache_hit_rate": round(self._get_cache_hit_rate(), 4),
+                    "degraded_searches": self._search_stats['degraded_searches'],
+                    "semantic_timeouts": self._search_stats['semantic_timeouts'],
+                    "keyword_timeouts": self._search_stats['keyword_timeouts']
                 }
             }
 
@@ -548,10 +692,19 @@ class HybridSearchService:
                     ) if self._search_stats['total_searches'] > 0 else 0,
                     "cache_hits": self._search_stats['cache_hits'],
                     "cache_misses": self._search_stats['cache_misses'],
+                    "cache_hit_rate": round(self._get_cache_hit_rate(), 4),
+                    "cache": self.result_cache.get_stats() if self.result_cache else None,
+                    "degraded_searches": self._search_stats['degraded_searches'],
+                    "semantic_timeouts": self._search_stats['semantic_timeouts'],
+                    "keyword_timeouts": self._search_stats['keyword_timeouts'],
                     "configuration": {
                         "semantic_weight": self.semantic_weight,
                         "keyword_weight": self.keyword_weight,
-                        "timeout_ms": self.timeout_ms
+                        "fusion_strategy": self.fusion_strategy,
+                        "rrf_k": self.rrf_k,
+                        "timeout_ms": self.timeout_ms,
+                        "semantic_timeout_ms": self.semantic_timeout_ms,
+                        "keyword_timeout_ms": self.keyword_timeout_ms
                     }
                 },
                 "keyword_search": keyword_stats
@@ -0,0 +1,360 @@
+"""
+Ingestion Job Service for ONYX Core
+
+Queues uploaded files for background ingestion and tracks per-file progress.
+
+- The upload API stores the files under UPLOAD_DIR/<job_id>/ (a volume
+  shared with the ingestion worker), records the job and pushes it onto the
+  ingestion:jobs Redis list
+- The ingestion worker (workers/ingestion_worker.py) takes jobs with BLMOVE
+  into its own processing list (ingestion:processing:<worker_id>), runs the
+  upload pipeline on each file and reports progress as it goes: parsed,
+  chunks embedded and chunks indexed. A job is removed from the processing
+  list (acknowledged) once it finishes; jobs left there by a worker that
+  crashed are requeued when it restarts, up to INGESTION_MAX_JOB_ATTEMPTS
+  attempts (at-least-once delivery)
+- Job state lives in one Redis hash per job (ingestion:job:<job_id>): job
+  fields plus one JSON field per file, so a status read is a single HGETALL.
+  Job state expires INGESTION_JOB_TTL_SECONDS after the last update
+"""
+
+import os
+import json
+import uuid
+import asyncio
+import logging
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+# Constants
+JOB_QUEUE_KEY = "ingestion:jobs"
+JOB_KEY_PREFIX = "ingestion:job:"
+PROCESSING_KEY_PREFIX = "ingestion:processing:"
+DEFAULT_MAX_JOB_ATTEMPTS = 3
+DEFAULT_JOB_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_POLL_TIMEOUT_SECONDS = 3  # Below the 5s socket timeout
+
+# Job and file statuses
+STATUS_QUEUED = "queued"
+STATUS_PROCESSING = "processing"
+STATUS_COMPLETED = "completed"
+STATUS_COMPLETED_WITH_ERRORS = "completed_with_errors"
+STATUS_FAILED = "failed"
+STATUS_SUCCESS = "success"
+STATUS_ERROR = "error"
+
+
+@dataclass
+class IngestionFile:
+    """A stored upload waiting for ingestion"""
+    filename: str
+    path: str
+
+
+@dataclass
+class IngestionJob:
+    """Background job data for ingestion"""
+    job_id: str
+    user_id: str
+    files: List[Dict[str, str]]  # IngestionFile dicts
+    retry_count: int = 0  # Times the job was requeued after its worker died
+    created_at: str = None
+
+    def __post_init__(self):
+        if self.created_at is None:
+            self.created_at = datetime.utcnow().isoformat()
+
+
+@dataclass
+class FileProgress:
+    """Ingestion progress of one file in a job"""
+    filename: str
+    status: str = STATUS_QUEUED
+    parsed: bool = False
+    chunks_embedded: int = 0
+    chunks_indexed: int = 0
+    doc_id: Optional[str] = None
+    error_message: Optional[str] = None
+    updated_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+
+
+class IngestionJobService:
+    """Service for queuing ingestion jobs and tracking their progress"""
+
+    def __init__(self):
+        """Initialize ingestion job service"""
+        self.redis_client = self._init_redis_client()
+        self.job_queue_key = JOB_QUEUE_KEY
+        self.job_ttl = int(os.getenv("INGESTION_JOB_TTL_SECONDS", str(DEFAULT_JOB_TTL_SECONDS)))
+        self.max_job_attempts = int(os.getenv("INGESTION_MAX_JOB_ATTEMPTS", str(DEFAULT_MAX_JOB_ATTEMPTS)))
+
+        # Raw queue payloads of the jobs taken by this process, needed to acknowledge them
+        self._in_flight: Dict[str, str] = {}
+
+    def _init_redis_client(self):
+        """Initialize Redis client for job queuing"""
+        try:
+            redis_host = os.getenv("REDIS_HOST", "localhost")
+            redis_port = int(os.getenv("REDIS_PORT", "6379"))
+            redis_password = os.getenv("REDIS_PASSWORD", None)
+
+            client = redis.Redis(
+                host=redis_host,
+                port=redis_port,
+                password=redis_password,
+                decode_responses=True,
+                socket_connect_timeout=5,
+                socket_timeout=5,
+                retry_on_timeout=True
+            )
+
+            # Test connection
+            client.ping()
+            logger.info("Redis connection established for ingestion job service")
+            return client
+
+        except Exception as e:
+            logger.error(f"Failed to connect to Redis: {e}")
+            raise
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{JOB_KEY_PREFIX}{job_id}"
+
+    def _processing_key(self, worker_id: str) -> str:
+        return f"{PROCESSING_KEY_PREFIX}{worker_id}"
+
+    @staticmethod
+    def new_job_id() -> str:
+        """Generate an id for a new job"""
+        return str(uuid.uuid4())
+
+    async def enqueue_job(self, job_id: str, user_id: str, files: List[IngestionFile]) -> IngestionJob:
+        """
+        Record a job and queue it for the ingestion worker
+
+        Args:
+            job_id: Job id (see new_job_id); the files are stored under it
+            user_id: User ID for permission metadata
+            files: Stored uploads to ingest
+
+        Returns:
+            The queued IngestionJob
+        """
+        job = IngestionJob(job_id=job_id, user_id=user_id, files=[asdict(f) for f in files])
+        job_key = self._job_key(job_id)
+
+        mapping = {
+            "status": STATUS_QUEUED,
+            "user_id": user_id,
+            "file_count": str(len(files)),
+            "created_at": job.created_at,
+            "updated_at": job.created_at,
+        }
+        for index, stored_file in enumerate(files):
+            mapping[f"file:{index}"] = json.dumps(asdict(FileProgress(filename=stored_file.filename)))
+
+        pipeline = self.redis_client.pipeline()
+        pipeline.hset(job_key, mapping=mapping)
+        pipeline.expire(job_key, self.job_ttl)
+        pipeline.lpush(self.job_queue_key, json.dumps(job.__dict__))
+        pipeline.execute()
+
+        logger.info(f"Ingestion job {job_id} queued with {len(files)} files for user {user_id}")
+        return job
+
+    async def get_next_job(self, worker_id: str, timeout: int = DEFAULT_POLL_TIMEOUT_SECONDS) -> Optional[IngestionJob]:
+        """
+        Get next ingestion job from queue
+
+        The job is moved into the worker's processing list, where it stays
+        until ack_job is called, so it survives a worker crash.
+
+        Args:
+            worker_id: Stable id of the worker taking the job
+            timeout: Seconds to block waiting for a job (keep it below the
+                Redis socket timeout)
+
+        Returns:
+            IngestionJob or None if no job available
+        """
+        try:
+            # BLMOVE blocks, so wait in a thread while other jobs keep running
+            job_data = await asyncio.to_thread(
+                self.redis_client.blmove,
+                self.job_queue_key, self._processing_key(worker_id), timeout, "RIGHT", "LEFT"
+            )
+
+            if job_data:
+                job = IngestionJob(**json.loads(job_data))
+                self._in_flight[job.job_id] = job_data
+                logger.debug(f"Retrieved ingestion job {job.job_id}")
+                return job
+
+            return None
+
+        except Exception as e:
+            logger.error(f"Error getting next ingestion job: {e}")
+            return None
+
+    async def ack_job(self, job_id: str, worker_id: str):
+        """
+        Remove a finished (or terminally failed) job from the worker's processing list
+
+        Args:
+            job_id: Job id
+            worker_id: Id of the worker that took the job
+        """
+        job_data = self._in_flight.pop(job_id, None)
+        if job_data is None:
+            return
+
+        try:
+            self.redis_client.lrem(self._processing_key(worker_id), 1, job_data)
+        except Exception as e:
+            logger.error(f"Error acknowledging ingestion job {job_id}: {e}")
+
+    async def recover_jobs(self, worker_id: str) -> List[IngestionJob]:
+        """
+        Requeue jobs a previous run of this worker took but never finished
+
+        Each requeue counts as an attempt; jobs that already used
+        max_job_attempts are marked failed instead.
+
+        Args:
+            worker_id: Stable id of the worker being started
+
+        Returns:
+            Jobs that were given up on (their stored files can be removed)
+        """
+        processing_key = self._processing_key(worker_id)
+        abandoned = []
+
+        for job_data in self.redis_client.lrange(processing_key, 0, -1):
+            job = IngestionJob(**json.loads(job_data))
+            job.retry_count += 1
+
+            pipeline = self.redis_client.pipeline()
+            if job.retry_count < self.max_job_attempts:
+                pipeline.hset(self._job_key(job.job_id), mapping={
+                    "status": STATUS_QUEUED,
+                    "updated_at": datetime.utcnow().isoformat(),
+                })
+                pipeline.rpush(self.job_queue_key, json.dumps(job.__dict__))
+                logger.warning(
+                    f"Requeued ingestion job {job.job_id} left by worker {worker_id} "
+                    f"(attempt {job.retry_count + 1}/{self.max_job_attempts})"
+                )
+            else:
+                pipeline.hset(self._job_key(job.job_id), mapping={
+                    "status": STATUS_FAILED,
+                    "updated_at": datetime.utcnow().isoformat(),
+                })
+                abandoned.append(job)
+                logger.error(f"Ingestion job {job.job_id} failed after {job.retry_count} attempts")
+            pipeline.expire(self._job_key(job.job_id), self.job_ttl)
+            pipeline.lrem(processing_key, 1, job_data)
+            pipeline.execute()
+
+        return abandoned
+
+    async def update_job_status(self, job_id: str, status: str):
+        """
+        Set the overall status of a job
+
+        Args:
+            job_id: Job id
+            status: New job status
+        """
+        try:
+            job_key = self._job_key(job_id)
+            self.redis_client.hset(job_key, mapping={
+                "status": status,
+                "updated_at": datetime.utcnow().isoformat(),
+            })
+            self.redis_client.expire(job_key, self.job_ttl)
+
+        except Exception as e:
+            logger.error(f"Error updating status of ingestion job {job_id}: {e}")
+
+    async def update_file_progress(self, job_id: str, index: int, progress: FileProgress):
+        """
+        Store the progress of one file in a job
+
+        Args:
+            job_id: Job id
+            index: Position of the file in the job
+            progress: Current file progress
+        """
+        try:
+            progress.updated_at = datetime.utcnow().isoformat()
+            self.redis_client.hset(self._job_key(job_id), mapping={
+                f"file:{index}": json.dumps(asdict(progress)),
+                "updated_at": progress.updated_at,
+            })
+
+        except Exception as e:
+            # Progress is informational; never fail ingestion over it
+            logger.warning(f"Error updating progress of ingestion job {job_id}: {e}")
+
+    async def get_job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job's status and per-file progress
+
+        Args:
+            job_id: Job id
+
+        Returns:
+            Job status dictionary, or None if the job is unknown or expired
+        """
+        try:
+            fields = self.redis_client.hgetall(self._job_key(job_id))
+        except Exception as e:
+            logger.error(f"Error reading ingestion job {job_id}: {e}")
+            raise
+
+        if not fields:
+            return None
+
+        file_count = int(fields.get("file_count", 0))
+        files = [json.loads(fields[f"file:{index}"]) for index in range(file_count) if f"file:{index}" in fields]
+
+        return {
+            "job_id": job_id,
+            "status": fields.get("status"),
+            "user_id": fields.get("user_id"),
+            "created_at": fields.get("created_at"),
+            "updated_at": fields.get("updated_at"),
+            "files": files,
+            "totals": {
+                "files": file_count,
+                "files_parsed": sum(1 for f in files if f["parsed"]),
+                "files_completed": sum(1 for f in files if f["status"] in (STATUS_SUCCESS, STATUS_ERROR)),
+                "chunks_embedded": sum(f["chunks_embedded"] for f in files),
+                "chunks_indexed": sum(f["chunks_indexed"] for f in files),
+            },
+        }
+
+    async def get_queue_status(self) -> Dict[str, Any]:
+        """Get the number of queued jobs"""
+        try:
+            return {"queued_jobs": self.redis_client.llen(self.job_queue_key)}
+        except Exception as e:
+            logger.error(f"Error getting ingestion queue status: {e}")
+            return {"queued_jobs": None, "error": str(e)}
+
+
+# Global service instance
+_ingestion_job_service = None
+
+
+def get_ingestion_job_service() -> IngestionJobService:
+    """Get or create ingestion job service instance"""
+    global _ingestion_job_service
+    if _ingestion_job_service is None:
+        _ingestion_job_service = IngestionJobService()
+    return _ingestion_job_service
@@ -13,6 +13,8 @@ from dataclasses import dataclass
 import asyncpg
 from datetime import datetime, timedelta
 
+from services.search_result_cache import invalidate_search_cache
+
 logger = logging.getLogger(__name__)
 
 # Constants
@@ -338,6 +340,7 @@ class KeywordSearchService:
                 success = bool(result)
                 if success:
                     logger.debug(f"Document {doc_id} synced to keyword search index")
+                    await invalidate_search_cache()
                 else:
                     logger.warning(f"Failed to sync document {doc_id} to keyword search index")
 
@@ -169,8 +169,9 @@ class MemoryAwareAgent:
         task_type: str
     ) -> List[Dict[str, Any]]:
         """Get standing instructions relevant to agent execution"""
+        conn = None
         try:
-            conn = self.memory_injection_service._get_connection()
+            conn = await self.memory_injection_service._get_connection()
             with conn.cursor() as cur:
                 # Get instructions for agent-relevant categories
                 cur.execute(
@@ -203,6 +204,9 @@ class MemoryAwareAgent:
         except Exception as e:
             logger.error(f"Failed to get agent instructions: {e}")
             return []
+        finally:
+            if conn:
+                conn.close()
 
     def _build_agent_prompt(
         self,
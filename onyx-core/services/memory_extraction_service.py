@@ -18,6 +18,8 @@ from enum import Enum
 
 from openai import OpenAI
 from memory_service import MemoryService, MemoryCategory, SourceType, CreateMemoryRequest
+from services import memory_patterns
+from services.memory_dedup import NearDuplicateIndex, jaccard_similarity
 
 logger = logging.getLogger(__name__)
 
@@ -59,40 +61,15 @@ class ExtractedMemory:
 class MemoryPatternExtractor:
     """Pattern-based memory extraction using regex and heuristics"""
 
-    # Patterns for different types of memories
+    # Patterns for different types of memories (see services/memory_patterns.py)
     MEMORY_PATTERNS = {
-        MemoryCategory.PRIORITY: [
-            r"(?:i need|i must|i have to|important to me|my priority(?:ies)?)(?:\s+is|\s+are)\s+([^.!?]+)",
-            r"(?:let's\s+make\s+sure|we\s+should|don't\s+forget)\s+([^.!?]+)",
-            r"(?:my\s+goal(?:s)?|i\s+want\s+to|i\s+plan\s+to)\s+([^.!?]+)"
-        ],
-        MemoryCategory.DECISION: [
-            r"(?:i've\s+decided|i\s+decide|we've\s+decided|let's\s+go\s+with)\s+([^.!?]+)",
-            r"(?:the\s+decision\s+is|final\s+decision|i'm\s+choosing)\s+([^.!?]+)",
-            r"(?:we'll|i'll|i\s+will)\s+([^.!?]+)(?:\s+instead|\s+rather)"
-        ],
-        MemoryCategory.PREFERENCE: [
-            r"(?:i\s+prefer|i\s+like|i'd\s+rather|i\s+enjoy)\s+([^.!?]+)",
-            r"(?:my\s+preference(?:s)?|(?:i'm|i\s+am)\s+comfortable\s+with)\s+([^.!?]+)",
-            r"(?:don't\s+(?:want|like)|avoid)\s+([^.!?]+)"
-        ],
-        MemoryCategory.CONTEXT: [
-            r"(?:background\s+info|context|for\s+reference|fyi)\s*:\s*([^.!?]+)",
-            r"(?:remember\s+that|keep\s+in\s+mind|it's\s+important\s+to\s+note)\s+([^.!?]+)",
-            r"(?:just\s+so\s+you\s+know|for\s+context)\s*,?\s*([^.!?]+)"
-        ],
-        MemoryCategory.RELATIONSHIP: [
-            r"(?:([A-Z][a-z]+\s+[A-Z][a-z]+)\s+(?:is\s+my|works\s+with|reports\s+to|manages))\s*([^.!?]+)",
-            r"(?:my\s+(?:boss|manager|colleague|friend|partner))\s*([^.!?]+)",
-            r"(?:we\s+(?:work\s+together|collaborate|report)\s+(?:with|to))\s*([^.!?]+)"
-        ],
-        MemoryCategory.GOAL: [
-            r"(?:my\s+goal(?:s)?|objective(?:s)?|target(?:s)?)\s+(?:is|are)\s+([^.!?]+)",
-            r"(?:i\s+aim\s+to|i\s+plan\s+to|i\s+want\s+to\s+achieve)\s+([^.!?]+)",
-            r"(?:by\s+(?:next\s+week|this\s+month|the\s+end\s+of))\s*,?\s*i\s+([^.!?]+)"
-        ]
+        MemoryCategory(category): patterns
+        for category, patterns in memory_patterns.MEMORY_PATTERNS.items()
     }
 
+    # Compiled once: every message is scanned a single time for all patterns
+    _engine = memory_patterns.MemoryPatternEngine(MEMORY_PATTERNS)
+
     @classmethod
     def extract_from_messages(cls, messages: List[Dict[str, Any]]) -> List[ExtractedMemory]:
         """Extract memories using pattern matching"""
@@ -105,30 +82,27 @@ class MemoryPatternExtractor:
             content = message.get('content', '')
             message_id = message.get('id')
 
-            for category, patterns in cls.MEMORY_PATTERNS.items():
-                for pattern in patterns:
-                    matches = re.finditer(pattern, content, re.IGNORECASE)
-                    for match in matches:
-                        fact = match.group(1).strip()
-
-                        # Quality filters
-                        if cls._is_valid_memory_fact(fact):
-                            confidence = cls._calculate_pattern_confidence(fact, category, content)
-
-                            if confidence >= EXTRACTION_CONFIDENCE_THRESHOLD:
-                                memory = ExtractedMemory(
-                                    fact=fact,
-                                    category=category,
-                                    confidence=confidence,
-                                    source_message_id=message_id,
-                                    evidence=[match.group(0)],
-                                    extraction_method='pattern',
-                                    metadata={
-                                        'pattern': pattern,
-                                        'original_text': match.group(0)
-                                    }
-                                )
-                                extracted.append(memory)
+            for match in cls._engine.scan(content):
+                fact = match.fact
+
+                # Quality filters
+                if cls._is_valid_memory_fact(fact):
+                    confidence = cls._calculate_pattern_confidence(fact, match.category, content)
+
+                    if confidence >= EXTRACTION_CONFIDENCE_THRESHOLD:
+                        memory = ExtractedMemory(
+                            fact=fact,
+                            category=match.category,
+                            confidence=confidence,
+                            source_message_id=message_id,
+                            evidence=[match.text],
+                            extraction_method='pattern',
+                            metadata={
+                                'pattern': match.pattern,
+                                'original_text': match.text
+                            }
+                        )
+                        extracted.append(memory)
 
         return cls._deduplicate_memories(extracted)
 
@@ -142,18 +116,7 @@ class MemoryPatternExtractor:
             return False
 
         # Check for meaningful content
-        meaningful_patterns = [
-            r'\b(?:need|want|prefer|decide|plan|goal|remember)\b',
-            r'\b(?:important|priority|critical|essential)\b',
-            r'\b(?:boss|manager|colleague|friend|family)\b'
-        ]
-
-        has_meaningful_content = any(
-            re.search(pattern, fact, re.IGNORECASE)
-            for pattern in meaningful_patterns
-        )
-
-        return has_meaningful_content
+        return memory_patterns.has_meaningful_content(fact)
 
     @classmethod
     def _calculate_pattern_confidence(cls, fact: str, category: MemoryCategory, context: str) -> float:
@@ -193,38 +156,22 @@ class MemoryPatternExtractor:
     def _deduplicate_memories(cls, memories: List[ExtractedMemory]) -> List[ExtractedMemory]:
         """Remove duplicate memories based on similar content"""
         unique = []
-        seen_facts = set()
+        seen = NearDuplicateIndex()
 
         for memory in memories:
-            # Normalize fact for comparison
-            normalized_fact = memory.fact.lower().strip()
-
-            # Simple similarity check
-            is_duplicate = False
-            for seen_fact in seen_facts:
-                if cls._calculate_similarity(normalized_fact, seen_fact) > 0.8:
-                    is_duplicate = True
-                    break
+            # Only LSH candidates are compared, not every fact seen so far
+            is_duplicate = any(similarity > 0.8 for _, similarity in seen.query(memory.fact))
 
             if not is_duplicate:
+                seen.add(len(unique), memory.fact)
                 unique.append(memory)
-                seen_facts.add(normalized_fact)
 
         return unique
 
     @classmethod
     def _calculate_similarity(cls, text1: str, text2: str) -> float:
         """Calculate simple text similarity"""
-        words1 = set(text1.split())
-        words2 = set(text2.split())
-
-        if not words1 or not words2:
-            return 0.0
-
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
-
-        return len(intersection) / len(union)
+        return jaccard_similarity(text1, text2)
 
 class LLMMemoryExtractor:
     """LLM-based memory extraction using OpenAI-compatible API"""
@@ -279,6 +226,67 @@ class LLMMemoryExtractor:
             logger.error(f"LLM memory extraction failed: {e}")
             return []
 
+    async def extract_memories_batch(
+        self,
+        conversations: List[Any]
+    ) -> Optional[Dict[str, List[ExtractedMemory]]]:
+        """
+        Extract memories from several conversations with one LLM call
+
+        Args:
+            conversations: Objects with conversation_id and messages (see
+                services.batch_memory_extraction.ConversationRecord)
+
+        Returns:
+            Memories by conversation ID, or None if the LLM call failed
+        """
+        if not conversations:
+            return {}
+
+        try:
+            sections = [
+                f"### Conversation {index}\n{self._format_conversation(conversation.messages)}"
+                for index, conversation in enumerate(conversations, start=1)
+            ]
+            prompt = self._create_extraction_prompt("\n\n".join(sections))
+            prompt += (
+                f"\n\nThe text above contains {len(conversations)} separate conversations. "
+                "Return a single JSON array and add a \"conversation\" field with the "
+                "conversation number to every memory."
+            )
+
+            # The OpenAI client is synchronous; keep the event loop free for other batches
+            response = await asyncio.to_thread(
+                self.client.chat.completions.create,
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": self._get_system_prompt()},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=DEFAULT_TEMPERATURE,
+                max_tokens=DEFAULT_MAX_TOKENS * min(len(conversations), 4)
+            )
+            items = self._extract_json_array(response.choices[0].message.content)
+            if items is None:
+                return None
+
+            results = {conversation.conversation_id: [] for conversation in conversations}
+            for item in items:
+                try:
+                    conversation = conversations[int(item.get('conversation', 1)) - 1]
+                except (TypeError, ValueError, IndexError):
+                    logger.warning(f"Dropping memory with unknown conversation: {item.get('conversation')}")
+                    continue
+                memory = self._parse_memory_item(item, conversation.messages)
+                if memory:
+                    results[conversation.conversation_id].append(memory)
+
+            return results
+
+        except Exception as e:
+            logger.error(f"Batch LLM memory extraction failed for {len(conversations)} conversations: {e}")
+            return None
+
     def _format_conversation(self, messages: List[Dict[str, Any]]) -> str:
         """Format conversation for LLM analysis"""
         formatted = []
@@ -360,60 +368,74 @@ Extract only information that is likely to be useful in future conversations."""
 
     def _parse_llm_response(self, response: str, messages: List[Dict[str, Any]]) -> List[ExtractedMemory]:
         """Parse LLM response into ExtractedMemory objects"""
+        extracted_data = self._extract_json_array(response)
+        if not extracted_data:
+            return []
+
+        memories = []
+        for item in extracted_data:
+            memory = self._parse_memory_item(item, messages)
+            if memory:
+                memories.append(memory)
+
+        return memories
+
+    def _extract_json_array(self, response: str) -> Optional[List[Dict[str, Any]]]:
+        """Extract the JSON array of memory items from an LLM response (None if unparseable)"""
         try:
             # Try to extract JSON from response
             json_match = re.search(r'\[.*\]', response, re.DOTALL)
             if not json_match:
                 logger.warning("No JSON found in LLM response")
-                return []
+                return None
 
-            json_str = json_match.group(0)
-            extracted_data = json.loads(json_str)
-
-            memories = []
-            for item in extracted_data:
-                try:
-                    # Validate category
-                    category_str = item.get('category', '').lower()
-                    try:
-                        category = MemoryCategory(category_str)
-                    except ValueError:
-                        category = MemoryCategory.CONTEXT  # Default category
-
-                    # Validate confidence
-                    confidence = float(item.get('confidence', 0.7))
-                    confidence = max(0.0, min(1.0, confidence))
-
-                    # Find source message
-                    evidence = item.get('evidence', [])
-                    source_message_id = self._find_source_message(evidence, messages)
-
-                    memory = ExtractedMemory(
-                        fact=item.get('fact', ''),
-                        category=category,
-                        confidence=confidence,
-                        source_message_id=source_message_id,
-                        evidence=evidence,
-                        extraction_method='llm',
-                        metadata={
-                            'llm_model': self.model,
-                            'raw_response': item
-                        }
-                    )
-                    memories.append(memory)
-
-                except Exception as e:
-                    logger.warning(f"Failed to parse memory item: {e}")
-                    continue
-
-            return memories
+            return json.loads(json_match.group(0))
 
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse LLM response as JSON: {e}")
-            return []
+            return None
         except Exception as e:
             logger.error(f"Error parsing LLM response: {e}")
-            return []
+            return None
+
+    def _parse_memory_item(
+        self,
+        item: Dict[str, Any],
+        messages: List[Dict[str, Any]]
+    ) -> Optional[ExtractedMemory]:
+        """Convert one LLM memory item into an ExtractedMemory (None if invalid)"""
+        try:
+            # Validate category
+            category_str = item.get('category', '').lower()
+            try:
+                category = MemoryCategory(category_str)
+            except ValueError:
+                category = MemoryCategory.CONTEXT  # Default category
+
+            # Validate confidence
+            confidence = float(item.get('confidence', 0.7))
+            confidence = max(0.0, min(1.0, confidence))
+
+            # Find source message
+            evidence = item.get('evidence', [])
+            source_message_id = self._find_source_message(evidence, messages)
+
+            return ExtractedMemory(
+                fact=item.get('fact', ''),
+                category=category,
+                confidence=confidence,
+                source_message_id=source_message_id,
+                evidence=evidence,
+                extraction_method='llm',
+                metadata={
+                    'llm_model': self.model,
+                    'raw_response': item
+                }
+            )
+
+        except Exception as e:
+            logger.warning(f"Failed to parse memory item: {e}")
+            return None
 
     def _find_source_message(self, evidence: List[str], messages: List[Dict[str, Any]]) -> Optional[str]:
         """Find the source message ID from evidence"""
@@ -467,7 +489,7 @@ class MemoryExtractionService:
 
             # Filter by confidence and create memory requests
             memory_requests = []
-            for memory in unique_memories:
+            for memory in self._select_memories(unique_memories):
                 if memory.confidence >= EXTRACTION_CONFIDENCE_THRESHOLD:
                     request = CreateMemoryRequest(
                         user_id=context.user_id,
@@ -486,12 +508,6 @@ class MemoryExtractionService:
                     )
                     memory_requests.append(request)
 
-            # Limit to avoid overwhelming the user
-            if len(memory_requests) > CONVERSATION_MEMORY_LIMIT:
-                # Sort by confidence and take the top ones
-                memory_requests.sort(key=lambda x: x.confidence, reverse=True)
-                memory_requests = memory_requests[:CONVERSATION_MEMORY_LIMIT]
-
             # Create memories
             created_memories = []
             for request in memory_requests:
@@ -507,6 +523,49 @@ class MemoryExtractionService:
             logger.error(f"Memory extraction failed: {e}")
             return []
 
+    async def extract_memories_batch(
+        self,
+        conversations: List[Any]
+    ) -> Optional[Dict[str, List[ExtractedMemory]]]:
+        """
+        Extract memories from several conversations without storing them
+
+        Pattern extraction runs per conversation; the LLM sees all of the
+        conversations in one prompt. Storage is left to the caller so batch
+        jobs can bulk insert (see services.batch_memory_extraction).
+
+        Args:
+            conversations: Objects with conversation_id and messages
+
+        Returns:
+            Selected memories by conversation ID, or None if the LLM call failed
+        """
+        llm_results = await self.llm_extractor.extract_memories_batch(conversations)
+        if llm_results is None:
+            return None
+
+        results = {}
+        for conversation in conversations:
+            pattern_memories = self.pattern_extractor.extract_from_messages(conversation.messages)
+            unique_memories = self._merge_and_deduplicate_memories(
+                pattern_memories + llm_results.get(conversation.conversation_id, [])
+            )
+            results[conversation.conversation_id] = self._select_memories(unique_memories)
+
+        return results
+
+    def _select_memories(self, memories: List[ExtractedMemory]) -> List[ExtractedMemory]:
+        """Keep confident memories, at most CONVERSATION_MEMORY_LIMIT (highest confidence first)"""
+        selected = [m for m in memories if m.confidence >= EXTRACTION_CONFIDENCE_THRESHOLD]
+
+        # Limit to avoid overwhelming the user
+        if len(selected) > CONVERSATION_MEMORY_LIMIT:
+            # Sort by confidence and take the top ones
+            selected.sort(key=lambda m: m.confidence, reverse=True)
+            selected = selected[:CONVERSATION_MEMORY_LIMIT]
+
+        return selected
+
     def _merge_and_deduplicate_memories(
         self,
         memories: List[ExtractedMemory]
@@ -515,23 +574,23 @@ class MemoryExtractionService:
         if not memories:
             return []
 
-        # Group by similar content
+        # Group by similar content; the LSH index yields only the memories
+        # worth comparing, keyed by the group they were added to
         groups = []
-        for memory in memories:
-            added_to_group = False
-
-            for group in groups:
-                # Check if memory is similar to group
-                if any(
-                    self._calculate_similarity(memory.fact, existing.fact) > 0.7
-                    for existing in group
-                ):
-                    group.append(memory)
-                    added_to_group = True
-                    break
-
-            if not added_to_group:
+        index = NearDuplicateIndex()
+        for position, memory in enumerate(memories):
+            similar_groups = [
+                group_id for (group_id, _), similarity in index.query(memory.fact)
+                if similarity > 0.7
+            ]
+
+            if similar_groups:
+                group_id = min(similar_groups)
+                groups[group_id].append(memory)
+            else:
+                group_id = len(groups)
                 groups.append([memory])
+            index.add((group_id, position), memory.fact)
 
         # Select best memory from each group
         result = []
@@ -552,8 +611,7 @@ class MemoryExtractionService:
 
     def _calculate_similarity(self, text1: str, text2: str) -> float:
         """Calculate text similarity for deduplication"""
-        from MemoryPatternExtractor import MemoryPatternExtractor
-        return MemoryPatternExtractor._calculate_similarity(text1.lower(), text2.lower())
+        return jaccard_similarity(text1, text2)
 
 # Global extraction service instance
 _extraction_service = None
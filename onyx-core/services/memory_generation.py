@@ -0,0 +1,121 @@
+"""
+Memory Generation Tracker for ONYX Core
+
+Keeps a per-user memory generation counter in Redis. Every write to a user's
+memories or standing instructions bumps the counter, and caches derived from
+those memories (e.g. the memory injection cache) stamp their entries with the
+generation they were built from. An entry whose generation no longer matches
+is stale, so the caches can use long TTLs and still never serve context
+that predates a memory change, in any worker.
+"""
+
+import time
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from services.cache_manager import CacheManager
+
+logger = logging.getLogger(__name__)
+
+# Constants
+GENERATION_KEY_PREFIX = "onyx:memory:generation"
+GENERATION_REFRESH_SECONDS = 1.0  # How stale another worker's bump may be seen
+
+
+class MemoryGenerationTracker:
+    """Per-user memory generation counters shared through Redis"""
+
+    def __init__(self, cache_manager: Optional[CacheManager] = None):
+        """
+        Initialize the generation tracker
+
+        Args:
+            cache_manager: CacheManager for the shared counters (None for in-process only)
+        """
+        self.cache_manager = cache_manager
+
+        # user_id -> (generation, checked_at)
+        self._generations: Dict[str, Tuple[int, float]] = {}
+
+    async def get(self, user_id: str) -> int:
+        """
+        Get a user's current memory generation
+
+        Reads Redis at most every GENERATION_REFRESH_SECONDS per user; when
+        Redis is unavailable the last known (or locally bumped) value is used.
+
+        Args:
+            user_id: User UUID
+
+        Returns:
+            Current generation (0 if the user's memories were never written)
+        """
+        generation, checked_at = self._generations.get(user_id, (0, 0.0))
+        if self.cache_manager is None:
+            return generation
+
+        now = time.monotonic()
+        if now - checked_at >= GENERATION_REFRESH_SECONDS:
+            remote = await self.cache_manager.get_counter(self._key(user_id))
+            if remote is not None:
+                generation = remote
+            self._generations[user_id] = (generation, now)
+
+        return generation
+
+    async def bump(self, user_id: str) -> int:
+        """
+        Advance a user's memory generation, invalidating derived caches
+
+        Args:
+            user_id: User UUID
+
+        Returns:
+            New generation
+        """
+        generation, _ = self._generations.get(user_id, (0, 0.0))
+
+        remote = None
+        if self.cache_manager is not None:
+            remote = await self.cache_manager.increment(self._key(user_id))
+
+        generation = remote if remote is not None else generation + 1
+        self._generations[user_id] = (generation, time.monotonic())
+        logger.debug(f"Memory generation for user {user_id} bumped to {generation}")
+        return generation
+
+    def _key(self, user_id: str) -> str:
+        """Redis key for a user's generation counter"""
+        return f"{GENERATION_KEY_PREFIX}:{user_id}"
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get tracker statistics"""
+        return {
+            "tracked_users": len(self._generations),
+            "redis_enabled": self.cache_manager is not None,
+        }
+
+
+# Global memory generation tracker instance
+_memory_generation_tracker = None
+
+
+def get_memory_generation_tracker() -> MemoryGenerationTracker:
+    """Get or create the memory generation tracker"""
+    global _memory_generation_tracker
+    if _memory_generation_tracker is None:
+        try:
+            cache_manager = CacheManager()
+        except Exception as e:
+            logger.warning(f"Memory generation counters are process-local: {e}")
+            cache_manager = None
+        _memory_generation_tracker = MemoryGenerationTracker(cache_manager)
+    return _memory_generation_tracker
+
+
+async def bump_memory_generation(user_id: str) -> None:
+    """Invalidation hook fired when a user's memories or instructions change"""
+    try:
+        await get_memory_generation_tracker().bump(user_id)
+    except Exception as e:
+        logger.warning(f"Failed to bump memory generation for user {user_id}: {e}")
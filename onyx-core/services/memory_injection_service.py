@@ -10,15 +10,49 @@ Story 4-3: Memory Injection & Agent Integration
 import os
 import time
 import json
+import uuid
+from collections import OrderedDict
+from decimal import Decimal
 from typing import Optional, Dict, Any, List, Tuple
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import logging
-from dataclasses import dataclass
-import psycopg2
+from dataclasses import dataclass, asdict, replace
 from psycopg2.extras import RealDictCursor
 
+from services.analytics_writer import get_analytics_writer
+from services.cache_manager import CacheManager
+from services.db_pool import get_shared_pool
+from services.memory_generation import get_memory_generation_tracker
+from services.memory_vector_index import get_memory_vector_index
+
 logger = logging.getLogger(__name__)
 
+try:
+    from metrics import record_cache_operation
+except ImportError:  # pragma: no cover - metrics module optional in tooling
+    record_cache_operation = None
+
+# Constants
+# Entries are invalidated by memory generation, so the TTL only bounds how
+# stale the age labels ("3 days ago") in the injection text can get
+DEFAULT_CACHE_TTL_SECONDS = 3600
+DEFAULT_CACHE_MAX_SIZE = 1000
+REDIS_KEY_PREFIX = "onyx:memory:injection"
+DATETIME_FIELDS = ("created_at", "updated_at", "last_accessed_at", "expires_at")
+CONTEXT_MEMORY_COLUMNS = (
+    "id, user_id, fact, category, confidence, source_type, "
+    "created_at, access_count, last_accessed_at"
+)
+# Confidence/category prior used to rank context-aware memories
+PRIOR_SCORE_SQL = """(confidence * 0.4 +
+    COALESCE(access_count, 0) * 0.02 +
+    CASE WHEN category = 'priority' THEN 0.15 ELSE 0 END +
+    CASE WHEN category = 'decision' THEN 0.1 ELSE 0 END +
+    CASE WHEN category = 'goal' THEN 0.05 ELSE 0 END)"""
+DEFAULT_SEMANTIC_WEIGHT = 0.6
+DEFAULT_SEMANTIC_MIN_SCORE = 0.25
+SEMANTIC_CANDIDATE_MULTIPLIER = 3  # ANN candidates per requested memory, before re-scoring
+
 
 @dataclass
 class MemoryInjection:
@@ -38,6 +72,7 @@ class CachedInjection:
     injection: MemoryInjection
     timestamp: float
     ttl: int = 300  # 5 minutes TTL
+    generation: int = 0  # User memory generation the injection was built from
 
 
 class MemoryInjectionService:
@@ -45,24 +80,33 @@ class MemoryInjectionService:
 
     def __init__(self):
         """Initialize memory injection service"""
-        self.connection_string = self._build_connection_string()
-        self.cache = {}  # Simple in-memory cache
-        self.cache_ttl = 300  # 5 minutes
-        self.max_cache_size = 100
-
-    def _build_connection_string(self) -> str:
-        """Build PostgreSQL connection string"""
-        host = os.getenv("POSTGRES_HOST", "localhost")
-        port = os.getenv("POSTGRES_PORT", "5432")
-        database = os.getenv("POSTGRES_DB", "manus")
-        user = os.getenv("POSTGRES_USER", "manus")
-        password = os.getenv("POSTGRES_PASSWORD", "")
-        return f"host={host} port={port} dbname={database} user={user} password={password}"
-
-    def _get_connection(self):
-        """Get database connection"""
-        conn = psycopg2.connect(self.connection_string)
-        return conn
+        self.db_pool = get_shared_pool()
+        self.generations = get_memory_generation_tracker()
+        self.analytics = get_analytics_writer()
+        self.vector_index = get_memory_vector_index()
+        self.semantic_weight = float(os.getenv("MEMORY_SEMANTIC_WEIGHT", DEFAULT_SEMANTIC_WEIGHT))
+        self.semantic_min_score = float(os.getenv("MEMORY_SEMANTIC_MIN_SCORE", DEFAULT_SEMANTIC_MIN_SCORE))
+        self.cache: "OrderedDict[str, CachedInjection]" = OrderedDict()  # LRU, oldest first
+        self.cache_ttl = int(os.getenv("MEMORY_INJECTION_CACHE_TTL_SECONDS", DEFAULT_CACHE_TTL_SECONDS))
+        self.max_cache_size = int(os.getenv("MEMORY_INJECTION_CACHE_MAX_SIZE", DEFAULT_CACHE_MAX_SIZE))
+        self.cache_stats = {
+            "memory_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+        }
+
+        # Shared tier so any worker can serve a warm injection
+        self.shared_cache = None
+        if os.getenv("MEMORY_INJECTION_REDIS_CACHE", "true").lower() == "true":
+            try:
+                self.shared_cache = CacheManager()
+            except Exception as e:
+                logger.warning(f"Memory injection cache Redis tier disabled: {e}")
+
+    async def _get_connection(self):
+        """Check out a pooled database connection off the event loop (close() returns it to the pool)"""
+        return await self.db_pool.agetconn()
 
     # =========================================================================
     # Memory Injection Core Methods
@@ -87,20 +131,24 @@ class MemoryInjectionService:
         """
         start_time = time.time()
 
-        # Check cache first
+        # Check cache first (read the generation before the database so a
+        # concurrent memory write can only make the new entry stale, never hide)
         cache_key = f"{user_id}:{conversation_id}"
-        cached = self._get_cached_injection(cache_key)
+        generation = await self.generations.get(user_id)
+        cached = await self._lookup_injection(cache_key, generation)
         if cached:
             logger.debug(f"Using cached injection for user {user_id}")
-            cached.injection_time = int((time.time() - start_time) * 1000)
-            return cached.injection
+            return cached
 
+        conn = None
         try:
-            conn = self._get_connection()
+            db_start = time.perf_counter()
+            conn = await self._get_connection()
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 # Parallel fetch of instructions and memories
                 instructions = await self._get_top_standing_instructions(cur, user_id)
                 memories = await self._get_top_memories(cur, user_id, current_message)
+                database_time_ms = (time.perf_counter() - db_start) * 1000
 
                 # Format for LLM injection
                 injection_text = self._format_for_llm(instructions, memories)
@@ -117,37 +165,36 @@ class MemoryInjectionService:
                         "instructions_count": len(instructions),
                         "memories_count": len(memories),
                         "cache_hit": False,
-                        "database_time_ms": None  # Can be enhanced with timing
+                        "database_time_ms": round(database_time_ms, 2)
                     }
                 )
 
-                # Log injection for analytics
-                await self._log_injection(
-                    cur, user_id, conversation_id,
-                    len(memories), len(instructions),
-                    "chat", injection.injection_time, True, None
-                )
+                conn.commit()
 
-                # Cache the result
-                self._cache_injection(cache_key, injection)
+            # Return the connection before the Redis round trip below
+            conn.close()
+            conn = None
 
-                conn.commit()
-                return injection
+            # Log injection for analytics (buffered, written in the background)
+            self._log_injection(
+                user_id, conversation_id,
+                len(memories), len(instructions),
+                "chat", injection.injection_time, True, None
+            )
+
+            # Cache the result
+            self._cache_injection(cache_key, injection, generation)
+            await self._store_shared_injection(cache_key, injection, generation)
+            return injection
 
         except Exception as e:
             logger.error(f"Failed to prepare injection for user {user_id}: {e}")
             # Log failed injection
-            try:
-                conn = self._get_connection()
-                with conn.cursor() as cur:
-                    await self._log_injection(
-                        cur, user_id, conversation_id,
-                        0, 0, "chat", int((time.time() - start_time) * 1000),
-                        False, str(e)
-                    )
-                    conn.commit()
-            except:
-                pass
+            self._log_injection(
+                user_id, conversation_id,
+                0, 0, "chat", int((time.time() - start_time) * 1000),
+                False, str(e)
+            )
 
             # Return minimal injection on error
             return MemoryInjection(
@@ -164,6 +211,9 @@ class MemoryInjectionService:
                     "error": str(e)
                 }
             )
+        finally:
+            if conn:
+                conn.close()
 
     async def _get_top_standing_instructions(
         self,
@@ -193,32 +243,25 @@ class MemoryInjectionService:
         current_message: Optional[str] = None,
         limit: int = 5
     ) -> List[Dict[str, Any]]:
-        """Get top 5 memories using composite scoring algorithm"""
+        """
+        Get top memories by composite score
+
+        Ranks by the materialized rank_score (migration 009), which orders
+        memories exactly like the full score, so the (user_id, rank_score)
+        index yields the top K without scoring every memory; the age decay
+        term shared by all rows is applied at query time.
+        """
         try:
             cursor.execute(
                 """
-                WITH ranked_memories AS (
-                    SELECT
-                        id, user_id, fact, category, confidence, source_type,
-                        created_at, access_count, last_accessed_at,
-                        -- Composite scoring algorithm with configurable weights
-                        (confidence * 0.5 +
-                         EXTRACT(EPOCH FROM (NOW() - created_at)) / 86400.0 * -0.001 +
-                         COALESCE(access_count, 0) * 0.01 +
-                         CASE WHEN source_type = 'auto_summary' THEN 0.2 ELSE 0 END +
-                         CASE WHEN category = 'priority' THEN 0.1 ELSE 0 END +
-                         CASE WHEN category = 'decision' THEN 0.05 ELSE 0 END +
-                         CASE WHEN category = 'goal' THEN 0.03 ELSE 0 END
-                        ) as memory_score
-                    FROM user_memories
-                    WHERE user_id = %s
-                        AND is_deleted = FALSE
-                        AND (expires_at IS NULL OR expires_at > NOW())
-                )
                 SELECT id, user_id, fact, category, confidence, source_type,
-                       created_at, access_count, last_accessed_at, memory_score
-                FROM ranked_memories
-                ORDER BY memory_score DESC
+                       created_at, access_count, last_accessed_at,
+                       rank_score - EXTRACT(EPOCH FROM LOCALTIMESTAMP) / 86400.0 * 0.001 AS memory_score
+                FROM user_memories
+                WHERE user_id = %s
+                    AND is_deleted = FALSE
+                    AND (expires_at IS NULL OR expires_at > NOW())
+                ORDER BY rank_score DESC
                 LIMIT %s
                 """,
                 (user_id, limit)
@@ -305,39 +348,145 @@ class MemoryInjectionService:
     # Caching Methods
     # =========================================================================
 
-    def _get_cached_injection(self, cache_key: str) -> Optional[CachedInjection]:
-        """Get cached injection if not expired"""
-        if cache_key not in self.cache:
+    async def _lookup_injection(self, cache_key: str, generation: int) -> Optional[MemoryInjection]:
+        """
+        Look up a cached injection in the in-process tier, then the Redis tier
+
+        Args:
+            cache_key: "user_id:conversation_id"
+            generation: Current memory generation of the user
+
+        Returns:
+            Copy of the cached injection marked as a cache hit, or None on miss
+        """
+        cached = self._get_cached_injection(cache_key, generation)
+        tier = "memory"
+        if cached is None:
+            cached = await self._get_shared_injection(cache_key, generation)
+            tier = "redis"
+
+        if cached is None:
+            self.cache_stats["misses"] += 1
+            self._record("get", "miss")
             return None
 
-        cached = self.cache[cache_key]
-        if time.time() - cached.timestamp > cached.ttl:
+        self.cache_stats[f"{tier}_hits"] += 1
+        self._record("get", f"{tier}_hit")
+        stats = dict(cached.injection.performance_stats, cache_hit=True, cache_tier=tier)
+        return replace(cached.injection, performance_stats=stats)
+
+    def _get_cached_injection(self, cache_key: str, generation: int = 0) -> Optional[CachedInjection]:
+        """Get cached injection if not expired and built from the current memory generation"""
+        cached = self.cache.get(cache_key)
+        if cached is None:
+            return None
+
+        if time.time() - cached.timestamp > cached.ttl or cached.generation != generation:
             del self.cache[cache_key]
             return None
 
+        self.cache.move_to_end(cache_key)
         return cached
 
-    def _cache_injection(self, cache_key: str, injection: MemoryInjection):
-        """Cache injection with TTL"""
-        # Implement simple LRU eviction if cache is full
-        if len(self.cache) >= self.max_cache_size:
-            oldest_key = min(self.cache.keys(),
-                           key=lambda k: self.cache[k].timestamp)
-            del self.cache[oldest_key]
+    def _cache_injection(self, cache_key: str, injection: MemoryInjection, generation: int = 0):
+        """Cache injection with TTL, stamped with the memory generation it was built from"""
+        if self.max_cache_size <= 0:
+            return
 
         self.cache[cache_key] = CachedInjection(
             injection=injection,
             timestamp=time.time(),
+            ttl=self.cache_ttl,
+            generation=generation
+        )
+        self.cache.move_to_end(cache_key)
+
+        # Evict least recently used entries
+        while len(self.cache) > self.max_cache_size:
+            self.cache.popitem(last=False)
+            self.cache_stats["evictions"] += 1
+            self._record("evict", "lru")
+
+    async def _get_shared_injection(self, cache_key: str, generation: int) -> Optional[CachedInjection]:
+        """Get an injection from the Redis tier, promoting it into the in-process tier"""
+        if self.shared_cache is None:
+            return None
+
+        data = await self.shared_cache.get(self._shared_key(cache_key, generation))
+        if not isinstance(data, dict):
+            return None
+
+        try:
+            injection = self._injection_from_dict(data)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cached injection {cache_key}: {e}")
+            return None
+
+        self._cache_injection(cache_key, injection, generation)
+        return CachedInjection(injection, time.time(), self.cache_ttl, generation)
+
+    async def _store_shared_injection(self, cache_key: str, injection: MemoryInjection, generation: int):
+        """Store an injection in the Redis tier"""
+        if self.shared_cache is None:
+            return
+        await self.shared_cache.set(
+            self._shared_key(cache_key, generation),
+            self._injection_to_dict(injection),
             ttl=self.cache_ttl
         )
 
+    def _shared_key(self, cache_key: str, generation: int) -> str:
+        """Redis key for an injection (the generation makes stale entries unreachable)"""
+        user_id, _, conversation_id = cache_key.partition(":")
+        return f"{REDIS_KEY_PREFIX}:{user_id}:{generation}:{conversation_id}"
+
+    def _injection_to_dict(self, injection: MemoryInjection) -> Dict[str, Any]:
+        """Serialize an injection to JSON-safe types"""
+
+        def to_json(value):
+            if isinstance(value, dict):
+                return {k: to_json(v) for k, v in value.items()}
+            if isinstance(value, (list, tuple)):
+                return [to_json(v) for v in value]
+            if isinstance(value, (datetime, date)):
+                return value.isoformat()
+            if isinstance(value, Decimal):
+                return float(value)
+            if isinstance(value, uuid.UUID):
+                return str(value)
+            return value
+
+        return to_json(asdict(injection))
+
+    def _injection_from_dict(self, data: Dict[str, Any]) -> MemoryInjection:
+        """Rebuild an injection from its serialized form"""
+        injection = MemoryInjection(**data)
+        # The Redis tier stores datetimes as ISO strings
+        for item in injection.memories + injection.standing_instructions:
+            for field_name in DATETIME_FIELDS:
+                value = item.get(field_name)
+                if isinstance(value, str):
+                    try:
+                        item[field_name] = datetime.fromisoformat(value)
+                    except ValueError:
+                        pass
+        return injection
+
+    def _record(self, operation: str, status: str) -> None:
+        """Export a cache operation through the metrics module"""
+        if record_cache_operation is None:
+            return
+        try:
+            record_cache_operation("memory_injection", operation, status)
+        except Exception as e:
+            logger.debug(f"Failed to record memory injection cache metric: {e}")
+
     # =========================================================================
     # Analytics and Logging
     # =========================================================================
 
-    async def _log_injection(
+    def _log_injection(
         self,
-        cursor,
         user_id: str,
         conversation_id: str,
         memories_count: int,
@@ -347,17 +496,11 @@ class MemoryInjectionService:
         success: bool,
         error_message: Optional[str]
     ):
-        """Log injection event for analytics"""
+        """Queue an injection event for the analytics writer"""
         try:
-            cursor.execute(
-                """
-                INSERT INTO memory_injection_logs (
-                    user_id, conversation_id, memories_count, injection_type,
-                    performance_ms, success, error_message
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """,
-                (user_id, conversation_id, memories_count + instructions_count,
-                 injection_type, performance_ms, success, error_message)
+            self.analytics.record_injection(
+                user_id, conversation_id, memories_count + instructions_count,
+                injection_type, performance_ms, success, error_message
             )
         except Exception as e:
             logger.error(f"Failed to log injection: {e}")
@@ -368,8 +511,9 @@ class MemoryInjectionService:
         days: int = 7
     ) -> Dict[str, Any]:
         """Get injection analytics for user"""
+        conn = None
         try:
-            conn = self._get_connection()
+            conn = await self._get_connection()
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute(
                     """
@@ -403,11 +547,26 @@ class MemoryInjectionService:
         except Exception as e:
             logger.error(f"Failed to get injection analytics: {e}")
             return {"error": str(e)}
+        finally:
+            if conn:
+                conn.close()
 
     def _get_cache_hit_rate(self) -> float:
-        """Calculate cache hit rate"""
-        # This is a simplified version - can be enhanced with actual hit tracking
-        return len(self.cache) / max(self.max_cache_size, 1) * 100
+        """Calculate cache hit rate (percent of lookups served from either tier)"""
+        hits = self.cache_stats["memory_hits"] + self.cache_stats["redis_hits"]
+        lookups = hits + self.cache_stats["misses"]
+        return hits / lookups * 100 if lookups else 0.0
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get injection cache statistics"""
+        return {
+            **self.cache_stats,
+            "hit_rate": round(self._get_cache_hit_rate(), 2),
+            "size": len(self.cache),
+            "max_size": self.max_cache_size,
+            "ttl_seconds": self.cache_ttl,
+            "redis_enabled": self.shared_cache is not None,
+        }
 
     # =========================================================================
     # Context-Aware Filtering
@@ -423,49 +582,46 @@ class MemoryInjectionService:
         """
         Get memories filtered by conversation context
         Enhanced for better relevance scoring
+
+        Relevant memories come from one filtered ANN lookup in the memory
+        vector index, re-scored by blending similarity with the confidence/
+        category prior. Keyword matching is the fallback when the index is
+        unavailable or finds nothing.
         """
+        # Semantic candidates (None when the vector index is unavailable)
+        candidates = await self.vector_index.search(
+            user_id, current_message, limit * SEMANTIC_CANDIDATE_MULTIPLIER, self.semantic_min_score
+        )
+
+        conn = None
         try:
-            conn = self._get_connection()
+            conn = await self._get_connection()
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                if candidates:
+                    memories = self._rank_semantic_candidates(cur, user_id, candidates, limit)
+                    if memories:
+                        return memories
+
                 # Extract keywords from current message for semantic matching
                 keywords = self._extract_keywords(current_message)
 
                 if keywords:
-                    # Build semantic search query
-                    keyword_conditions = []
-                    params = [user_id]
-
-                    for keyword in keywords[:5]:  # Limit to top 5 keywords
-                        keyword_conditions.append("fact ILIKE %s")
-                        params.append(f"%{keyword}%")
-
-                    where_clause = " OR ".join(keyword_conditions)
+                    # Prefix match any of the top 5 keywords; the expression
+                    # matches the idx_memories_search GIN index (migration 005)
+                    ts_query = " | ".join(f"{keyword}:*" for keyword in keywords[:5])
 
                     cur.execute(
                         f"""
-                        WITH semantic_memories AS (
-                            SELECT id, user_id, fact, category, confidence, source_type,
-                                   created_at, access_count, last_accessed_at,
-                                   -- Boost score for keyword matches
-                                   (confidence * 0.4 +
-                                    access_count * 0.02 +
-                                    CASE WHEN category = 'priority' THEN 0.15 ELSE 0 END +
-                                    CASE WHEN category = 'decision' THEN 0.1 ELSE 0 END +
-                                    CASE WHEN category = 'goal' THEN 0.05 ELSE 0 END
-                                   ) as relevance_score
-                            FROM user_memories
-                            WHERE user_id = %s
-                                AND is_deleted = FALSE
-                                AND ({where_clause})
-                                AND (expires_at IS NULL OR expires_at > NOW())
-                        )
-                        SELECT id, user_id, fact, category, confidence, source_type,
-                               created_at, access_count, last_accessed_at, relevance_score
-                        FROM semantic_memories
+                        SELECT {CONTEXT_MEMORY_COLUMNS}, {PRIOR_SCORE_SQL} as relevance_score
+                        FROM user_memories
+                        WHERE user_id = %s
+                            AND is_deleted = FALSE
+                            AND to_tsvector('english', fact) @@ to_tsquery('english', %s)
+                            AND (expires_at IS NULL OR expires_at > NOW())
                         ORDER BY relevance_score DESC
                         LIMIT %s
                         """,
-                        params + [limit]
+                        (user_id, ts_query, limit)
                     )
                 else:
                     # Fallback to standard top memories
@@ -477,6 +633,55 @@ class MemoryInjectionService:
         except Exception as e:
             logger.error(f"Failed to get context-aware memories: {e}")
             return []
+        finally:
+            if conn:
+                conn.close()
+
+    def _rank_semantic_candidates(
+        self,
+        cursor,
+        user_id: str,
+        candidates: List[Tuple[str, float]],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Load live ANN candidates and blend similarity with the memory prior
+
+        Args:
+            cursor: Database cursor
+            user_id: User UUID
+            candidates: (memory_id, similarity) pairs from the vector index
+            limit: Maximum memories to return
+
+        Returns:
+            Memories with similarity and relevance_score, best first
+        """
+        similarity = dict(candidates)
+        # The database stays the source of truth for deletion and expiry
+        cursor.execute(
+            f"""
+            SELECT {CONTEXT_MEMORY_COLUMNS}, {PRIOR_SCORE_SQL} as prior_score
+            FROM user_memories
+            WHERE id = ANY(%s::uuid[])
+                AND user_id = %s
+                AND is_deleted = FALSE
+                AND (expires_at IS NULL OR expires_at > NOW())
+            """,
+            (list(similarity), user_id)
+        )
+
+        memories = []
+        for row in cursor.fetchall():
+            memory = dict(row)
+            memory["similarity"] = similarity.get(str(memory["id"]), 0.0)
+            memory["relevance_score"] = (
+                self.semantic_weight * memory["similarity"] +
+                (1 - self.semantic_weight) * float(memory.pop("prior_score") or 0)
+            )
+            memories.append(memory)
+
+        memories.sort(key=lambda m: m["relevance_score"], reverse=True)
+        return memories[:limit]
 
     def _extract_keywords(self, text: str) -> List[str]:
         """Extract keywords from text for semantic matching"""
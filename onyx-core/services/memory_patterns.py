@@ -0,0 +1,212 @@
+"""
+Memory Pattern Engine for ONYX Core
+
+Single-pass regex extraction for MemoryPatternExtractor. The per-category
+memory patterns are compiled once into one alternation in which every
+pattern is a named group, so a message is scanned a single time and the
+group that matched identifies the pattern (and with it the category).
+
+Two cheap guards keep the scan close to regex-engine speed:
+- Matches must start at a word boundary, so the alternation is only tried
+  at the start of words
+- A lookahead on the characters any pattern can start with (derived from
+  the patterns themselves) skips words that cannot start a memory
+
+Like any single regex, the scan returns non-overlapping matches: where two
+patterns match at the same position the one listed first wins, so the
+pattern table is ordered by category priority.
+"""
+
+import re
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Patterns for different types of memories, by category (listed in priority order)
+MEMORY_PATTERNS: Dict[str, List[str]] = {
+    "priority": [
+        r"(?:i need|i must|i have to|important to me|my priority(?:ies)?)(?:\s+is|\s+are)\s+([^.!?]+)",
+        r"(?:let's\s+make\s+sure|we\s+should|don't\s+forget)\s+([^.!?]+)",
+        r"(?:my\s+goal(?:s)?|i\s+want\s+to|i\s+plan\s+to)\s+([^.!?]+)"
+    ],
+    "decision": [
+        r"(?:i've\s+decided|i\s+decide|we've\s+decided|let's\s+go\s+with)\s+([^.!?]+)",
+        r"(?:the\s+decision\s+is|final\s+decision|i'm\s+choosing)\s+([^.!?]+)",
+        r"(?:we'll|i'll|i\s+will)\s+([^.!?]+)(?:\s+instead|\s+rather)"
+    ],
+    "preference": [
+        r"(?:i\s+prefer|i\s+like|i'd\s+rather|i\s+enjoy)\s+([^.!?]+)",
+        r"(?:my\s+preference(?:s)?|(?:i'm|i\s+am)\s+comfortable\s+with)\s+([^.!?]+)",
+        r"(?:don't\s+(?:want|like)|avoid)\s+([^.!?]+)"
+    ],
+    "context": [
+        r"(?:background\s+info|context|for\s+reference|fyi)\s*:\s*([^.!?]+)",
+        r"(?:remember\s+that|keep\s+in\s+mind|it's\s+important\s+to\s+note)\s+([^.!?]+)",
+        r"(?:just\s+so\s+you\s+know|for\s+context)\s*,?\s*([^.!?]+)"
+    ],
+    "relationship": [
+        r"(?:([A-Z][a-z]+\s+[A-Z][a-z]+)\s+(?:is\s+my|works\s+with|reports\s+to|manages))\s*([^.!?]+)",
+        r"(?:my\s+(?:boss|manager|colleague|friend|partner))\s*([^.!?]+)",
+        r"(?:we\s+(?:work\s+together|collaborate|report)\s+(?:with|to))\s*([^.!?]+)"
+    ],
+    "goal": [
+        r"(?:my\s+goal(?:s)?|objective(?:s)?|target(?:s)?)\s+(?:is|are)\s+([^.!?]+)",
+        r"(?:i\s+aim\s+to|i\s+plan\s+to|i\s+want\s+to\s+achieve)\s+([^.!?]+)",
+        r"(?:by\s+(?:next\s+week|this\s+month|the\s+end\s+of))\s*,?\s*i\s+([^.!?]+)"
+    ]
+}
+
+# A fact is worth keeping only if it mentions one of these
+MEANINGFUL_CONTENT_PATTERN = re.compile(
+    r"\b(?:need|want|prefer|decide|plan|goal|remember"
+    r"|important|priority|critical|essential"
+    r"|boss|manager|colleague|friend|family)\b",
+    re.IGNORECASE
+)
+
+
+@dataclass
+class PatternMatch:
+    """A memory pattern match in a message"""
+    category: Any
+    fact: str  # First capture group of the pattern
+    text: str  # Whole matched text
+    pattern: str
+
+
+def has_meaningful_content(fact: str) -> bool:
+    """Check whether a fact mentions a need, preference, plan, priority or person"""
+    return MEANINGFUL_CONTENT_PATTERN.search(fact) is not None
+
+
+def _leading_chars(pattern: str) -> Optional[Set[str]]:
+    """
+    Characters a pattern can start with
+
+    Args:
+        pattern: Regular expression source
+
+    Returns:
+        Set of possible first characters, or None if any character could be
+        first (or the pattern is too complex to tell)
+    """
+    try:
+        from re import _constants as sre_constants, _parser as sre_parse
+    except ImportError:  # pragma: no cover - Python < 3.11
+        return None
+
+    def first(items) -> Optional[Set[str]]:
+        for op, av in items:
+            if op is sre_constants.AT:
+                continue  # Zero-width anchor, look at the next item
+            if op is sre_constants.LITERAL:
+                return {chr(av)}
+            if op is sre_constants.IN:
+                chars = set()
+                for item_op, item_av in av:
+                    if item_op is sre_constants.LITERAL:
+                        chars.add(chr(item_av))
+                    elif item_op is sre_constants.RANGE and item_av[1] - item_av[0] < 128:
+                        chars.update(chr(c) for c in range(item_av[0], item_av[1] + 1))
+                    else:
+                        return None
+                return chars
+            if op is sre_constants.SUBPATTERN:
+                sub = av[-1]
+                return first(sub) if sub.getwidth()[0] > 0 else None
+            if op is sre_constants.BRANCH:
+                chars = set()
+                for branch in av[1]:
+                    branch_chars = first(branch) if branch.getwidth()[0] > 0 else None
+                    if branch_chars is None:
+                        return None
+                    chars |= branch_chars
+                return chars
+            if op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and av[0] > 0:
+                return first(av[2])
+            return None
+        return None
+
+    try:
+        return first(sre_parse.parse(pattern))
+    except Exception:
+        return None
+
+
+class MemoryPatternEngine:
+    """Compiled single-pass matcher over a table of memory patterns"""
+
+    def __init__(self, patterns: Dict[Any, List[str]]):
+        """
+        Compile the pattern table into one regex
+
+        Args:
+            patterns: Category -> regex sources; each pattern's first capture
+                group is the memory fact
+        """
+        self._patterns: List[str] = []
+        self._categories: List[Any] = []
+        self._fact_groups: Dict[str, int] = {}
+
+        alternatives = []
+        leading: Optional[Set[str]] = set()
+        for category, category_patterns in patterns.items():
+            for pattern in category_patterns:
+                alternatives.append(f"(?P<p{len(self._patterns)}>{pattern})")
+                self._patterns.append(pattern)
+                self._categories.append(category)
+
+                chars = _leading_chars(pattern)
+                leading = leading | chars if leading is not None and chars is not None else None
+
+        lookahead = ""
+        if leading:
+            lookahead = "(?=[" + "".join(re.escape(c) for c in sorted(leading)) + "])"
+
+        self.regex = re.compile(rf"\b{lookahead}(?:{'|'.join(alternatives)})", re.IGNORECASE)
+
+        # Each pattern's fact is the first group inside its named wrapper group
+        for name, index in self.regex.groupindex.items():
+            pattern_index = int(name[1:])
+            has_groups = re.compile(self._patterns[pattern_index]).groups > 0
+            self._fact_groups[name] = index + 1 if has_groups else index
+
+        logger.debug(f"Compiled {len(self._patterns)} memory patterns into one regex")
+
+    @property
+    def pattern_count(self) -> int:
+        return len(self._patterns)
+
+    def scan(self, content: str) -> Iterator[PatternMatch]:
+        """
+        Find memory pattern matches in a message with one regex scan
+
+        Args:
+            content: Message text
+
+        Yields:
+            PatternMatch for every match, in text order
+        """
+        for match in self.regex.finditer(content):
+            name = match.lastgroup  # The named wrapper closes last
+            pattern_index = int(name[1:])
+            yield PatternMatch(
+                category=self._categories[pattern_index],
+                fact=(match.group(self._fact_groups[name]) or "").strip(),
+                text=match.group(0),
+                pattern=self._patterns[pattern_index],
+            )
+
+
+# Global pattern engine instance
+_memory_pattern_engine = None
+
+
+def get_memory_pattern_engine() -> MemoryPatternEngine:
+    """Get or create the engine for the default memory patterns"""
+    global _memory_pattern_engine
+    if _memory_pattern_engine is None:
+        _memory_pattern_engine = MemoryPatternEngine(MEMORY_PATTERNS)
+    return _memory_pattern_engine
@@ -2,7 +2,9 @@
 Memory Service for ONYX
 
 This service provides CRUD operations for user memories with categorization,
-confidence scoring, and search functionality.
+confidence scoring, and search functionality. Database access goes through a
+pooled asyncpg backend (see services/db_pool.py) so memory API calls never
+block the event loop.
 """
 
 import os
@@ -10,55 +12,72 @@ import re
 import uuid
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
-import psycopg2
-from psycopg2.extras import RealDictCursor, Json
 import logging
 
+import asyncpg
+
+from services.analytics_writer import get_analytics_writer
+from services.db_pool import InstrumentedPool, PoolConfig, build_postgres_dsn, init_json_codecs
+from services.memory_dedup import jaccard_similarity, lsh_bands
+from services.memory_generation import bump_memory_generation
+from services.memory_vector_index import get_memory_vector_index
+
 logger = logging.getLogger(__name__)
 
+# Near-duplicate detection (see services/memory_dedup.py)
+DUPLICATE_SIMILARITY_THRESHOLD = float(os.getenv("MEMORY_DUPLICATE_THRESHOLD", "0.8"))
+DUPLICATE_CANDIDATE_LIMIT = 20
+
+# Columns returned for a memory record
+MEMORY_COLUMNS = """
+    id, user_id, fact, category, confidence, source_type,
+    source_message_id, conversation_id, metadata, expires_at,
+    access_count, last_accessed_at, is_deleted, created_at, updated_at
+"""
+
 
 class MemoryService:
     """Service for memory CRUD operations and management"""
 
     def __init__(self):
-        """Initialize memory service with database connection"""
-        self.connection_string = self._build_connection_string()
-        self.conn = None
-
-    def _build_connection_string(self) -> str:
-        """Build PostgreSQL connection string from environment variables"""
-        host = os.getenv("POSTGRES_HOST", "localhost")
-        port = os.getenv("POSTGRES_PORT", "5432")
-        database = os.getenv("POSTGRES_DB", "manus")
-        user = os.getenv("POSTGRES_USER", "manus")
-        password = os.getenv("POSTGRES_PASSWORD", "")
-
-        return f"host={host} port={port} dbname={database} user={user} password={password}"
-
-    def connect(self):
-        """Establish database connection"""
+        """Initialize memory service with a pooled asyncpg backend (created lazily)"""
+        self.db = InstrumentedPool(
+            name="memory",
+            dsn=build_postgres_dsn(),
+            config=PoolConfig.from_env("MEMORY_DB"),
+            init=init_json_codecs
+        )
+
+    async def initialize(self) -> None:
+        """Create the connection pool (also done lazily on first query)"""
+        await self.db.initialize()
+
+    async def close(self) -> None:
+        """Close the connection pool"""
+        await self.db.close()
+
+    async def __aenter__(self):
+        """Async context manager entry"""
+        await self.initialize()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.close()
+
+    async def health_check(self) -> Dict[str, Any]:
+        """Check database connectivity and report pool saturation"""
         try:
-            if self.conn is None or self.conn.closed:
-                self.conn = psycopg2.connect(self.connection_string)
-                logger.info("Memory service database connection established")
+            async with self.db.acquire() as conn:
+                await conn.fetchval("SELECT 1")
+            return {"status": "healthy", "pool": self.db.get_stats()}
         except Exception as e:
-            logger.error(f"Memory service database connection failed: {e}")
-            raise
-
-    def close(self):
-        """Close database connection"""
-        if self.conn and not self.conn.closed:
-            self.conn.close()
-            logger.info("Memory service database connection closed")
-
-    def __enter__(self):
-        """Context manager entry"""
-        self.connect()
-        return self
+            logger.error(f"Memory service health check failed: {e}")
+            return {"status": "unhealthy", "error": str(e), "pool": self.db.get_stats()}
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit"""
-        self.close()
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool saturation metrics"""
+        return self.db.get_stats()
 
     # =========================================================================
     # Memory CRUD Operations
@@ -93,88 +112,62 @@ class MemoryService:
         Returns:
             Created memory record or None if failed
         """
-        try:
-            self.connect()
-            with self.conn.cursor() as cur:
-                # Validate inputs
-                if not fact or not fact.strip():
-                    raise ValueError("Memory fact cannot be empty")
+        # Validate inputs
+        if not fact or not fact.strip():
+            raise ValueError("Memory fact cannot be empty")
 
-                if not self._validate_category(category):
-                    raise ValueError(f"Invalid category: {category}")
+        if not self._validate_category(category):
+            raise ValueError(f"Invalid category: {category}")
 
-                if not self._validate_confidence(confidence):
-                    raise ValueError(f"Invalid confidence score: {confidence}")
+        if not self._validate_confidence(confidence):
+            raise ValueError(f"Invalid confidence score: {confidence}")
 
-                if not self._validate_source_type(source_type):
-                    raise ValueError(f"Invalid source type: {source_type}")
+        if not self._validate_source_type(source_type):
+            raise ValueError(f"Invalid source type: {source_type}")
+
+        try:
+            async with self.db.acquire() as conn:
+                # Detect and mask PII if enabled (stored facts are masked, so
+                # duplicates are looked up by the masked text)
+                masked_fact, pii_detected = self._detect_and_mask_pii(fact)
+                if pii_detected:
+                    logger.info(f"PII detected and masked in memory for user {user_id}")
 
                 # Check for duplicates
-                duplicate = await self._find_duplicate_memory(user_id, fact)
+                bands = lsh_bands(masked_fact)
+                duplicate = await self._find_duplicate_memory(conn, user_id, masked_fact, bands)
                 if duplicate and duplicate['confidence'] > 0.7:
                     logger.info(f"Duplicate memory found with high confidence: {duplicate['id']}")
                     return duplicate
 
-                # Detect and mask PII if enabled
-                masked_fact, pii_detected = self._detect_and_mask_pii(fact)
-                if pii_detected:
-                    logger.info(f"PII detected and masked in memory for user {user_id}")
-
-                cur.execute(
-                    """
+                row = await conn.fetchrow(
+                    f"""
                     INSERT INTO user_memories
                     (user_id, fact, category, confidence, source_type,
-                     source_message_id, conversation_id, metadata, expires_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    RETURNING id, user_id, fact, category, confidence, source_type,
-                              source_message_id, conversation_id, metadata, expires_at,
-                              access_count, last_accessed_at, is_deleted, created_at, updated_at
+                     source_message_id, conversation_id, metadata, expires_at, lsh_bands)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+                    RETURNING {MEMORY_COLUMNS}
                     """,
-                    (
-                        user_id,
-                        masked_fact,
-                        category,
-                        confidence,
-                        source_type,
-                        source_message_id,
-                        conversation_id,
-                        Json(metadata or {}),
-                        expires_at
-                    )
+                    user_id,
+                    masked_fact,
+                    category,
+                    confidence,
+                    source_type,
+                    source_message_id,
+                    conversation_id,
+                    metadata or {},
+                    expires_at,
+                    bands
                 )
 
-                result = cur.fetchone()
-                self.conn.commit()
-
-                # Convert to dict with proper column names
-                memory = {
-                    'id': result[0],
-                    'user_id': result[1],
-                    'fact': result[2],
-                    'category': result[3],
-                    'confidence': result[4],
-                    'source_type': result[5],
-                    'source_message_id': result[6],
-                    'conversation_id': result[7],
-                    'metadata': result[8],
-                    'expires_at': result[9],
-                    'access_count': result[10],
-                    'last_accessed_at': result[11],
-                    'is_deleted': result[12],
-                    'created_at': result[13],
-                    'updated_at': result[14]
-                }
-
-                logger.info(f"Created memory {memory['id']} for user {user_id}")
-                return memory
+            memory = self._row_to_dict(row)
+            await bump_memory_generation(user_id)
+            get_memory_vector_index().index_in_background(memory)
+            logger.info(f"Created memory {memory['id']} for user {user_id}")
+            return memory
 
-        except ValueError as e:
-            logger.error(f"Validation error creating memory: {e}")
-            raise
         except Exception as e:
             logger.error(f"Failed to create memory: {e}")
-            if self.conn:
-                self.conn.rollback()
             return None
 
     async def get_memory(self, memory_id: str, user_id: str) -> Optional[Dict[str, Any]]:
@@ -189,24 +182,20 @@ class MemoryService:
             Memory record or None if not found
         """
         try:
-            self.connect()
-            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(
-                    """
-                    SELECT id, user_id, fact, category, confidence, source_type,
-                           source_message_id, conversation_id, metadata, expires_at,
-                           access_count, last_accessed_at, is_deleted, created_at, updated_at
+            async with self.db.acquire() as conn:
+                row = await conn.fetchrow(
+                    f"""
+                    SELECT {MEMORY_COLUMNS}
                     FROM user_memories
-                    WHERE id = %s AND user_id = %s AND is_deleted = FALSE
+                    WHERE id = $1 AND user_id = $2 AND is_deleted = FALSE
                     """,
-                    (memory_id, user_id)
+                    memory_id, user_id
                 )
 
-                result = cur.fetchone()
-                if result:
+                if row:
                     # Update access tracking
-                    await self._track_access(memory_id)
-                    return dict(result)
+                    self._track_access(memory_id)
+                    return self._row_to_dict(row)
 
                 return None
 
@@ -231,86 +220,65 @@ class MemoryService:
         Returns:
             Updated memory record or None if failed
         """
-        try:
-            self.connect()
-            with self.conn.cursor() as cur:
-                # Build dynamic update query
-                valid_fields = ['fact', 'category', 'confidence', 'metadata', 'expires_at']
-                update_fields = []
-                params = []
-                param_index = 1
+        # Build dynamic update query
+        valid_fields = ['fact', 'category', 'confidence', 'metadata', 'expires_at']
+        update_fields = []
+        params = []
+        param_index = 1
+
+        for field, value in updates.items():
+            if field not in valid_fields:
+                continue
 
-                for field, value in updates.items():
-                    if field not in valid_fields:
-                        continue
+            # Validate specific fields
+            if field == 'category' and not self._validate_category(value):
+                raise ValueError(f"Invalid category: {value}")
 
-                    # Validate specific fields
-                    if field == 'category' and not self._validate_category(value):
-                        raise ValueError(f"Invalid category: {value}")
+            if field == 'confidence' and not self._validate_confidence(value):
+                raise ValueError(f"Invalid confidence score: {value}")
 
-                    if field == 'confidence' and not self._validate_confidence(value):
-                        raise ValueError(f"Invalid confidence score: {value}")
+            if field == 'fact' and (not value or not value.strip()):
+                raise ValueError("Memory fact cannot be empty")
 
-                    if field == 'fact' and not value or not value.strip():
-                        raise ValueError("Memory fact cannot be empty")
+            update_fields.append(f"{field} = ${param_index}")
+            params.append(value)
+            param_index += 1
 
-                    update_fields.append(f"{field} = ${param_index}")
-                    params.append(value if field != 'metadata' else Json(value))
-                    param_index += 1
+            # Keep the near-duplicate index in step with the fact
+            if field == 'fact':
+                update_fields.append(f"lsh_bands = ${param_index}")
+                params.append(lsh_bands(value))
+                param_index += 1
 
-                if not update_fields:
-                    raise ValueError("No valid fields to update")
+        if not update_fields:
+            raise ValueError("No valid fields to update")
 
-                # Add WHERE parameters
-                params.extend([memory_id, user_id])
+        # Add WHERE parameters
+        params.extend([memory_id, user_id])
 
-                cur.execute(
+        try:
+            async with self.db.acquire() as conn:
+                row = await conn.fetchrow(
                     f"""
                     UPDATE user_memories
                     SET {', '.join(update_fields)}, updated_at = NOW()
                     WHERE id = ${param_index} AND user_id = ${param_index + 1} AND is_deleted = FALSE
-                    RETURNING id, user_id, fact, category, confidence, source_type,
-                              source_message_id, conversation_id, metadata, expires_at,
-                              access_count, last_accessed_at, is_deleted, created_at, updated_at
+                    RETURNING {MEMORY_COLUMNS}
                     """,
-                    params
+                    *params
                 )
 
-                result = cur.fetchone()
-                if result:
-                    self.conn.commit()
-
-                    # Convert to dict
-                    memory = {
-                        'id': result[0],
-                        'user_id': result[1],
-                        'fact': result[2],
-                        'category': result[3],
-                        'confidence': result[4],
-                        'source_type': result[5],
-                        'source_message_id': result[6],
-                        'conversation_id': result[7],
-                        'metadata': result[8],
-                        'expires_at': result[9],
-                        'access_count': result[10],
-                        'last_accessed_at': result[11],
-                        'is_deleted': result[12],
-                        'created_at': result[13],
-                        'updated_at': result[14]
-                    }
-
-                    logger.info(f"Updated memory {memory_id} for user {user_id}")
-                    return memory
+            if row:
+                memory = self._row_to_dict(row)
+                await bump_memory_generation(user_id)
+                get_memory_vector_index().index_in_background(memory)
+                logger.info(f"Updated memory {memory_id} for user {user_id}")
+                return memory
 
-                return None
+            return None
 
-        except ValueError as e:
-            logger.error(f"Validation error updating memory: {e}")
-            raise
         except Exception as e:
             logger.error(f"Failed to update memory {memory_id}: {e}")
-            if self.conn:
-                self.conn.rollback()
             return None
 
     async def delete_memory(self, memory_id: str, user_id: str) -> bool:
@@ -325,30 +293,28 @@ class MemoryService:
             True if deleted successfully
         """
         try:
-            self.connect()
-            with self.conn.cursor() as cur:
-                cur.execute(
+            async with self.db.acquire() as conn:
+                status = await conn.execute(
                     """
                     UPDATE user_memories
                     SET is_deleted = TRUE, updated_at = NOW()
-                    WHERE id = %s AND user_id = %s AND is_deleted = FALSE
+                    WHERE id = $1 AND user_id = $2 AND is_deleted = FALSE
                     """,
-                    (memory_id, user_id)
+                    memory_id, user_id
                 )
 
-                rows_affected = cur.rowcount
-                self.conn.commit()
-
-                if rows_affected > 0:
-                    logger.info(f"Deleted memory {memory_id} for user {user_id}")
-                    return True
+            # asyncpg returns the command tag, e.g. "UPDATE 1"
+            rows_affected = int(status.split()[-1]) if status else 0
+            if rows_affected > 0:
+                await bump_memory_generation(user_id)
+                get_memory_vector_index().remove_in_background(memory_id)
+                logger.info(f"Deleted memory {memory_id} for user {user_id}")
+                return True
 
-                return False
+            return False
 
         except Exception as e:
             logger.error(f"Failed to delete memory {memory_id}: {e}")
-            if self.conn:
-                self.conn.rollback()
             return False
 
     # =========================================================================
@@ -385,56 +351,52 @@ class MemoryService:
             List of memory records
         """
         try:
-            self.connect()
-            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Build query
-                query = """
-                    SELECT id, user_id, fact, category, confidence, source_type,
-                           source_message_id, conversation_id, metadata, expires_at,
-                           access_count, last_accessed_at, is_deleted, created_at, updated_at
-                    FROM user_memories
-                    WHERE user_id = %s AND is_deleted = FALSE
-                """
-                params = [user_id]
-                param_index = 2
-
-                # Add filters
-                if category:
-                    query += f" AND category = ${param_index}"
-                    params.append(category)
-                    param_index += 1
-
-                if source_type:
-                    query += f" AND source_type = ${param_index}"
-                    params.append(source_type)
-                    param_index += 1
-
-                if confidence_min is not None:
-                    query += f" AND confidence >= ${param_index}"
-                    params.append(confidence_min)
-                    param_index += 1
-
-                if search:
-                    query += f" AND fact ILIKE ${param_index}"
-                    params.append(f"%{search}%")
-                    param_index += 1
-
-                # Add sorting
-                valid_sort_fields = ['created_at', 'updated_at', 'confidence', 'access_count', 'last_accessed_at']
-                if sort_by not in valid_sort_fields:
-                    sort_by = 'created_at'
-
-                if sort_order.upper() not in ['ASC', 'DESC']:
-                    sort_order = 'DESC'
-
-                query += f" ORDER BY {sort_by} {sort_order}"
-                query += f" LIMIT ${param_index} OFFSET ${param_index + 1}"
-                params.extend([limit, offset])
-
-                cur.execute(query, params)
-                results = cur.fetchall()
-
-                return [dict(row) for row in results]
+            # Build query
+            query = f"""
+                SELECT {MEMORY_COLUMNS}
+                FROM user_memories
+                WHERE user_id = $1 AND is_deleted = FALSE
+            """
+            params = [user_id]
+            param_index = 2
+
+            # Add filters
+            if category:
+                query += f" AND category = ${param_index}"
+                params.append(category)
+                param_index += 1
+
+            if source_type:
+                query += f" AND source_type = ${param_index}"
+                params.append(source_type)
+                param_index += 1
+
+            if confidence_min is not None:
+                query += f" AND confidence >= ${param_index}"
+                params.append(confidence_min)
+                param_index += 1
+
+            if search:
+                query += f" AND fact ILIKE ${param_index}"
+                params.append(f"%{search}%")
+                param_index += 1
+
+            # Add sorting
+            valid_sort_fields = ['created_at', 'updated_at', 'confidence', 'access_count', 'last_accessed_at']
+            if sort_by not in valid_sort_fields:
+                sort_by = 'created_at'
+
+            if sort_order.upper() not in ['ASC', 'DESC']:
+                sort_order = 'DESC'
+
+            query += f" ORDER BY {sort_by} {sort_order}"
+            query += f" LIMIT ${param_index} OFFSET ${param_index + 1}"
+            params.extend([limit, offset])
+
+            async with self.db.acquire() as conn:
+                rows = await conn.fetch(query, *params)
+
+            return [self._row_to_dict(row) for row in rows]
 
         except Exception as e:
             logger.error(f"Failed to get user memories: {e}")
@@ -460,33 +422,29 @@ class MemoryService:
             List of matching memories
         """
         try:
-            self.connect()
-            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-                search_query = """
-                    SELECT id, user_id, fact, category, confidence, source_type,
-                           source_message_id, conversation_id, metadata, expires_at,
-                           access_count, last_accessed_at, is_deleted, created_at, updated_at,
-                           ts_rank(to_tsvector('english', fact), plainto_tsquery('english', %s)) as rank
-                    FROM user_memories
-                    WHERE user_id = %s
-                      AND is_deleted = FALSE
-                      AND to_tsvector('english', fact) @@ plainto_tsquery('english', %s)
-                """
-                params = [query, user_id, query]
-                param_index = 4
-
-                if category:
-                    search_query += f" AND category = ${param_index}"
-                    params.append(category)
-                    param_index += 1
-
-                search_query += " ORDER BY rank DESC, confidence DESC LIMIT $" + str(param_index)
-                params.append(limit)
-
-                cur.execute(search_query, params)
-                results = cur.fetchall()
-
-                return [dict(row) for row in results]
+            search_query = f"""
+                SELECT {MEMORY_COLUMNS},
+                       ts_rank(to_tsvector('english', fact), plainto_tsquery('english', $1)) as rank
+                FROM user_memories
+                WHERE user_id = $2
+                  AND is_deleted = FALSE
+                  AND to_tsvector('english', fact) @@ plainto_tsquery('english', $1)
+            """
+            params = [query, user_id]
+            param_index = 3
+
+            if category:
+                search_query += f" AND category = ${param_index}"
+                params.append(category)
+                param_index += 1
+
+            search_query += f" ORDER BY rank DESC, confidence DESC LIMIT ${param_index}"
+            params.append(limit)
+
+            async with self.db.acquire() as conn:
+                rows = await conn.fetch(search_query, *params)
+
+            return [self._row_to_dict(row) for row in rows]
 
         except Exception as e:
             logger.error(f"Failed to search memories: {e}")
@@ -499,20 +457,18 @@ class MemoryService:
     async def get_memory_categories(self, user_id: str) -> List[Dict[str, Any]]:
         """Get all memory categories for a user"""
         try:
-            self.connect()
-            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(
+            async with self.db.acquire() as conn:
+                rows = await conn.fetch(
                     """
                     SELECT id, user_id, name, description, color, icon, is_system_category, created_at, updated_at
                     FROM memory_categories
-                    WHERE user_id = %s
+                    WHERE user_id = $1
                     ORDER BY is_system_category DESC, name ASC
                     """,
-                    (user_id,)
+                    user_id
                 )
 
-                results = cur.fetchall()
-                return [dict(row) for row in results]
+            return [self._row_to_dict(row) for row in rows]
 
         except Exception as e:
             logger.error(f"Failed to get memory categories: {e}")
@@ -521,18 +477,14 @@ class MemoryService:
     async def initialize_default_categories(self, user_id: str) -> bool:
         """Initialize default system categories for a user"""
         try:
-            self.connect()
-            with self.conn.cursor() as cur:
-                cur.execute("SELECT insert_default_categories(%s)", (user_id,))
-                self.conn.commit()
+            async with self.db.acquire() as conn:
+                await conn.execute("SELECT insert_default_categories($1)", user_id)
 
-                logger.info(f"Initialized default categories for user {user_id}")
-                return True
+            logger.info(f"Initialized default categories for user {user_id}")
+            return True
 
         except Exception as e:
             logger.error(f"Failed to initialize default categories: {e}")
-            if self.conn:
-                self.conn.rollback()
             return False
 
     # =========================================================================
@@ -558,45 +510,67 @@ class MemoryService:
         ]
         return source_type in valid_types
 
-    async def _find_duplicate_memory(self, user_id: str, fact: str) -> Optional[Dict[str, Any]]:
-        """Find potential duplicate memories"""
+    def _row_to_dict(self, row: asyncpg.Record) -> Dict[str, Any]:
+        """Convert a record to a dict with UUIDs as strings (matching the API models)"""
+        return {
+            key: str(value) if isinstance(value, uuid.UUID) else value
+            for key, value in dict(row).items()
+        }
+
+    async def _find_duplicate_memory(
+        self,
+        conn: asyncpg.Connection,
+        user_id: str,
+        fact: str,
+        bands: Optional[List[int]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find an existing memory that duplicates a fact
+
+        Candidates are the exact match plus memories sharing an LSH band with
+        the fact (an idx_memories_lsh_bands probe); each is confirmed with the
+        word-set Jaccard similarity.
+
+        Args:
+            conn: Database connection
+            user_id: User UUID
+            fact: Memory fact
+            bands: LSH band hashes of the fact (computed if not given)
+
+        Returns:
+            Highest-confidence duplicate, or None
+        """
         try:
-            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Simple similarity check - can be enhanced with more sophisticated algorithms
-                cur.execute(
-                    """
-                    SELECT id, fact, confidence
-                    FROM user_memories
-                    WHERE user_id = %s
-                      AND is_deleted = FALSE
-                      AND (fact = %s OR fact ILIKE %s)
-                    ORDER BY confidence DESC
-                    LIMIT 1
-                    """,
-                    (user_id, fact, f"%{fact[:50]}%")
-                )
+            rows = await conn.fetch(
+                """
+                SELECT id, fact, confidence
+                FROM user_memories
+                WHERE user_id = $1
+                  AND is_deleted = FALSE
+                  AND (fact = $2 OR lsh_bands && $3::bigint[])
+                LIMIT $4
+                """,
+                user_id, fact, bands if bands is not None else lsh_bands(fact), DUPLICATE_CANDIDATE_LIMIT
+            )
+
+            duplicates = [
+                row for row in rows
+                if row['fact'] == fact
+                or jaccard_similarity(fact, row['fact']) >= DUPLICATE_SIMILARITY_THRESHOLD
+            ]
+            if not duplicates:
+                return None
 
-                result = cur.fetchone()
-                return dict(result) if result else None
+            return self._row_to_dict(max(duplicates, key=lambda row: row['confidence']))
 
         except Exception as e:
             logger.error(f"Failed to find duplicate memory: {e}")
             return None
 
-    async def _track_access(self, memory_id: str) -> None:
-        """Track memory access for analytics"""
+    def _track_access(self, memory_id: str) -> None:
+        """Track memory access for analytics (buffered, written in the background)"""
         try:
-            with self.conn.cursor() as cur:
-                cur.execute(
-                    """
-                    UPDATE user_memories
-                    SET access_count = access_count + 1, last_accessed_at = NOW()
-                    WHERE id = %s
-                    """,
-                    (memory_id,)
-                )
-                self.conn.commit()
-
+            get_analytics_writer().record_memory_access([memory_id])
         except Exception as e:
             logger.error(f"Failed to track memory access: {e}")
 
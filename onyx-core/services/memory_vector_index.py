@@ -0,0 +1,312 @@
+"""
+Memory Vector Index for ONYX Core
+
+Keeps an embedding of every user memory in a dedicated Qdrant collection so
+context-aware injection can find the memories relevant to the current
+message with one filtered ANN lookup instead of keyword scans.
+
+- Memories are embedded when they are written (MemoryService,
+  SummaryMemoryStorage) and removed when they are deleted
+- Points carry user_id in their payload; a keyword payload index on it keeps
+  per-user filtering inside the HNSW search
+- The index is an accelerator: every failure is logged and reported as
+  "no result", and callers fall back to keyword matching
+"""
+
+import os
+import time
+import asyncio
+import logging
+from typing import Any, Coroutine, Dict, List, Optional, Set, Tuple
+
+from qdrant_client import AsyncQdrantClient  # pyright: ignore[reportMissingImports]
+from qdrant_client.models import (  # pyright: ignore[reportMissingImports]
+    Distance,
+    FieldCondition,
+    Filter,
+    MatchValue,
+    PayloadSchemaType,
+    PointIdsList,
+    PointStruct,
+    VectorParams,
+)
+
+logger = logging.getLogger(__name__)
+
+# Constants
+COLLECTION_NAME = "user_memories"
+VECTOR_SIZE = 1536  # text-embedding-3-small, same model as the document index
+RETRY_INIT_AFTER_SECONDS = 60
+DEFAULT_BACKFILL_BATCH_SIZE = 256
+
+
+class MemoryVectorIndex:
+    """Qdrant-backed semantic index of user memories"""
+
+    def __init__(self, embedder: Any = None, client: Any = None):
+        """
+        Initialize the memory vector index
+
+        Args:
+            embedder: Object with async get_query_embedding(text) and
+                embed_texts(texts) (defaults to the RAG service)
+            client: Async Qdrant client (defaults to one built from QDRANT_URL)
+        """
+        self.collection_name = os.getenv("MEMORY_COLLECTION_NAME", COLLECTION_NAME)
+        self.enabled = os.getenv("ENABLE_MEMORY_VECTOR_INDEX", "true").lower() == "true"
+        self.embedder = embedder
+        self.client = client
+
+        self._ready = False
+        self._retry_at = 0.0
+        self._init_lock = asyncio.Lock()
+        self._background: Set[asyncio.Task] = set()
+
+    async def _ensure_ready(self) -> bool:
+        """Lazily create the client and collection; returns False while unavailable"""
+        if self._ready:
+            return True
+        if not self.enabled or time.time() < self._retry_at:
+            return False
+
+        async with self._init_lock:
+            if self._ready:
+                return True
+            try:
+                if self.embedder is None:
+                    from rag_service import get_rag_service
+                    self.embedder = await get_rag_service()
+                if self.client is None:
+                    self.client = AsyncQdrantClient(
+                        url=os.getenv("QDRANT_URL", "http://localhost:6333"),
+                        api_key=os.getenv("QDRANT_API_KEY"),
+                    )
+                await self._ensure_collection()
+                self._ready = True
+                return True
+            except Exception as e:
+                self._retry_at = time.time() + RETRY_INIT_AFTER_SECONDS
+                logger.warning(f"Memory vector index unavailable, retrying in {RETRY_INIT_AFTER_SECONDS}s: {e}")
+                return False
+
+    async def _ensure_collection(self) -> None:
+        """Create the memory collection and its user_id payload index if missing"""
+        collections = (await self.client.get_collections()).collections
+        if self.collection_name in [c.name for c in collections]:
+            return
+
+        await self.client.create_collection(
+            collection_name=self.collection_name,
+            vectors_config=VectorParams(size=VECTOR_SIZE, distance=Distance.COSINE),
+        )
+        # Every search filters by user; index the field so filtering happens during HNSW traversal
+        await self.client.create_payload_index(
+            collection_name=self.collection_name,
+            field_name="user_id",
+            field_schema=PayloadSchemaType.KEYWORD,
+        )
+        logger.info(f"Created Qdrant collection: {self.collection_name} ({VECTOR_SIZE} dimensions)")
+
+    # =========================================================================
+    # Writes
+    # =========================================================================
+
+    async def index_memories(self, memories: List[Dict[str, Any]]) -> int:
+        """
+        Embed and upsert memories
+
+        Args:
+            memories: Memory dicts with at least id, user_id and fact
+                (category, confidence and source_type are stored as payload)
+
+        Returns:
+            Number of memories indexed (0 if the index is unavailable)
+        """
+        memories = [m for m in memories if m.get("id") and m.get("fact")]
+        if not memories or not await self._ensure_ready():
+            return 0
+
+        try:
+            vectors = await self.embedder.embed_texts([m["fact"] for m in memories])
+            points = [
+                PointStruct(
+                    id=str(memory["id"]),
+                    vector=vector,
+                    payload={
+                        "user_id": str(memory["user_id"]),
+                        "category": memory.get("category"),
+                        "confidence": memory.get("confidence"),
+                        "source_type": memory.get("source_type"),
+                    },
+                )
+                for memory, vector in zip(memories, vectors)
+            ]
+            await self.client.upsert(collection_name=self.collection_name, points=points, wait=False)
+            return len(points)
+        except Exception as e:
+            logger.warning(f"Failed to index {len(memories)} memories: {e}")
+            return 0
+
+    async def index_memory(self, memory: Dict[str, Any]) -> bool:
+        """
+        Embed and upsert a single memory
+
+        Args:
+            memory: Memory dict (see index_memories)
+
+        Returns:
+            True if indexed
+        """
+        return await self.index_memories([memory]) == 1
+
+    async def remove_memory(self, memory_id: str) -> bool:
+        """
+        Remove a memory from the index
+
+        Args:
+            memory_id: Memory UUID
+
+        Returns:
+            True if removed
+        """
+        if not await self._ensure_ready():
+            return False
+        try:
+            await self.client.delete(
+                collection_name=self.collection_name,
+                points_selector=PointIdsList(points=[str(memory_id)]),
+                wait=False,
+            )
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to remove memory {memory_id} from vector index: {e}")
+            return False
+
+    def index_in_background(self, memory: Dict[str, Any]) -> None:
+        """Index a memory without delaying the write that produced it"""
+        self._spawn(self.index_memory(memory))
+
+    def remove_in_background(self, memory_id: str) -> None:
+        """Remove a memory without delaying the delete that produced it"""
+        self._spawn(self.remove_memory(memory_id))
+
+    def _spawn(self, coro: Coroutine) -> None:
+        """Run a coroutine as a tracked background task (dropped when no loop is running)"""
+        if not self.enabled:
+            coro.close()
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(coro)
+        except RuntimeError:
+            coro.close()
+            return
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    # =========================================================================
+    # Search
+    # =========================================================================
+
+    async def search(
+        self,
+        user_id: str,
+        text: str,
+        limit: int,
+        min_score: float = 0.0,
+    ) -> Optional[List[Tuple[str, float]]]:
+        """
+        Find a user's memories most similar to a text
+
+        Args:
+            user_id: User UUID (only this user's memories are searched)
+            text: Text to match (e.g. the current chat message)
+            limit: Maximum candidates
+            min_score: Minimum cosine similarity
+
+        Returns:
+            (memory_id, similarity) pairs by descending similarity, or None
+            if the index is unavailable (callers should fall back)
+        """
+        if not text or not text.strip() or not await self._ensure_ready():
+            return None
+
+        try:
+            vector = await self.embedder.get_query_embedding(text)
+            response = await self.client.query_points(
+                collection_name=self.collection_name,
+                query=vector,
+                query_filter=Filter(
+                    must=[FieldCondition(key="user_id", match=MatchValue(value=str(user_id)))]
+                ),
+                limit=limit,
+                score_threshold=min_score,
+                with_payload=False,
+            )
+            return [(str(point.id), float(point.score)) for point in response.points]
+        except Exception as e:
+            logger.warning(f"Memory vector search failed for user {user_id}: {e}")
+            return None
+
+    # =========================================================================
+    # Maintenance
+    # =========================================================================
+
+    async def backfill(self, batch_size: int = DEFAULT_BACKFILL_BATCH_SIZE) -> int:
+        """
+        Index every live memory (for memories written before the index existed)
+
+        Args:
+            batch_size: Memories embedded per request
+
+        Returns:
+            Number of memories indexed
+        """
+        from services.db_pool import get_shared_pool
+
+        indexed = 0
+        conn = await get_shared_pool().agetconn()
+        with conn:
+            with conn.cursor(name="memory_vector_backfill") as cur:
+                cur.itersize = batch_size
+                cur.execute(
+                    """
+                    SELECT id, user_id, fact, category, confidence, source_type
+                    FROM user_memories
+                    WHERE is_deleted = FALSE
+                    """
+                )
+                columns = ["id", "user_id", "fact", "category", "confidence", "source_type"]
+                while True:
+                    rows = cur.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    indexed += await self.index_memories([dict(zip(columns, row)) for row in rows])
+
+        logger.info(f"Backfilled {indexed} memories into {self.collection_name}")
+        return indexed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index status"""
+        return {
+            "enabled": self.enabled,
+            "ready": self._ready,
+            "pending_writes": len(self._background),
+            "collection": self.collection_name,
+        }
+
+
+# Global memory vector index instance
+_memory_vector_index = None
+
+
+def get_memory_vector_index() -> MemoryVectorIndex:
+    """Get or create the memory vector index"""
+    global _memory_vector_index
+    if _memory_vector_index is None:
+        _memory_vector_index = MemoryVectorIndex()
+    return _memory_vector_index
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(get_memory_vector_index().backfill())
@@ -0,0 +1,197 @@
+"""
+Parse Pool for ONYX Core
+
+Runs CPU-bound file parsing (PDF text extraction, CSV type analysis, JSON
+structure analysis, ...) in a bounded ProcessPoolExecutor so it neither
+blocks the event loop nor serializes concurrent uploads on the GIL.
+
+- Workers are spawned (not forked) so they never inherit the event loop,
+  open connections or locks held by other threads
+- Workers are recycled after PARSE_WORKER_MAX_TASKS files, which bounds the
+  memory a long-running parser library can accumulate
+- If the pool cannot be created or a worker dies, the pool is rebuilt on
+  the next call and the failed file is reported as a parse error
+
+Only a file path crosses the process boundary, and the parsed content comes
+back as a ParseResult. Uploads that were already spooled for validation (or
+stored for an ingestion job) are parsed from that file via open_file, other
+streams are spooled once by open_stream. Parsers that split one file across
+workers (PDF page ranges) submit their tasks to the same executor.
+
+Streaming formats (text, JSONL, and the page ordering / metadata of PDFs)
+are read incrementally in the calling process; only PDF page ranges are
+extracted in the workers.
+"""
+
+import os
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import BinaryIO, Optional
+
+from file_parsers.base_parser import ParseResult, SegmentStream
+
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_PARSE_WORKERS = min(4, os.cpu_count() or 1)
+PARSE_WORKER_MAX_TASKS = 50  # Files parsed by a worker before it is replaced
+
+
+def _parse_in_worker(file_path: str, filename: str, user_id: str) -> ParseResult:
+    """
+    Parse a file in a worker process
+
+    Args:
+        file_path: Path of the spooled upload
+        filename: Original filename
+        user_id: User ID for permission metadata
+
+    Returns:
+        ParseResult with the parsed content and file metadata
+    """
+    from file_parsers.parser_factory import ParserFactory
+
+    try:
+        parser = ParserFactory.get_parser(filename)
+        result = parser.extract_content(file_path)
+
+        if result.success and result.metadata is not None:
+            file_metadata = parser.build_file_metadata(os.path.basename(filename), os.path.getsize(file_path), user_id)
+            result.metadata['file_metadata'] = file_metadata.__dict__
+
+        return result
+
+    except ValueError as e:
+        return ParseResult(success=False, error_message=str(e))
+    except Exception as e:
+        return ParseResult(success=False, error_message=f"File parsing failed: {str(e)}")
+
+
+class ParsePool:
+    """Bounded process pool for file parsing"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialize the parse pool (workers start on first use)
+
+        Args:
+            max_workers: Worker processes (defaults to UPLOAD_PARSE_WORKERS)
+        """
+        self.max_workers = max(1, max_workers or int(os.getenv("UPLOAD_PARSE_WORKERS", DEFAULT_PARSE_WORKERS)))
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Get or create the process pool"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=PARSE_WORKER_MAX_TASKS,
+            )
+            logger.info(f"Started parse pool with {self.max_workers} workers")
+        return self._executor
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """The worker processes, for parsers that submit their own tasks"""
+        return self._get_executor()
+
+    async def parse_file(self, file_path: str, filename: str, user_id: str) -> ParseResult:
+        """
+        Parse a file in a worker process
+
+        Args:
+            file_path: Path of the file to parse
+            filename: Original filename (selects the parser)
+            user_id: User ID for permission metadata
+
+        Returns:
+            ParseResult with extracted content
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            executor = self._get_executor()
+            return await loop.run_in_executor(executor, _parse_in_worker, file_path, filename, user_id)
+
+        except BrokenProcessPool as e:
+            logger.error(f"Parse worker died while parsing {filename}: {e}")
+            self._executor = None  # Rebuilt on the next call
+            return ParseResult(success=False, error_message=f"File parsing failed: worker process died ({e})")
+        except Exception as e:
+            logger.error(f"Failed to parse {filename} in parse pool: {e}")
+            return ParseResult(success=False, error_message=f"File parsing failed: {str(e)}")
+
+    async def open_stream(self, stream: BinaryIO, filename: str, user_id: str) -> SegmentStream:
+        """
+        Parse an upload in a worker process into a SegmentStream
+
+        Args:
+            stream: Seekable binary stream of the upload
+            filename: Original filename
+            user_id: User ID for permission metadata
+
+        Returns:
+            SegmentStream with the parsed content as one segment
+
+        Raises:
+            ValueError: If the file type is not supported or parsing fails
+        """
+        from file_parsers.parser_factory import ParserFactory
+
+        parser = ParserFactory.get_parser(filename)
+        temp_file_path = await asyncio.to_thread(parser._spool_to_temp_file, stream, filename)
+
+        try:
+            return await self.open_file(temp_file_path, filename, user_id)
+        finally:
+            try:
+                os.unlink(temp_file_path)
+            except Exception:
+                pass
+
+    async def open_file(self, file_path: str, filename: str, user_id: str) -> SegmentStream:
+        """
+        Parse a file on disk in a worker process into a SegmentStream
+
+        Args:
+            file_path: Path of the file (e.g. an upload spooled for validation)
+            filename: Original filename (selects the parser)
+            user_id: User ID for permission metadata
+
+        Returns:
+            SegmentStream with the parsed content as one segment
+
+        Raises:
+            ValueError: If the file type is not supported or parsing fails
+        """
+        from file_parsers.parser_factory import ParserFactory
+
+        ParserFactory.get_parser(filename)  # Reject unsupported types before submitting
+        result = await self.parse_file(file_path, filename, user_id)
+
+        if not result.success:
+            raise ValueError(result.error_message)
+
+        return SegmentStream(segments=iter([result.content]), metadata=result.metadata or {})
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            logger.info("Parse pool shut down")
+
+
+# Global parse pool instance
+_parse_pool = None
+
+
+def get_parse_pool() -> ParsePool:
+    """Get or create the parse pool instance"""
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ParsePool()
+    return _parse_pool
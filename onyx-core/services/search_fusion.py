@@ -0,0 +1,153 @@
+"""
+Search Fusion Module
+
+Vectorized score fusion for hybrid search. Semantic (cosine) and keyword
+(BM25) scores live on incomparable scales, so besides the legacy raw
+weighted sum this module offers:
+- rrf: Reciprocal Rank Fusion, sum of weight / (k + rank) per leg
+- minmax: per-leg min-max normalization, then weighted sum
+- zscore: per-leg z-score standardization, then weighted sum
+
+All strategies operate on numpy arrays over the union of candidates, so
+fusing hundreds of candidates per leg stays well inside the fusion budget.
+"""
+
+import logging
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Constants
+FUSION_RRF = "rrf"
+FUSION_MINMAX = "minmax"
+FUSION_ZSCORE = "zscore"
+FUSION_WEIGHTED = "weighted"  # Legacy raw-score weighted sum
+FUSION_STRATEGIES = (FUSION_RRF, FUSION_MINMAX, FUSION_ZSCORE, FUSION_WEIGHTED)
+DEFAULT_RRF_K = 60
+
+
+def _align(
+    semantic: Sequence[Tuple[str, float]],
+    keyword: Sequence[Tuple[str, float]],
+) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Map both legs onto the union of document ids
+
+    Returns:
+        (doc_ids, semantic scores, semantic present mask,
+         keyword scores, keyword present mask); the first occurrence of a
+         duplicate id within a leg wins
+    """
+    positions: Dict[str, int] = {}
+    doc_ids: List[str] = []
+    for doc_id, _ in list(semantic) + list(keyword):
+        if doc_id not in positions:
+            positions[doc_id] = len(doc_ids)
+            doc_ids.append(doc_id)
+
+    n = len(doc_ids)
+    legs = []
+    for leg in (semantic, keyword):
+        scores = np.zeros(n, dtype=np.float64)
+        present = np.zeros(n, dtype=bool)
+        for doc_id, score in leg:
+            idx = positions[doc_id]
+            if not present[idx]:
+                scores[idx] = score
+                present[idx] = True
+        legs.extend([scores, present])
+
+    return (doc_ids, *legs)
+
+
+def _minmax(scores: np.ndarray, present: np.ndarray) -> np.ndarray:
+    """Min-max normalize the present scores to [0, 1]; absent entries are 0"""
+    out = np.zeros_like(scores)
+    if not present.any():
+        return out
+    values = scores[present]
+    low, high = values.min(), values.max()
+    # A leg where every candidate scores the same carries no ordering signal
+    out[present] = (values - low) / (high - low) if high > low else 1.0
+    return out
+
+
+def _zscore(scores: np.ndarray, present: np.ndarray) -> np.ndarray:
+    """Standardize the present scores; absent entries get the leg minimum"""
+    out = np.zeros_like(scores)
+    if not present.any():
+        return out
+    values = scores[present]
+    std = values.std()
+    standardized = (values - values.mean()) / std if std > 0 else np.zeros_like(values)
+    out[present] = standardized
+    # Missing from a leg should never beat the weakest candidate that leg returned
+    out[~present] = standardized.min()
+    return out
+
+
+def _ranks(scores: np.ndarray, present: np.ndarray) -> np.ndarray:
+    """1-based rank of each present entry by descending score (ties keep input order)"""
+    ranks = np.full(scores.shape, np.inf)
+    idx = np.flatnonzero(present)
+    order = idx[np.argsort(-scores[idx], kind="stable")]
+    ranks[order] = np.arange(1, len(order) + 1)
+    return ranks
+
+
+def fuse_scores(
+    semantic: Sequence[Tuple[str, float]],
+    keyword: Sequence[Tuple[str, float]],
+    strategy: str = FUSION_RRF,
+    semantic_weight: float = 0.7,
+    keyword_weight: float = 0.3,
+    rrf_k: int = DEFAULT_RRF_K,
+) -> Tuple[List[str], np.ndarray]:
+    """
+    Fuse semantic and keyword candidate scores
+
+    Args:
+        semantic: (doc_id, score) pairs from semantic search
+        keyword: (doc_id, score) pairs from keyword search
+        strategy: One of FUSION_STRATEGIES
+        semantic_weight: Weight of the semantic leg
+        keyword_weight: Weight of the keyword leg
+        rrf_k: RRF smoothing constant (only used by "rrf")
+
+    Returns:
+        Tuple of (doc_ids in first-seen order, combined scores aligned with doc_ids)
+
+    Raises:
+        ValueError: If the strategy is unknown
+    """
+    if strategy not in FUSION_STRATEGIES:
+        raise ValueError(f"Unknown fusion strategy: {strategy}")
+
+    doc_ids, sem, sem_present, kw, kw_present = _align(semantic, keyword)
+    if not doc_ids:
+        return doc_ids, np.zeros(0)
+
+    if strategy == FUSION_RRF:
+        # 1 / (k + inf) == 0 for candidates missing from a leg
+        combined = (
+            semantic_weight / (rrf_k + _ranks(sem, sem_present)) +
+            keyword_weight / (rrf_k + _ranks(kw, kw_present))
+        )
+    elif strategy == FUSION_MINMAX:
+        combined = (
+            semantic_weight * _minmax(sem, sem_present) +
+            keyword_weight * _minmax(kw, kw_present)
+        )
+    elif strategy == FUSION_ZSCORE:
+        combined = (
+            semantic_weight * _zscore(sem, sem_present) +
+            keyword_weight * _zscore(kw, kw_present)
+        )
+        # Shift to non-negative so multiplicative boosts (recency) keep their meaning
+        combined = combined - combined.min()
+    else:
+        combined = semantic_weight * sem + keyword_weight * kw
+
+    return doc_ids, combined
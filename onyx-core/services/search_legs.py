@@ -0,0 +1,63 @@
+"""
+Search Legs Module
+
+Runs the independent legs of a hybrid search (semantic, keyword) under their
+own time budgets. A leg that times out or fails is reported instead of
+raised, so the caller can fuse whatever finished and flag the response as
+degraded rather than discarding completed work.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Leg statuses
+LEG_OK = "ok"
+LEG_TIMEOUT = "timeout"
+LEG_ERROR = "error"
+
+
+@dataclass
+class SearchLegResult:
+    """Outcome of one search leg"""
+
+    name: str
+    results: List[Any]
+    status: str
+    latency_ms: float
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the leg completed within its budget"""
+        return self.status == LEG_OK
+
+
+async def run_search_leg(name: str, leg: Awaitable[List[Any]], timeout_ms: int) -> SearchLegResult:
+    """
+    Run a search leg under its own timeout
+
+    Args:
+        name: Leg name used in timings and logs
+        leg: Awaitable producing the leg's results
+        timeout_ms: Budget for this leg (the leg is cancelled when exceeded)
+
+    Returns:
+        SearchLegResult with results (empty unless the leg completed) and status
+    """
+    start = time.perf_counter()
+    try:
+        results = await asyncio.wait_for(leg, timeout=timeout_ms / 1000.0)
+        return SearchLegResult(name, results or [], LEG_OK, (time.perf_counter() - start) * 1000)
+    except asyncio.TimeoutError:
+        latency_ms = (time.perf_counter() - start) * 1000
+        logger.warning(f"{name} search leg timed out after {timeout_ms}ms")
+        return SearchLegResult(name, [], LEG_TIMEOUT, latency_ms, f"timed out after {timeout_ms}ms")
+    except Exception as e:
+        latency_ms = (time.perf_counter() - start) * 1000
+        logger.error(f"{name} search leg failed: {e}")
+        return SearchLegResult(name, [], LEG_ERROR, latency_ms, str(e))
@@ -0,0 +1,217 @@
+"""
+Search Result Cache for ONYX Core
+
+Caches fused hybrid search results keyed by (normalized query, permission set,
+source filter, limit, query type). Two tiers:
+- In-process LRU front tier with TTL
+- Shared Redis tier via CacheManager
+
+Invalidation is generation based: every document sync bumps a shared
+generation counter, and cache keys embed the generation, so entries written
+before the sync are never served again and simply expire by TTL.
+"""
+
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from config.search_config import get_search_settings
+from services.cache_manager import CacheManager
+from services.embedding_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+# Constants
+CACHE_KEY_PREFIX = "onyx:search:results"
+GENERATION_KEY = "onyx:search:generation"
+GENERATION_REFRESH_SECONDS = 1.0  # How stale another worker's invalidation may be seen
+
+
+class SearchResultCache:
+    """Two-tier (in-process LRU + Redis) cache for fused search results"""
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        max_size: int,
+        cache_manager: Optional[CacheManager] = None,
+    ):
+        """
+        Initialize the search result cache
+
+        Args:
+            ttl_seconds: TTL for cached results in both tiers
+            max_size: Maximum entries in the in-process tier
+            cache_manager: CacheManager for the shared Redis tier (None for in-process only)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.cache_manager = cache_manager
+
+        # key -> (expires_at, generation, results)
+        self._front: "OrderedDict[str, tuple]" = OrderedDict()
+        self._generation = 0
+        self._generation_checked_at = 0.0
+
+    def make_key(
+        self,
+        query: str,
+        user_permissions: List[str],
+        source_filter: Optional[str],
+        limit: int,
+        query_type: str,
+        **options: Any,
+    ) -> str:
+        """
+        Build the cache key for a search request
+
+        Args:
+            query: Search query (normalized before hashing)
+            user_permissions: Permission set (order-insensitive)
+            source_filter: Optional source filter
+            limit: Result limit
+            query_type: Search strategy
+            **options: Any other options that change the results
+
+        Returns:
+            Cache key (without generation)
+        """
+        parts = [
+            normalize_query(query),
+            ",".join(sorted(set(user_permissions or ["*"]))),
+            source_filter or "",
+            str(limit),
+            query_type,
+            ",".join(f"{k}={options[k]}" for k in sorted(options)),
+        ]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get cached results
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            Cached results as dicts, or None on miss
+        """
+        generation = await self._current_generation()
+
+        entry = self._front.get(key)
+        if entry is not None:
+            expires_at, entry_generation, results = entry
+            if entry_generation == generation and expires_at > time.monotonic():
+                self._front.move_to_end(key)
+                return results
+            del self._front[key]
+
+        if self.cache_manager is not None:
+            cached = await self.cache_manager.get(self._storage_key(key, generation))
+            if isinstance(cached, dict) and isinstance(cached.get("results"), list):
+                self._store_front(key, generation, cached["results"])
+                return cached["results"]
+
+        return None
+
+    async def set(self, key: str, results: List[Dict[str, Any]]) -> None:
+        """
+        Cache results in both tiers
+
+        Args:
+            key: Key from make_key
+            results: JSON-serializable results
+        """
+        generation = await self._current_generation()
+        self._store_front(key, generation, results)
+
+        if self.cache_manager is not None:
+            await self.cache_manager.set(
+                self._storage_key(key, generation), {"results": results}, ttl=self.ttl_seconds
+            )
+
+    async def invalidate(self) -> None:
+        """Invalidate all cached results in this process and, via Redis, in every worker"""
+        self._front.clear()
+
+        new_generation = None
+        if self.cache_manager is not None:
+            new_generation = await self.cache_manager.increment(GENERATION_KEY)
+
+        self._generation = new_generation if new_generation is not None else self._generation + 1
+        self._generation_checked_at = time.monotonic()
+        logger.debug(f"Search result cache invalidated (generation {self._generation})")
+
+    async def _current_generation(self) -> int:
+        """Get the shared generation, refreshing from Redis at most every GENERATION_REFRESH_SECONDS"""
+        if self.cache_manager is None:
+            return self._generation
+
+        now = time.monotonic()
+        if now - self._generation_checked_at >= GENERATION_REFRESH_SECONDS:
+            remote = await self.cache_manager.get_counter(GENERATION_KEY)
+            if remote is not None and remote != self._generation:
+                self._generation = remote
+                self._front.clear()
+            self._generation_checked_at = now
+
+        return self._generation
+
+    def _storage_key(self, key: str, generation: int) -> str:
+        """Redis key for a cache entry at a given generation"""
+        return f"{CACHE_KEY_PREFIX}:{generation}:{key}"
+
+    def _store_front(self, key: str, generation: int, results: List[Dict[str, Any]]) -> None:
+        """Insert into the in-process LRU tier"""
+        if self.max_size <= 0:
+            return
+        self._front[key] = (time.monotonic() + self.ttl_seconds, generation, results)
+        self._front.move_to_end(key)
+        while len(self._front) > self.max_size:
+            self._front.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache tier statistics"""
+        return {
+            "front_size": len(self._front),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "generation": self._generation,
+            "redis_enabled": self.cache_manager is not None,
+        }
+
+
+# Global search result cache instance
+search_result_cache = None
+
+
+def get_search_result_cache() -> Optional[SearchResultCache]:
+    """Get or create the search result cache (None when disabled by SearchConfig)"""
+    global search_result_cache
+    settings = get_search_settings()
+    if not settings.enable_search_cache:
+        return None
+    if search_result_cache is None:
+        try:
+            cache_manager = CacheManager()
+        except Exception as e:
+            logger.warning(f"Search result cache Redis tier disabled: {e}")
+            cache_manager = None
+        search_result_cache = SearchResultCache(
+            ttl_seconds=settings.search_cache_ttl_seconds,
+            max_size=settings.cache_max_size,
+            cache_manager=cache_manager,
+        )
+    return search_result_cache
+
+
+async def invalidate_search_cache() -> None:
+    """Invalidation hook fired when documents are added or synced"""
+    try:
+        cache = get_search_result_cache()
+        if cache is not None:
+            await cache.invalidate()
+    except Exception as e:
+        logger.warning(f"Failed to invalidate search result cache: {e}")
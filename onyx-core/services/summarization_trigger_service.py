@@ -14,11 +14,12 @@ import asyncio
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 import logging
-import psycopg2
 from psycopg2.extras import RealDictCursor
 import redis
 from dataclasses import dataclass
 
+from services.db_pool import get_shared_pool
+
 logger = logging.getLogger(__name__)
 
 
@@ -54,22 +55,13 @@ class SummarizationTriggerService:
 
     def __init__(self):
         """Initialize summarization trigger service"""
-        self.connection_string = self._build_connection_string()
+        self.db_pool = get_shared_pool()
         self.redis_client = self._init_redis_client()
         self.trigger_interval = int(os.getenv("SUMMARIZATION_TRIGGER_INTERVAL", "10"))
         self.job_queue_key = "summarization:jobs"
         self.processing_key_prefix = "summarization:processing:"
         self.cooldown_period = int(os.getenv("SUMMARIZATION_COOLDOWN_SECONDS", "60"))
 
-    def _build_connection_string(self) -> str:
-        """Build PostgreSQL connection string"""
-        host = os.getenv("POSTGRES_HOST", "localhost")
-        port = os.getenv("POSTGRES_PORT", "5432")
-        database = os.getenv("POSTGRES_DB", "manus")
-        user = os.getenv("POSTGRES_USER", "manus")
-        password = os.getenv("POSTGRES_PASSWORD", "")
-        return f"host={host} port={port} dbname={database} user={user} password={password}"
-
     def _init_redis_client(self):
         """Initialize Redis client for job queuing"""
         try:
@@ -96,9 +88,9 @@ class SummarizationTriggerService:
             logger.error(f"Failed to connect to Redis: {e}")
             raise
 
-    def _get_connection(self):
-        """Get database connection"""
-        return psycopg2.connect(self.connection_string)
+    async def _get_connection(self):
+        """Check out a pooled database connection off the event loop (close() returns it to the pool)"""
+        return await self.db_pool.agetconn()
 
     # =========================================================================
     # Trigger Detection Methods
@@ -282,7 +274,7 @@ class SummarizationTriggerService:
     async def _get_conversation_message_count(self, conversation_id: str) -> int:
         """Get total message count for conversation"""
         try:
-            conn = self._get_connection()
+            conn = await self._get_connection()
             with conn.cursor() as cur:
                 cur.execute(
                     "SELECT COUNT(*) FROM messages WHERE conversation_id = %s",
@@ -301,7 +293,7 @@ class SummarizationTriggerService:
     async def _get_last_summary_time(self, conversation_id: str) -> Optional[float]:
         """Get timestamp of last summary for conversation"""
         try:
-            conn = self._get_connection()
+            conn = await self._get_connection()
             with conn.cursor() as cur:
                 cur.execute(
                     """
@@ -342,7 +334,7 @@ class SummarizationTriggerService:
     ):
         """Track trigger events for analytics"""
         try:
-            conn = self._get_connection()
+            conn = await self._get_connection()
             with conn.cursor() as cur:
                 cur.execute(
                     """
@@ -369,7 +361,7 @@ class SummarizationTriggerService:
     ):
         """Track job completion for analytics"""
         try:
-            conn = self._get_connection()
+            conn = await self._get_connection()
             with conn.cursor() as cur:
                 processing_time = None
                 if job.created_at:
@@ -403,7 +395,7 @@ class SummarizationTriggerService:
             processing_count = len(self.redis_client.keys(f"{self.processing_key_prefix}*"))
 
             # Get recent metrics from database
-            conn = self._get_connection()
+            conn = await self._get_connection()
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute(
                     """
@@ -13,9 +13,13 @@ import uuid
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 import logging
-import psycopg2
 from psycopg2.extras import RealDictCursor, Json
 
+from services.db_pool import get_shared_pool
+from services.memory_dedup import jaccard_similarity, lsh_bands
+from services.memory_generation import bump_memory_generation
+from services.memory_vector_index import get_memory_vector_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,23 +28,14 @@ class SummaryMemoryStorage:
 
     def __init__(self):
         """Initialize summary memory storage service"""
-        self.connection_string = self._build_connection_string()
+        self.db_pool = get_shared_pool()
         self.summary_confidence = float(os.getenv("AUTO_SUMMARY_CONFIDENCE", "0.9"))
         self.duplicate_threshold = float(os.getenv("SUMMARY_DUPLICATE_THRESHOLD", "0.8"))
         self.duplicate_time_window_hours = int(os.getenv("SUMMARY_DUPLICATE_WINDOW_HOURS", "1"))
 
-    def _build_connection_string(self) -> str:
-        """Build PostgreSQL connection string"""
-        host = os.getenv("POSTGRES_HOST", "localhost")
-        port = os.getenv("POSTGRES_PORT", "5432")
-        database = os.getenv("POSTGRES_DB", "manus")
-        user = os.getenv("POSTGRES_USER", "manus")
-        password = os.getenv("POSTGRES_PASSWORD", "")
-        return f"host={host} port={port} dbname={database} user={user} password={password}"
-
-    def _get_connection(self):
-        """Get database connection"""
-        return psycopg2.connect(self.connection_string)
+    async def _get_connection(self):
+        """Check out a pooled database connection off the event loop (close() returns it to the pool)"""
+        return await self.db_pool.agetconn()
 
     # =========================================================================
     # Core Storage Methods
@@ -72,7 +67,7 @@ class SummaryMemoryStorage:
                 logger.info(f"Found duplicate summary for conversation {conversation_id}, using existing memory {duplicate_memory_id}")
                 return duplicate_memory_id
 
-            conn = self._get_connection()
+            conn = await self._get_connection()
             try:
                 with conn.cursor() as cur:
                     # Start transaction
@@ -90,19 +85,30 @@ class SummaryMemoryStorage:
 
                     conn.commit()
 
-                    logger.info(
-                        f"Stored summary for conversation {conversation_id}: "
-                        f"summary_id={summary_id}, memory_id={memory_id}"
-                    )
-
-                    return memory_id
-
             except Exception as e:
                 conn.rollback()
                 raise
             finally:
                 conn.close()
 
+            # Connection is back in the pool before awaiting the generation bump
+            await bump_memory_generation(user_id)
+            get_memory_vector_index().index_in_background({
+                "id": memory_id,
+                "user_id": user_id,
+                "fact": result.summary,
+                "category": "summary",
+                "confidence": result.confidence,
+                "source_type": "auto_summary",
+            })
+
+            logger.info(
+                f"Stored summary for conversation {conversation_id}: "
+                f"summary_id={summary_id}, memory_id={memory_id}"
+            )
+
+            return memory_id
+
         except Exception as e:
             logger.error(f"Error storing summary for conversation {conversation_id}: {e}")
             raise Exception(f"Failed to store summary: {str(e)}")
@@ -183,8 +189,8 @@ class SummaryMemoryStorage:
                 """
                 INSERT INTO user_memories
                 (user_id, fact, category, confidence, source_type, source_message_id,
-                 conversation_id, metadata, created_at, updated_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, NOW(), NOW())
+                 conversation_id, metadata, lsh_bands, created_at, updated_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s::bigint[], NOW(), NOW())
                 RETURNING id
                 """,
                 (
@@ -195,7 +201,8 @@ class SummaryMemoryStorage:
                     'auto_summary',  # Source type
                     None,  # No specific source message
                     conversation_id,
-                    Json(metadata)
+                    Json(metadata),
+                    lsh_bands(result.summary)
                 )
             )
 
@@ -231,11 +238,13 @@ class SummaryMemoryStorage:
             Memory ID of duplicate if found, None otherwise
         """
         try:
-            conn = self._get_connection()
+            conn = await self._get_connection()
             try:
                 with conn.cursor() as cur:
                     # Check for very similar summaries in the same conversation
-                    # within the time window using text similarity
+                    # within the time window. Only summaries sharing an LSH band
+                    # can be similar enough, so the rest never leave the database
+                    # (rows written before migration 010 have no bands yet)
                     cur.execute(
                         """
                         SELECT id, fact
@@ -245,16 +254,16 @@ class SummaryMemoryStorage:
                             AND category = 'summary'
                             AND source_type = 'auto_summary'
                             AND created_at > NOW() - INTERVAL '%s hours'
+                            AND (lsh_bands IS NULL OR lsh_bands && %s::bigint[])
                         ORDER BY created_at DESC
                         LIMIT 5
                         """,
-                        (user_id, conversation_id, self.duplicate_time_window_hours)
+                        (user_id, conversation_id, self.duplicate_time_window_hours, lsh_bands(summary_text))
                     )
 
                     existing_memories = cur.fetchall()
 
                     for memory_id, existing_summary in existing_memories:
-                        # Simple similarity check - can be enhanced with more sophisticated algorithms
                         similarity = self._calculate_text_similarity(summary_text, existing_summary)
                         if similarity >= self.duplicate_threshold:
                             logger.debug(
@@ -273,26 +282,8 @@ class SummaryMemoryStorage:
             return None
 
     def _calculate_text_similarity(self, text1: str, text2: str) -> float:
-        """
-        Calculate simple text similarity using word overlap
-        Can be enhanced with more sophisticated algorithms like cosine similarity
-        """
-        try:
-            # Convert to lowercase and extract words
-            words1 = set(text1.lower().split())
-            words2 = set(text2.lower().split())
-
-            # Calculate Jaccard similarity
-            intersection = words1.intersection(words2)
-            union = words1.union(words2)
-
-            if not union:
-                return 0.0
-
-            return len(intersection) / len(union)
-
-        except Exception:
-            return 0.0
+        """Word-set Jaccard similarity (shared with the other memory dedup paths)"""
+        return jaccard_similarity(text1, text2)
 
     # =========================================================================
     # Memory Retrieval Methods
@@ -314,7 +305,7 @@ class SummaryMemoryStorage:
             List of conversation summary records
         """
         try:
-            conn = self._get_connection()
+            conn = await self._get_connection()
             try:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     cur.execute(
@@ -367,7 +358,7 @@ class SummaryMemoryStorage:
             List of summary memory records
         """
         try:
-            conn = self._get_connection()
+            conn = await self._get_connection()
             try:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     cur.execute(
@@ -413,7 +404,7 @@ class SummaryMemoryStorage:
     async def get_service_metrics(self) -> Dict[str, Any]:
         """Get storage service metrics"""
         try:
-            conn = self._get_connection()
+            conn = await self._get_connection()
             try:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     # Summary statistics
@@ -499,7 +490,7 @@ class SummaryMemoryStorage:
             Number of summaries cleaned up
         """
         try:
-            conn = self._get_connection()
+            conn = await self._get_connection()
             try:
                 with conn.cursor() as cur:
                     cur.execute(
@@ -347,7 +347,7 @@ class TestHybridSearchService:
         hybrid_service.rag_service = AsyncMock()
         hybrid_service.keyword_search_service = AsyncMock()
 
-        hybrid_service.rag_service.search.return_value = [mock_semantic_result]
+        hybrid_service.rag_service.semantic_search.return_value = [mock_semantic_result]
         hybrid_service.keyword_search_service.search.return_value = [mock_keyword_result]
 
         # Execute search
@@ -379,7 +379,7 @@ class TestHybridSearchService:
 
         hybrid_service.rag_service = AsyncMock()
         hybrid_service.keyword_search_service = AsyncMock()
-        hybrid_service.rag_service.search.side_effect = slow_semantic_search
+        hybrid_service.rag_service.semantic_search.side_effect = slow_semantic_search
         hybrid_service.keyword_search_service.search.side_effect = slow_keyword_search
 
         # Execute search should handle timeout gracefully
@@ -408,7 +408,7 @@ class TestHybridSearchService:
         )
 
         hybrid_service.rag_service = AsyncMock()
-        hybrid_service.rag_service.search.return_value = [mock_result]
+        hybrid_service.rag_service.semantic_search.return_value = [mock_result]
 
         # Execute semantic-only search
         results = await hybrid_service.search(
@@ -463,7 +463,7 @@ class TestHybridSearchService:
         # Mock services that raise exceptions
         hybrid_service.rag_service = AsyncMock()
         hybrid_service.keyword_search_service = AsyncMock()
-        hybrid_service.rag_service.search.side_effect = Exception("Semantic search failed")
+        hybrid_service.rag_service.semantic_search.side_effect = Exception("Semantic search failed")
         hybrid_service.keyword_search_service.search.side_effect = Exception("Keyword search failed")
 
         # Execute search should not raise exceptions
@@ -239,7 +239,7 @@ class TestMemoryInjectionService:
         assert cached.injection.user_id == 'user-123'
 
         # Test cache expiration
-        expired_time = time.time() - 400  # Past default TTL of 300 seconds
+        expired_time = time.time() - service.cache_ttl - 1  # Past the configured TTL
         service.cache['user-123:conv-456'].timestamp = expired_time
         cached = service._get_cached_injection('user-123:conv-456')
         assert cached is None
@@ -0,0 +1,125 @@
+"""
+Unit Tests for Analytics Writer
+
+Tests event buffering and aggregation, batched flushes, size/time flush
+triggers, buffer limits, and draining on shutdown.
+"""
+
+import asyncio
+from contextlib import contextmanager
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from services.analytics_writer import (
+    AnalyticsWriter,
+    INSERT_INJECTION_LOGS_SQL,
+    UPDATE_INSTRUCTION_USAGE_SQL,
+    UPDATE_MEMORY_ACCESS_SQL,
+)
+
+
+def make_writer(**kwargs):
+    """Create a writer over a mocked pool; returns (writer, cursor)"""
+    cursor = MagicMock()
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+
+    @contextmanager
+    def connection():
+        yield conn
+
+    pool = MagicMock()
+    pool.connection = connection
+
+    defaults = {"batch_size": 100, "flush_interval_seconds": 60.0, "max_buffer": 1000}
+    defaults.update(kwargs)
+    return AnalyticsWriter(pool=pool, **defaults), cursor
+
+
+@pytest.mark.asyncio
+async def test_flush_batches_logs_and_aggregates_access():
+    """Logs go out as one INSERT; repeated accesses collapse into one row per id."""
+    writer, cursor = make_writer()
+    writer.record_injection("user-1", "conv-1", 3, "chat", 12, True)
+    writer.record_injection("user-1", "conv-2", 0, "chat", 40, False, "db down")
+    writer.record_memory_access(["m-2", "m-1"])
+    writer.record_memory_access(["m-1"])
+    writer.record_instruction_usage(["i-1"])
+
+    with patch("services.analytics_writer.execute_values") as execute_values:
+        rows = await writer.flush()
+
+    assert rows == 5
+    calls = {call.args[1]: call.args[2] for call in execute_values.call_args_list}
+    assert [row[:7] for row in calls[INSERT_INJECTION_LOGS_SQL]] == [
+        ("user-1", "conv-1", 3, "chat", 12, True, None),
+        ("user-1", "conv-2", 0, "chat", 40, False, "db down"),
+    ]
+    assert [row[:2] for row in calls[UPDATE_MEMORY_ACCESS_SQL]] == [("m-1", 2), ("m-2", 1)]
+    assert [row[:2] for row in calls[UPDATE_INSTRUCTION_USAGE_SQL]] == [("i-1", 1)]
+    assert writer.get_stats()["pending"] == 0
+
+    # Nothing buffered, nothing written
+    with patch("services.analytics_writer.execute_values") as execute_values:
+        assert await writer.flush() == 0
+    execute_values.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_batch_size_triggers_background_flush():
+    """Reaching the batch size flushes without waiting for the interval."""
+    writer, _ = make_writer(batch_size=2)
+
+    with patch("services.analytics_writer.execute_values"):
+        writer.record_memory_access(["m-1"])
+        assert writer.get_stats()["running"] is True
+        writer.record_memory_access(["m-2"])
+        for _ in range(50):
+            if writer.get_stats()["flushes"]:
+                break
+            await asyncio.sleep(0.01)
+        await writer.stop()
+
+    assert writer.get_stats()["flushes"] == 1
+    assert writer.get_stats()["rows_written"] == 2
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_buffered_events():
+    """Shutdown writes everything still buffered."""
+    writer, _ = make_writer()
+    await writer.start()
+    writer.record_injection("user-1", "conv-1", 1, "chat", 5, True)
+
+    with patch("services.analytics_writer.execute_values") as execute_values:
+        await writer.stop()
+
+    execute_values.assert_called_once()
+    stats = writer.get_stats()
+    assert stats["pending"] == 0
+    assert stats["running"] is False
+
+
+def test_full_buffer_drops_new_events():
+    """Events beyond max_buffer are dropped and counted instead of blocking."""
+    writer, _ = make_writer(max_buffer=2)
+
+    writer.record_memory_access(["m-1", "m-2"])
+    writer.record_memory_access(["m-3"])
+
+    stats = writer.get_stats()
+    assert stats["pending"] == 2
+    assert stats["dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_counted():
+    """A failed flush is logged and counted, never raised to the caller."""
+    writer, _ = make_writer()
+    writer.record_memory_access(["m-1"])
+
+    with patch("services.analytics_writer.execute_values", side_effect=Exception("db down")):
+        assert await writer.flush() == 0
+
+    assert writer.get_stats()["failed_flushes"] == 1
@@ -0,0 +1,161 @@
+"""
+Unit Tests for Batch Memory Extraction
+
+Tests prompt packing, bulk storage with near-duplicate skipping, bounded
+concurrent processing, and checkpoint handling for failed packs.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from services.batch_memory_extraction import (
+    INSERT_MEMORIES_SQL,
+    BatchMemoryExtractor,
+    ConversationRecord,
+    fit_to_budget,
+)
+
+
+BASE_TIME = datetime(2026, 1, 1)
+
+
+def make_conversation(index, tokens=100, user_id="user-1"):
+    """A conversation record with a given estimated size"""
+    return ConversationRecord(
+        conversation_id=f"conv-{index}",
+        user_id=user_id,
+        created_at=BASE_TIME + timedelta(minutes=index),
+        messages=[{"id": f"msg-{index}", "role": "user", "content": "x" * 40}],
+        estimated_tokens=tokens,
+    )
+
+
+def make_memory(fact, confidence=0.8):
+    """An extracted memory as returned by the extraction service"""
+    return SimpleNamespace(
+        fact=fact, category="preference", confidence=confidence, source_message_id=None,
+        evidence=[], extraction_method="llm", metadata={},
+    )
+
+
+def make_pool(existing_facts=()):
+    """Mocked shared pool; returns (pool, cursor)"""
+    cursor = MagicMock()
+    cursor.fetchone.return_value = None  # No checkpoint yet
+    cursor.fetchall.return_value = [("user-1", fact) for fact in existing_facts]
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+
+    @contextmanager
+    def connection():
+        yield conn
+
+    pool = MagicMock()
+    pool.connection = connection
+    return pool, cursor
+
+
+def make_extractor(conversations, extractor, **kwargs):
+    """Batch extractor over a fixed conversation stream"""
+    pool, cursor = make_pool(kwargs.pop("existing_facts", ()))
+    batch = BatchMemoryExtractor(extractor=extractor, pool=pool, **kwargs)
+
+    async def stream(after, user_id):
+        for conversation in conversations:
+            yield conversation
+
+    batch._stream_conversations = stream
+    return batch, cursor
+
+
+def inserted_rows(execute_values):
+    """Rows passed to the bulk memory INSERT"""
+    return [
+        row for call in execute_values.call_args_list
+        if call.args[1] == INSERT_MEMORIES_SQL
+        for row in call.args[2]
+    ]
+
+
+@pytest.fixture(autouse=True)
+def no_side_effects():
+    """Skip generation bumps and vector indexing"""
+    with patch("services.batch_memory_extraction.bump_memory_generation", new=AsyncMock()), \
+            patch("services.batch_memory_extraction.get_memory_vector_index"):
+        yield
+
+
+def test_fit_to_budget_keeps_latest_messages():
+    """Long conversations are cut from the start, never below one message."""
+    messages = [{"content": "a" * 400} for _ in range(5)]
+
+    assert len(fit_to_budget(messages, token_budget=250)) == 2
+    assert len(fit_to_budget(messages, token_budget=1)) == 1
+
+
+@pytest.mark.asyncio
+async def test_packs_respect_token_budget():
+    """Conversations are packed until the next one would exceed the budget."""
+    conversations = [make_conversation(i, tokens=t) for i, t in enumerate([300, 300, 300, 900, 50])]
+    batch, _ = make_extractor(conversations, MagicMock(), token_budget=1000)
+
+    packs = [pack async for pack in batch._packs(None, None)]
+
+    assert [[c.conversation_id for c in pack.conversations] for pack in packs] == [
+        ["conv-0", "conv-1", "conv-2"], ["conv-3", "conv-4"]
+    ]
+    assert [pack.sequence for pack in packs] == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_run_bulk_inserts_and_checkpoints():
+    """Each pack is one LLM call and one INSERT; duplicates are skipped."""
+    conversations = [make_conversation(i) for i in range(4)]
+    extractor = MagicMock()
+    extractor.extract_memories_batch = AsyncMock(side_effect=lambda pack: {
+        c.conversation_id: [
+            make_memory(f"Prefers email updates for project {c.conversation_id}"),
+            make_memory("Works remotely on Fridays and Mondays"),
+        ]
+        for c in pack
+    })
+    batch, cursor = make_extractor(
+        conversations, extractor, token_budget=200, concurrency=2,
+        existing_facts=["works remotely on fridays and mondays"],
+    )
+
+    with patch("services.batch_memory_extraction.execute_values",
+               side_effect=lambda cur, sql, rows, **kw: [("m", r[0], r[1], r[2], r[3], r[4]) for r in rows]) as ev:
+        result = await batch.run("job-1")
+
+    assert extractor.extract_memories_batch.await_count == 2  # 4 conversations, 2 per prompt
+    assert sorted(row[1] for row in inserted_rows(ev)) == sorted(
+        f"Prefers email updates for project conv-{i}" for i in range(4)
+    )
+    assert result.memories_stored == 4
+    assert result.duplicates_skipped == 4
+    assert result.conversations_processed == 4
+    assert result.checkpoint == conversations[-1].position
+
+    checkpoint_params = cursor.execute.call_args_list[-1].args[1]
+    assert checkpoint_params[0] == "job-1"
+    assert checkpoint_params[1:3] == conversations[-1].position
+
+
+@pytest.mark.asyncio
+async def test_failed_pack_holds_checkpoint():
+    """A failed pack keeps the checkpoint before it so a rerun retries it."""
+    conversations = [make_conversation(i) for i in range(3)]
+    extractor = MagicMock()
+    extractor.extract_memories_batch = AsyncMock(side_effect=[{}, None, {}])
+    batch, _ = make_extractor(conversations, extractor, token_budget=100, concurrency=1)
+
+    with patch("services.batch_memory_extraction.execute_values"):
+        result = await batch.run("job-2")
+
+    assert result.failed_prompts == 1
+    assert result.checkpoint == conversations[0].position
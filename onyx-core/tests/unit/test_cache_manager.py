@@ -91,6 +91,24 @@ async def test_cache_get_ttl():
         assert ttl == -1
 
 
+@pytest.mark.asyncio
+async def test_cache_counters():
+    """Test atomic counters used for generation-based invalidation."""
+    manager = CacheManager()
+
+    with patch.object(manager.redis, 'incr', new=AsyncMock(return_value=3)):
+        assert await manager.increment("counter") == 3
+
+    with patch.object(manager.redis, 'get', new=AsyncMock(return_value=None)):
+        assert await manager.get_counter("counter") == 0
+
+    with patch.object(manager.redis, 'get', new=AsyncMock(return_value="7")):
+        assert await manager.get_counter("counter") == 7
+
+    with patch.object(manager.redis, 'incr', new=AsyncMock(side_effect=Exception("Redis error"))):
+        assert await manager.increment("counter") is None
+
+
 @pytest.mark.asyncio
 async def test_cache_error_handling():
     """Test error handling in cache operations."""
@@ -0,0 +1,355 @@
+"""
+Unit Tests for Instrumented Database Pool
+
+Tests pool configuration, saturation/acquire statistics, the pooled
+MemoryService backend, and the shared psycopg2 pool's health checks and
+leak detection.
+"""
+
+import asyncio
+import gc
+import threading
+import uuid
+
+import psycopg2.extensions
+import psycopg2.pool
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from services.db_pool import InstrumentedPool, PoolConfig, SharedConnectionPool, build_postgres_dsn
+
+
+class FakePool:
+    """Minimal asyncpg pool stand-in with a fixed number of connections"""
+
+    def __init__(self, size=2):
+        self.size = size
+        self.idle = [MagicMock(name=f"conn-{i}") for i in range(size)]
+        self.freed = asyncio.Condition()
+
+    def get_size(self):
+        return self.size
+
+    def get_idle_size(self):
+        return len(self.idle)
+
+    async def acquire(self, timeout=None):
+        async with self.freed:
+            await asyncio.wait_for(self.freed.wait_for(lambda: self.idle), timeout)
+            return self.idle.pop()
+
+    async def release(self, conn):
+        async with self.freed:
+            self.idle.append(conn)
+            self.freed.notify()
+
+    async def close(self):
+        pass
+
+
+def make_pool(size=2, **config):
+    """Create an InstrumentedPool over a FakePool"""
+    pool = InstrumentedPool("test", "postgresql://localhost/test", PoolConfig(max_size=size, **config))
+    pool.pool = FakePool(size)
+    return pool
+
+
+def test_pool_config_from_env(monkeypatch):
+    """Pool size and statement cache settings come from prefixed env vars."""
+    monkeypatch.setenv("MEMORY_DB_POOL_MAX_SIZE", "25")
+    monkeypatch.setenv("MEMORY_DB_STATEMENT_CACHE_SIZE", "0")
+
+    config = PoolConfig.from_env("MEMORY_DB")
+
+    assert config.max_size == 25
+    assert config.statement_cache_size == 0
+    assert config.min_size == 2
+
+
+def test_dsn_quotes_credentials(monkeypatch):
+    """Special characters in credentials are URL-encoded."""
+    monkeypatch.setenv("POSTGRES_USER", "onyx")
+    monkeypatch.setenv("POSTGRES_PASSWORD", "p@ss/word")
+    monkeypatch.setenv("POSTGRES_HOST", "db")
+    monkeypatch.setenv("POSTGRES_DB", "manus")
+
+    assert build_postgres_dsn() == "postgresql://onyx:p%40ss%2Fword@db:5432/manus"
+
+
+@pytest.mark.asyncio
+async def test_initialize_passes_statement_cache_settings():
+    """The asyncpg pool is created once with the configured sizes."""
+    pool = InstrumentedPool("memory", "postgresql://localhost/test", PoolConfig(max_size=7, statement_cache_size=50))
+
+    with patch("services.db_pool.asyncpg.create_pool", new=AsyncMock(return_value=FakePool())) as create_pool:
+        await asyncio.gather(pool.initialize(), pool.initialize())
+
+    create_pool.assert_awaited_once()
+    kwargs = create_pool.await_args.kwargs
+    assert kwargs["max_size"] == 7
+    assert kwargs["statement_cache_size"] == 50
+    assert kwargs["server_settings"]["application_name"] == "onyx-memory"
+
+
+@pytest.mark.asyncio
+async def test_acquire_tracks_saturation():
+    """In-use count, peak and saturation reflect checked-out connections."""
+    pool = make_pool(size=2)
+
+    async with pool.acquire():
+        async with pool.acquire():
+            stats = pool.get_stats()
+            assert stats["in_use"] == 2
+            assert stats["saturation"] == 1.0
+
+    stats = pool.get_stats()
+    assert stats["in_use"] == 0
+    assert stats["peak_in_use"] == 2
+    assert stats["acquisitions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_and_times_out_when_exhausted():
+    """Waiting on an exhausted pool is counted, and timeouts are reported."""
+    pool = make_pool(size=1, acquire_timeout=0.05)
+
+    async with pool.acquire():
+        with pytest.raises(asyncio.TimeoutError):
+            async with pool.acquire():
+                pass
+
+    assert pool.get_stats()["acquire_timeouts"] == 1
+
+    acquired, release = asyncio.Event(), asyncio.Event()
+
+    async def holder():
+        async with pool.acquire():
+            acquired.set()
+            await release.wait()
+
+    task = asyncio.create_task(holder())
+    await acquired.wait()
+    asyncio.get_running_loop().call_later(0.01, release.set)
+    pool.config.acquire_timeout = 1.0
+    async with pool.acquire():
+        pass
+    await task
+
+    assert pool.get_stats()["waits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_service_uses_pooled_connection():
+    """MemoryService queries run on pooled asyncpg connections with $n parameters."""
+    from services.memory_service import MemoryService
+
+    service = MemoryService()
+    service.db = make_pool(size=1)
+    conn = service.db.pool.idle[0]
+    memory_id = uuid.uuid4()
+    conn.fetch = AsyncMock(return_value=[{"id": memory_id, "fact": "Prefers email"}])
+
+    memories = await service.get_user_memories("user-1", category="preference", limit=5)
+
+    assert memories == [{"id": str(memory_id), "fact": "Prefers email"}]
+    query, *params = conn.fetch.await_args.args
+    assert "category = $2" in query and "LIMIT $3 OFFSET $4" in query
+    assert params == ["user-1", "preference", 5, 0]
+    assert service.get_pool_stats()["acquisitions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_service_delete_reads_command_tag():
+    """Soft delete reports success from the asyncpg command tag."""
+    from services.memory_service import MemoryService
+
+    service = MemoryService()
+    service.db = make_pool(size=1)
+    conn = service.db.pool.idle[0]
+
+    conn.execute = AsyncMock(return_value="UPDATE 1")
+    assert await service.delete_memory("m-1", "user-1") is True
+
+    conn.execute = AsyncMock(return_value="UPDATE 0")
+    assert await service.delete_memory("m-1", "user-1") is False
+
+
+class FakeRawConnection:
+    """psycopg2 connection stand-in"""
+
+    def __init__(self):
+        self.closed = 0
+        self.autocommit = False
+        self.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        self.rollback = MagicMock()
+        self.commit = MagicMock()
+
+    def get_transaction_status(self):
+        return self.transaction_status
+
+
+class FakeThreadedPool:
+    """ThreadedConnectionPool stand-in that hands out FakeRawConnections"""
+
+    def __init__(self, minconn, maxconn, *args, **kwargs):
+        self.maxconn = maxconn
+        self.idle = []
+        self.used = 0
+        self.putconn_calls = []
+
+    def getconn(self):
+        if self.idle:
+            conn = self.idle.pop()
+        elif self.used < self.maxconn:
+            conn = FakeRawConnection()
+        else:
+            raise psycopg2.pool.PoolError("connection pool exhausted")
+        self.used += 1
+        return conn
+
+    def putconn(self, conn, close=False):
+        self.used -= 1
+        self.putconn_calls.append((conn, close))
+        if not close:
+            self.idle.append(conn)
+
+    def closeall(self):
+        pass
+
+
+def make_shared_pool(max_size=2, acquire_timeout=0.05):
+    """Create a SharedConnectionPool over FakeThreadedPool"""
+    config = PoolConfig(min_size=1, max_size=max_size, acquire_timeout=acquire_timeout)
+    pool = SharedConnectionPool("test-shared", "postgresql://localhost/test", config)
+    with patch("services.db_pool.psycopg2.pool.ThreadedConnectionPool", FakeThreadedPool):
+        pool._ensure_pool()
+    return pool
+
+
+def test_shared_pool_close_returns_and_resets_connection():
+    """close() returns the connection to the pool, rolling back open transactions."""
+    pool = make_shared_pool()
+
+    conn = pool.getconn()
+    raw = conn._conn
+    raw.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+    conn.autocommit = True  # forwarded to the raw connection
+    assert raw.autocommit is True
+
+    conn.close()
+
+    raw.rollback.assert_called_once()
+    assert raw.autocommit is False
+    assert conn.closed
+    assert pool.get_stats()["in_use"] == 0
+    assert pool.getconn()._conn is raw  # reused, not reconnected
+
+
+def test_shared_pool_is_bounded():
+    """Checkouts beyond max_size fail after acquire_timeout and are counted."""
+    pool = make_shared_pool(max_size=1)
+    held = pool.getconn()
+
+    with pytest.raises(psycopg2.pool.PoolError):
+        pool.getconn()
+
+    stats = pool.get_stats()
+    assert stats["waits"] == 1
+    assert stats["exhausted"] == 1
+    held.close()
+
+
+def test_shared_pool_waits_for_a_returned_connection():
+    """A checkout on an exhausted pool is served as soon as a connection is returned."""
+    pool = make_shared_pool(max_size=1, acquire_timeout=5.0)
+    held = pool.getconn()
+    raw = held._conn
+
+    timer = threading.Timer(0.05, held.close)
+    timer.start()
+    conn = pool.getconn()
+    timer.join()
+
+    assert conn._conn is raw
+    assert pool.get_stats()["waits"] == 1
+    assert pool.get_stats()["exhausted"] == 0
+
+
+@pytest.mark.asyncio
+async def test_shared_pool_getconn_on_event_loop_fails_fast():
+    """A blocking checkout on the event-loop thread raises instead of waiting."""
+    pool = make_shared_pool(max_size=1, acquire_timeout=5.0)
+    held = pool.getconn()
+
+    with pytest.raises(psycopg2.pool.PoolError):
+        pool.getconn()
+
+    stats = pool.get_stats()
+    assert stats["waits"] == 0
+    assert stats["exhausted"] == 1
+    held.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_pool_agetconn_waits_off_the_event_loop():
+    """agetconn waits for a returned connection while the event loop keeps running."""
+    pool = make_shared_pool(max_size=1, acquire_timeout=5.0)
+    held = await pool.agetconn()
+    raw = held._conn
+
+    async def release_later():
+        await asyncio.sleep(0.05)
+        held.close()
+
+    release = asyncio.create_task(release_later())
+    conn = await pool.agetconn()
+    await release
+
+    assert conn._conn is raw
+    assert pool.get_stats()["waits"] == 1
+    assert pool.get_stats()["exhausted"] == 0
+    conn.close()
+
+
+def test_shared_pool_discards_closed_connections():
+    """A connection closed by the server is replaced on checkout."""
+    pool = make_shared_pool()
+    conn = pool.getconn()
+    raw = conn._conn
+    conn.close()
+    raw.closed = 1
+
+    fresh = pool.getconn()
+
+    assert fresh._conn is not raw
+    assert pool.get_stats()["discarded"] == 1
+
+
+def test_shared_pool_reclaims_leaked_connections():
+    """Connections dropped without close() are reported and reclaimed."""
+    pool = make_shared_pool(max_size=1)
+
+    def leaky():
+        pool.getconn()  # never closed
+
+    leaky()
+    gc.collect()
+
+    assert pool.get_stats()["leaks"] == 1
+    # The leaked connection is returned on the next checkout instead of exhausting the pool
+    conn = pool.getconn()
+    assert pool.get_stats()["in_use"] == 1
+    conn.close()
+
+
+def test_shared_pool_reports_long_held_checkouts():
+    """Checkouts held past the leak threshold are listed with their owner."""
+    pool = make_shared_pool()
+    pool.leak_threshold_seconds = 0.0
+
+    conn = pool.getconn()
+    leaks = pool.find_leaks()
+
+    assert len(leaks) == 1
+    assert "test_shared_pool_reports_long_held_checkouts" in leaks[0]["owner"]
+    conn.close()
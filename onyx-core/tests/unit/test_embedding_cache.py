@@ -0,0 +1,145 @@
+"""
+Unit Tests for Query Embedding Cache
+
+Tests the in-process LRU tier, the Redis tier with packed float32 vectors,
+and RAGService integration.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from services.embedding_cache import (
+    EmbeddingCache,
+    normalize_query,
+    pack_vector,
+    unpack_vector,
+)
+
+
+def make_cache(**kwargs):
+    """Create a cache without a Redis tier unless one is patched in"""
+    defaults = {"model_name": "test-model", "vector_size": 3, "max_size": 2, "ttl_seconds": 60}
+    defaults.update(kwargs)
+    return EmbeddingCache(**defaults)
+
+
+def test_normalize_query():
+    """Whitespace and case differences map to the same normalized text."""
+    assert normalize_query("  Quarterly   Revenue\tReport ") == "quarterly revenue report"
+
+
+def test_key_includes_model_name():
+    """Keys are scoped by the embedding model."""
+    cache_a = make_cache(model_name="model-a")
+    cache_b = make_cache(model_name="model-b")
+
+    assert cache_a.make_key("Hello  World") == cache_a.make_key("hello world")
+    assert cache_a.make_key("hello world") != cache_b.make_key("hello world")
+
+
+def test_pack_roundtrip_is_float32_bytes():
+    """Vectors are packed as 4 bytes per dimension."""
+    data = pack_vector([0.5, -1.25, 2.0])
+    assert isinstance(data, bytes)
+    assert len(data) == 12
+    assert unpack_vector(data) == [0.5, -1.25, 2.0]
+
+
+@pytest.mark.asyncio
+async def test_memory_tier_hit_and_lru_eviction():
+    """The in-process tier serves hits and evicts the least recently used entry."""
+    cache = make_cache()
+
+    await cache.set("q1", [1.0, 0.0, 0.0])
+    await cache.set("q2", [0.0, 1.0, 0.0])
+    assert await cache.get("Q1") == [1.0, 0.0, 0.0]  # refreshes q1
+
+    await cache.set("q3", [0.0, 0.0, 1.0])  # evicts q2
+    assert await cache.get("q2") is None
+    assert await cache.get("q1") is not None
+
+    stats = cache.get_stats()
+    assert stats["memory_hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_stores_packed_bytes_and_promotes():
+    """Redis stores packed bytes, and Redis hits are promoted into memory."""
+    cache = make_cache()
+    cache.redis = MagicMock()
+    cache.redis.setex = AsyncMock(return_value=True)
+
+    await cache.set("query", [0.25, 0.5, 0.75])
+    key, ttl, value = cache.redis.setex.call_args.args
+    assert ttl == 60
+    assert value == pack_vector([0.25, 0.5, 0.75])
+
+    cache.clear()
+    cache.redis.get = AsyncMock(return_value=value)
+    assert await cache.get("query") == [0.25, 0.5, 0.75]
+    assert cache.get_stats()["redis_hits"] == 1
+
+    # Second lookup is served from memory without touching Redis
+    cache.redis.get.reset_mock()
+    assert await cache.get("query") == [0.25, 0.5, 0.75]
+    cache.redis.get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_degrade_to_miss():
+    """Redis failures are treated as cache misses."""
+    cache = make_cache()
+    cache.redis = MagicMock()
+    cache.redis.get = AsyncMock(side_effect=Exception("Redis down"))
+    cache.redis.setex = AsyncMock(side_effect=Exception("Redis down"))
+
+    await cache.set("query", [1.0, 2.0, 3.0])
+    cache.clear()
+    assert await cache.get("query") is None
+
+
+@pytest.mark.asyncio
+async def test_rag_service_uses_cache_for_repeated_queries():
+    """RAGService only calls the embeddings API once for a repeated query."""
+    with patch("rag_service.QdrantClient"), patch("rag_service.OpenAI"), \
+            patch("rag_service.AsyncQdrantClient"), patch("rag_service.AsyncOpenAI"):
+        from rag_service import RAGService
+        service = RAGService()
+
+    service.embedding_cache = make_cache()
+    service.embed_text = AsyncMock(return_value=[0.1, 0.2, 0.3])
+
+    first = await service.get_query_embedding("What is ONYX?")
+    second = await service.get_query_embedding("what is  onyx?")
+
+    assert first == second
+    service.embed_text.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_lookup_still_caches_the_embedding():
+    """A caller cancelled mid-embedding (e.g. a leg timeout) still populates the cache."""
+    with patch("rag_service.QdrantClient"), patch("rag_service.OpenAI"), \
+            patch("rag_service.AsyncQdrantClient"), patch("rag_service.AsyncOpenAI"):
+        from rag_service import RAGService
+        service = RAGService()
+
+    service.embedding_cache = make_cache()
+
+    async def slow_embed(text):
+        await asyncio.sleep(0.05)
+        return [0.1, 0.2, 0.3]
+
+    service.embed_text = AsyncMock(side_effect=slow_embed)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(service.get_query_embedding("slow query"), timeout=0.01)
+    await asyncio.sleep(0.1)
+
+    assert await service.embedding_cache.get("slow query") == [0.1, 0.2, 0.3]
+    assert await service.get_query_embedding("slow query") == [0.1, 0.2, 0.3]
+    service.embed_text.assert_awaited_once()
@@ -0,0 +1,188 @@
+"""
+Unit Tests for Embedding Service
+
+Tests chunk embedding generation, the content-hash dedup store integration
+and the embedding statistics.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from services.embedding_service import (
+    EmbeddingService,
+    EmbeddingRateController,
+    EMBEDDING_DIMENSIONS,
+)
+
+
+def make_service(monkeypatch, dedup: bool = True) -> EmbeddingService:
+    """Create an EmbeddingService with the OpenAI client patched out"""
+    monkeypatch.setenv("ENABLE_EMBEDDING_DEDUP", "true" if dedup else "false")
+    with patch("services.embedding_service.AsyncOpenAI"):
+        service = EmbeddingService()
+    return service
+
+
+def fake_vector(text: str):
+    """Deterministic fake embedding for a chunk text"""
+    return [float(len(text))] * EMBEDDING_DIMENSIONS
+
+
+@pytest.mark.asyncio
+async def test_dedup_store_hits_skip_the_api(monkeypatch):
+    """Only chunks missing from the dedup store are embedded, and new vectors are stored."""
+    service = make_service(monkeypatch)
+    known_hash = service._calculate_chunk_hash("known chunk")
+
+    service.dedup_store = MagicMock()
+    service.dedup_store.get_many = AsyncMock(return_value={known_hash: [9.0] * EMBEDDING_DIMENSIONS})
+    service.dedup_store.put_many = AsyncMock(return_value=True)
+    service._generate_batch_embeddings_with_retry = AsyncMock(
+        side_effect=lambda texts: [fake_vector(t) for t in texts]
+    )
+
+    chunks = ["known chunk", "new chunk", "new chunk", "another"]
+    processed = await service._generate_chunk_embeddings(chunks, {})
+
+    service._generate_batch_embeddings_with_retry.assert_awaited_once_with(["new chunk", "another"])
+    stored = service.dedup_store.put_many.await_args.args[0]
+    assert set(stored) == {service._calculate_chunk_hash("new chunk"), service._calculate_chunk_hash("another")}
+
+    assert [c.text for c in processed] == chunks
+    assert [c.metadata.chunk_index for c in processed] == [0, 1, 2, 3]
+    assert [c.reused for c in processed] == [True, False, True, False]
+    assert processed[0].embedding == [9.0] * EMBEDDING_DIMENSIONS
+    assert processed[2].embedding == fake_vector("new chunk")
+
+    stats = service._generate_stats(processed, processing_time=1.0)
+    assert stats["reused_chunks"] == 2
+    assert stats["embedded_chunks"] == 2
+    assert stats["dedup_ratio"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_embeddings_without_dedup_store(monkeypatch):
+    """With dedup disabled every unique chunk is embedded."""
+    service = make_service(monkeypatch, dedup=False)
+    assert service.dedup_store is None
+
+    service._generate_batch_embeddings_with_retry = AsyncMock(
+        side_effect=lambda texts: [fake_vector(t) for t in texts]
+    )
+
+    processed = await service._generate_chunk_embeddings(["a", "bb"], {})
+
+    assert [c.embedding[0] for c in processed] == [1.0, 2.0]
+    assert service._generate_stats(processed, processing_time=1.0)["dedup_ratio"] == 0.0
+
+
+class FakeRateLimitError(Exception):
+    """Stand-in for openai.RateLimitError carrying a Retry-After header"""
+
+    status_code = 429
+
+    def __init__(self, retry_after: str):
+        super().__init__("rate limited")
+        self.response = SimpleNamespace(headers={"retry-after": retry_after})
+
+
+def test_pack_batches_by_token_budget(monkeypatch):
+    """Batches are packed by token count and keep input order."""
+    service = make_service(monkeypatch, dedup=False)
+    service.batch_token_budget = 10
+    service._count_tokens = lambda text: len(text)
+
+    texts = ["aaaa", "bbbb", "cc", "dddddddddddd", "e"]
+    assert service._pack_batches(texts) == [(0, 3), (3, 4), (4, 5)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_batches_keep_output_order(monkeypatch):
+    """Batches run concurrently (bounded) and results come back in input order."""
+    service = make_service(monkeypatch, dedup=False)
+    service.batch_token_budget = 2
+    service._count_tokens = lambda text: 1
+    service.rate_controller = EmbeddingRateController(max_concurrency=2)
+
+    in_flight = 0
+    peak = 0
+
+    async def create(model, input):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Later batches finish first to prove ordering does not depend on completion
+        await asyncio.sleep(0.01 * (10 - len(input[0])))
+        in_flight -= 1
+        return SimpleNamespace(data=[
+            SimpleNamespace(index=i, embedding=fake_vector(t)) for i, t in enumerate(input)
+        ])
+
+    service.openai_client.embeddings.create = create
+    texts = ["x" * n for n in range(1, 9)]
+
+    embeddings = await service._embed_concurrently(texts)
+
+    assert [e[0] for e in embeddings] == [float(n) for n in range(1, 9)]
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_backs_off_and_retries(monkeypatch):
+    """A 429 halves the concurrency limit, honors Retry-After and is retried."""
+    service = make_service(monkeypatch, dedup=False)
+    service.rate_controller = EmbeddingRateController(max_concurrency=4)
+    response = SimpleNamespace(data=[SimpleNamespace(index=0, embedding=fake_vector("a"))])
+    service.openai_client.embeddings.create = AsyncMock(
+        side_effect=[FakeRateLimitError("0.01"), response]
+    )
+
+    embeddings = await service._generate_batch_embeddings_with_retry(["a"])
+
+    assert embeddings == [fake_vector("a")]
+    assert service.openai_client.embeddings.create.await_count == 2
+    assert service.rate_controller.limit == 2
+    assert service.rate_controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_releases_its_slot(monkeypatch):
+    """Cancelling an in-flight batch frees its slot without lowering the limit."""
+    service = make_service(monkeypatch, dedup=False)
+    service.rate_controller = EmbeddingRateController(max_concurrency=2)
+    started = asyncio.Event()
+
+    async def create(model, input):
+        started.set()
+        await asyncio.sleep(10)
+
+    service.openai_client.embeddings.create = create
+    task = asyncio.create_task(service._generate_batch_embeddings_with_retry(["a"]))
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert service.rate_controller.in_flight == 0
+    assert service.rate_controller.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_short_response_is_retried(monkeypatch):
+    """A response with missing embeddings is retried instead of failing the batch."""
+    monkeypatch.setattr("services.embedding_service.RETRY_DELAY", 0)
+    service = make_service(monkeypatch, dedup=False)
+    service.rate_controller = EmbeddingRateController(max_concurrency=1)
+    good = SimpleNamespace(data=[
+        SimpleNamespace(index=i, embedding=fake_vector(t)) for i, t in enumerate(["a", "bb"])
+    ])
+    short = SimpleNamespace(data=good.data[:1])
+    service.openai_client.embeddings.create = AsyncMock(side_effect=[short, good])
+
+    embeddings = await service._generate_batch_embeddings_with_retry(["a", "bb"])
+
+    assert embeddings == [fake_vector("a"), fake_vector("bb")]
+    assert service.openai_client.embeddings.create.await_count == 2
+    assert service.rate_controller.in_flight == 0
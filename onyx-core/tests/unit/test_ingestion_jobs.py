@@ -0,0 +1,198 @@
+"""
+Unit Tests for Background Ingestion Jobs
+
+Tests job queuing and progress tracking in Redis, the job upload and status
+endpoints, and job processing in the ingestion worker.
+"""
+
+import io
+import os
+
+import pytest
+from fastapi import HTTPException
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from api.upload import FileProcessingResult, FileValidationResult, create_ingestion_job, get_ingestion_job
+from services.ingestion_job_service import IngestionFile, IngestionJobService
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis commands the job service uses"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.lists = {}
+
+    def ping(self):
+        return True
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        return []
+
+    def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def expire(self, key, ttl):
+        return True
+
+    def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value)
+
+    def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+
+    def blmove(self, source, destination, timeout, src, dest):
+        items = self.lists.get(source)
+        if not items:
+            return None
+        value = items.pop()
+        self.lists.setdefault(destination, []).insert(0, value)
+        return value
+
+    def lrange(self, key, start, end):
+        return list(self.lists.get(key, []))
+
+    def lrem(self, key, count, value):
+        items = self.lists.get(key, [])
+        if value in items:
+            items.remove(value)
+            return 1
+        return 0
+
+    def llen(self, key):
+        return len(self.lists.get(key, []))
+
+
+@pytest.fixture
+def job_service():
+    """Job service backed by FakeRedis"""
+    with patch("services.ingestion_job_service.redis.Redis", return_value=FakeRedis()):
+        service = IngestionJobService()
+    with patch("api.upload.get_ingestion_job_service", return_value=service), \
+            patch("workers.ingestion_worker.get_ingestion_job_service", return_value=service):
+        yield service
+
+
+@pytest.mark.asyncio
+async def test_job_progress_round_trip(job_service):
+    """Queued jobs come back from the queue and report per-file progress."""
+    await job_service.enqueue_job("job-1", "user@example.com", [
+        IngestionFile(filename="a.txt", path="/uploads/job-1/0_a.txt"),
+        IngestionFile(filename="b.pdf", path="/uploads/job-1/1_b.pdf"),
+    ])
+
+    job = await job_service.get_next_job("worker-1")
+    assert job.job_id == "job-1"
+    assert [f["filename"] for f in job.files] == ["a.txt", "b.pdf"]
+    assert await job_service.get_next_job("worker-1") is None
+
+    status = await job_service.get_job_status("job-1")
+    assert status["status"] == "queued"
+    assert [f["status"] for f in status["files"]] == ["queued", "queued"]
+    assert await job_service.get_job_status("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_create_job_stores_files_and_queues(job_service, tmp_path):
+    """Valid files are stored under the job directory and the job id returned."""
+    files = [
+        SimpleNamespace(filename="notes.txt", file=io.BytesIO(b"hello world")),
+        SimpleNamespace(filename="bad.exe", file=io.BytesIO(b"MZ")),
+    ]
+
+    def validate(file, file_path=None):
+        is_valid = file.filename.endswith(".txt")
+        return FileValidationResult(filename=file.filename, is_valid=is_valid, file_size=11, file_type=".txt",
+                                    error_message=None if is_valid else "Unsupported file type")
+
+    with patch("api.upload.UPLOAD_DIR", str(tmp_path)), \
+            patch("api.upload.validate_upload_file", side_effect=validate):
+        response = await create_ingestion_job(files=files, current_user={"email": "user@example.com"})
+
+    assert response.queued_files == ["notes.txt"]
+    assert [r.filename for r in response.rejected_files] == ["bad.exe"]
+    job = await job_service.get_next_job("worker-1")
+    assert job.job_id == response.job_id
+    with open(job.files[0]["path"], "rb") as stored:
+        assert stored.read() == b"hello world"
+
+    status = await get_ingestion_job(response.job_id, current_user={"email": "user@example.com"})
+    assert status["totals"]["files"] == 1
+    with pytest.raises(HTTPException) as error:
+        await get_ingestion_job(response.job_id, current_user={"email": "someone@example.com"})
+    assert error.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_worker_reports_progress_and_cleans_up(job_service, tmp_path):
+    """The worker records per-file progress and the job outcome, then removes the files."""
+    from workers.ingestion_worker import IngestionWorker
+
+    job_dir = tmp_path / "job-2"
+    job_dir.mkdir()
+    (job_dir / "0_a.txt").write_bytes(b"alpha")
+    (job_dir / "1_b.txt").write_bytes(b"beta")
+    await job_service.enqueue_job("job-2", "user@example.com", [
+        IngestionFile(filename="a.txt", path=str(job_dir / "0_a.txt")),
+        IngestionFile(filename="b.txt", path=str(job_dir / "1_b.txt")),
+    ])
+
+    async def ingest(stream, filename, user_id, progress=None, file_path=None):
+        if filename == "b.txt":
+            return FileProcessingResult(filename=filename, status="error", error_message="Embedding failed")
+        await progress(parsed=True)
+        await progress(chunks_embedded=3)
+        await progress(chunks_indexed=3)
+        return FileProcessingResult(filename=filename, status="success", chunks_count=3, doc_id="doc-a")
+
+    worker = IngestionWorker()
+    with patch("workers.ingestion_worker.ingest_file", side_effect=ingest):
+        await worker._process_job_with_timeout(await job_service.get_next_job(worker.worker_id))
+
+    status = await job_service.get_job_status("job-2")
+    assert status["status"] == "completed_with_errors"
+    first, second = status["files"]
+    assert (first["status"], first["parsed"], first["chunks_embedded"], first["chunks_indexed"]) == ("success", True, 3, 3)
+    assert first["doc_id"] == "doc-a"
+    assert (second["status"], second["error_message"]) == ("error", "Embedding failed")
+    assert status["totals"]["chunks_indexed"] == 3
+    assert not os.path.exists(job_dir)
+
+
+@pytest.mark.asyncio
+async def test_unacknowledged_jobs_are_recovered(job_service):
+    """Jobs taken by a worker that died are requeued on restart, then failed after max attempts."""
+    job_service.max_job_attempts = 2
+    await job_service.enqueue_job("job-3", "user@example.com", [
+        IngestionFile(filename="a.txt", path="/uploads/job-3/0_a.txt"),
+    ])
+
+    await job_service.get_next_job("worker-1")  # worker dies without acknowledging
+    assert await job_service.recover_jobs("worker-1") == []
+
+    job = await job_service.get_next_job("worker-1")
+    assert (job.job_id, job.retry_count) == ("job-3", 1)
+    abandoned = await job_service.recover_jobs("worker-1")
+
+    assert [j.job_id for j in abandoned] == ["job-3"]
+    assert (await job_service.get_job_status("job-3"))["status"] == "failed"
+    assert await job_service.get_next_job("worker-1") is None
+
+
+@pytest.mark.asyncio
+async def test_finished_jobs_are_acknowledged(job_service):
+    """A processed job leaves the worker's processing list."""
+    await job_service.enqueue_job("job-4", "user@example.com", [])
+
+    job = await job_service.get_next_job("worker-1")
+    await job_service.ack_job(job.job_id, "worker-1")
+
+    assert await job_service.recover_jobs("worker-1") == []
+    assert await job_service.get_next_job("worker-1") is None
@@ -0,0 +1,82 @@
+"""
+Unit Tests for Streaming JSON Parsing
+
+Tests the single-pass JSON structure analyzer, streaming JSON Lines records
+to text in batches, and JSONL validation from the stream header.
+"""
+
+import io
+import json
+
+import pytest
+from unittest.mock import patch
+
+from file_parsers.json_parser import JSONParser, JSONStructureAnalyzer
+from file_parsers.parser_factory import ParserFactory
+
+
+def test_structure_analyzer_single_pass_statistics():
+    """All structure statistics come out of one traversal."""
+    analyzer = JSONStructureAnalyzer()
+    analyzer.add({
+        "name": "onyx",
+        "tags": ["a", "b", "c"],
+        "owner": {"id": 7, "teams": [{"name": "core", "active": True}], "extra": {}},
+        "score": None,
+    })
+
+    assert analyzer.to_metadata() == {
+        "depth": 4,
+        "total_keys": 9,
+        "total_values": 8,
+        "has_arrays": True,
+        "has_objects": True,
+        "max_array_length": 3,
+    }
+    assert analyzer.value_types == {"str": 5, "int": 1, "bool": 1, "NoneType": 1}
+
+
+def test_jsonl_streams_records_in_batches():
+    """Records are yielded in batches, invalid lines skipped, and totals added at the end."""
+    lines = [json.dumps({"level": "info", "message": f"event {i}", "attrs": {"n": i}}) for i in range(5)]
+    lines.insert(2, "{not json")
+    data = ("\n".join(lines) + "\n").encode()
+
+    with patch("file_parsers.json_parser.JSONL_RECORDS_PER_SEGMENT", 2):
+        content_stream = JSONParser().open_stream(io.BytesIO(data), "events.jsonl")
+        assert "total_objects" not in content_stream.metadata
+        segments = list(content_stream.segments)
+
+    assert len(segments) == 4  # Three record batches and the summary
+    assert "Record 1:" in segments[0] and "Record 2:" in segments[0]
+    assert "message: event 4" in segments[2]
+    assert segments[-1].startswith("JSONL File Information:")
+
+    metadata = content_stream.metadata
+    assert (metadata["total_objects"], metadata["error_count"]) == (5, 1)
+    assert metadata["depth"] == 2
+    assert metadata["consistent_structure"] is True
+    assert metadata["field_frequency"]["level"]["count"] == 5
+
+
+def test_jsonl_without_valid_records_fails():
+    """A JSONL file with no valid line raises once the stream is read."""
+    content_stream = JSONParser().open_stream(io.BytesIO(b"{bad\n[also bad\n"), "broken.jsonl")
+
+    with pytest.raises(ValueError):
+        list(content_stream.segments)
+
+
+def test_jsonl_validation_reads_only_the_header():
+    """A long JSONL file whose sample ends mid-line validates; a bad first line does not."""
+    record = json.dumps({"message": "x" * 300})
+    long_file = io.BytesIO(("\n".join([record] * 20)).encode())
+
+    assert JSONParser().validate_stream(long_file, "logs.jsonl").is_valid
+    assert not JSONParser().validate_stream(io.BytesIO(b"{oops\n{}\n"), "logs.jsonl").is_valid
+
+
+def test_only_jsonl_is_streamed():
+    """JSON Lines streams in the calling thread; JSON documents still go to the parse pool."""
+    assert ParserFactory.supports_streaming("logs.jsonl")
+    assert not ParserFactory.supports_streaming("config.json")
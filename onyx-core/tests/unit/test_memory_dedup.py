@@ -0,0 +1,79 @@
+"""
+Unit Tests for Memory Near-Duplicate Detection
+
+Tests MinHash/LSH band generation, the in-memory near-duplicate index and
+the LSH-backed duplicate lookup in MemoryService.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from services.memory_dedup import (
+    LSH_BANDS,
+    NearDuplicateIndex,
+    jaccard_similarity,
+    lsh_bands,
+)
+from services.memory_service import MemoryService
+
+
+BUDGET_FACT = "The Q4 marketing budget is fixed at 50k dollars and was approved by finance"
+BUDGET_VARIANT = "the q4 marketing budget is fixed at 50k dollars and was approved by Finance today"
+UNRELATED_FACT = "Prefers meetings before noon on Tuesdays"
+
+
+def test_jaccard_similarity_ignores_case():
+    """Similarity is computed on lowercased word sets."""
+    assert jaccard_similarity("Prefers Email", "prefers email") == 1.0
+    assert jaccard_similarity("a b", "b c") == pytest.approx(1 / 3)
+    assert jaccard_similarity("", "anything") == 0.0
+
+
+def test_lsh_bands_are_stable_bigints():
+    """Bands are deterministic and fit a BIGINT column."""
+    bands = lsh_bands(BUDGET_FACT)
+
+    assert len(bands) == LSH_BANDS
+    assert bands == lsh_bands(BUDGET_FACT.upper())
+    assert all(-2**63 <= band < 2**63 for band in bands)
+    assert lsh_bands("   ") == []
+
+
+def test_near_duplicates_share_a_band():
+    """Similar facts collide in at least one band; unrelated facts do not."""
+    assert jaccard_similarity(BUDGET_FACT, BUDGET_VARIANT) > 0.8
+    assert set(lsh_bands(BUDGET_FACT)) & set(lsh_bands(BUDGET_VARIANT))
+    assert not set(lsh_bands(BUDGET_FACT)) & set(lsh_bands(UNRELATED_FACT))
+
+
+def test_index_returns_verified_candidates_in_insertion_order():
+    """Only LSH candidates come back, each with its exact similarity."""
+    index = NearDuplicateIndex()
+    index.add("variant", BUDGET_VARIANT)
+    index.add("unrelated", UNRELATED_FACT)
+    index.add("exact", BUDGET_FACT)
+
+    matches = index.query(BUDGET_FACT)
+
+    assert [key for key, _ in matches] == ["variant", "exact"]
+    assert matches[0][1] == pytest.approx(jaccard_similarity(BUDGET_FACT, BUDGET_VARIANT))
+    assert matches[1][1] == 1.0
+    assert len(index) == 3
+
+
+@pytest.mark.asyncio
+async def test_find_duplicate_memory_confirms_lsh_candidates():
+    """The database returns band matches; only real near-duplicates count."""
+    service = MemoryService()
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=[
+        {"id": "m-1", "fact": UNRELATED_FACT, "confidence": 0.95},  # LSH false positive
+        {"id": "m-2", "fact": BUDGET_VARIANT, "confidence": 0.9},
+    ])
+
+    duplicate = await service._find_duplicate_memory(conn, "user-1", BUDGET_FACT)
+
+    assert duplicate["id"] == "m-2"
+    query, user_id, fact, bands, _ = conn.fetch.await_args.args
+    assert "lsh_bands &&" in query and "ILIKE" not in query
+    assert (user_id, fact, bands) == ("user-1", BUDGET_FACT, lsh_bands(BUDGET_FACT))
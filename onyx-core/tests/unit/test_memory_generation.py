@@ -0,0 +1,128 @@
+"""
+Unit Tests for Memory Generation Tracker
+
+Tests per-user generation counters, the Redis refresh throttle, and
+generation-based invalidation of the memory injection cache.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from services.memory_generation import MemoryGenerationTracker, GENERATION_KEY_PREFIX
+from services.memory_injection_service import MemoryInjectionService, MemoryInjection
+
+
+def make_cache_manager(generation=0):
+    """Create a mocked CacheManager with a generation counter"""
+    manager = MagicMock()
+    manager.get_counter = AsyncMock(return_value=generation)
+    manager.increment = AsyncMock(return_value=generation + 1)
+    return manager
+
+
+def make_injection(user_id="user-1", text="Cached"):
+    """Create a minimal injection"""
+    return MemoryInjection(
+        user_id=user_id,
+        conversation_id="conv-1",
+        standing_instructions=[],
+        memories=[],
+        injection_text=text,
+        injection_time=5,
+        performance_stats={"cache_hit": True},
+    )
+
+
+@pytest.mark.asyncio
+async def test_process_local_bump_is_per_user():
+    """Without Redis, bumps advance only the written user's generation."""
+    tracker = MemoryGenerationTracker()
+
+    assert await tracker.get("user-1") == 0
+    assert await tracker.bump("user-1") == 1
+
+    assert await tracker.get("user-1") == 1
+    assert await tracker.get("user-2") == 0
+
+
+@pytest.mark.asyncio
+async def test_bump_uses_shared_counter():
+    """Bumps increment the user's Redis counter."""
+    manager = make_cache_manager(generation=4)
+    tracker = MemoryGenerationTracker(manager)
+
+    assert await tracker.bump("user-1") == 5
+
+    manager.increment.assert_awaited_once_with(f"{GENERATION_KEY_PREFIX}:user-1")
+    # A fresh local bump is trusted until the next refresh
+    assert await tracker.get("user-1") == 5
+    manager.get_counter.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_refreshes_from_redis_at_most_once_per_interval():
+    """Other workers' bumps are picked up on refresh, not on every read."""
+    manager = make_cache_manager(generation=2)
+    tracker = MemoryGenerationTracker(manager)
+
+    assert await tracker.get("user-1") == 2
+    manager.get_counter.return_value = 3
+    assert await tracker.get("user-1") == 2
+    assert manager.get_counter.await_count == 1
+
+    with patch("services.memory_generation.time.monotonic", return_value=1e9):
+        assert await tracker.get("user-1") == 3
+
+
+@pytest.mark.asyncio
+async def test_redis_failure_keeps_last_known_generation():
+    """A failed Redis read falls back to the local generation."""
+    manager = make_cache_manager()
+    manager.increment.return_value = None
+    tracker = MemoryGenerationTracker(manager)
+
+    assert await tracker.bump("user-1") == 1
+    manager.get_counter.return_value = None
+    with patch("services.memory_generation.time.monotonic", return_value=1e9):
+        assert await tracker.get("user-1") == 1
+
+
+@pytest.mark.asyncio
+async def test_injection_cache_invalidated_by_memory_write():
+    """A cached injection is served until the user's memories change."""
+    service = MemoryInjectionService()
+    service.generations = MemoryGenerationTracker()
+    service.cache.clear()
+    service._cache_injection("user-1:conv-1", make_injection(), generation=0)
+
+    result = await service.prepare_injection("user-1", "conv-1")
+    assert result.injection_text == "Cached"
+
+    await service.generations.bump("user-1")
+    with patch.object(service, "_get_connection", side_effect=Exception("db down")):
+        result = await service.prepare_injection("user-1", "conv-1")
+
+    assert result.injection_text == ""
+    assert "user-1:conv-1" not in service.cache
+
+
+@pytest.mark.asyncio
+async def test_memory_service_writes_bump_generation():
+    """MemoryService deletes bump the user's generation only when a row changed."""
+    from services.memory_service import MemoryService
+
+    service = MemoryService()
+    conn = MagicMock()
+    acquire = MagicMock()
+    acquire.__aenter__ = AsyncMock(return_value=conn)
+    acquire.__aexit__ = AsyncMock(return_value=False)
+    service.db = MagicMock()
+    service.db.acquire.return_value = acquire
+
+    with patch("services.memory_service.bump_memory_generation", new=AsyncMock()) as bump:
+        conn.execute = AsyncMock(return_value="UPDATE 1")
+        await service.delete_memory("m-1", "user-1")
+        conn.execute = AsyncMock(return_value="UPDATE 0")
+        await service.delete_memory("m-2", "user-1")
+
+    bump.assert_awaited_once_with("user-1")
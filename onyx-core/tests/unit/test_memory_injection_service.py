@@ -8,6 +8,7 @@ Story 4-3: Memory Injection & Agent Integration
 
 import pytest
 import asyncio
+import json
 import time
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, timedelta
@@ -37,7 +38,9 @@ class TestMemoryInjectionService:
     def injection_service(self):
         """Create memory injection service instance"""
         service = MemoryInjectionService()
-        service.cache = {}  # Start with empty cache
+        service.cache.clear()  # Start with empty cache
+        service.vector_index = MagicMock()
+        service.vector_index.search = AsyncMock(return_value=None)  # Vector index unavailable
         return service
 
     @pytest.fixture
@@ -325,6 +328,60 @@ class TestMemoryInjectionService:
         assert len(result) == 1
         assert "aerospace" in result[0]["fact"]
 
+        # Keywords become an index-backed prefix tsquery instead of ILIKE scans
+        query, params = cursor.execute.call_args.args
+        assert "to_tsvector('english', fact) @@ to_tsquery('english', %s)" in query
+        assert "ILIKE" not in query
+        assert set(params[1].split(" | ")) >= {"aerospace:*", "defense:*"}
+
+    @pytest.mark.asyncio
+    async def test_get_context_aware_memories_semantic(self, injection_service, sample_user_data):
+        """Test ANN candidates are re-scored by blending similarity with the prior"""
+        injection_service.vector_index.search = AsyncMock(return_value=[("m-1", 0.9), ("m-2", 0.3)])
+        injection_service.semantic_weight = 0.5
+
+        conn = MagicMock()
+        cursor = MagicMock()
+        conn.cursor.return_value.__enter__.return_value = cursor
+        cursor.fetchall.return_value = [
+            {"id": "m-2", "fact": "Prefers email", "prior_score": 0.5},
+            {"id": "m-1", "fact": "Works on aerospace bids", "prior_score": 0.1},
+        ]
+
+        with patch.object(injection_service, '_get_connection', return_value=conn):
+            result = await injection_service.get_context_aware_memories(
+                user_id=sample_user_data["user_id"],
+                conversation_id=sample_user_data["conversation_id"],
+                current_message="How are the aerospace bids going?",
+                limit=1
+            )
+
+        # One ANN lookup with oversampling, one indexed fetch of the live candidates
+        injection_service.vector_index.search.assert_awaited_once_with(
+            sample_user_data["user_id"], "How are the aerospace bids going?", 3,
+            injection_service.semantic_min_score
+        )
+        query, params = cursor.execute.call_args.args
+        assert "id = ANY(%s::uuid[])" in query
+        assert params == (["m-1", "m-2"], sample_user_data["user_id"])
+        assert [m["id"] for m in result] == ["m-1"]
+        assert result[0]["similarity"] == 0.9
+        assert result[0]["relevance_score"] == pytest.approx(0.5)
+        assert "prior_score" not in result[0]
+
+    @pytest.mark.asyncio
+    async def test_get_top_memories_uses_rank_score(self, injection_service, mock_connection):
+        """Test top memories are read in materialized rank_score order"""
+        conn, cursor = mock_connection
+        cursor.fetchall.return_value = []
+
+        await injection_service._get_top_memories(cursor, "user-1", limit=5)
+
+        query, params = cursor.execute.call_args.args
+        assert "ORDER BY rank_score DESC" in query
+        assert "rank_score - EXTRACT(EPOCH FROM LOCALTIMESTAMP)" in query
+        assert params == ("user-1", 5)
+
     def test_extract_keywords(self, injection_service):
         """Test keyword extraction"""
         # Test with normal text
@@ -405,6 +462,77 @@ class TestMemoryInjectionService:
         assert cached_result.injection_time < 5  # Cached should be under 5ms
         assert cached_result.performance_stats["cache_hit"] is True
 
+    def test_cache_lru_eviction_and_stats(self, injection_service):
+        """Test the LRU tier evicts the least recently used entry and counts it"""
+        injection_service.max_cache_size = 2
+        injection = MemoryInjection(
+            user_id="u", conversation_id="c", standing_instructions=[], memories=[],
+            injection_text="Test", injection_time=1, performance_stats={}
+        )
+        injection_service._cache_injection("u:1", injection)
+        injection_service._cache_injection("u:2", injection)
+        assert injection_service._get_cached_injection("u:1") is not None  # u:1 now most recent
+
+        injection_service._cache_injection("u:3", injection)
+
+        assert list(injection_service.cache) == ["u:1", "u:3"]
+        assert injection_service.cache_stats["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_rate_counts_lookups(self, injection_service, sample_user_data):
+        """Test hit rate is computed from real hits and misses, not cache fill"""
+        injection_service.shared_cache = None
+        cache_key = f"{sample_user_data['user_id']}:{sample_user_data['conversation_id']}"
+        injection = MemoryInjection(
+            user_id=sample_user_data["user_id"], conversation_id=sample_user_data["conversation_id"],
+            standing_instructions=[], memories=[], injection_text="Test", injection_time=1,
+            performance_stats={"cache_hit": False}
+        )
+
+        assert await injection_service._lookup_injection(cache_key, 0) is None
+        injection_service._cache_injection(cache_key, injection)
+        hit = await injection_service._lookup_injection(cache_key, 0)
+
+        assert hit.performance_stats["cache_hit"] is True
+        assert hit.performance_stats["cache_tier"] == "memory"
+        assert injection.performance_stats["cache_hit"] is False  # Stored entry untouched
+        assert injection_service._get_cache_hit_rate() == 50.0
+        assert injection_service.get_cache_stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_shared_cache_round_trip(self, injection_service, sample_user_data, sample_memories):
+        """Test injections written to the Redis tier can be served by another worker"""
+        store = {}
+
+        async def fake_set(key, value, ttl=0):
+            store[key] = json.loads(json.dumps(value))
+            return True
+
+        shared = MagicMock()
+        shared.set = AsyncMock(side_effect=fake_set)
+        shared.get = AsyncMock(side_effect=lambda key: store.get(key))
+        injection_service.shared_cache = shared
+
+        cache_key = f"{sample_user_data['user_id']}:{sample_user_data['conversation_id']}"
+        injection = MemoryInjection(
+            user_id=sample_user_data["user_id"], conversation_id=sample_user_data["conversation_id"],
+            standing_instructions=[], memories=sample_memories, injection_text="Warm",
+            injection_time=12, performance_stats={"cache_hit": False}
+        )
+        await injection_service._store_shared_injection(cache_key, injection, 3)
+
+        # A different worker with a cold in-process tier
+        injection_service.cache.clear()
+        hit = await injection_service._lookup_injection(cache_key, 3)
+
+        assert hit.injection_text == "Warm"
+        assert hit.performance_stats["cache_tier"] == "redis"
+        assert hit.memories[0]["created_at"] == sample_memories[0]["created_at"]
+        assert cache_key in injection_service.cache  # Promoted into the LRU tier
+        # A newer memory generation never reads the old entry
+        injection_service.cache.clear()
+        assert await injection_service._lookup_injection(cache_key, 4) is None
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
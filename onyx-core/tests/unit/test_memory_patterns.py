@@ -0,0 +1,59 @@
+"""
+Unit Tests for Memory Pattern Engine
+
+Tests the single-pass pattern scan: category resolution from the matched
+group, fact capture, word-boundary anchoring and content filters.
+"""
+
+from services.memory_patterns import (
+    MEMORY_PATTERNS,
+    MemoryPatternEngine,
+    get_memory_pattern_engine,
+    has_meaningful_content,
+)
+
+
+def test_scan_resolves_category_from_matched_group():
+    """Each match reports the category and pattern that produced it."""
+    engine = get_memory_pattern_engine()
+    content = (
+        "Hi there. I prefer email updates over calls. "
+        "I've decided to use the second vendor! "
+        "FYI: the launch moved to March."
+    )
+
+    matches = list(engine.scan(content))
+
+    assert [(m.category, m.fact) for m in matches] == [
+        ("preference", "email updates over calls"),
+        ("decision", "to use the second vendor"),
+        ("context", "the launch moved to March"),
+    ]
+    assert matches[0].text == "I prefer email updates over calls"
+    assert matches[0].pattern in MEMORY_PATTERNS["preference"]
+
+
+def test_fact_is_first_group_of_its_pattern():
+    """Patterns with several groups still report their first group as the fact."""
+    engine = MemoryPatternEngine(MEMORY_PATTERNS)
+
+    (match,) = engine.scan("Jane Doe reports to the CFO.")
+
+    assert match.category == "relationship"
+    assert match.fact == "Jane Doe"
+
+
+def test_matches_start_at_word_boundaries():
+    """Triggers inside longer words do not start a match."""
+    engine = MemoryPatternEngine({"preference": [r"avoid\s+([^.!?]+)"]})
+
+    assert list(engine.scan("This is unavoid able today.")) == []
+    assert [m.fact for m in engine.scan("Please avoid late meetings.")] == ["late meetings"]
+
+
+def test_has_meaningful_content():
+    """Facts must mention a need, plan, priority or person."""
+    assert has_meaningful_content("the budget is a top priority")
+    assert has_meaningful_content("My Manager approves travel")
+    assert not has_meaningful_content("the sky is blue today")
+    assert not has_meaningful_content("unplanned downtime")
@@ -0,0 +1,113 @@
+"""
+Unit Tests for Memory Vector Index
+
+Tests collection setup, write-time indexing, user-filtered ANN search and
+graceful degradation when Qdrant or the embedder is unavailable.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from services.memory_vector_index import MemoryVectorIndex
+
+
+def make_index(collections=()):
+    """Create an index over a mocked Qdrant client and embedder"""
+    existing = []
+    for name in collections:
+        collection = MagicMock()
+        collection.name = name
+        existing.append(collection)
+
+    client = MagicMock()
+    client.get_collections = AsyncMock(return_value=MagicMock(collections=existing))
+    client.create_collection = AsyncMock()
+    client.create_payload_index = AsyncMock()
+    client.upsert = AsyncMock()
+    client.delete = AsyncMock()
+    client.query_points = AsyncMock(return_value=MagicMock(points=[]))
+
+    embedder = MagicMock()
+    embedder.embed_texts = AsyncMock(side_effect=lambda texts: [[0.1] * 4 for _ in texts])
+    embedder.get_query_embedding = AsyncMock(return_value=[0.2] * 4)
+
+    index = MemoryVectorIndex(embedder=embedder, client=client)
+    index.enabled = True
+    return index, client, embedder
+
+
+@pytest.mark.asyncio
+async def test_creates_collection_with_user_payload_index():
+    """A missing collection is created along with a keyword index on user_id."""
+    index, client, _ = make_index()
+
+    await index.index_memory({"id": "m-1", "user_id": "u-1", "fact": "Prefers email"})
+
+    client.create_collection.assert_awaited_once()
+    assert client.create_payload_index.await_args.kwargs["field_name"] == "user_id"
+
+
+@pytest.mark.asyncio
+async def test_index_memories_embeds_in_one_batch():
+    """Memories are embedded together and upserted with filterable payloads."""
+    index, client, embedder = make_index(collections=["user_memories"])
+    memories = [
+        {"id": "m-1", "user_id": "u-1", "fact": "Prefers email", "category": "preference", "confidence": 0.9},
+        {"id": "m-2", "user_id": "u-1", "fact": "Q4 budget is fixed", "category": "decision", "confidence": 0.8},
+        {"id": "m-3", "user_id": "u-1", "fact": ""},  # Nothing to embed
+    ]
+
+    assert await index.index_memories(memories) == 2
+
+    embedder.embed_texts.assert_awaited_once_with(["Prefers email", "Q4 budget is fixed"])
+    client.create_collection.assert_not_awaited()
+    points = client.upsert.await_args.kwargs["points"]
+    assert [p.id for p in points] == ["m-1", "m-2"]
+    assert points[0].payload == {
+        "user_id": "u-1", "category": "preference", "confidence": 0.9, "source_type": None
+    }
+
+
+@pytest.mark.asyncio
+async def test_search_filters_by_user():
+    """Search embeds the text once and restricts the ANN lookup to the user."""
+    index, client, embedder = make_index(collections=["user_memories"])
+    client.query_points.return_value = MagicMock(
+        points=[MagicMock(id="m-1", score=0.82), MagicMock(id="m-2", score=0.41)]
+    )
+
+    hits = await index.search("u-1", "email preferences", limit=6, min_score=0.3)
+
+    assert hits == [("m-1", 0.82), ("m-2", 0.41)]
+    kwargs = client.query_points.await_args.kwargs
+    assert kwargs["limit"] == 6 and kwargs["score_threshold"] == 0.3
+    condition = kwargs["query_filter"].must[0]
+    assert condition.key == "user_id" and condition.match.value == "u-1"
+
+
+@pytest.mark.asyncio
+async def test_unavailable_index_reports_none():
+    """Failures are reported as 'no index' so callers fall back to keywords."""
+    index, client, _ = make_index()
+    client.get_collections.side_effect = Exception("qdrant down")
+
+    assert await index.search("u-1", "anything", limit=3) is None
+    assert await index.index_memory({"id": "m-1", "user_id": "u-1", "fact": "x"}) is False
+    # Initialization is not retried on every call
+    assert client.get_collections.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_background_writes_do_not_block_caller():
+    """Write-time indexing runs as a tracked background task."""
+    index, client, _ = make_index(collections=["user_memories"])
+
+    index.index_in_background({"id": "m-1", "user_id": "u-1", "fact": "Prefers email"})
+    index.remove_in_background("m-2")
+    assert index.get_stats()["pending_writes"] == 2
+
+    await asyncio.gather(*index._background)
+    client.upsert.assert_awaited_once()
+    client.delete.assert_awaited_once()
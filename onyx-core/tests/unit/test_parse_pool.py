@@ -0,0 +1,92 @@
+"""
+Unit Tests for the Parse Pool and Concurrent Uploads
+
+Tests file parsing in worker processes and concurrent processing of the
+files in one upload request.
+"""
+
+import io
+import os
+import asyncio
+import time
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from api.upload import FileProcessingResult, FileValidationResult, upload_files
+from file_parsers.base_parser import BaseParser
+from services.parse_pool import ParsePool
+
+
+CSV_CONTENT = b"name,team,score\nAda,core,91\nGrace,infra,88\nLinus,kernel,75\n"
+
+
+@pytest.mark.asyncio
+async def test_parse_pool_parses_upload_in_worker():
+    """A non-streaming upload is parsed in a worker with its original filename."""
+    pool = ParsePool(max_workers=1)
+    try:
+        content_stream = await pool.open_stream(io.BytesIO(CSV_CONTENT), "scores.csv", "user-1")
+    finally:
+        pool.shutdown()
+
+    content = "".join(content_stream.segments)
+    assert "Grace" in content
+    assert content_stream.metadata["file_metadata"]["filename"] == "scores.csv"
+    assert content_stream.metadata["file_metadata"]["user_id"] == "user-1"
+
+
+@pytest.mark.asyncio
+async def test_parse_pool_rejects_unsupported_files():
+    """Unsupported types fail before anything is spooled or submitted."""
+    pool = ParsePool(max_workers=1)
+
+    with pytest.raises(ValueError):
+        await pool.open_stream(io.BytesIO(b"data"), "archive.zip", "user-1")
+    assert pool._executor is None
+
+
+@pytest.mark.asyncio
+async def test_upload_files_processes_files_concurrently():
+    """Total time is about the slowest file, not the sum; results keep file order."""
+    files = [SimpleNamespace(filename=f"doc{i}.pdf", file=io.BytesIO(b"%PDF-1.4")) for i in range(6)]
+
+    def validate(file, file_path=None):
+        return FileValidationResult(filename=file.filename, is_valid=True, file_size=100, file_type=".pdf")
+
+    async def process(file, user_id, file_path=None):
+        await asyncio.sleep(0.2)
+        return FileProcessingResult(filename=file.filename, status="success", processing_time=0.2)
+
+    with patch("api.upload.validate_upload_file", side_effect=validate), \
+            patch("api.upload.process_uploaded_file", side_effect=process):
+        started = time.monotonic()
+        response = await upload_files(MagicMock(), files=files, current_user={"email": "user@example.com"})
+        elapsed = time.monotonic() - started
+
+    assert elapsed < 0.6
+    assert response.successful_files == 6
+    assert [result.filename for result in response.results] == [file.filename for file in files]
+
+
+@pytest.mark.asyncio
+async def test_non_streaming_upload_is_spooled_once():
+    """The copy spooled for validation is the one parsed, and it is removed afterwards."""
+    files = [SimpleNamespace(filename="scores.csv", file=io.BytesIO(CSV_CONTENT))]
+    parsed_paths = []
+
+    async def process(file, user_id, file_path=None):
+        parsed_paths.append(file_path)
+        assert os.path.exists(file_path)
+        return FileProcessingResult(filename=file.filename, status="success", processing_time=0.1)
+
+    spool = BaseParser._spool_to_temp_file
+    with patch.object(BaseParser, "_spool_to_temp_file", autospec=True, side_effect=spool) as spooled, \
+            patch("api.upload.process_uploaded_file", side_effect=process):
+        response = await upload_files(MagicMock(), files=files, current_user={"email": "user@example.com"})
+
+    assert response.successful_files == 1
+    assert spooled.call_count == 1
+    assert parsed_paths[0] is not None
+    assert not os.path.exists(parsed_paths[0])
@@ -0,0 +1,109 @@
+"""
+Unit Tests for Page-Parallel PDF Extraction
+
+Tests page-range extraction with per-page skipping of unreadable pages,
+streaming pages in order from worker processes, and mapping chunk offsets
+back to page numbers.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from file_parsers.base_parser import SegmentStream
+from file_parsers.pdf_parser import PDFParser, extract_page_range
+
+
+def make_pdf(page_texts):
+    """Build a PDF with one line of text per page (None makes a page whose content is missing)"""
+    page_ids = [3 + 2 * i for i in range(len(page_texts))]
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % i for i in page_ids) + b"] /Count %d >>" % len(page_ids),
+    }
+    font_id = 3 + 2 * len(page_texts)
+    objects[font_id] = b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    for page_id, text in zip(page_ids, page_texts):
+        contents = b"%d 0 R" % (page_id + 1) if text is not None else b"999 0 R"
+        objects[page_id] = (b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents " + contents +
+                            b" /Resources << /Font << /F1 %d 0 R >> >> >>" % font_id)
+        if text is not None:
+            body = b"BT /F1 12 Tf 72 720 Td (" + text.encode() + b") Tj ET"
+            objects[page_id + 1] = b"<< /Length %d >>\nstream\n" % len(body) + body + b"\nendstream"
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += b"%d 0 obj\n" % obj_id + objects[obj_id] + b"\nendobj\n"
+    size = max(objects) + 1
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % size
+    for obj_id in range(1, size):
+        out += b"%010d 00000 n \n" % offsets[obj_id] if obj_id in offsets else b"0000000000 65535 f \n"
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref)
+    return bytes(out)
+
+
+PAGE_TEXTS = [f"Page {n} discusses topic number {n} in detail" for n in range(1, 8)]
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    """Seven-page PDF whose third page is broken"""
+    page_texts = list(PAGE_TEXTS)
+    page_texts[2] = None
+    path = tmp_path / "report.pdf"
+    path.write_bytes(make_pdf(page_texts))
+    return str(path)
+
+
+def test_extract_page_range_skips_broken_pages(pdf_path):
+    """A page neither backend can read is skipped; the rest of the range is kept."""
+    pages = extract_page_range(pdf_path, 2, 4)
+
+    assert [page.page_number for page in pages] == [2, 3, 4]
+    assert [page.method for page in pages] == ["pdfminer", None, "pdfminer"]
+    assert "topic number 4" in pages[2].text
+
+
+def test_open_stream_yields_pages_in_order_from_workers(pdf_path):
+    """Page ranges extracted in worker processes come back in page order with page offsets."""
+    executor = ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        with open(pdf_path, "rb") as stream, patch("file_parsers.pdf_parser.PDF_PAGES_PER_TASK", 2):
+            content_stream = PDFParser().open_stream(stream, "report.pdf", executor=executor)
+            segments = list(content_stream.segments)
+    finally:
+        executor.shutdown()
+
+    assert len(segments) == 6
+    for segment, page_number in zip(segments, [1, 2, 4, 5, 6, 7]):
+        assert f"topic number {page_number}" in segment
+    assert [page for _, page in content_stream.page_starts] == [1, 2, 4, 5, 6, 7]
+    assert content_stream.metadata["skipped_pages"] == [3]
+    assert content_stream.metadata["pages_extracted"] == 6
+
+    # A span starting in page 2's text and ending in page 4's covers both pages
+    start = content_stream.page_starts[1][0] + 5
+    end = content_stream.page_starts[2][0] + 5
+    assert content_stream.pages_for_range(start, end) == [2, 4]
+    assert content_stream.pages_for_range(0, 5) == [1]
+
+
+def test_failed_worker_range_is_extracted_in_process(pdf_path):
+    """A range whose worker fails is extracted locally rather than lost."""
+    executor = MagicMock()
+    executor.submit.side_effect = RuntimeError("cannot schedule new futures after shutdown")
+
+    with patch("file_parsers.pdf_parser.PDF_PAGES_PER_TASK", 3):
+        pages = list(PDFParser().iter_pages(pdf_path, 7, executor=executor))
+
+    assert [page.page_number for page in pages] == list(range(1, 8))
+    assert executor.submit.call_count == 3
+
+
+def test_pages_for_range_without_pages():
+    """Formats without pages map chunks to no page numbers."""
+    assert SegmentStream(segments=iter([]), metadata={}).pages_for_range(0, 100) == []
@@ -0,0 +1,226 @@
+"""
+Unit Tests for RAG Service
+
+Tests client selection (async vs sync execution mode) and the Qdrant/OpenAI
+call paths used by search and indexing.
+"""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from rag_service import RAGService, DocumentChunk, COLLECTION_NAME, VECTOR_SIZE
+
+
+def make_service(async_mode: bool = True, monkeypatch=None) -> RAGService:
+    """Create a RAGService with all network clients patched out"""
+    monkeypatch.setenv("RAG_ASYNC_MODE", "true" if async_mode else "false")
+    monkeypatch.setenv("ENABLE_EMBEDDING_CACHE", "false")
+    with patch("rag_service.QdrantClient"), patch("rag_service.OpenAI"), \
+            patch("rag_service.AsyncQdrantClient"), patch("rag_service.AsyncOpenAI"):
+        service = RAGService()
+    return service
+
+
+def embedding_response(*vectors):
+    """Build an OpenAI-style embeddings response"""
+    return SimpleNamespace(
+        data=[SimpleNamespace(index=i, embedding=v) for i, v in enumerate(vectors)]
+    )
+
+
+def collections_response(*names):
+    """Build a Qdrant-style get_collections response"""
+    return SimpleNamespace(collections=[SimpleNamespace(name=n) for n in names])
+
+
+@pytest.mark.asyncio
+async def test_async_mode_uses_async_clients(monkeypatch):
+    """In async mode search awaits the async Qdrant and OpenAI clients."""
+    service = make_service(async_mode=True, monkeypatch=monkeypatch)
+    service.enable_hybrid_search = False
+
+    service.async_openai_client = MagicMock()
+    service.async_openai_client.embeddings.create = AsyncMock(
+        return_value=embedding_response([0.1, 0.2])
+    )
+    service.async_qdrant_client = MagicMock()
+    service.async_qdrant_client.get_collections = AsyncMock(
+        return_value=collections_response(COLLECTION_NAME)
+    )
+    hit = SimpleNamespace(id="doc-1", score=0.9, payload={"text": "hello", "title": "t", "source": "upload"})
+    service.async_qdrant_client.search = AsyncMock(return_value=[hit])
+
+    results = await service.search("hello", search_type="semantic", user_email="a@b.com")
+
+    assert [r.doc_id for r in results] == ["doc-1"]
+    service.async_openai_client.embeddings.create.assert_awaited_once()
+    service.async_qdrant_client.search.assert_awaited_once()
+    service.qdrant_client.search.assert_not_called()
+    service.openai_client.embeddings.create.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_sync_mode_uses_sync_clients(monkeypatch):
+    """With RAG_ASYNC_MODE=false the synchronous clients are used."""
+    service = make_service(async_mode=False, monkeypatch=monkeypatch)
+
+    assert service.async_qdrant_client is None
+    assert service.async_openai_client is None
+
+    service.openai_client.embeddings.create.return_value = embedding_response([0.5])
+    assert await service.embed_text("hello") == [0.5]
+
+
+@pytest.mark.asyncio
+async def test_close_releases_async_clients(monkeypatch):
+    """close() closes the async Qdrant client and the shared HTTP pool."""
+    service = make_service(async_mode=True, monkeypatch=monkeypatch)
+    service.async_qdrant_client = MagicMock(close=AsyncMock())
+    service._async_http_client = MagicMock(aclose=AsyncMock())
+
+    await service.close()
+
+    service.async_qdrant_client.close.assert_awaited_once()
+    service._async_http_client.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_collection_existence_is_memoized(monkeypatch):
+    """get_collections is only called once across many requests."""
+    service = make_service(async_mode=True, monkeypatch=monkeypatch)
+    service.async_qdrant_client = MagicMock()
+    service.async_qdrant_client.get_collections = AsyncMock(
+        return_value=collections_response(COLLECTION_NAME)
+    )
+    service.async_qdrant_client.get_collection = AsyncMock(
+        return_value=SimpleNamespace(points_count=42)
+    )
+
+    for _ in range(3):
+        assert await service.get_document_count() == 42
+
+    service.async_qdrant_client.get_collections.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_collection_not_found_triggers_reverification(monkeypatch):
+    """A "not found" error clears the memoized state and the next call recreates the collection."""
+    service = make_service(async_mode=True, monkeypatch=monkeypatch)
+    service.async_qdrant_client = MagicMock()
+    service.async_qdrant_client.get_collections = AsyncMock(
+        return_value=collections_response(COLLECTION_NAME)
+    )
+    service.async_qdrant_client.create_collection = AsyncMock()
+
+    await service.ensure_collection_exists()
+    assert service._collection_verified
+
+    service.async_qdrant_client.get_collection = AsyncMock(
+        side_effect=Exception(f"Collection `{COLLECTION_NAME}` not found")
+    )
+    assert await service.get_document_count() == 0
+    assert not service._collection_verified
+
+    service.async_qdrant_client.get_collections = AsyncMock(return_value=collections_response())
+    await service.ensure_collection_exists()
+
+    service.async_qdrant_client.create_collection.assert_awaited_once()
+    assert service._collection_verified
+
+
+@pytest.mark.asyncio
+async def test_add_documents_batches_embeddings_and_upserts(monkeypatch):
+    """Bulk indexing embeds per batch and upserts each batch once with wait=True."""
+    service = make_service(async_mode=True, monkeypatch=monkeypatch)
+    service._collection_verified = True
+    service.embedding_batch_size = 2
+
+    async def fake_embeddings(model, input):
+        return embedding_response(*[[float(len(text))] for text in input])
+
+    service.async_openai_client = MagicMock()
+    service.async_openai_client.embeddings.create = AsyncMock(side_effect=fake_embeddings)
+    service.async_qdrant_client = MagicMock()
+    service.async_qdrant_client.upsert = AsyncMock()
+
+    documents = [
+        DocumentChunk(doc_id=f"doc-{i}", text="x" * (i + 1), title="t", source="upload")
+        for i in range(5)
+    ]
+    indexed = await service.add_documents(documents, batch_size=4)
+
+    assert indexed == 5
+    # Batches of 4 and 1 points; the first needs two embedding requests of 2 inputs
+    assert service.async_openai_client.embeddings.create.await_count == 3
+    upserts = service.async_qdrant_client.upsert.await_args_list
+    assert sorted(len(call.kwargs["points"]) for call in upserts) == [1, 4]
+    assert all(call.kwargs["wait"] is True for call in upserts)
+
+    points = {p.id: p for call in upserts for p in call.kwargs["points"]}
+    assert points["doc-3"].vector == [4.0]
+
+
+@pytest.mark.asyncio
+async def test_add_documents_counts_failed_batches(monkeypatch):
+    """A failed batch is reported as not indexed without failing other batches."""
+    service = make_service(async_mode=True, monkeypatch=monkeypatch)
+    service._collection_verified = True
+    service.embed_texts = AsyncMock(side_effect=lambda texts: [[0.0] for _ in texts])
+    service.async_qdrant_client = MagicMock()
+    service.async_qdrant_client.upsert = AsyncMock(side_effect=[None, Exception("boom")])
+
+    documents = [DocumentChunk(doc_id=f"doc-{i}", text="t", title="t", source="s") for i in range(4)]
+
+    assert await service.add_documents(documents, batch_size=2) == 2
+
+
+@pytest.mark.asyncio
+async def test_add_documents_reuses_precomputed_embeddings(monkeypatch):
+    """Chunks with a precomputed vector are upserted without calling the embeddings API."""
+    service = make_service(async_mode=True, monkeypatch=monkeypatch)
+    service._collection_verified = True
+    service.embed_texts = AsyncMock(side_effect=lambda texts: [[0.5] * VECTOR_SIZE for _ in texts])
+    service.async_qdrant_client = MagicMock()
+    service.async_qdrant_client.upsert = AsyncMock()
+
+    precomputed = [0.25] * VECTOR_SIZE
+    documents = [
+        DocumentChunk(doc_id="doc-0", text="a", title="t", source="s", embedding=precomputed),
+        DocumentChunk(doc_id="doc-1", text="b", title="t", source="s"),
+        DocumentChunk(doc_id="doc-2", text="c", title="t", source="s", embedding=[1.0]),  # wrong size
+    ]
+
+    assert await service.add_documents(documents) == 3
+
+    service.embed_texts.assert_awaited_once_with(["b", "c"])
+    points = {p.id: p for p in service.async_qdrant_client.upsert.await_args.kwargs["points"]}
+    assert points["doc-0"].vector == precomputed
+    assert points["doc-1"].vector == [0.5] * VECTOR_SIZE
+
+
+@pytest.mark.asyncio
+async def test_add_document_skips_embedding_when_vector_given(monkeypatch):
+    """add_document stores a supplied embedding without re-embedding the text."""
+    service = make_service(async_mode=True, monkeypatch=monkeypatch)
+    service._collection_verified = True
+    service.embed_text = AsyncMock()
+    service.async_qdrant_client = MagicMock()
+    service.async_qdrant_client.upsert = AsyncMock()
+
+    assert await service.add_document("doc", "text", "title", "s", embedding=[0.1] * VECTOR_SIZE)
+    service.embed_text.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_semantic_search_raises_where_search_returns_empty(monkeypatch):
+    """search() hides backend failures; semantic_search() lets hybrid legs see them."""
+    service = make_service(async_mode=True, monkeypatch=monkeypatch)
+    service._collection_verified = True
+    service.embed_text = AsyncMock(return_value=[0.1])
+    service.async_qdrant_client = MagicMock()
+    service.async_qdrant_client.search = AsyncMock(side_effect=Exception("qdrant down"))
+
+    assert await service.search("query", search_type="semantic") == []
+    with pytest.raises(Exception, match="qdrant down"):
+        await service.semantic_search("query", top_k=10)
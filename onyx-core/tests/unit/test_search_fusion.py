@@ -0,0 +1,84 @@
+"""
+Unit Tests for Search Fusion
+
+Tests the RRF, min-max, z-score and legacy weighted fusion strategies.
+"""
+
+import pytest
+
+from services.search_fusion import fuse_scores, FUSION_STRATEGIES
+
+
+def ranked(doc_ids, scores):
+    """Order doc ids by fused score, highest first"""
+    return [doc_id for _, doc_id in sorted(zip(-scores, doc_ids))]
+
+
+def test_rrf_rewards_agreement_across_legs():
+    """A document ranked well by both legs beats single-leg winners."""
+    semantic = [("a", 0.92), ("b", 0.90), ("c", 0.40)]
+    keyword = [("d", 25.0), ("b", 20.0), ("e", 3.0)]
+
+    doc_ids, scores = fuse_scores(semantic, keyword, strategy="rrf", rrf_k=60)
+
+    assert doc_ids == ["a", "b", "c", "d", "e"]
+    assert ranked(doc_ids, scores)[0] == "b"
+    assert scores[doc_ids.index("b")] == pytest.approx(0.7 / 62 + 0.3 / 62)
+
+
+def test_rrf_ranks_by_score_not_input_order():
+    """Ranks come from scores even if a leg is not pre-sorted."""
+    doc_ids, scores = fuse_scores([("a", 0.1), ("b", 0.9)], [], strategy="rrf")
+    assert ranked(doc_ids, scores) == ["b", "a"]
+
+
+def test_minmax_puts_legs_on_same_scale():
+    """Large raw BM25 scores no longer drown out cosine similarity."""
+    semantic = [("a", 0.9), ("b", 0.5)]
+    keyword = [("b", 40.0), ("a", 38.0)]
+
+    doc_ids, scores = fuse_scores(semantic, keyword, strategy="minmax")
+    assert scores.max() <= 1.0
+    assert ranked(doc_ids, scores)[0] == "a"
+
+    # The legacy raw sum lets BM25 magnitude dominate
+    doc_ids, scores = fuse_scores(semantic, keyword, strategy="weighted")
+    assert ranked(doc_ids, scores)[0] == "b"
+
+
+def test_zscore_is_non_negative_and_penalizes_missing():
+    """Z-score output is shifted non-negative and absent candidates rank last."""
+    semantic = [("a", 0.9), ("b", 0.6), ("c", 0.3)]
+    keyword = [("a", 12.0), ("b", 6.0)]
+
+    doc_ids, scores = fuse_scores(semantic, keyword, strategy="zscore")
+
+    assert scores.min() == pytest.approx(0.0)
+    assert ranked(doc_ids, scores) == ["a", "b", "c"]
+
+
+def test_weighted_matches_legacy_formula():
+    """The legacy strategy is the raw weighted sum."""
+    doc_ids, scores = fuse_scores(
+        [("a", 0.8)], [("a", 2.0), ("b", 1.0)], strategy="weighted",
+        semantic_weight=0.7, keyword_weight=0.3
+    )
+    assert scores[doc_ids.index("a")] == pytest.approx(0.8 * 0.7 + 2.0 * 0.3)
+    assert scores[doc_ids.index("b")] == pytest.approx(0.3)
+
+
+@pytest.mark.parametrize("strategy", FUSION_STRATEGIES)
+def test_empty_and_single_leg_inputs(strategy):
+    """Every strategy handles empty legs and constant scores."""
+    doc_ids, scores = fuse_scores([], [], strategy=strategy)
+    assert doc_ids == [] and len(scores) == 0
+
+    doc_ids, scores = fuse_scores([("a", 0.5), ("b", 0.5)], [], strategy=strategy)
+    assert doc_ids == ["a", "b"]
+    assert len(scores) == 2
+
+
+def test_unknown_strategy_raises():
+    """Unknown strategies are rejected."""
+    with pytest.raises(ValueError):
+        fuse_scores([("a", 1.0)], [], strategy="borda")
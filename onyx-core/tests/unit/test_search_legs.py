@@ -0,0 +1,54 @@
+"""
+Unit Tests for Search Legs
+
+Tests per-leg timeouts and failure isolation used by hybrid search.
+"""
+
+import asyncio
+
+import pytest
+
+from services.search_legs import run_search_leg, LEG_OK, LEG_TIMEOUT, LEG_ERROR
+
+
+async def leg(results, delay=0.0, error=None):
+    """Fake search leg"""
+    await asyncio.sleep(delay)
+    if error:
+        raise error
+    return results
+
+
+@pytest.mark.asyncio
+async def test_leg_completes_within_budget():
+    """A leg that finishes in time returns its results and timing."""
+    result = await run_search_leg("semantic", leg(["a", "b"]), timeout_ms=100)
+
+    assert result.ok
+    assert result.status == LEG_OK
+    assert result.results == ["a", "b"]
+    assert result.latency_ms >= 0
+
+
+@pytest.mark.asyncio
+async def test_slow_leg_times_out_without_blocking_others():
+    """Each leg has its own budget; a slow leg does not discard a fast one."""
+    fast, slow = await asyncio.gather(
+        run_search_leg("keyword", leg(["k"]), timeout_ms=50),
+        run_search_leg("semantic", leg(["s"], delay=1.0), timeout_ms=20),
+    )
+
+    assert fast.ok and fast.results == ["k"]
+    assert slow.status == LEG_TIMEOUT
+    assert slow.results == []
+    assert slow.latency_ms < 500
+
+
+@pytest.mark.asyncio
+async def test_failed_leg_is_reported_not_raised():
+    """Exceptions become an error status."""
+    result = await run_search_leg("keyword", leg([], error=RuntimeError("db down")), timeout_ms=50)
+
+    assert result.status == LEG_ERROR
+    assert result.error == "db down"
+    assert result.results == []
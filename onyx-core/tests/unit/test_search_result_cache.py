@@ -0,0 +1,107 @@
+"""
+Unit Tests for Search Result Cache
+
+Tests key normalization, the in-process LRU tier, generation-based
+invalidation, and the shared Redis tier via a mocked CacheManager.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from services.search_result_cache import SearchResultCache, GENERATION_KEY
+
+
+def make_cache(cache_manager=None, **kwargs):
+    """Create a cache, in-process only unless a CacheManager is given"""
+    defaults = {"ttl_seconds": 60, "max_size": 2}
+    defaults.update(kwargs)
+    return SearchResultCache(cache_manager=cache_manager, **defaults)
+
+
+def make_cache_manager(generation=0):
+    """Create a mocked CacheManager with a generation counter"""
+    manager = MagicMock()
+    manager.get = AsyncMock(return_value=None)
+    manager.set = AsyncMock(return_value=True)
+    manager.get_counter = AsyncMock(return_value=generation)
+    manager.increment = AsyncMock(return_value=generation + 1)
+    return manager
+
+
+def test_key_normalizes_query_and_permissions():
+    """Equivalent requests share a key; different options do not."""
+    cache = make_cache()
+
+    key = cache.make_key("Quarterly  Report", ["b", "a"], None, 5, "hybrid", recency_boost=True)
+
+    assert key == cache.make_key("quarterly report", ["a", "b", "a"], None, 5, "hybrid", recency_boost=True)
+    assert key != cache.make_key("quarterly report", ["a"], None, 5, "hybrid", recency_boost=True)
+    assert key != cache.make_key("quarterly report", ["a", "b"], "slack", 5, "hybrid", recency_boost=True)
+    assert key != cache.make_key("quarterly report", ["a", "b"], None, 5, "hybrid", recency_boost=False)
+
+
+@pytest.mark.asyncio
+async def test_front_tier_hit_and_lru_eviction():
+    """The in-process tier serves hits and evicts the least recently used entry."""
+    cache = make_cache()
+
+    await cache.set("k1", [{"doc_id": "1"}])
+    await cache.set("k2", [{"doc_id": "2"}])
+    assert await cache.get("k1") == [{"doc_id": "1"}]  # refreshes k1
+
+    await cache.set("k3", [{"doc_id": "3"}])  # evicts k2
+    assert await cache.get("k2") is None
+    assert await cache.get("k1") is not None
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_misses():
+    """Entries past their TTL are not served."""
+    cache = make_cache()
+
+    with patch("services.search_result_cache.time.monotonic", return_value=1000.0):
+        await cache.set("k", [{"doc_id": "1"}])
+    with patch("services.search_result_cache.time.monotonic", return_value=1061.0):
+        assert await cache.get("k") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_bumps_generation():
+    """Invalidation drops cached results and moves to a new generation."""
+    manager = make_cache_manager(generation=4)
+    cache = make_cache(cache_manager=manager)
+
+    await cache.set("k", [{"doc_id": "1"}])
+    assert manager.set.call_args.args[0] == "onyx:search:results:4:k"
+
+    await cache.invalidate()
+
+    manager.increment.assert_awaited_once_with(GENERATION_KEY)
+    assert cache.get_stats()["generation"] == 5
+    assert await cache.get("k") is None
+    manager.get.assert_awaited_with("onyx:search:results:5:k")
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_hit_is_promoted():
+    """Results written by another worker are served from Redis and promoted."""
+    manager = make_cache_manager()
+    manager.get = AsyncMock(return_value={"results": [{"doc_id": "1"}]})
+    cache = make_cache(cache_manager=manager)
+
+    assert await cache.get("k") == [{"doc_id": "1"}]
+    assert await cache.get("k") == [{"doc_id": "1"}]
+    manager.get.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_remote_invalidation_clears_front_tier():
+    """A generation bump from another worker invalidates the local tier."""
+    manager = make_cache_manager(generation=0)
+    cache = make_cache(cache_manager=manager)
+    await cache.set("k", [{"doc_id": "1"}])
+
+    manager.get_counter = AsyncMock(return_value=1)
+    cache._generation_checked_at = 0.0  # force a refresh
+
+    assert await cache.get("k") is None
@@ -0,0 +1,174 @@
+"""
+Unit Tests for Streaming Upload Ingestion
+
+Tests incremental chunking against whole-document chunking, incremental
+text parsing, streamed embedding batches and the upload pipeline.
+"""
+
+import io
+import re
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from api.upload import process_uploaded_file
+from file_parsers.text_parser import TextParser
+from services.embedding_service import (
+    EmbeddingService,
+    StreamingChunker,
+    EMBEDDING_DIMENSIONS,
+)
+
+
+class FakeTokenizer:
+    """Lossless tokenizer: one token per word with its leading whitespace"""
+
+    def encode(self, text):
+        return re.findall(r"\s*\S+|\s+", text)
+
+    def decode(self, tokens):
+        return "".join(tokens)
+
+
+def make_service(monkeypatch, tokenizer=None) -> EmbeddingService:
+    """Create an EmbeddingService without dedup and with the API patched out"""
+    monkeypatch.setenv("ENABLE_EMBEDDING_DEDUP", "false")
+    with patch("services.embedding_service.AsyncOpenAI"):
+        service = EmbeddingService()
+    service.tokenizer = tokenizer
+    service._generate_batch_embeddings_with_retry = AsyncMock(
+        side_effect=lambda texts: [[float(len(t))] * EMBEDDING_DIMENSIONS for t in texts]
+    )
+    return service
+
+
+def make_document(words: int) -> str:
+    """Document of numbered words split into paragraphs"""
+    return "\n\n".join(
+        " ".join(f"word{i}" for i in range(start, min(start + 90, words)))
+        for start in range(0, words, 90)
+    )
+
+
+def stream_chunks(chunker, text, segment_size):
+    """Feed a text to a chunker in fixed-size segments"""
+    chunks = []
+    for start in range(0, len(text), segment_size):
+        chunks.extend(chunker.feed(text[start:start + segment_size]))
+    return chunks + chunker.finish()
+
+
+@pytest.mark.parametrize("words", [10, 500, 951, 1800])
+def test_streaming_chunks_match_whole_document_chunks(monkeypatch, words):
+    """Feeding segments of any size yields the same windows as chunking at once."""
+    document = make_document(words)
+    service = make_service(monkeypatch, tokenizer=FakeTokenizer())
+    expected = service._chunk_content(document)
+
+    for segment_size in (7, 100, 4096):
+        spans = stream_chunks(StreamingChunker(FakeTokenizer()), document, segment_size)
+        assert [span.text for span in spans] == expected
+        assert all(document[span.start_char:span.end_char].strip() == span.text for span in spans)
+
+
+def test_streaming_word_chunks_match_word_fallback(monkeypatch):
+    """Without a tokenizer the chunker reproduces the word-based chunking."""
+    document = make_document(1000)
+    service = make_service(monkeypatch)
+
+    spans = stream_chunks(StreamingChunker(), document, 333)
+
+    assert [span.text for span in spans] == service._chunk_content(document)
+
+
+def test_text_parser_streams_segments(monkeypatch):
+    """Text is decoded block by block and cut at paragraph breaks."""
+    monkeypatch.setattr("file_parsers.text_parser.STREAM_READ_SIZE", 64)
+    raw = "First   paragraph,\r\nline two\r\n\r\n" + "\n\n".join(
+        f"Paragraph {i} is about café opening hours." for i in range(100)
+    )
+    content_stream = TextParser().open_stream(io.BytesIO(raw.encode("utf-8")), "notes.txt")
+
+    segments = list(content_stream.segments)
+
+    assert len(segments) > 2
+    assert segments[0].startswith("First paragraph, line two\n\nParagraph 0")
+    assert all(segment.endswith("\n\n") for segment in segments[:-1])
+    assert "".join(segments).split() == TextParser()._process_text_content(raw).split()
+    assert content_stream.metadata["encoding"] == "utf-8"
+    assert content_stream.metadata["word_count"] == len(raw.split())
+    assert content_stream.metadata["char_count"] == len(raw)
+
+
+def test_text_parser_validates_stream_header():
+    """Binary data is rejected from the header without reading the file."""
+    parser = TextParser()
+
+    assert parser.validate_stream(io.BytesIO(b"plain text\n" * 10), "notes.txt").is_valid
+    binary = parser.validate_stream(io.BytesIO(b"\x00\x00\x00\x01" * 100), "notes.txt")
+    assert not binary.is_valid
+    assert not parser.validate_stream(io.BytesIO(b"text"), "notes.pdf").is_valid
+
+
+@pytest.mark.asyncio
+async def test_embed_stream_yields_ordered_batches(monkeypatch):
+    """Batches come out in document order with running chunk indexes."""
+    service = make_service(monkeypatch, tokenizer=FakeTokenizer())
+    document = make_document(5000)
+
+    async def segments():
+        for start in range(0, len(document), 1000):
+            yield document[start:start + 1000]
+
+    batches = [batch async for batch in service.embed_stream(segments(), {}, batch_chunks=3)]
+
+    chunks = [chunk for batch in batches for chunk in batch]
+    assert [len(batch) for batch in batches[:-1]] == [3] * (len(batches) - 1)
+    assert [chunk.text for chunk in chunks] == service._chunk_content(document)
+    assert [chunk.metadata.chunk_index for chunk in chunks] == list(range(len(chunks)))
+    assert all(chunk.metadata.total_chunks is None for chunk in chunks)
+
+
+@pytest.mark.asyncio
+async def test_process_uploaded_file_indexes_streamed_batches(monkeypatch):
+    """Each embedded batch is indexed as it arrives, without a temp file."""
+    service = make_service(monkeypatch, tokenizer=FakeTokenizer())
+    rag_service = MagicMock()
+    rag_service.add_documents = AsyncMock(side_effect=lambda documents: len(documents))
+    document = make_document(3000)
+    upload = SimpleNamespace(filename="notes.txt", file=io.BytesIO(document.encode("utf-8")), seek=AsyncMock())
+
+    with patch("api.upload.get_embedding_service", new=AsyncMock(return_value=service)), \
+            patch("api.upload.get_rag_service", new=AsyncMock(return_value=rag_service)), \
+            patch("services.embedding_service.STREAM_BATCH_CHUNKS", 2), \
+            patch("tempfile.NamedTemporaryFile") as temp_file:
+        result = await process_uploaded_file(upload, "user@example.com")
+
+    assert result.status == "success"
+    assert rag_service.add_documents.await_count > 1
+    temp_file.assert_not_called()
+    indexed = [doc for call in rag_service.add_documents.await_args_list for doc in call.args[0]]
+    assert len(indexed) == result.chunks_count > 2
+    assert [doc.doc_id for doc in indexed] == [f"{result.doc_id}_chunk_{i}" for i in range(len(indexed))]
+    assert indexed[0].metadata["file_metadata"]["permissions"] == ["user:user@example.com", "team:*"]
+
+
+@pytest.mark.asyncio
+async def test_failed_upload_removes_partially_indexed_chunks(monkeypatch):
+    """A file that fails after some batches were indexed leaves no chunks behind."""
+    service = make_service(monkeypatch, tokenizer=FakeTokenizer())
+    rag_service = MagicMock()
+    rag_service.add_documents = AsyncMock(side_effect=[2, 2, Exception("qdrant down")] + [2] * 100)
+    rag_service.delete_documents = AsyncMock(return_value=True)
+    document = make_document(3000)
+    upload = SimpleNamespace(filename="notes.txt", file=io.BytesIO(document.encode("utf-8")), seek=AsyncMock())
+
+    with patch("api.upload.get_embedding_service", new=AsyncMock(return_value=service)), \
+            patch("api.upload.get_rag_service", new=AsyncMock(return_value=rag_service)), \
+            patch("services.embedding_service.STREAM_BATCH_CHUNKS", 2):
+        result = await process_uploaded_file(upload, "user@example.com")
+
+    assert result.status == "error"
+    sent = [doc.doc_id for call in rag_service.add_documents.await_args_list for doc in call.args[0]]
+    rag_service.delete_documents.assert_awaited_once_with(sent)
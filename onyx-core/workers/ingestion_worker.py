@@ -0,0 +1,264 @@
+"""
+Ingestion Background Worker for ONYX
+
+This worker processes upload ingestion jobs from the Redis queue: it parses,
+embeds and indexes each stored file with the upload pipeline, reports
+per-file progress, and removes the stored files once the job is done.
+
+Jobs are acknowledged once they finish. Jobs left unfinished by a crash
+are requeued when the worker restarts under the same INGESTION_WORKER_ID
+(defaults to the hostname), so each worker needs a stable, unique id.
+
+Run with: python -m workers.ingestion_worker (UPLOAD_DIR must be shared with
+the API, which stores the uploaded files there)
+"""
+
+import os
+import asyncio
+import signal
+import socket
+import sys
+import time
+import logging
+from typing import Any, Dict, List
+
+from api.upload import UPLOAD_FILE_CONCURRENCY, FileProcessingResult, ingest_file
+from services.ingestion_job_service import (
+    STATUS_COMPLETED,
+    STATUS_COMPLETED_WITH_ERRORS,
+    STATUS_FAILED,
+    STATUS_PROCESSING,
+    FileProgress,
+    IngestionJob,
+    get_ingestion_job_service,
+)
+from services.parse_pool import get_parse_pool
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionWorker:
+    """Background worker for processing ingestion jobs"""
+
+    def __init__(self):
+        """Initialize ingestion worker"""
+        self.job_service = get_ingestion_job_service()
+        self.running = False
+        # Stable across restarts so unfinished jobs of a crashed run are recovered
+        self.worker_id = os.getenv("INGESTION_WORKER_ID", f"ingestion-worker-{socket.gethostname()}")
+        self.max_concurrent_jobs = int(os.getenv("MAX_CONCURRENT_INGESTION_JOBS", "2"))
+        self.job_timeout = int(os.getenv("INGESTION_JOB_TIMEOUT_SECONDS", "1800"))
+
+        # Statistics
+        self.stats = {
+            "jobs_processed": 0,
+            "jobs_successful": 0,
+            "jobs_failed": 0,
+            "files_processed": 0,
+            "files_failed": 0,
+            "start_time": time.time(),
+        }
+
+    async def start(self):
+        """Start the worker process"""
+        logger.info(f"Starting ingestion worker {self.worker_id}")
+
+        # Set up signal handlers for graceful shutdown
+        signal.signal(signal.SIGINT, self._signal_handler)
+        signal.signal(signal.SIGTERM, self._signal_handler)
+
+        self.running = True
+
+        try:
+            for job in await self.job_service.recover_jobs(self.worker_id):
+                self._remove_stored_files(job)
+            await self._job_processing_loop()
+        except Exception as e:
+            logger.error(f"Worker error: {e}")
+        finally:
+            await self._shutdown()
+
+    async def stop(self):
+        """Stop the worker gracefully (running jobs are finished first)"""
+        logger.info(f"Stopping ingestion worker {self.worker_id}")
+        self.running = False
+
+    def _signal_handler(self, signum, frame):
+        """Handle shutdown signals"""
+        logger.info(f"Received signal {signum}, shutting down gracefully")
+        asyncio.create_task(self.stop())
+
+    async def _job_processing_loop(self):
+        """Main loop: take jobs while fewer than max_concurrent_jobs are running"""
+        logger.info("Job processing loop started")
+        slots = asyncio.Semaphore(self.max_concurrent_jobs)
+        running_jobs = set()
+
+        while self.running:
+            await slots.acquire()
+            try:
+                job = await self.job_service.get_next_job(self.worker_id)
+            except Exception as e:
+                logger.error(f"Error in job processing loop: {e}")
+                job = None
+                await asyncio.sleep(5)  # Brief pause on error
+
+            if job is None:
+                slots.release()
+                continue
+
+            task = asyncio.create_task(self._process_job_with_timeout(job))
+            running_jobs.add(task)
+            task.add_done_callback(running_jobs.discard)
+            task.add_done_callback(lambda _: slots.release())
+
+        if running_jobs:
+            logger.info(f"Waiting for {len(running_jobs)} running jobs")
+            await asyncio.gather(*running_jobs, return_exceptions=True)
+
+    async def _process_job_with_timeout(self, job: IngestionJob):
+        """Process a job with timeout"""
+        try:
+            await asyncio.wait_for(self._process_job(job), timeout=self.job_timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Ingestion job {job.job_id} timed out after {self.job_timeout}s")
+            await self.job_service.update_job_status(job.job_id, STATUS_FAILED)
+            self.stats["jobs_processed"] += 1
+            self.stats["jobs_failed"] += 1
+        except Exception as e:
+            logger.error(f"Ingestion job {job.job_id} failed: {e}")
+            await self.job_service.update_job_status(job.job_id, STATUS_FAILED)
+            self.stats["jobs_processed"] += 1
+            self.stats["jobs_failed"] += 1
+        finally:
+            self._remove_stored_files(job)
+            await self.job_service.ack_job(job.job_id, self.worker_id)
+
+    async def _process_job(self, job: IngestionJob):
+        """Ingest the files of a job concurrently (up to UPLOAD_FILE_CONCURRENCY at a time)"""
+        job_start_time = time.time()
+        logger.info(f"Processing ingestion job {job.job_id} ({len(job.files)} files)")
+
+        await self.job_service.update_job_status(job.job_id, STATUS_PROCESSING)
+
+        semaphore = asyncio.Semaphore(max(1, UPLOAD_FILE_CONCURRENCY))
+
+        async def process_file(index: int, stored_file: Dict[str, Any]) -> FileProcessingResult:
+            async with semaphore:
+                return await self._process_file(job, index, stored_file)
+
+        results: List[FileProcessingResult] = await asyncio.gather(*(
+            process_file(index, stored_file) for index, stored_file in enumerate(job.files)
+        ))
+
+        successful = sum(1 for result in results if result.status == "success")
+        if successful == len(results):
+            status = STATUS_COMPLETED
+        elif successful:
+            status = STATUS_COMPLETED_WITH_ERRORS
+        else:
+            status = STATUS_FAILED
+
+        await self.job_service.update_job_status(job.job_id, status)
+
+        # Update statistics
+        self.stats["jobs_processed"] += 1
+        self.stats["jobs_successful" if successful else "jobs_failed"] += 1
+        self.stats["files_processed"] += len(results)
+        self.stats["files_failed"] += len(results) - successful
+
+        logger.info(
+            f"Ingestion job {job.job_id} {status}: {successful}/{len(results)} files "
+            f"in {time.time() - job_start_time:.1f}s"
+        )
+
+    async def _process_file(self, job: IngestionJob, index: int, stored_file: Dict[str, Any]) -> FileProcessingResult:
+        """
+        Ingest one stored file, reporting progress as it advances
+
+        Args:
+            job: Job the file belongs to
+            index: Position of the file in the job
+            stored_file: IngestionFile dict (filename, path)
+
+        Returns:
+            FileProcessingResult of the upload pipeline
+        """
+        progress = FileProgress(filename=stored_file["filename"], status=STATUS_PROCESSING)
+        await self.job_service.update_file_progress(job.job_id, index, progress)
+
+        async def on_progress(**updates):
+            for name, value in updates.items():
+                setattr(progress, name, value)
+            await self.job_service.update_file_progress(job.job_id, index, progress)
+
+        try:
+            with open(stored_file["path"], "rb") as stream:
+                result = await ingest_file(
+                    stream, stored_file["filename"], job.user_id,
+                    progress=on_progress, file_path=stored_file["path"]
+                )
+        except OSError as e:
+            result = FileProcessingResult(
+                filename=stored_file["filename"],
+                status="error",
+                error_message=f"Stored upload unavailable: {str(e)}"
+            )
+
+        progress.status = result.status
+        progress.doc_id = result.doc_id
+        progress.error_message = result.error_message
+        await self.job_service.update_file_progress(job.job_id, index, progress)
+
+        return result
+
+    def _remove_stored_files(self, job: IngestionJob):
+        """Delete a job's stored uploads and its directory"""
+        job_dirs = set()
+        for stored_file in job.files:
+            job_dirs.add(os.path.dirname(stored_file["path"]))
+            try:
+                os.unlink(stored_file["path"])
+            except OSError:
+                pass
+
+        for job_dir in job_dirs:
+            try:
+                os.rmdir(job_dir)
+            except OSError:
+                pass
+
+    async def _shutdown(self):
+        """Clean shutdown of worker"""
+        logger.info(f"Shutting down worker {self.worker_id}")
+
+        # Report final statistics
+        uptime = time.time() - self.stats["start_time"]
+        logger.info(
+            f"Worker {self.worker_id} final stats: "
+            f"uptime={uptime:.1f}s, "
+            f"jobs_processed={self.stats['jobs_processed']}, "
+            f"jobs_successful={self.stats['jobs_successful']}, "
+            f"jobs_failed={self.stats['jobs_failed']}, "
+            f"files_processed={self.stats['files_processed']}"
+        )
+
+        get_parse_pool().shutdown()
+        self.running = False
+
+
+async def main():
+    """Main entry point for the worker"""
+    worker = IngestionWorker()
+    await worker.start()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())